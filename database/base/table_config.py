@@ -1,4 +1,6 @@
-import pandas as pd
+from src.core.global_imports import import_pandas
+
+pd = import_pandas()
 
 # global
 DECIMAL_PLACES = ".4f"
@@ -123,16 +123,21 @@ def current_replication_id():
     return max_id
 
 
-def filter_replications(rep_ids: Union[int, list[int]] = current_replication_id(), type: str = None, name: str = None, stat: str = None) -> pd.DataFrame:
+def filter_replications(rep_ids: Union[int, list[int]] = None, type: str = None, name: str = None, stat: str = None) -> pd.DataFrame:
     """
     Filter data for one or multiple replications by IDs and optionally by type, name, and stat.
 
     :param rep_ids: int or list[int] - Single replication ID or list of replication IDs to filter.
+                    Defaults to the latest replication run.
     :param type: str (optional) - Filter for the type of data (e.g., 'Entity', 'Server', etc.).
     :param name: str (optional) - Filter for the name of the entity or server.
     :param stat: str (optional) - Filter for the specific statistic to retrieve.
     :return: pd.DataFrame - A pandas DataFrame containing the filtered results.
     """
+    # Resolved per call, a default argument would query the database when the module is imported
+    if rep_ids is None:
+        rep_ids = current_replication_id()
+
     # Ensure rep_ids is a list for consistency
     if isinstance(rep_ids, int):
         rep_ids = [rep_ids]
@@ -123,16 +123,21 @@ def current_simulation_id():
     return max_id
 
 
-def filter_simulations(simulation_ids: Union[int, list[int]] = current_simulation_id(), type: str = None, name: str = None, stat: str = None) -> pd.DataFrame:
+def filter_simulations(simulation_ids: Union[int, list[int]] = None, type: str = None, name: str = None, stat: str = None) -> pd.DataFrame:
     """
     Filter data for one or multiple simulations by IDs and optionally by type, name, and stat.
 
     :param simulation_ids: int or list[int] - Single simulation ID or list of simulation IDs to filter.
+                           Defaults to the latest simulation.
     :param type: str (optional) - Filter for the type of data (e.g., 'Entity', 'Server', etc.).
     :param name: str (optional) - Filter for the name of the entity or server.
     :param stat: str (optional) - Filter for the specific statistic to retrieve.
     :return: pd.DataFrame - A pandas DataFrame containing the filtered results.
     """
+    # Resolved per call, a default argument would query the database when the module is imported
+    if simulation_ids is None:
+        simulation_ids = current_simulation_id()
+
     # Ensure sim_ids is a list for consistency
     if isinstance(simulation_ids, int):
         simulation_ids = [simulation_ids]
@@ -3,8 +3,7 @@ from typing import Protocol, Any, List, Tuple
 import logging
 import numpy as np
 
-from src.core.components.date_time import DateTime
-from src.core.global_imports import ENTITY_PROCESSING_LOG_ENTRY
+from src.core.utils.logging_utils import LazyLogEntry
 from src.core.utils.helper import round_value
 
 
@@ -101,7 +100,7 @@ def _safe_log(msg: str, timestamp: float) -> None:
     """Safe logging that doesn't disrupt simulation."""
     try:
         if logging.root.level <= logging.TRACE:
-            logging.log(logging.TRACE, ENTITY_PROCESSING_LOG_ENTRY.format(msg, DateTime.get(timestamp)))
+            logging.log(logging.TRACE, LazyLogEntry(timestamp, msg))
     except Exception:
         pass
 
@@ -4,11 +4,21 @@ import logging.handlers
 import pathlib
 import datetime as dt
 
+import src.core.config as cfg
+from src.core.utils.logging_utils import start_queue_logging
 from dmpg_logs.logging_utils.file_logger import log_puffer_dict, find_puffer_path
 from dmpg_logs.logging_utils.gps_logger import find_gps_path, log_gps_json_dict
 
 
-def setup_logging(log_puffer: bool = False, log_gps: bool = False):
+def setup_logging(log_puffer: bool = False, log_gps: bool = False, use_queue: bool = False):
+    """
+    Configure the file and stderr handlers of the root logger.
+
+    :param log_puffer: Write the storage locations of puffer.py to the head of the log file
+    :param log_gps: Write the GPS JSON to the head of the log file
+    :param use_queue: Only enqueue records in the simulation and replication processes and let a single listener
+                      thread in this process do formatting and I/O (see ``start_queue_logging``)
+    """
     base_dir = pathlib.Path(__file__).resolve().parent.parent
     config_path = base_dir / "trace_logging" / "logging_configs.json"
     with open(config_path, encoding="utf-8") as f:
@@ -40,3 +50,6 @@ def setup_logging(log_puffer: bool = False, log_gps: bool = False):
     h.pop("backupCount", None)
 
     logging.config.dictConfig(config)
+
+    if use_queue:
+        start_queue_logging(cfg.logging_queue_size, cfg.logging_queue_timeout)
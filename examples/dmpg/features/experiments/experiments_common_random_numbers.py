@@ -0,0 +1,61 @@
+"""
+Compares two scenarios with and without common random numbers (config ``simulation.random_streams``).
+
+Replication r of both scenarios is always run with seed r. Without named streams the two runs consume the global
+random stream in a different order as soon as the scenarios diverge, so the paired replications are hardly
+correlated. With named streams every component and purpose draws from its own stream, both scenarios see the
+same arrivals and the confidence interval of the difference gets much narrower.
+"""
+from src.core.components.server import Server
+from src.core.components.sink import Sink
+from src.core.components.source import Source
+from src.core.global_imports import random
+from src.core.simulation.experiments.experiment import ExperimentRunner
+from src.core.simulation.experiments.parameter_manager import parameterize_model
+
+
+@parameterize_model
+def setup_tandem_line(env, parameters=None):
+    params = parameters or {}
+
+    source = Source(env, "Source", (random.expovariate, 1 / 6))
+    placement = Server(env, "Placement", (random.uniform, 3, params.get('placement_time_max', 5.5)))
+    inspection = Server(env, "Inspection", (random.uniform, 2, 5))
+    good_parts = Sink(env, "Goodparts")
+    bad_parts = Sink(env, "Badparts")
+
+    source.connect(placement)
+    placement.connect(inspection)
+    inspection.connect(good_parts, 92)
+    inspection.connect(bad_parts, 8)
+
+
+def run_experiment(common_random_numbers: bool, replications: int = 30):
+    """
+    Run the baseline and the faster placement scenario.
+
+    :return: Paired difference of the average time in the placement queue
+    """
+    experiment = ExperimentRunner(
+        name="Placement Speed-Up",
+        model_builder=setup_tandem_line,
+        common_random_numbers=common_random_numbers
+    )
+    experiment.create_scenario(name="Baseline", parameters={'placement_time_max': 5.5})
+    experiment.create_scenario(name="FasterPlacement", parameters={'placement_time_max': 5})
+    experiment.run_all(steps=5000, replications=replications)
+
+    return experiment.get_paired_difference('Server', 'Placement', 'TimeInQueue (average)',
+                                            'Baseline', 'FasterPlacement')
+
+
+if __name__ == "__main__":
+    results = {'Global random stream': run_experiment(False),
+               'Common random numbers': run_experiment(True)}
+
+    print(f"{'Random numbers':<24}{'Difference':>12}{'Half-Width':>12}")
+    for name, difference in results.items():
+        print(f"{name:<24}{difference['Average']:>12.4f}{difference['Half-Width']:>12.4f}")
+
+    ratio = results['Global random stream']['Half-Width'] / results['Common random numbers']['Half-Width']
+    print(f"Common random numbers narrow the confidence interval of the difference {ratio:.1f}x")
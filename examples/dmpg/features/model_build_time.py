@@ -0,0 +1,39 @@
+"""
+Compares the time to build a model of 3000 components with the time of a replication of it.
+
+Every replication builds the model anew with the model function, which also resets the model of the previous
+replication. With 1000 Source -> Server -> Sink lines, each server processing about 25 entities in a replication,
+the build is a small share of the replication, so keeping a template of the components wouldn't pay off.
+"""
+import time
+
+from src.core.components.model import Model
+from src.core.components.server import Server
+from src.core.components.sink import Sink
+from src.core.components.source import Source
+from src.core.global_imports import random
+
+LINES = 1000
+DURATION = 1000
+REPLICATIONS = 3
+
+
+def setup_lines(env):
+    for i in range(LINES):
+        source = Source(env, f"BuildSource{i}", (random.expovariate, 1 / 40))
+        server = Server(env, f"BuildServer{i}", (random.uniform, 20, 40))
+        sink = Sink(env, f"BuildSink{i}")
+        source.connect(server)
+        server.connect(sink)
+
+
+if __name__ == "__main__":
+    for replication in range(REPLICATIONS):
+        start = time.perf_counter()
+        env = Model().start_simulation(setup_lines, DURATION, seed=replication)
+        build_time = time.perf_counter() - start
+        start = time.perf_counter()
+        env.run(until=DURATION)
+        run_time = time.perf_counter() - start
+        print(f"Replication {replication}: build of {3 * LINES} components {build_time * 1000:7.0f} ms, "
+              f"run {run_time * 1000:7.0f} ms ({build_time / run_time:.1%})")
@@ -0,0 +1,80 @@
+"""
+Compares the standard SimPy event heap with the bucket event scheduler (config ``simulation.event_scheduler``).
+
+The tandem line has almost no simultaneous events, the shift model releases large batches at shift changes.
+"""
+import time
+
+from src.core.components.entity import EntityManager
+from src.core.components.model import Model
+from src.core.components.server import Server
+from src.core.components.sink import Sink
+from src.core.components.source import Source
+from src.core.global_imports import random, set_random_seed
+from src.core.simulation.bucket_environment import create_environment, HEAP_SCHEDULER, BUCKET_SCHEDULER
+
+
+def setup_tandem_line(env):
+    source = Source(env, "Source", (random.expovariate, 1 / 6))
+    placement = Server(env, "Placement", (random.triangular, 3, 5, 4))
+    inspection = Server(env, "Inspection", (random.uniform, 2, 4))
+    good_parts = Sink(env, "Goodparts")
+    bad_parts = Sink(env, "Badparts")
+
+    source.connect(placement)
+    placement.connect(inspection)
+    inspection.connect(good_parts, 92)
+    inspection.connect(bad_parts, 8)
+
+
+def setup_shift_changes(env):
+    # 200 stations start and finish their work at the same shift change every 480 minutes
+    sink = Sink(env, "ShiftSink")
+    for i in range(200):
+        source = Source(env, f"ShiftSource{i}", (lambda: 480,))
+        server = Server(env, f"ShiftServer{i}", (lambda: 60,))
+        source.connect(server)
+        server.connect(sink)
+
+
+def run(model_func, scheduler, duration, count_events=False):
+    """
+    Build and run a model like ``Model.run_simulation`` with the given scheduler.
+
+    :return: Tuple of wall time in seconds and number of processed events (0 if not counted)
+    """
+    set_random_seed(1)
+    env = create_environment(scheduler)
+    EntityManager.initialize(env)
+    Model().reset_simulation()
+    model_func(env)
+
+    events = 0
+    if count_events:
+        step = env.step
+
+        def counting_step():
+            nonlocal events
+            events += 1
+            step()
+
+        env.step = counting_step
+
+    start = time.perf_counter()
+    env.run(until=duration)
+    return time.perf_counter() - start, events
+
+
+def main():
+    print(f"{'Model':<15} | {'Scheduler':<9} | {'Events':>9} | {'Seconds':>8} | {'Events/sec':>12}")
+    print("-" * 66)
+    for name, model_func, duration in (("Tandem line", setup_tandem_line, 200000),
+                                       ("Shift changes", setup_shift_changes, 100000)):
+        _, events = run(model_func, HEAP_SCHEDULER, duration, count_events=True)
+        for scheduler in (HEAP_SCHEDULER, BUCKET_SCHEDULER):
+            seconds = min(run(model_func, scheduler, duration)[0] for _ in range(3))
+            print(f"{name:<15} | {scheduler:<9} | {events:>9} | {seconds:>8.3f} | {events / seconds:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Compares INFO-level logging of parallel replications with direct file handlers and with queue logging.
+
+With direct handlers every worker process formats its records and writes them to the log file itself. With queue
+logging (``start_queue_logging`` or ``setup_logging(use_queue=True)``) the workers only enqueue the records and a
+single listener thread in this process formats and writes them, tagged with the replication number. A record waits
+for room in a full queue (``queue_timeout``), with a timeout of 0 the records that don't fit are dropped instead.
+"""
+import logging
+import os
+import tempfile
+import time
+
+from src.core.components.server import Server
+from src.core.components.sink import Sink
+from src.core.components.source import Source
+from src.core.global_imports import random
+from src.core.simulation.simulation import run_replications
+from src.core.utils.logging_utils import start_queue_logging, stop_queue_logging
+
+WORKERS = 16
+REPLICATIONS = 32
+DURATION = 20000
+
+
+def log_finished_part(component, entity, **kwargs):
+    logging.info("%s finished %s", component.name, entity.name)
+
+
+def setup_tandem_line(env):
+    source = Source(env, "Source", (random.expovariate, 1 / 6))
+    placement = Server(env, "Placement", (random.triangular, 3, 5, 4), after_processing_trigger=log_finished_part)
+    inspection = Server(env, "Inspection", (random.uniform, 2, 4), after_processing_trigger=log_finished_part)
+    good_parts = Sink(env, "Goodparts")
+    bad_parts = Sink(env, "Badparts")
+
+    source.connect(placement)
+    placement.connect(inspection)
+    inspection.connect(good_parts, 92)
+    inspection.connect(bad_parts, 8)
+
+
+def run(use_queue: bool, log_file: str, queue_timeout: float = 5.0):
+    """
+    Run the replications with a file handler on the root logger.
+
+    :return: Tuple of wall time in seconds, number of written lines, number of dropped records and number of
+             replications that dropped records
+    """
+    handler = logging.FileHandler(log_file, mode='w')
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    root = logging.getLogger()
+    root_handlers = root.handlers[:]
+    for root_handler in root_handlers:
+        root.removeHandler(root_handler)
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+
+    start = time.perf_counter()
+    if use_queue:
+        queue_logging = start_queue_logging(queue_timeout=queue_timeout)
+    run_replications(setup_tandem_line, DURATION, REPLICATIONS, multiprocessing=True, max_workers=WORKERS,
+                     enable_detailed_replication_data=False, skip_statistics=True)
+    dropped = stop_queue_logging() if use_queue else 0
+    replications_with_drops = len(queue_logging.dropped_per_replication) if use_queue else 0
+    wall_time = time.perf_counter() - start
+
+    root.removeHandler(handler)
+    handler.close()
+    for root_handler in root_handlers:
+        root.addHandler(root_handler)
+
+    with open(log_file, encoding='utf-8') as f:
+        lines = sum(1 for _ in f)
+    return wall_time, lines, dropped, replications_with_drops
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as log_dir:
+        log_file = os.path.join(log_dir, "replications.log")
+        for name, use_queue, queue_timeout in (("direct file handler", False, 0),
+                                               ("queue logging", True, 5.0),
+                                               ("queue logging, dropping", True, 0)):
+            wall_time, lines, dropped, replications_with_drops = run(use_queue, log_file, queue_timeout)
+            print(f"{name:<28} {wall_time:7.2f} s  {lines:>9} lines  {dropped:>9} dropped "
+                  f"in {replications_with_drops} replications")
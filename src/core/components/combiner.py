@@ -7,17 +7,16 @@ import src.core.global_imports as gi
 import src.core.statistics.entity_type_utils as et
 from dmpg_logs.logging_utils.stats_logger import log_combiner_statistics
 from src.core.event.block_event import BlockEvent
-from src.core.components.date_time import DateTime
 from src.core.components.entity import Entity
+from src.core.components.entity_type_queue import EntityTypeQueue
 from src.core.components.logistic.storage_manager import StorageManager
 from src.core.components.model import Model, ComponentType
 from src.core.components.work_schedule import ask_work_schedule, WorkScheduleWeek
 from src.core.components_abstract.processing_component import ProcessingComponent
 from src.core.global_imports import DURATION_WARM_UP
-from src.core.global_imports import ENTITY_PROCESSING_LOG_ENTRY
+from src.core.utils.logging_utils import LazyLogEntry
 from src.core.statistics.entity_type_utils import initialize_entity_types_combiner
 from src.core.types.queue_type import QueueType
-from src.core.utils.helper import count_entity_type, get_entity_by_type
 from src.core.utils.helper import get_value_from_distribution_with_parameters, round_value
 
 
@@ -100,7 +99,7 @@ class Combiner(ProcessingComponent):
                                      vehicle_group,
                                      position)
 
-        self.member_input_queue = []
+        self.member_input_queue = EntityTypeQueue()
         self.member_queue_length = 0
         self.member_queue_lengths = []
         self.member_queue_times = []
@@ -155,8 +154,7 @@ class Combiner(ProcessingComponent):
                 stats[et.MEMBERS_IN_QUEUE_MAX] = max(stats[et.MEMBERS_IN_QUEUE_MAX], stats[et.MEMBERS_QUEUE_LENGTH])
 
         logging.root.level <= logging.TRACE and logging.trace(
-            ENTITY_PROCESSING_LOG_ENTRY.format(f"[Combiner] {self.name} received entity {entity.name}",
-                                               DateTime.get(self.env.now)))
+            LazyLogEntry(self.env.now, "[Combiner] {} received entity {}", self.name, entity.name))
 
         self.env.process(self._request_worker())
 
@@ -184,11 +182,11 @@ class Combiner(ProcessingComponent):
         if self.combination_rules:
             # Check whether a rule can be fulfilled or not
             for rule in self.combination_rules:
-                if self.input_queue and count_entity_type(rule, self.member_input_queue) >= self.combination_rules[rule]:  # rule fulffilled
+                if self.input_queue and self.member_input_queue.count(rule) >= self.combination_rules[rule]:  # rule fulffilled
                     entity, queue_entry_time = self.input_queue.popleft()
 
                     for _ in range(self.combination_rules[rule]):
-                        member, member_queue_entry_time = get_entity_by_type(rule, self.member_input_queue)
+                        member, member_queue_entry_time = self.member_input_queue.pop_by_type(rule)
                         member_entry_times.append(member_queue_entry_time)
                         entity.batch_members.append(member)
                         members_poped += 1
@@ -200,7 +198,7 @@ class Combiner(ProcessingComponent):
                 if self.queuing_order == QueueType.LIFO:
                     entity, queue_entry_time = self.input_queue.pop()
                     for _ in range(self.members_to_combine):
-                        member, member_queue_entry_time = self.member_input_queue.pop(-1)
+                        member, member_queue_entry_time = self.member_input_queue.pop()
                         member_entry_times.append(member_queue_entry_time)
                         entity.batch_members.append(member)
                         members_poped += 1
@@ -237,8 +235,8 @@ class Combiner(ProcessingComponent):
                 self.member_queue_times.append(self.env.now - member_entry_times[i])
 
             logging.root.level <= logging.TRACE and logging.trace(
-                ENTITY_PROCESSING_LOG_ENTRY.format(f"[Combiner] {self.name} begins processing {entity.name} , worker={worker_info}",
-                                                   DateTime.get(self.env.now)))
+                LazyLogEntry(self.env.now, "[Combiner] {} begins processing {} , worker={}",
+                             self.name, entity.name, worker_info))
 
             # Processes a single entity logic.
             if self.storage_queue:
@@ -254,18 +252,16 @@ class Combiner(ProcessingComponent):
             capa_id = self.capa_ids.popleft()
 
             logging.root.level <= logging.TRACE and logging.trace(
-                ENTITY_PROCESSING_LOG_ENTRY.format(f"[Combiner] {self.name} starts processing {entity.name}",
-                                                   DateTime.get(start_time)))
+                LazyLogEntry(start_time, "[Combiner] {} starts processing {}", self.name, entity.name))
 
             # Log statistics before processing (from first file)
             logging.root.level <= logging.TRACE and logging.trace(
-                ENTITY_PROCESSING_LOG_ENTRY.format(
-                    f"[CombinerStats] Combiner={self.name}, Status=busy, Entity={entity.name}, Queue={self.queue_length}, Total={self.total_entities_processed_pivot_table}",
-                    DateTime.get(self.env.now)
-                )
+                LazyLogEntry(self.env.now, "[CombinerStats] Combiner={}, Status=busy, Entity={}, Queue={}, Total={}",
+                             self.name, entity.name, self.queue_length, self.total_entities_processed_pivot_table)
             )
 
-            processing_time = get_value_from_distribution_with_parameters(self._determine_processing_time(entity))
+            processing_time = get_value_from_distribution_with_parameters(
+                self._determine_processing_time(entity), (self.name, 'processing'))
             resource_users = len(self.resource.users)
 
             # Simulate breakdowns or use ovens if applicable.
@@ -278,9 +274,8 @@ class Combiner(ProcessingComponent):
 
             # Log processing completion for this entity.
             logging.root.level <= logging.TRACE and logging.trace(
-                ENTITY_PROCESSING_LOG_ENTRY.format(
-                    f"[Combiner] {self.name} finished processing {entity.name} time {round_value(processing_time)}",
-                    DateTime.get(self.env.now)))
+                LazyLogEntry(self.env.now, "[Combiner] {} finished processing {} time {}",
+                             self.name, entity.name, round_value(processing_time)))
 
             if self.env.now >= DURATION_WARM_UP:
                 if self.units_utilized_over_time and self.units_utilized_over_time[-1][1] is None:
@@ -302,10 +297,8 @@ class Combiner(ProcessingComponent):
 
                 # Log statistics after processing (from first file)
                 logging.root.level <= logging.TRACE and logging.trace(
-                    ENTITY_PROCESSING_LOG_ENTRY.format(
-                        f"[CombinerStats] Combiner={self.name}, Status=idle, Entity=-, Queue={self.queue_length}, Total={self.total_entities_processed_pivot_table}",
-                        DateTime.get(self.env.now)
-                    )
+                    LazyLogEntry(self.env.now, "[CombinerStats] Combiner={}, Status=idle, Entity=-, Queue={}, Total={}",
+                                 self.name, self.queue_length, self.total_entities_processed_pivot_table)
                 )
 
             # Route entity to next destination
@@ -349,4 +342,5 @@ class Combiner(ProcessingComponent):
         self.units_utilized_over_time = []
         if self.time_between_machine_breakdowns:
             self.time_until_next_machine_breakdown = (
-                get_value_from_distribution_with_parameters(self.time_between_machine_breakdowns))
+                get_value_from_distribution_with_parameters(self.time_between_machine_breakdowns,
+                                                            (self.name, 'breakdown')))
@@ -3,11 +3,10 @@ from collections import deque
 
 from simpy import Environment
 
-from src.core.components.date_time import DateTime
 from src.core.components.entity import Entity
 from src.core.components_abstract.resetable_named_object import ResetAbleNamedObject, ResetAbleNamedObjectManager
 from src.core.components_abstract.routing_object import RoutingObject
-from src.core.global_imports import ENTITY_PROCESSING_LOG_ENTRY
+from src.core.utils.logging_utils import LazyLogEntry
 from src.core.types.componet_type import ComponentType
 
 
@@ -112,9 +111,8 @@ class Connection(ResetAbleNamedObject, RoutingObject):
         :param entity: The entity being processed
         """
 
-        logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(
-            "".join([component.name, " added ", entity.name, " to ", next_component.name]),
-            DateTime.get(component.env.now)))
+        logging.root.level <= logging.TRACE and logging.trace(
+            LazyLogEntry(component.env.now, "{} added {} to {}", component.name, entity.name, next_component.name))
 
         next_component.handle_entity_arrival(entity)
         component.number_exited += 1
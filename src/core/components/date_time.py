@@ -2,6 +2,7 @@ import locale
 from datetime import datetime, timedelta
 from typing import Union
 
+import src.core.config as cfg
 from src.core.components_abstract.singleton import Singleton
 from src.core.global_imports import HOURS_PER_DAY, MINUTES_PER_HOUR, SECONDS_PER_MINUTE
 from src.core.types.time_component import TimeComponent
@@ -16,9 +17,14 @@ class DateTime(Singleton):
     """The set date and time when the object is created."""
     simpy_time_mapped_to = TimeComponent.minute
     """The mapped time in minutes."""
+    format_cache_size = 4096
+    """Maximum number of results of get kept in the format cache."""
+    _format_cache = {}
+
     @classmethod
     def set(cls, initial_date_time: datetime) -> None:
         cls.initial_date_time = initial_date_time
+        cls._format_cache = {}
 
     @classmethod
     def get(cls, time_now: Union[float, int] = 0, time_string_from_initial_date: bool = True, get_weekday_hour_minute: bool = False) -> str:
@@ -28,7 +34,21 @@ class DateTime(Singleton):
         :param from_initial_date:
         :return: Returns a delta between `time_now` and `from_initial_date` if from_initial_date is set
         """
+        # Many log entries share the same simulation time, so the formatted result is cached per time, format and
+        # rounding precision. The cache is only valid for the current initial date time and time mapping, set and map
+        # clear it.
+        key = (time_now, type(time_now), cfg.precision, time_string_from_initial_date, get_weekday_hour_minute)
+        result = cls._format_cache.get(key)
+        if result is None:
+            if len(cls._format_cache) >= cls.format_cache_size:
+                cls._format_cache = {}
+            result = cls._format_cache[key] = cls._format(time_now, time_string_from_initial_date,
+                                                          get_weekday_hour_minute)
+        return result
 
+    @classmethod
+    def _format(cls, time_now: Union[float, int], time_string_from_initial_date: bool,
+                get_weekday_hour_minute: bool) -> str:
         match cls.simpy_time_mapped_to:
             case TimeComponent.second:
                 delta = timedelta(seconds=time_now)
@@ -57,6 +77,7 @@ class DateTime(Singleton):
         """
         assert isinstance(time_component, TimeComponent), "Invalid type for time_component argument!"
         cls.simpy_time_mapped_to = time_component
+        cls._format_cache = {}
 
     @classmethod
     def map_time_to_steps(cls, days: Union[int, float] = 0, hours: Union[int, float] = 0, minutes: Union[int, float] = 0, seconds: Union[int, float] = 0) -> Union[float, int]:
@@ -107,8 +107,10 @@ class EntityManager(Singleton):
         """
         cls.env = env
 
-        # Initialize max pool sizes from settings
-        cls.max_pool_size_by_type = defaultdict(lambda: cfg.entity_pool_default)
+        # Capture the pool sizes of the run's configuration, so destroying an entity needs no config lookup
+        config = cfg.snapshot()
+        default_pool_size = config.entity_pool_default
+        cls.max_pool_size_by_type = defaultdict(lambda: default_pool_size, config.entity_pool_by_type)
 
         cls.current_number_in_system = 0
         cls.last_change_time = env.now
@@ -167,7 +169,7 @@ class EntityManager(Singleton):
 
         # Recycle by type
         pool = cls.reycled_entities.setdefault(entity.entity_type, [])
-        max_pool_size = cfg.get_entity_pool_size(entity.entity_type)
+        max_pool_size = cls.max_pool_size_by_type[entity.entity_type]
 
         if len(pool) < max_pool_size:
             entity.reset()
@@ -233,7 +235,6 @@ class EntityManager(Singleton):
         # Clear entity collections
         cls.entities.clear()
         cls.reycled_entities.clear()
-        cls.max_pool_size_by_type.clear()
 
         # Reset counters and tracking variables
         cls.current_number_in_system = 0
@@ -0,0 +1,84 @@
+from collections import deque
+from itertools import count
+from typing import Tuple, Dict, Deque
+
+from src.core.components.entity import Entity
+
+
+class EntityTypeQueue:
+    """
+    Queue of (entity, queue entry time) tuples that keeps one FIFO deque per entity type.
+
+    Counting the waiting entities of a type is O(1), taking the oldest entity of a type is O(1)
+    and taking the newest entity overall is O(number of entity types).
+    """
+
+    def __init__(self):
+        self._queues: Dict[str, Deque[Tuple[int, Entity, float]]] = {}
+        self._sequence = count()
+        self._length = 0
+
+    def append(self, item: Tuple[Entity, float]) -> None:
+        """
+        Add an entity with its queue entry time.
+
+        :param item: Tuple of entity and queue entry time
+        """
+        entity, queue_entry_time = item
+        queue = self._queues.get(entity.entity_type)
+        if queue is None:
+            queue = self._queues[entity.entity_type] = deque()
+        queue.append((next(self._sequence), entity, queue_entry_time))
+        self._length += 1
+
+    def count(self, entity_type: str) -> int:
+        """
+        Number of waiting entities of a type.
+
+        :param entity_type: Type of the entities to count
+        :return: Number of entities of the type in the queue
+        """
+        queue = self._queues.get(entity_type)
+        return len(queue) if queue else 0
+
+    def pop_by_type(self, entity_type: str) -> Tuple[Entity, float]:
+        """
+        Remove and return the oldest entity of a type.
+
+        :param entity_type: Type of the entity to take
+        :return: Tuple of entity and queue entry time
+        """
+        _, entity, queue_entry_time = self._queues[entity_type].popleft()
+        self._length -= 1
+        return entity, queue_entry_time
+
+    def pop(self) -> Tuple[Entity, float]:
+        """
+        Remove and return the entity that arrived last, regardless of its type.
+
+        :return: Tuple of entity and queue entry time
+        """
+        newest_queue = None
+        for queue in self._queues.values():
+            if queue and (newest_queue is None or queue[-1][0] > newest_queue[-1][0]):
+                newest_queue = queue
+
+        if newest_queue is None:
+            raise IndexError('pop from an empty EntityTypeQueue')
+
+        _, entity, queue_entry_time = newest_queue.pop()
+        self._length -= 1
+        return entity, queue_entry_time
+
+    def clear(self) -> None:
+        """Remove all entities."""
+        self._queues.clear()
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self):
+        """Iterate over the waiting (entity, queue entry time) tuples in arrival order."""
+        records = sorted(record for queue in self._queues.values() for record in queue)
+        return ((entity, queue_entry_time) for _, entity, queue_entry_time in records)
@@ -7,14 +7,13 @@ import src.core.global_imports as gi
 import src.core.statistics.entity_type_utils as et
 from dmpg_logs.logging_utils.stats_logger import log_storage_statistics
 from src.core.event.block_event import BlockEvent
-from src.core.components.date_time import DateTime
 from src.core.components.entity import Entity
 from src.core.components.logistic.storage_manager import StorageManager
 from src.core.components.model import Model, ComponentType
 from src.core.components.work_schedule import WorkScheduleWeek
 from src.core.components_abstract.processing_component import ProcessingComponent
 from src.core.event.storage_event import StorageEvent
-from src.core.global_imports import ENTITY_PROCESSING_LOG_ENTRY
+from src.core.utils.logging_utils import LazyLogEntry
 from src.core.types.queue_type import QueueType
 from src.core.utils.helper import get_value_from_distribution_with_parameters, round_value, \
     execute_trigger
@@ -138,17 +137,15 @@ class Storage(ProcessingComponent):
             worker_info = f" with worker {worker.id}"
 
         logging.root.level <= logging.TRACE and logging.trace(
-            ENTITY_PROCESSING_LOG_ENTRY.format(f"[Storage] {self.name} begins processing {entity.name} , worker={worker_info}",
-                                               DateTime.get(self.env.now)))
+            LazyLogEntry(self.env.now, "[Storage] {} begins processing {} , worker={}",
+                         self.name, entity.name, worker_info))
 
         start_time = self.env.now
         processing_time = 0  # Will be calculated if processing_time_dwp is set, or measured as elapsed time
 
         logging.root.level <= logging.TRACE and logging.trace(
-            ENTITY_PROCESSING_LOG_ENTRY.format(
-                f"[StorageStats] Storage={self.name}, Status=busy, Entity={entity.name} Queue={self.queue_length}, Total={self.total_entities_processed_pivot_table}",
-                DateTime.get(self.env.now)
-            )
+            LazyLogEntry(self.env.now, "[StorageStats] Storage={}, Status=busy, Entity={} Queue={}, Total={}",
+                         self.name, entity.name, self.queue_length, self.total_entities_processed_pivot_table)
         )
 
         if entity.is_vehicle_routed:
@@ -159,8 +156,7 @@ class Storage(ProcessingComponent):
         capa_id = self.capa_ids.popleft()
 
         logging.root.level <= logging.TRACE and logging.trace(
-            ENTITY_PROCESSING_LOG_ENTRY.format(f"[Storage] {self.name} starts processing {entity.name}",
-                                               DateTime.get(start_time)))
+            LazyLogEntry(start_time, "[Storage] {} starts processing {}", self.name, entity.name))
 
         # Start tracking utilization with the current count of processing entities
         if not self.units_utilized_over_time or self.units_utilized_over_time[-1][1] is not None:
@@ -168,7 +164,7 @@ class Storage(ProcessingComponent):
 
         if self.processing_time_dwp:
             processing_time_dwp = self._determine_processing_time(entity)
-            processing_time = get_value_from_distribution_with_parameters(processing_time_dwp)
+            processing_time = get_value_from_distribution_with_parameters(processing_time_dwp, (self.name, 'processing'))
             yield self.env.timeout(processing_time)  # Time-based storing
 
         if self.storage_expression:
@@ -189,9 +185,8 @@ class Storage(ProcessingComponent):
         processing_time = end_time - start_time
 
         logging.root.level <= logging.TRACE and logging.trace(
-            ENTITY_PROCESSING_LOG_ENTRY.format(
-                f"[Storage] {self.name} finished processing {entity.name} time {round_value(processing_time)}",
-                DateTime.get(self.env.now)))
+            LazyLogEntry(self.env.now, "[Storage] {} finished processing {} time {}",
+                         self.name, entity.name, round_value(processing_time)))
 
         if end_time >= gi.DURATION_WARM_UP:
 
@@ -226,10 +221,8 @@ class Storage(ProcessingComponent):
         self.capa_ids.append(capa_id)
 
         logging.root.level <= logging.TRACE and logging.trace(
-            ENTITY_PROCESSING_LOG_ENTRY.format(
-                f"[StorageStats] Storage={self.name}, Status=idle, Entity=-, Queue={self.queue_length}, Total={self.total_entities_processed_pivot_table}",
-                DateTime.get(self.env.now)
-            )
+            LazyLogEntry(self.env.now, "[StorageStats] Storage={}, Status=idle, Entity=-, Queue={}, Total={}",
+                         self.name, self.queue_length, self.total_entities_processed_pivot_table)
         )
 
     def _determine_processing_time(self, entity: Entity):
@@ -2,12 +2,11 @@ import logging
 from collections import deque
 from typing import Tuple
 
-from src.core.components.date_time import DateTime
 from src.core.components.exception import EnviromentException
 from src.core.components.logistic.storage_manager_strategy import fifo_strategy
 from src.core.components_abstract.singleton import Singleton
 from src.core.event.storage_event import StorageEvent
-from src.core.global_imports import ENTITY_PROCESSING_LOG_ENTRY
+from src.core.utils.logging_utils import LazyLogEntry
 
 
 class StorageManager(Singleton):
@@ -52,8 +51,8 @@ class StorageManager(Singleton):
         cls.storage_queues[queue].append(storage_event)
 
         logging.root.level <= logging.TRACE and logging.trace(
-            ENTITY_PROCESSING_LOG_ENTRY.format(f"{storage_event.called.name} add to {queue}, Queue size: {len(cls.storage_queues[queue])}",
-                                               DateTime.get(cls.env.now)))
+            LazyLogEntry(cls.env.now, "{} add to {}, Queue size: {}",
+                         storage_event.called.name, queue, len(cls.storage_queues[queue])))
 
         # Get number of waiting servers before the loop
         num_waiting = len(cls.waiting_server_pools[queue])
@@ -1,8 +1,5 @@
 import re
-from typing import Union
-
-import pandas as pd
-import simpy
+from typing import TYPE_CHECKING, Union
 
 from src.core.components.entity import EntityManager
 from src.core.components.logistic.storage_manager import StorageManager
@@ -10,9 +7,15 @@ from src.core.components_abstract.resetable_named_object import ResetAbleNamedOb
 from src.core.components_abstract.singleton import Singleton
 import src.core.config as cfg
 from src.core.global_imports import set_duration_warm_up
+from src.core.simulation.bucket_environment import create_environment
 from src.core.statistics.tally_statistic import TallyStatistic
+from src.core.utils.helper import read_csv_table
+from src.core.utils.random_streams import RandomStreams
 from src.core.types.componet_type import ComponentType
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class Model(metaclass=Singleton):
     """
@@ -23,26 +26,35 @@ class Model(metaclass=Singleton):
         """
         Initialize the Model instance with dictionaries to hold different component types.
         """
+        self.component_ids = {}
+        """Stable integer id of every component name, kept across simulation resets"""
+        self._components_by_id = []
+
         self.components = {
-            ComponentType.SOURCES: ResetAbleNamedObjectManager(),
-            ComponentType.SERVERS: ResetAbleNamedObjectManager(),
-            ComponentType.SINKS: ResetAbleNamedObjectManager(),
-            ComponentType.VEHICLES: ResetAbleNamedObjectManager(),
-            ComponentType.COMBINER: ResetAbleNamedObjectManager(),
-            ComponentType.SEPARATORS: ResetAbleNamedObjectManager(),
-            ComponentType.STORAGE: ResetAbleNamedObjectManager()
+            ComponentType.SOURCES: ResetAbleNamedObjectManager(self._register_component_id),
+            ComponentType.SERVERS: ResetAbleNamedObjectManager(self._register_component_id),
+            ComponentType.SINKS: ResetAbleNamedObjectManager(self._register_component_id),
+            ComponentType.VEHICLES: ResetAbleNamedObjectManager(self._register_component_id),
+            ComponentType.COMBINER: ResetAbleNamedObjectManager(self._register_component_id),
+            ComponentType.SEPARATORS: ResetAbleNamedObjectManager(self._register_component_id),
+            ComponentType.STORAGE: ResetAbleNamedObjectManager(self._register_component_id)
         }
 
         self.routing_table = None
         self.routing_table_destination_column = None
+        # Destination of every step of the routing table, a component id or the name of a routing group
+        self._routing_table_destinations = None
         self.all_components = {}
         self.connection_registry = {}  # Track all connections by key
         self.state_variables = {}
         self.tally_statistics = {}
         self.routing_group = {}
+        self._routing_group_ids = {}
         self.routing_group_strategy = {}
         self.worker_pools = {}
         self.env = None
+        self.config = cfg.snapshot()
+        """Configuration snapshot of the current run, frozen when the run starts"""
 
     def register_connection(self, origin_name: str, destination_name: str, connection):
         """
@@ -78,9 +90,37 @@ class Model(metaclass=Singleton):
         :param show_progress: Whether to display a progress bar during simulation
         :return: Environment after simulation
         """
+        env = self.start_simulation(model_func, duration, seed, warm_up)
+
+        # 8. Run the simulation (with optional progress bar), pure tandem lines optionally without the event loop and
+        # partitionable models optionally in parallel processes
+        engine = self._find_engine(self.config.engine)
+        if engine is not None:
+            env = self.env = engine.run(duration, self.config.event_scheduler)
+        elif show_progress:
+            self._run_with_progress(env, duration)
+        else:
+            env.run(until=duration)
+
+        return env
+
+    def start_simulation(self, model_func, duration, seed=None, warm_up=None):
+        """
+        Seed the run, set the warm-up and build the model, without running it.
+
+        :param model_func: Function that builds the model
+        :param duration: Simulation duration
+        :param seed: Random seed (optional)
+        :param warm_up: Warm-up duration (optional)
+        :return: Environment of the model at time 0
+        """
+        # 0. Freeze the configuration of this run
+        config = self.config = cfg.snapshot()
+
         # 1. Handle random seed
         import src.core.global_imports as gi
-        gi.set_random_seed(cfg.random_seed)
+        RandomStreams.configure(config.random_streams, config.batched_variates, config.variate_block_size)
+        gi.set_random_seed(config.random_seed)
 
         if seed is not None:
             gi.set_random_seed(seed)
@@ -93,8 +133,18 @@ class Model(metaclass=Singleton):
         else:
             set_duration_warm_up(0)
 
-        # 3. Create fresh environment
-        env = simpy.Environment()
+        # 3. - 7. Build the model on a fresh environment
+        return self.build(model_func)
+
+    def build(self, model_func):
+        """
+        Build a model on a fresh environment with the current config, without running it.
+
+        :param model_func: Function that builds the model
+        :return: Environment of the model
+        """
+        # 3. Create fresh environment with the configured event scheduler
+        env = create_environment(cfg.snapshot().event_scheduler)
 
         # 4. Initialize managers with new environment
         EntityManager.initialize(env)
@@ -109,14 +159,28 @@ class Model(metaclass=Singleton):
 
         # 7. Build the model
         model_func(env)
+        return env
 
-        # 8. Run the simulation (with optional progress bar)
-        if show_progress:
-            self._run_with_progress(env, duration)
-        else:
-            env.run(until=duration)
+    def _find_engine(self, engine: str):
+        """
+        Check whether the built model can run on the vectorized tandem line engine or in partitions.
 
-        return env
+        :param engine: 'simpy' to always use the event loop, 'auto' to use the tandem line engine and 'partitioned' to
+                       run the model in parallel partitions when the model qualifies
+        :return: The tandem line or partitioned run, or None to run the event loop
+        """
+        from src.core.simulation.partitioned_engine import PARTITIONED_ENGINE, find_partitioned_run
+        from src.core.simulation.tandem_engine import AUTO_ENGINE, SIMPY_ENGINE, find_tandem_line
+
+        if engine == SIMPY_ENGINE:
+            return None
+        if engine == AUTO_ENGINE:
+            return find_tandem_line(self)
+        if engine == PARTITIONED_ENGINE:
+            return find_partitioned_run(self, self.config.partitions)
+
+        raise ValueError(f"Unknown simulation engine '{engine}', expected '{SIMPY_ENGINE}', '{AUTO_ENGINE}' or "
+                         f"'{PARTITIONED_ENGINE}'.")
 
     def _run_with_progress(self, env, duration):
         """
@@ -177,6 +241,7 @@ class Model(metaclass=Singleton):
         """
 
         self.routing_group[group_name] = []
+        self._routing_group_ids[group_name] = []
         self.routing_group_strategy[group_name] = strategy
 
     def add_member_to_group(self, group_name: str, member_name: str) -> None:
@@ -189,6 +254,7 @@ class Model(metaclass=Singleton):
         """
 
         self.routing_group[group_name].append(member_name)
+        self._routing_group_ids[group_name].append(self.get_component_id(member_name))
 
     def is_group(self, group_name: str) -> bool:
         """
@@ -210,8 +276,8 @@ class Model(metaclass=Singleton):
 
         member_with_smallest_queue = None
 
-        for member_name in self.routing_group[group_name]:
-            member = self.get_component_by_name(member_name)
+        for member_id in self._routing_group_ids[group_name]:
+            member = self._components_by_id[member_id]
             if self.routing_group_strategy[group_name] == 'No_Queue':
                 if member.capacity > member.used_capacity:
                     return member
@@ -379,21 +445,49 @@ class Model(metaclass=Singleton):
         :param component: The component to be added
         :param component_type: The type of component
         """
-        # If component already exists with this name
-        if component.name in self.all_components:
-            if self.all_components[component.name] is component:
-                return
-
-            # Remove old component from collection to avoid duplicates
-            for i, obj in enumerate(self.components[component_type].resetable_named_objects):
-                if obj.name == component.name:
-                    self.components[component_type].resetable_named_objects.pop(i)
-                    break
-
-        # Add the component to all_components and to the appropriate collection
+        # Components with the same name replace the existing one in place
         self.all_components[component.name] = component
         self.components[component_type].add(component)
 
+    def _register_component_id(self, component) -> None:
+        """
+        Assign the stable integer id of the component name to the component.
+        A component replacing another one with the same name takes over its id.
+
+        :param component: The component to register
+        """
+        component_id = component.component_id = self.get_component_id(component.name)
+        self._components_by_id[component_id] = component
+
+    def get_component_id(self, name: str) -> int:
+        """
+        Gets the stable integer id of a component name. An id is reserved for a name without a component yet, e.g. a
+        member of a routing group that is created later.
+
+        :param name: Name of the component.
+
+        :return: The id of the name.
+        """
+
+        component_id = self.component_ids.get(name)
+        if component_id is None:
+            component_id = self.component_ids[name] = len(self._components_by_id)
+            self._components_by_id.append(None)
+        return component_id
+
+    def get_component_by_id(self, component_id: int):
+        """
+        Gets component by its integer id.
+
+        :param component_id: Id of the component (``component.component_id``).
+
+        :return: The component or None if no component with this id exists in the current simulation.
+        """
+
+        if 0 <= component_id < len(self._components_by_id):
+            return self._components_by_id[component_id]
+        return None
+
     def get_components(self):
         """
         Retrieve all components in the model, organized by their type.
@@ -423,7 +517,7 @@ class Model(metaclass=Singleton):
         if name in self.all_components:
             return self.all_components[name]
 
-    def add_routing_table(self, routing_table_destination_column: str, routing_table: pd.DataFrame = None,
+    def add_routing_table(self, routing_table_destination_column: str, routing_table: 'pd.DataFrame' = None,
                           routing_table_file: str = None):
         """
         Add a routing table to the model for sequence routing.
@@ -435,10 +529,32 @@ class Model(metaclass=Singleton):
         self.routing_table_destination_column = routing_table_destination_column
 
         if routing_table_file:
-            self.routing_table = pd.read_csv(routing_table_file)
+            self.routing_table = read_csv_table(routing_table_file)
 
         if routing_table is not None:
             self.routing_table = routing_table
+        self._routing_table_destinations = None
+
+    def get_sequence_destination(self, sequence_index: int):
+        """
+        Gets the destination of a step of the routing table. The destination names are resolved to component ids once,
+        a routing group chooses its member with the group strategy.
+
+        :param sequence_index: Index of the step in the routing table.
+
+        :return: The destination component or None if it doesn't exist (yet).
+        """
+
+        destinations = self._routing_table_destinations
+        if destinations is None:
+            column = self.routing_table[self.routing_table_destination_column]
+            destinations = self._routing_table_destinations = {
+                index: name if self.is_group(name) else self.get_component_id(name) for index, name in column.items()}
+
+        destination = destinations[sequence_index]
+        if isinstance(destination, str):
+            return self.get_next_destination_from_group(destination)
+        return self._components_by_id[destination]
 
     def reset_simulation(self):
         """
@@ -455,13 +571,16 @@ class Model(metaclass=Singleton):
         # Clear connection registry
         self.connection_registry.clear()
 
-        # Clear all components dict
+        # Clear all components dict, the ids of the component names stay stable
         self.all_components.clear()
+        self._components_by_id = [None] * len(self._components_by_id)
 
         # Reset other state variables
         self.state_variables = {}
         self.routing_group = {}
+        self._routing_group_ids = {}
         self.routing_group_strategy = {}
+        self._routing_table_destinations = None
         self.tally_statistics = {}
         self.worker_pools = {}
 
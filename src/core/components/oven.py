@@ -1,17 +1,20 @@
-from typing import Union, List
+import math
+from collections import deque
+from typing import Union, List, Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
-from scipy.integrate import odeint
 
 from src.core.components.date_time import DateTime
+from src.core.global_imports import import_pandas
 
 
 class Oven:
     """
     Represents an oven with the ability to heat a workpiece and control temperature.
 
+    The temperatures follow a linear (Newton-type) heating model, which is solved in closed form: the oven temperature
+    relaxes exponentially towards its equilibrium and the workpiece follows the oven with its own time constant.
+
     Attributes:
         temperature_current_outside (float): Current outside temperature.
         temperature_initiale_setpoint (float): Initial setpoint temperature.
@@ -21,22 +24,23 @@ class Oven:
         proportionality_constant_temperature_workpiece (float): Proportionality constant for the workpiece temperature.
         proportionality_constant_temperature_oven (float): Proportionality constant for the oven temperature.
         proportionality_constant_door (float): Proportionality constant for the door.
-        temperature_history_workpiece (list): History of workpiece temperature.
-        temperature_history_oven (list): History of oven temperature.
-        temperature_history_setpoint (list): History of setpoint temperature.
+        temperature_history_workpiece (deque): Latest samples of the workpiece temperature.
+        temperature_history_oven (deque): Latest samples of the oven temperature.
+        temperature_history_setpoint (deque): Latest samples of the setpoint temperature.
         list_with_timestamps (list): List of timestamps.
-        list_with_timestamps_in_steps (list): List of timestamps in steps.
+        list_with_timestamps_in_steps (deque): Steps of the temperature samples.
         last_step (int): The last step in the simulation.
         show_diagram (bool): Flag to indicate if the diagram should be shown.
         door_status (int): Status of the door (0 for closed, 1 for open).
-        door_status_history (list): History of door statuses.
+        door_status_history (deque): Latest samples of the door status.
     """
 
     def __init__(self, temperature_initiale_workpiece: Union[int, float] = 20,
                  temperature_initiale_oven: Union[int, float] = 20,
                  temperature_initiale_setpoint: Union[int, float] = 200,
                  temperature_current_outside: Union[int, float] = 20,
-                 number_of_calculate_between_two_timestamps: Union[int, float] = 10):
+                 number_of_calculate_between_two_timestamps: Union[int, float] = 10,
+                 history_size: int = 10000):
         """
         Initialize an Oven instance with given parameters.
 
@@ -45,6 +49,7 @@ class Oven:
         :param temperature_initiale_setpoint: Initial setpoint temperature.
         :param temperature_current_outside: Current outside temperature.
         :param number_of_calculate_between_two_timestamps: Number of calculations between two time stamps.
+        :param history_size: Number of temperature samples kept in the histories.
         """
 
         self.temperature_current_outside = temperature_current_outside
@@ -57,17 +62,17 @@ class Oven:
         self.proportionality_constant_temperature_oven = 0.3
         self.proportionality_constant_door = 0.5
 
-        self.temperature_history_workpiece = []
-        self.temperature_history_oven = []
-        self.temperature_history_setpoint = []
+        self.temperature_history_workpiece = deque(maxlen=history_size)
+        self.temperature_history_oven = deque(maxlen=history_size)
+        self.temperature_history_setpoint = deque(maxlen=history_size)
 
         self.list_with_timestamps = []
-        self.list_with_timestamps_in_steps = []
+        self.list_with_timestamps_in_steps = deque(maxlen=history_size)
 
         self.last_step = 0
         self.show_diagram = False
         self.door_status = 0
-        self.door_status_history = []
+        self.door_status_history = deque(maxlen=history_size)
 
     def model(self, current_values: List[float], t: float, proportionality_constant_workpiece: float,
               proportionality_constant_oven: float, proportionality_constant_door: float):
@@ -75,7 +80,7 @@ class Oven:
         Model the temperature changes in the oven and workpiece.
 
         :param current_values: Current temperature values for the workpiece and oven.
-        :param t: Time (required by odeint, even if not used).
+        :param t: Time (required by ODE solvers, even if not used).
         :param proportionality_constant_workpiece: Proportionality constant for the workpiece.
         :param proportionality_constant_oven: Proportionality constant for the oven.
         :param proportionality_constant_door: Proportionality constant for the door.
@@ -89,6 +94,48 @@ class Oven:
 
         return [d_temperature_workpiece_dt, d_temperature_oven_dt]
 
+    def _oven_equilibrium(self) -> Tuple[float, float]:
+        """
+        Rate and equilibrium temperature of the oven for the current setpoint and door status.
+
+        :return: Tuple of the rate at which the oven approaches its equilibrium and the equilibrium temperature.
+        """
+        rate_setpoint = self.proportionality_constant_temperature_oven
+        rate_door = self.door_status * self.proportionality_constant_door
+        rate = rate_setpoint + rate_door
+
+        if rate == 0:
+            return 0, self.current_values[1]
+
+        equilibrium = (rate_setpoint * self.temperature_current_setpoint + rate_door * self.temperature_current_outside) / rate
+        return rate, equilibrium
+
+    def temperatures_after(self, elapsed_time: Union[float, np.ndarray]) -> Tuple[Union[float, np.ndarray], Union[float, np.ndarray]]:
+        """
+        Solve the model in closed form for the current setpoint and door status.
+
+        :param elapsed_time: Time (or array of times) after the current state.
+        :return: Tuple of the workpiece and oven temperatures at that time.
+        """
+        temperature_workpiece, temperature_oven = self.current_values
+        rate_workpiece = self.proportionality_constant_temperature_workpiece
+        rate_oven, equilibrium = self._oven_equilibrium()
+
+        decay_oven = np.exp(-rate_oven * elapsed_time)
+        decay_workpiece = np.exp(-rate_workpiece * elapsed_time)
+        oven_offset = temperature_oven - equilibrium
+
+        if math.isclose(rate_workpiece, rate_oven):
+            workpiece_oven_term = rate_workpiece * oven_offset * elapsed_time * decay_workpiece
+        else:
+            amplitude = rate_workpiece * oven_offset / (rate_workpiece - rate_oven)
+            workpiece_oven_term = amplitude * (decay_oven - decay_workpiece)
+
+        oven = equilibrium + oven_offset * decay_oven
+        workpiece = equilibrium + (temperature_workpiece - equilibrium) * decay_workpiece + workpiece_oven_term
+
+        return workpiece, oven
+
     def calculate_oven(self, current_step):
         """
         Calculate the temperature changes in the oven over a given time step.
@@ -99,30 +146,15 @@ class Oven:
         time_range = np.linspace(self.last_step, current_step,
                                  self.number_of_calculates_between_two_time_stamps)
 
-        # self.list_with_timestamps_in_steps.append(round(time_range[-1], 2))
         self.list_with_timestamps_in_steps.extend(time_range)
-        # self.door_status_history.append(self.door_status*10)
         self.door_status_history.extend([self.door_status * 10] * self.number_of_calculates_between_two_time_stamps)
         self.temperature_history_setpoint.extend([self.temperature_current_setpoint] * self.number_of_calculates_between_two_time_stamps)
 
-        solution = odeint(self.model,
-                          self.current_values,
-                          time_range,
-                          args=(self.proportionality_constant_temperature_workpiece,
-                                self.proportionality_constant_temperature_oven,
-                                self.proportionality_constant_door))
-
-        temperature_current_workpiece = solution[:, 0]
-        temperature_current_oven = solution[:, 1]
-        self.current_values = [temperature_current_workpiece[-1], temperature_current_oven[-1]]
-
-        # temperature_current_setpoint = solution[:, 2]
+        temperature_current_workpiece, temperature_current_oven = self.temperatures_after(time_range - self.last_step)
+        self.current_values = [float(temperature_current_workpiece[-1]), float(temperature_current_oven[-1])]
 
-        # self.temperature_history_workpiece.append(temperature_current_workpiece[-1])
-        # self.temperature_history_oven.append(temperature_current_oven[-1])
         self.temperature_history_workpiece.extend(temperature_current_workpiece)
         self.temperature_history_oven.extend(temperature_current_oven)
-        # self.temperature_history_setpoint.append(self.temperature_initiale_setpoint)
 
         self.last_step = current_step
 
@@ -132,42 +164,31 @@ class Oven:
 
     def calculate_time_to_required_temperature(self) -> Union[int, float]:
         """
-        Calculate the time required for the oven to heat up to the required temperature using the differential model.
-        This provides a more accurate calculation of the time required to reach the desired temperature.
+        Calculate the time required for the oven to heat up to the required temperature.
+        The oven temperature approaches its equilibrium exponentially, so the time is computed in closed form.
 
         :return: time_to_heat (float): Time required to reach the desired temperature.
         """
         current_temp = self.current_values[1]
-        target_temp = self.temperature_initiale_setpoint
+        target_temp = self.temperature_initiale_setpoint - 15
+        max_simulation_time = 10000  # Returned if the oven never reaches the target temperature
 
-        if current_temp >= (target_temp - 15):
+        if current_temp >= target_temp:
             return 0  # Already close enough to the required temperature
 
-        # Define the simulation time range and a reasonable step size
-        max_simulation_time = 10000  # Large enough time to allow heating
-        time_step = 0.1
-        time_range = np.arange(0, max_simulation_time, time_step)
-
-        # Simulate the oven heating process over time using odeint
-        solution = odeint(self.model,
-                          self.current_values,
-                          time_range,
-                          args=(self.proportionality_constant_temperature_workpiece,
-                                self.proportionality_constant_temperature_oven,
-                                self.proportionality_constant_door))
-
-        # Find the first time step where the oven reaches the required temperature
-        temperature_oven_over_time = solution[:, 1]
-        for i, temperature in enumerate(temperature_oven_over_time):
-            if temperature >= (target_temp - 15):
-                return time_range[i]  # Return the time at which the target temperature is reached
+        rate, equilibrium = self._oven_equilibrium()
+        if rate == 0 or equilibrium <= target_temp:
+            return max_simulation_time
 
-        return max_simulation_time  # If never reaches the target within the simulation, return max time
+        time_to_heat = math.log((equilibrium - current_temp) / (equilibrium - target_temp)) / rate
+        return min(time_to_heat, max_simulation_time)
 
     def show_infos(self):
         """
         Display the temperature changes in the oven and workpiece over time.
         """
+        import matplotlib.pyplot as plt
+        pd = import_pandas()
 
         plt.xlabel('Time (minute)')
         plt.ylabel('Temperature (°C)')
@@ -181,14 +202,13 @@ class Oven:
         plt.grid(True)
         plt.show()
 
-        for timestamp_in_step in self.list_with_timestamps_in_steps:
-            timestamp = DateTime.get(round(timestamp_in_step, 1), True)
-            self.list_with_timestamps.append(timestamp)
+        self.list_with_timestamps = [DateTime.get(round(timestamp_in_step, 1), True)
+                                     for timestamp_in_step in self.list_with_timestamps_in_steps]
 
         data = {'Date': self.list_with_timestamps,
-                'step': self.list_with_timestamps_in_steps,
-                'Temperature of Workpiece': self.temperature_history_workpiece,
-                'Temperature of Oven': self.temperature_history_oven,
+                'step': list(self.list_with_timestamps_in_steps),
+                'Temperature of Workpiece': list(self.temperature_history_workpiece),
+                'Temperature of Oven': list(self.temperature_history_oven),
                 # 'Temperature of Setpoint': self.temperature_history_setpoint
                 }
 
@@ -7,12 +7,12 @@ import src.core.global_imports as gi
 import src.core.statistics.entity_type_utils as et
 from dmpg_logs.logging_utils.stats_logger import log_separator_statistics
 from src.core.event.block_event import BlockEvent
-from src.core.components.date_time import DateTime
 from src.core.components.logistic.storage_manager import StorageManager
 from src.core.components.model import Model, ComponentType
 from src.core.components.work_schedule import ask_work_schedule, WorkScheduleWeek
 from src.core.components_abstract.processing_component import ProcessingComponent
-from src.core.global_imports import ENTITY_PROCESSING_LOG_ENTRY, DURATION_WARM_UP
+from src.core.global_imports import DURATION_WARM_UP
+from src.core.utils.logging_utils import LazyLogEntry
 from src.core.types.queue_type import QueueType
 from src.core.utils.helper import get_value_from_distribution_with_parameters, round_value, execute_trigger
 
@@ -138,15 +138,13 @@ class Separator(ProcessingComponent):
                 worker_info = f" with worker {worker.id}"
 
             logging.root.level <= logging.TRACE and logging.trace(
-                ENTITY_PROCESSING_LOG_ENTRY.format(f"[Separator] {self.name} begins processing {entity.name} , worker={worker_info}",
-                                                   DateTime.get(self.env.now)))
+                LazyLogEntry(self.env.now, "[Separator] {} begins processing {} , worker={}",
+                             self.name, entity.name, worker_info))
 
             # Log statistics before processing
             logging.root.level <= logging.TRACE and logging.trace(
-                ENTITY_PROCESSING_LOG_ENTRY.format(
-                    f"[SeparatorStats] Separator={self.name}, Status=busy, Entity={entity.name}, Queue={self.queue_length}, Total={self.total_entities_processed_pivot_table}",
-                    DateTime.get(self.env.now)
-                )
+                LazyLogEntry(self.env.now, "[SeparatorStats] Separator={}, Status=busy, Entity={}, Queue={}, Total={}",
+                             self.name, entity.name, self.queue_length, self.total_entities_processed_pivot_table)
             )
 
             # Process the entity
@@ -167,10 +165,10 @@ class Separator(ProcessingComponent):
             capa_id = self.capa_ids.popleft()
 
             logging.root.level <= logging.TRACE and logging.trace(
-                ENTITY_PROCESSING_LOG_ENTRY.format(f"[Separator] {self.name} starts processing {entity.name}",
-                                                   DateTime.get(start_time)))
+                LazyLogEntry(start_time, "[Separator] {} starts processing {}", self.name, entity.name))
 
-            processing_time = get_value_from_distribution_with_parameters(self._determine_processing_time(entity))
+            processing_time = get_value_from_distribution_with_parameters(
+                self._determine_processing_time(entity), (self.name, 'processing'))
             resource_users = len(self.resource.users)
 
             # Set current location for entity (from first file)
@@ -192,9 +190,8 @@ class Separator(ProcessingComponent):
 
             # Log processing completion for this entity.
             logging.root.level <= logging.TRACE and logging.trace(
-                ENTITY_PROCESSING_LOG_ENTRY.format(
-                    f"[Separator] {self.name} finished processing {entity.name} time {round_value(processing_time)}",
-                    DateTime.get(self.env.now)))
+                LazyLogEntry(self.env.now, "[Separator] {} finished processing {} time {}",
+                             self.name, entity.name, round_value(processing_time)))
 
             if self.env.now >= DURATION_WARM_UP:
                 if self.units_utilized_over_time and self.units_utilized_over_time[-1][1] is None:
@@ -214,10 +211,8 @@ class Separator(ProcessingComponent):
 
                 # Log statistics after processing
                 logging.root.level <= logging.TRACE and logging.trace(
-                    ENTITY_PROCESSING_LOG_ENTRY.format(
-                        f"[SeparatorStats] Separator={self.name}, Status=idle, Entity=-, Queue={self.queue_length}, Total={self.total_entities_processed_pivot_table}",
-                        DateTime.get(self.env.now)
-                    )
+                    LazyLogEntry(self.env.now, "[SeparatorStats] Separator={}, Status=idle, Entity=-, Queue={}, Total={}",
+                                 self.name, self.queue_length, self.total_entities_processed_pivot_table)
                 )
 
             # Log server statistics (from first file)
@@ -261,4 +256,5 @@ class Separator(ProcessingComponent):
         self.units_utilized_over_time = []
         if self.time_between_machine_breakdowns:
             self.time_until_next_machine_breakdown = (
-                get_value_from_distribution_with_parameters(self.time_between_machine_breakdowns))
+                get_value_from_distribution_with_parameters(self.time_between_machine_breakdowns,
+                                                            (self.name, 'breakdown')))
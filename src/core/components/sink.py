@@ -6,14 +6,13 @@ import simpy
 import src.core.global_imports as gi
 import src.core.statistics.entity_type_utils as et
 from dmpg_logs.logging_utils.stats_logger import log_sink_statistics
-from src.core.components.date_time import DateTime
 from src.core.components.entity import EntityManager
 from src.core.components.logistic.storage_manager import StorageManager
 from src.core.components.model import Model, ComponentType
 from src.core.components.source import Source
 from src.core.components.work_schedule import WorkScheduleWeek
 from src.core.components_abstract.processing_component import ProcessingComponent
-from src.core.global_imports import ENTITY_PROCESSING_LOG_ENTRY
+from src.core.utils.logging_utils import LazyLogEntry
 from src.core.statistics.entity_type_utils import initialize_entity_types_sink, update_entity_types_sink
 from src.core.statistics.tally_statistic import TallyStatistic
 from src.core.types.queue_type import QueueType
@@ -146,12 +145,11 @@ class Sink(ProcessingComponent):
             worker_info = f" with worker {worker.id}"
 
         logging.root.level <= logging.TRACE and logging.trace(
-            ENTITY_PROCESSING_LOG_ENTRY.format(f"[Sink] {self.name} begins processing {worker_info}",
-                                               DateTime.get(self.env.now)))
+            LazyLogEntry(self.env.now, "[Sink] {} begins processing {}", self.name, worker_info))
 
         logging.root.level <= logging.TRACE and logging.trace(
-            ENTITY_PROCESSING_LOG_ENTRY.format(
-                f"[SinkStats] Sink={self.name}, Status=busy, Entity={entity.name} , NumberEntered={self.entities_processed} ", DateTime.get(self.env.now))
+            LazyLogEntry(self.env.now, "[SinkStats] Sink={}, Status=busy, Entity={} , NumberEntered={} ",
+                         self.name, entity.name, self.entities_processed)
         )
 
         if gi.COLLECT_ENTITY_TYPE_STATS:
@@ -184,11 +182,11 @@ class Sink(ProcessingComponent):
         capa_id = self.capa_ids.popleft()
 
         logging.root.level <= logging.TRACE and logging.trace(
-            ENTITY_PROCESSING_LOG_ENTRY.format(f"[Sink] {self.name} starts processing {entity.name}",
-                                               DateTime.get(start_time)))
+            LazyLogEntry(start_time, "[Sink] {} starts processing {}", self.name, entity.name))
 
         if self.processing_time_dwp:
-            processing_time = get_value_from_distribution_with_parameters(self._determine_processing_time(entity))
+            processing_time = get_value_from_distribution_with_parameters(
+                self._determine_processing_time(entity), (self.name, 'processing'))
         else:
             processing_time = 0
         resource_users = len(self.resource.users)
@@ -203,9 +201,8 @@ class Sink(ProcessingComponent):
 
         # Log processing completion for this entity
         logging.root.level <= logging.TRACE and logging.trace(
-            ENTITY_PROCESSING_LOG_ENTRY.format(
-                f"[Sink] {self.name} finished processing {entity.name}, time {round_value(processing_time)}",
-                DateTime.get(self.env.now)))
+            LazyLogEntry(self.env.now, "[Sink] {} finished processing {}, time {}",
+                         self.name, entity.name, round_value(processing_time)))
 
         if self.env.now >= gi.DURATION_WARM_UP:
             if self.units_utilized_over_time and self.units_utilized_over_time[-1][1] is None:
@@ -238,16 +235,15 @@ class Sink(ProcessingComponent):
                 self.source.generate_single_entity()
 
         logging.root.level <= logging.TRACE and logging.trace(
-            ENTITY_PROCESSING_LOG_ENTRY.format(
-                f"[Sink] {self.name} destroyed {entity.name} ", DateTime.get(self.env.now))
+            LazyLogEntry(self.env.now, "[Sink] {} destroyed {} ", self.name, entity.name)
         )
 
         # Free up capacity
         self.used_capacity -= 1
 
         logging.root.level <= logging.TRACE and logging.trace(
-            ENTITY_PROCESSING_LOG_ENTRY.format(
-                f"[SinkStats] Sink={self.name}, Status=idle, Entity=-, NumberEntered={self.entities_processed}", DateTime.get(self.env.now))
+            LazyLogEntry(self.env.now, "[SinkStats] Sink={}, Status=idle, Entity=-, NumberEntered={}",
+                         self.name, self.entities_processed)
         )
 
         # Return used capacity id
@@ -1,19 +1,17 @@
 import logging
-import random
 from typing import Union, Type, Callable, Optional, Tuple
 
 import numpy
-import pandas as pd
 
 import src.core.statistics.entity_type_utils as et
 from src.core.event.block_event import BlockEvent
 from src.core.statistics.entity_type_utils import initialize_entity_types_source
-from src.core.global_imports import ENTITY_PROCESSING_LOG_ENTRY
+from src.core.utils.logging_utils import LazyLogEntry
 import src.core.global_imports as gi
 from src.core.components.entity import Entity
 from src.core.utils.helper import get_value_from_distribution_with_parameters, validate_probabilities, \
-    create_connection_cache, execute_trigger, validate_entity_weights
-from src.core.components.date_time import DateTime
+    create_connection_cache, execute_trigger, validate_entity_weights, read_csv_table
+from src.core.utils.random_streams import RandomStreams
 from src.core.components_abstract.resetable_named_object import ResetAbleNamedObject
 from src.core.components_abstract.routing_object import RoutingObject
 from src.core.components.model import Model, ComponentType
@@ -82,10 +80,10 @@ class Source(ResetAbleNamedObject, RoutingObject):
 
         if arrival_table_file:
             if arrival_table_config:
-                self.arrival_table = pd.read_csv(arrival_table_file, sep=arrival_table_config['sep'],
-                                                 decimal=arrival_table_config['decimal'])
+                self.arrival_table = read_csv_table(arrival_table_file, {'sep': arrival_table_config['sep'],
+                                                                         'decimal': arrival_table_config['decimal']})
             else:
-                self.arrival_table = pd.read_csv(arrival_table_file)
+                self.arrival_table = read_csv_table(arrival_table_file)
             self.arrival_table_index = 0
             self.arrival_table_column_name = list(self.arrival_table.columns)[0]
         else:
@@ -138,7 +136,7 @@ class Source(ResetAbleNamedObject, RoutingObject):
                     yield self.env.event()
 
             wait_time = self.arrival_table_based_wait_time() if self.arrival_table is not None else (
-                get_value_from_distribution_with_parameters(self.creation_time_dwp))
+                get_value_from_distribution_with_parameters(self.creation_time_dwp, (self.name, 'arrival')))
 
             self.generate_single_entity()
 
@@ -219,8 +217,8 @@ class Source(ResetAbleNamedObject, RoutingObject):
                 )
 
         logging.root.level <= logging.TRACE and logging.trace(
-            ENTITY_PROCESSING_LOG_ENTRY.format(
-                f"[SourceStats] Source={self.name}, Status=busy, Entity={entity.name} , Created={self.entities_created_pivot_table}", DateTime.get(self.env.now))
+            LazyLogEntry(self.env.now, "[SourceStats] Source={}, Status=busy, Entity={} , Created={}",
+                         self.name, entity.name, self.entities_created_pivot_table)
         )
 
         if gi.COLLECT_ENTITY_TYPE_STATS:
@@ -236,8 +234,7 @@ class Source(ResetAbleNamedObject, RoutingObject):
             self.entity_type_stats_source[entity.entity_type][et.NUMBER_EXITED] += 1
 
         logging.root.level <= logging.TRACE and logging.trace(
-            ENTITY_PROCESSING_LOG_ENTRY.format(
-                f"[Source] {self.name} created {entity.name} ", DateTime.get(self.env.now))
+            LazyLogEntry(self.env.now, "[Source] {} created {} ", self.name, entity.name)
         )
 
         # Execute after_creation_trigger
@@ -250,8 +247,8 @@ class Source(ResetAbleNamedObject, RoutingObject):
         self.route_entity(entity, self.vehicle_group, self.capa_id)
 
         logging.root.level <= logging.TRACE and logging.trace(
-            ENTITY_PROCESSING_LOG_ENTRY.format(
-                f"[SourceStats] {self.name}, Status=idle, Entity=- , Exited={self.number_exited_pivot_table} ", DateTime.get(self.env.now))
+            LazyLogEntry(self.env.now, "[SourceStats] {}, Status=idle, Entity=- , Exited={} ",
+                         self.name, self.number_exited_pivot_table)
         )
 
     def __repr__(self) -> str:
@@ -267,4 +264,4 @@ class Source(ResetAbleNamedObject, RoutingObject):
         classes = list(self.entity_class.keys())
         weights = list(self.entity_class.values())
 
-        return random.choices(classes, weights=weights, k=1)[0]
+        return RandomStreams.random((self.name, 'entity_class')).choices(classes, weights=weights, k=1)[0]
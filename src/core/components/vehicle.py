@@ -1,17 +1,17 @@
 import logging
-from typing import Callable, Tuple, List
+from collections import deque
+from typing import Callable, Tuple, Deque
 
 import numpy as np
 import simpy
 
 import src.core.global_imports as gi
 import src.core.statistics.entity_type_utils as et
-from src.core.components.date_time import DateTime
 from src.core.components.entity import Entity
 from src.core.components.model import Model, ComponentType
 from src.core.components.vehicle_manager import VehicleManager
 from src.core.components_abstract.resetable_named_object import ResetAbleNamedObject
-from src.core.global_imports import ENTITY_PROCESSING_LOG_ENTRY
+from src.core.utils.logging_utils import LazyLogEntry
 from src.core.statistics.entity_type_utils import initialize_entity_types_vehicle
 from src.core.utils.helper import get_value_from_distribution_with_parameters
 
@@ -47,7 +47,12 @@ class Vehicle(ResetAbleNamedObject):
         self.travel_time_expression = travel_time_expression
         self.vehicle_capacity = vehicle_capacity  # Max number of entities it can carry at once
         self.batching = batching
-        self.entity_queue: List[Tuple[Entity, Callable, float]] = []
+        self.entity_queue: Deque[Tuple[Entity, Callable, float]] = deque()
+        # Group membership, set by the VehicleManager
+        self.vehicle_group = None
+        self.group_index = None
+        # Collision index of the vehicle group, set by VehiclePositionIndex when a collision strategy uses it
+        self.position_index = None
         self.idle: bool = True
         # resource_capacity controls trips can run concurrently.
         self.resource = simpy.Resource(env, capacity=resource_capacity)
@@ -114,13 +119,9 @@ class Vehicle(ResetAbleNamedObject):
         """
         Transport entities from the queue based on the batching setting.
         """
-        # Handle batching: Transport multiple entities if batching, otherwise transport whatever is available
-        if self.batching:
-            entities_to_transport = self.entity_queue[:self.vehicle_capacity]
-            self.entity_queue = self.entity_queue[self.vehicle_capacity:]
-        else:
-            entities_to_transport = self.entity_queue[:min(len(self.entity_queue), self.vehicle_capacity)]
-            self.entity_queue = self.entity_queue[len(entities_to_transport):]
+        # Load up to vehicle capacity, with or without batching whatever is available is transported
+        entities_to_transport = [self.entity_queue.popleft()
+                                 for _ in range(min(len(self.entity_queue), self.vehicle_capacity))]
 
         # Calculate queue times for the entities being transported
         for entity, destination, queue_entry_time in entities_to_transport:
@@ -132,7 +133,7 @@ class Vehicle(ResetAbleNamedObject):
         self.idle = False
 
         if self.travel_time_dwp:
-            travel_time = get_value_from_distribution_with_parameters(self.travel_time_dwp)
+            travel_time = get_value_from_distribution_with_parameters(self.travel_time_dwp, (self.name, 'travel'))
         if self.travel_time_expression:
             travel_time = self.travel_time_expression(self, entity)
             if gi.COLLECT_ENTITY_TYPE_STATS:
@@ -143,11 +144,11 @@ class Vehicle(ResetAbleNamedObject):
                     stats[et.QUEUE_TIMES].append(queue_time)
                     stats[et.MAX_TIME_IN_QUEUE] = max(stats[et.MAX_TIME_IN_QUEUE], queue_time)
 
-        travel_time = get_value_from_distribution_with_parameters(self.travel_time_dwp)
+        travel_time = get_value_from_distribution_with_parameters(self.travel_time_dwp, (self.name, 'travel'))
 
-        logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(
-            "".join([self.name, " transporting ", str(len(entities_to_transport)), " entities. Travel time: ",
-                     str(travel_time)]), DateTime.get(self.env.now)))
+        logging.root.level <= logging.TRACE and logging.trace(
+            LazyLogEntry(self.env.now, "{} transporting {} entities. Travel time: {}",
+                         self.name, len(entities_to_transport), travel_time))
 
         # Track utilization
         idle_time = 0
@@ -192,7 +193,7 @@ class Vehicle(ResetAbleNamedObject):
             VehicleManager().request_entity(self.transport_queue, self)
 
     def move_to_location(self, destination):
-        travel_time = get_value_from_distribution_with_parameters(self.travel_time_dwp)
+        travel_time = get_value_from_distribution_with_parameters(self.travel_time_dwp, (self.name, 'travel'))
         yield self.env.timeout(travel_time)
 
         # Track utilization
@@ -206,22 +207,65 @@ class Vehicle(ResetAbleNamedObject):
     def return_to_home(self):
         self.lower_bound = min([self.home_point.position[1], self.current_location.position[1]])
         self.upper_bound = max([self.home_point.position[1], self.current_location.position[1]])
-        travel_time = get_value_from_distribution_with_parameters(self.travel_time_dwp)
+        travel_time = get_value_from_distribution_with_parameters(self.travel_time_dwp, (self.name, 'travel'))
         self.current_location = self.home_point
         self.position = self.home_point.position
         self.upper_bound = self.position[1]
         self.lower_bound = self.position[1]
-        logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(
-            "".join([self.name, " transporting ", self.current_location.name, " to ", self.home_point.name, ". Travel time: ",
-                     str(travel_time)]), DateTime.get(self.env.now)))
+        logging.root.level <= logging.TRACE and logging.trace(
+            LazyLogEntry(self.env.now, "{} transporting {} to {}. Travel time: {}",
+                         self.name, self.current_location.name, self.home_point.name, travel_time))
 
         yield self.env.timeout(travel_time)
 
     def set_home_point(self, home_point):
-        self.position = home_point.position
         self.home_point = home_point
+        self.position = home_point.position
         self.current_location = home_point
 
+    @property
+    def idle(self) -> bool:
+        return self._idle
+
+    @idle.setter
+    def idle(self, value: bool):
+        self._idle = value
+        self._update_position_index()
+        if self.group_index is not None:
+            VehicleManager().update_idle_vehicle(self)
+
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, value):
+        self._position = value
+        self._update_position_index()
+
+    @property
+    def lower_bound(self):
+        return self._lower_bound
+
+    @lower_bound.setter
+    def lower_bound(self, value):
+        self._lower_bound = value
+        self._update_position_index()
+
+    @property
+    def upper_bound(self):
+        return self._upper_bound
+
+    @upper_bound.setter
+    def upper_bound(self, value):
+        self._upper_bound = value
+        self._update_position_index()
+
+    def _update_position_index(self):
+        """Keep the collision index of the vehicle group in sync with the vehicle state."""
+        if self.position_index is not None:
+            self.position_index.update(self)
+
     def reset(self):
         """Reset the vehicle's state."""
         self.total_trips = 0
@@ -1,12 +1,13 @@
 import logging
+from bisect import bisect_left
+from collections import deque
 from typing import Tuple, Callable
 
 from src.core.components.exception import MissingVehicleException
-from src.core.components.date_time import DateTime
 from src.core.components.vehicle_manager_strategy import get_vehicle_with_lowest_queue
 from src.core.components_abstract.singleton import Singleton
 from src.core.event.block_event import BlockEvent
-from src.core.global_imports import ENTITY_PROCESSING_LOG_ENTRY
+from src.core.utils.logging_utils import LazyLogEntry
 from src.core.utils.utils import calc_upper_and_lower_bound
 
 
@@ -15,6 +16,7 @@ class VehicleManager(metaclass=Singleton):
         self.vehicle_groups = {}
         self.vehicle_group_strategies = {}
         self.vehicle_queues = {}
+        self.idle_vehicles = {}
         self.env = None
         self.set_bounds = False
 
@@ -22,7 +24,8 @@ class VehicleManager(metaclass=Singleton):
 
     def add_vehicle_group(self, group_name: str, strategy: Tuple[Callable, ...] = None):
         self.vehicle_groups[group_name] = []
-        self.vehicle_queues[group_name] = []
+        self.vehicle_queues[group_name] = deque()
+        self.idle_vehicles[group_name] = []  # Sorted group indices of the idle vehicles
         if strategy:
             self.vehicle_group_strategies[group_name] = strategy
         else:
@@ -32,14 +35,40 @@ class VehicleManager(metaclass=Singleton):
         if vehicle is None:
             raise MissingVehicleException('Vehicle must be provided')
 
+        vehicle.vehicle_group = group_name
+        vehicle.group_index = len(self.vehicle_groups[group_name])
         self.vehicle_groups[group_name].append(vehicle)
+        self.update_idle_vehicle(vehicle)
+
+    def update_idle_vehicle(self, vehicle):
+        """
+        Keep the idle-vehicle index of the vehicle's group in sync with its idle state.
+
+        :param vehicle: The vehicle whose idle state changed
+        """
+        group = self.vehicle_groups.get(vehicle.vehicle_group)
+        index = vehicle.group_index
+        # Ignore vehicles of a group that has been recreated since they were added
+        if group is None or index is None or index >= len(group) or group[index] is not vehicle:
+            return
+
+        idle_vehicles = self.idle_vehicles[vehicle.vehicle_group]
+        position = bisect_left(idle_vehicles, index)
+        indexed = position < len(idle_vehicles) and idle_vehicles[position] == index
+
+        if vehicle.idle and not indexed:
+            idle_vehicles.insert(position, index)
+        elif not vehicle.idle and indexed:
+            del idle_vehicles[position]
 
     def _transport_entity(self, vehicle, entity, destination, calling_object, event):
         if self.set_bounds:
             vehicle.lower_bound, vehicle.upper_bound = calc_upper_and_lower_bound(vehicle, calling_object, destination)
         yield self.env.process(vehicle.move_to_location(calling_object))
         self.env.schedule(event)
-        logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(f"Transported {entity.name} from {calling_object.name} to {destination.name}", DateTime.get(self.env.now)))
+        logging.root.level <= logging.TRACE and logging.trace(
+            LazyLogEntry(self.env.now, "Transported {} from {} to {}",
+                         entity.name, calling_object.name, destination.name))
         vehicle.handle_entity_arrival(entity, destination)
 
     def request_transport(self, group_name: str, entity, destination, calling_object, capa_id=None, event=None):
@@ -47,51 +76,44 @@ class VehicleManager(metaclass=Singleton):
             event = BlockEvent(self.env)  # Blocking the station until the entity is transported
             calling_object.block_event[capa_id] = event
 
-        if len(self.vehicle_queues[group_name]) == 0:
-            logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(f"Vehicle queue {group_name} is empty!", DateTime.get(self.env.now)))
+        if not self.vehicle_queues[group_name]:
+            logging.root.level <= logging.TRACE and logging.trace(
+                LazyLogEntry(self.env.now, "Vehicle queue {} is empty!", group_name))
             vehicle = self._get_vehicle_from_group(group_name, entity, calling_object, destination)
         else:
-            vehicle = None
-            logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(f"Vehicle queue {group_name} is not empty!", DateTime.get(self.env.now)))
-            for vehicle in self.vehicle_groups[group_name]:
-                if vehicle.idle:
-                    logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(f"{vehicle.name} is idle request entity", DateTime.get(self.env.now)))
-                    self.request_entity(group_name, vehicle)
+            group = self.vehicle_groups[group_name]
+            logging.root.level <= logging.TRACE and logging.trace(
+                LazyLogEntry(self.env.now, "Vehicle queue {} is not empty!", group_name))
+            for index in list(self.idle_vehicles[group_name]):
+                idle_vehicle = group[index]
+                logging.root.level <= logging.TRACE and logging.trace(
+                    LazyLogEntry(self.env.now, "{} is idle request entity", idle_vehicle.name))
+                self.request_entity(group_name, idle_vehicle)
+
+            # The new request goes to the last vehicle of the group, as with the former scan over all vehicles
+            vehicle = group[-1] if group else None
 
         if vehicle is None:
-            logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(f"No vehicle available adding {entity.name} to {group_name}", DateTime.get(self.env.now)))
+            logging.root.level <= logging.TRACE and logging.trace(
+                LazyLogEntry(self.env.now, "No vehicle available adding {} to {}", entity.name, group_name))
             # no vehicle availble put entity in queue
             self.vehicle_queues[group_name].append((entity, destination, calling_object, event, self.env.now))
         else:
-            logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(f"Vehicle available transporting {entity.name}", DateTime.get(self.env.now)))
+            logging.root.level <= logging.TRACE and logging.trace(
+                LazyLogEntry(self.env.now, "Vehicle available transporting {}", entity.name))
             self.env.process(self._transport_entity(vehicle, entity, destination, calling_object, event))
 
     def _get_vehicle_from_group(self, group_name: str, entity, calling_object, destination):
         return self.vehicle_group_strategies[group_name][0](self.vehicle_groups[group_name], calling_object, entity, destination)
 
     def request_entity(self, group_name: str, vehicle):
-        event_found = False
-        index = -1
-
-        if len(self.vehicle_queues[group_name]) > 0:
-
-            while not event_found:
-                index = index + 1
-                transport_req = self.vehicle_queues[group_name][index]
-                """
-                if waiting_time > 1:
-                    event_found = True
-                    print(f'Waited to be transproted for: {self.env.now - transport_req[4]}')
-                """
-                vehilce = self._get_vehicle_from_group(group_name, transport_req[0], transport_req[1], transport_req[2])
-                if vehilce == vehilce:
-                    event_found = True
+        queue = self.vehicle_queues[group_name]
 
+        if queue:
+            # Pending requests are served first come, first served
+            entity, destination, calling_object, event, _ = queue.popleft()
+            self.env.process(self._transport_entity(vehicle, entity, destination, calling_object, event))
         else:
+            # The vehicle is sent home twice, as it always has been, so that runs stay reproducible for identical seeds
             self.env.process(vehicle.return_to_home())
-
-        if event_found:
-            transport_req = self.vehicle_queues[group_name].pop(index)
-            self.env.process(self._transport_entity(vehicle, transport_req[0], transport_req[1], transport_req[2], transport_req[3]))
-        else:
             self.env.process(vehicle.return_to_home())
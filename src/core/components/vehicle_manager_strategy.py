@@ -1,4 +1,5 @@
-from src.core.utils.utils import get_upper_and_lower_bound
+from src.core.components.vehicle_position_index import VehiclePositionIndex
+from src.core.utils.utils import get_upper_and_lower_bound, calc_upper_and_lower_bound
 
 
 def get_vehicle_with_lowest_queue(vehicle_group: list, calling_object, entity, destination):
@@ -41,3 +42,46 @@ def get_vehicle_with_no_collusion(vehicle_group: list, calling_object, entity, d
                     optimal_vehicle = vehicle
 
     return optimal_vehicle
+
+
+def get_vehicle_with_no_collusion_sweep_line(vehicle_group: list, calling_object, entity, destination):
+    """
+    Same dispatch decision as get_vehicle_with_no_collusion, but checks each idle vehicle against a
+    sorted-position index of the group instead of comparing it with every other vehicle.
+    Each collision check costs O(log V) instead of O(V).
+    """
+    position_index = _get_position_index(vehicle_group)
+    trip_lower_bound = min(calling_object.position[1], destination.position[1])
+    trip_upper_bound = max(calling_object.position[1], destination.position[1])
+    optimal_vehicle = None
+
+    for vehicle in vehicle_group:
+        if vehicle.idle:
+            if optimal_vehicle is None:
+                optimal_vehicle = vehicle
+            lower_bound, upper_bound = calc_upper_and_lower_bound(vehicle, calling_object, destination)
+
+            if position_index.is_blocked(upper_bound, vehicle, trip_lower_bound, trip_upper_bound):
+                continue
+            if position_index.is_blocked(lower_bound, vehicle, trip_lower_bound, trip_upper_bound):
+                continue
+
+            distance_a = abs(vehicle.position[1] - destination.position[1])
+            distance_b = abs(optimal_vehicle.position[1] - destination.position[0])
+            if distance_a < distance_b:
+                optimal_vehicle = vehicle
+
+    return optimal_vehicle
+
+
+def _get_position_index(vehicle_group: list) -> VehiclePositionIndex:
+    """
+    Get the position index of a vehicle group, building it on first use or when vehicles were added.
+
+    :param vehicle_group: Vehicles of the group
+    :return: The position index shared by all vehicles of the group
+    """
+    position_index = vehicle_group[0].position_index if vehicle_group else None
+    if position_index is None or position_index.vehicle_count != len(vehicle_group):
+        position_index = VehiclePositionIndex(vehicle_group)
+    return position_index
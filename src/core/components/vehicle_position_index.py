@@ -0,0 +1,117 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+
+BUSY = 'busy'
+HOME = 'home'
+AWAY = 'away'
+
+
+class VehiclePositionIndex:
+    """
+    Sorted-position index over the vehicles of one vehicle group, used for collision checks along the y-axis.
+
+    Vehicles are kept in one of three buckets that mirror the cases of ``get_upper_and_lower_bound``:
+
+    - busy vehicles with their fixed travel interval (sorted lists of lower and upper bounds),
+    - idle vehicles parked at their home point (counter of y positions),
+    - idle vehicles away from home (sorted list of y positions), whose interval depends on the requested trip.
+
+    Vehicles notify the index whenever their state changes, so a stabbing query costs O(log V).
+    """
+
+    def __init__(self, vehicles: list):
+        """
+        Build the index for a vehicle group and register it on every vehicle.
+
+        :param vehicles: Vehicles of the group
+        """
+        self.vehicle_count = 0
+        self._busy_lower_bounds = []
+        self._busy_upper_bounds = []
+        self._home_positions = Counter()
+        self._away_positions = []
+        self._entries = {}
+
+        for vehicle in vehicles:
+            vehicle.position_index = self
+            self.update(vehicle)
+            self.vehicle_count += 1
+
+    def update(self, vehicle) -> None:
+        """
+        Re-index a vehicle after its idle state, position or bounds changed.
+
+        :param vehicle: The vehicle to re-index
+        """
+        self._remove(vehicle)
+
+        if not vehicle.idle:
+            # Busy vehicles without known bounds cannot be located and are not indexed
+            if vehicle.lower_bound is None or vehicle.upper_bound is None:
+                return
+            entry = (BUSY, (vehicle.lower_bound, vehicle.upper_bound))
+            insort(self._busy_lower_bounds, vehicle.lower_bound)
+            insort(self._busy_upper_bounds, vehicle.upper_bound)
+        elif vehicle.position is None:
+            return
+        elif vehicle.home_point is not None and vehicle.position == vehicle.home_point.position:
+            entry = (HOME, vehicle.position[1])
+            self._home_positions[vehicle.position[1]] += 1
+        else:
+            entry = (AWAY, vehicle.position[1])
+            insort(self._away_positions, vehicle.position[1])
+
+        self._entries[vehicle] = entry
+
+    def _remove(self, vehicle) -> None:
+        """
+        Remove a vehicle from its current bucket.
+
+        :param vehicle: The vehicle to remove
+        """
+        entry = self._entries.pop(vehicle, None)
+        if entry is None:
+            return
+
+        bucket, key = entry
+        if bucket == BUSY:
+            lower_bound, upper_bound = key
+            del self._busy_lower_bounds[bisect_left(self._busy_lower_bounds, lower_bound)]
+            del self._busy_upper_bounds[bisect_left(self._busy_upper_bounds, upper_bound)]
+        elif bucket == HOME:
+            self._home_positions[key] -= 1
+            if self._home_positions[key] == 0:
+                del self._home_positions[key]
+        else:
+            del self._away_positions[bisect_left(self._away_positions, key)]
+
+    def is_blocked(self, point: float, vehicle, trip_lower_bound: float, trip_upper_bound: float) -> bool:
+        """
+        Check whether the interval of any vehicle other than ``vehicle`` contains ``point``.
+
+        :param point: Position on the y-axis to check
+        :param vehicle: The vehicle asking, excluded from the check
+        :param trip_lower_bound: Lower bound of the requested trip (calling object and destination)
+        :param trip_upper_bound: Upper bound of the requested trip (calling object and destination)
+        :return: True if another vehicle occupies the point
+        """
+        # Busy intervals containing the point: #(lower <= point) - #(upper < point)
+        if bisect_right(self._busy_lower_bounds, point) - bisect_left(self._busy_upper_bounds, point) > 0:
+            return True
+
+        own_bucket, own_key = self._entries.get(vehicle, (None, None))
+
+        # Vehicles parked at home occupy a single point
+        if self._home_positions.get(point, 0) - (own_bucket == HOME and own_key == point) > 0:
+            return True
+
+        # Vehicles away from home span their own position and the requested trip
+        own_away = own_bucket == AWAY
+        if trip_lower_bound <= point <= trip_upper_bound:
+            blocking = len(self._away_positions) - own_away
+        elif point < trip_lower_bound:
+            blocking = bisect_right(self._away_positions, point) - (own_away and own_key <= point)
+        else:
+            blocking = len(self._away_positions) - bisect_left(self._away_positions, point) - (own_away and own_key >= point)
+
+        return blocking > 0
@@ -3,10 +3,9 @@ import logging
 import unittest
 from typing import List, Tuple
 
-import pandas as pd
-
 from src.core.components.date_time import DateTime
-from src.core.global_imports import DAYS_PER_WEEK, HOURS_PER_DAY, MINUTES_PER_HOUR
+from src.core.global_imports import import_pandas, DAYS_PER_WEEK, HOURS_PER_DAY, MINUTES_PER_HOUR
+from src.core.utils.helper import read_csv_table
 
 
 class WorkScheduleWeek:
@@ -78,7 +77,7 @@ class WorkScheduleWeek:
                 "start step": shift[0],
                 "end step": shift[1]
             })
-        work_schedule_table = pd.DataFrame(work_schedule_table)
+        work_schedule_table = import_pandas().DataFrame(work_schedule_table)
         logging.info("Work Schedule Table: %s\n%s\n", name, work_schedule_table)
 
     def find_overlaps(self):
@@ -215,10 +214,7 @@ def load_work_schedule_from_csv(csv_path: str, config: dict = None) -> WorkSched
     """
     Load a weekly work schedule from a CSV file.
     """
-    if config:
-        df = pd.read_csv(csv_path, **config)
-    else:
-        df = pd.read_csv(csv_path)
+    df = read_csv_table(csv_path, config)
 
     # Create a WorkScheduleDay instance for each weekday
     days = {
@@ -1,10 +1,10 @@
 import simpy
 import logging
-import pandas as pd
 from typing import List, Dict, Optional, Union, Any, Set, Iterator
 from src.core.components.date_time import DateTime
 from src.core.components.model import Model
 import src.core.config as cfg
+from src.core.utils.helper import read_csv_table
 
 # Constants
 TABLE_WIDTH: int = 80
@@ -33,7 +33,7 @@ class Worker:
     def end_assignment(self, server_name: str, end_time: float) -> float:
         """End an assignment and calculate busy time"""
         if self.busy_since is None or self.busy_with != server_name:
-            logging.warning(f"Worker {self.id} wasn't assigned to {server_name} but was asked to end assignment")
+            logging.warning("Worker %s wasn't assigned to %s but was asked to end assignment", self.id, server_name)
             return 0.0
 
         duration: float = end_time - self.busy_since
@@ -265,9 +265,6 @@ def load_workers_from_csv(csv_path: str, config: Optional[Dict[str, Any]] = None
     :param config: Optional pandas configuration for CSV reading
     :return: List of Worker objects created from the CSV data
     """
-    if config:
-        df: pd.DataFrame = pd.read_csv(csv_path, **config)
-    else:
-        df: pd.DataFrame = pd.read_csv(csv_path)
+    df = read_csv_table(csv_path, config)
     workers: List[Worker] = [Worker(row['id']) for _, row in df.iterrows()]
     return workers
@@ -8,14 +8,13 @@ import simpy
 
 import src.core.global_imports as gi
 import src.core.statistics.entity_type_utils as et
-from src.core.components.date_time import DateTime
 from src.core.components.entity import Entity
 from src.core.components.logistic.storage_manager import StorageManager
 from src.core.components.model import Model, ComponentType
 from src.core.components.work_schedule import WorkScheduleWeek, ask_work_schedule
 from src.core.components_abstract.resetable_named_object import ResetAbleNamedObjectManager, ResetAbleNamedObject
 from src.core.components_abstract.routing_object import RoutingObject
-from src.core.global_imports import ENTITY_PROCESSING_LOG_ENTRY
+from src.core.utils.logging_utils import LazyLogEntry
 from src.core.statistics.entity_type_utils import initialize_entity_types_component
 from src.core.types.queue_type import QueueType
 from src.core.utils.helper import get_value_from_distribution_with_parameters, validate_probabilities, \
@@ -107,7 +106,8 @@ class ProcessingComponent(ResetAbleNamedObject, RoutingObject, ABC):
         # Breakdown management
         if self.time_between_machine_breakdowns:
             self.time_until_next_machine_breakdown = (
-                get_value_from_distribution_with_parameters(self.time_between_machine_breakdowns))
+                get_value_from_distribution_with_parameters(self.time_between_machine_breakdowns,
+                                                            (self.name, 'breakdown')))
 
         # Storage management
         self.storage_queue = storage_queue
@@ -165,8 +165,7 @@ class ProcessingComponent(ResetAbleNamedObject, RoutingObject, ABC):
         self.input_queue.append((entity, self.env.now))
 
         logging.root.level <= logging.TRACE and logging.trace(
-            ENTITY_PROCESSING_LOG_ENTRY.format(f"[{self.component_type}] {self.name} received entity {entity.name}",
-                                               DateTime.get(self.env.now)))
+            LazyLogEntry(self.env.now, "[{}] {} received entity {}", self.component_type, self.name, entity.name))
 
         # Execute after_arrival_trigger
         execute_trigger(self.after_arrival_trigger, self, entity)
@@ -278,13 +277,13 @@ class ProcessingComponent(ResetAbleNamedObject, RoutingObject, ABC):
         if processing_time > self.time_until_next_machine_breakdown:
             # (1) process until breakdown
             logging.root.level <= logging.TRACE and logging.trace(
-                ENTITY_PROCESSING_LOG_ENTRY.format(f"{self.name} machine breakdown",
-                                                   DateTime.get(self.env.now)))
+                LazyLogEntry(self.env.now, "{} machine breakdown", self.name))
 
             yield self.env.timeout(self.time_until_next_machine_breakdown)
 
             # (2) Breakdown
-            breakdown_duration = get_value_from_distribution_with_parameters(self.machine_breakdown_duration)
+            breakdown_duration = get_value_from_distribution_with_parameters(self.machine_breakdown_duration,
+                                                                             (self.name, 'repair'))
             yield self.env.timeout(breakdown_duration)
 
             # (3) Update downtime statistics
@@ -293,13 +292,13 @@ class ProcessingComponent(ResetAbleNamedObject, RoutingObject, ABC):
                 self.total_downtime_pivot_table += breakdown_duration
 
             logging.root.level <= logging.TRACE and logging.trace(
-                ENTITY_PROCESSING_LOG_ENTRY.format(f"{self.name} failure corrected",
-                                                   DateTime.get(self.env.now)))
+                LazyLogEntry(self.env.now, "{} failure corrected", self.name))
 
             # (4) Continue processing after breakdown is resolved
             processing_time_remaining = processing_time - self.time_until_next_machine_breakdown
             self.time_until_next_machine_breakdown = (
-                get_value_from_distribution_with_parameters(self.time_between_machine_breakdowns))
+                get_value_from_distribution_with_parameters(self.time_between_machine_breakdowns,
+                                                            (self.name, 'breakdown')))
 
             yield self.env.timeout(processing_time_remaining)
 
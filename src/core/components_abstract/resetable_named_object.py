@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Callable, Optional
 
 import simpy
 
@@ -9,65 +10,63 @@ class ResetAbleNamedObjectManager:
     """
     Manages a collection of resettable named objects.
 
+    Objects are indexed by name in insertion order, so adding, replacing and looking up an object is O(1).
+
     Attributes:
         resetable_named_objects (list): List of resettable named objects.
     """
 
-    def __init__(self):
+    def __init__(self, on_add: Optional[Callable] = None):
         """
-        Initialize the manager with an empty list of resettable named objects.
+        Initialize the manager with an empty registry of resettable named objects.
+
+        :param on_add: Optional callback invoked with every object added to the manager.
         """
-        self.resetable_named_objects = []
-        self._object_names = set()
         self._object_pool = {}
+        self.on_add = on_add
+
+    @property
+    def resetable_named_objects(self) -> list:
+        """
+        List of the managed objects in insertion order.
+        """
+        return list(self._object_pool.values())
 
     def add(self, rno):
         """
-        Add a resettable named object to the manager.
+        Add a resettable named object to the manager. An object with the same name is replaced in place.
 
         :param rno: The resettable named object to add.
         """
-        # Check if an object with this name already exists in the active list
-        for i, obj in enumerate(self.resetable_named_objects):
-            if obj.name == rno.name and obj is not rno:
-                # Replace the old object with the new one
-                self.resetable_named_objects[i] = rno
-                self._object_pool[rno.name] = rno
-                return
-
-        self.resetable_named_objects.append(rno)
         self._object_pool[rno.name] = rno
 
-    def __iter__(self):
+        if self.on_add is not None:
+            self.on_add(rno)
+
+    def get(self, name: str):
         """
-        Initialize the iteration object for the manager.
+        Get a managed object by name.
 
-        :return: The manager itself as an iterator.
+        :param name: Name of the object.
+        :return: The object or None if no object with this name is managed.
         """
-        self.iteration_object = -1
-        return self
+        return self._object_pool.get(name)
 
-    def __next__(self):
+    def __iter__(self):
         """
-        Get the next resettable named object in the iteration.
+        Iterate over the managed objects in insertion order.
 
-        :return: The next resettable named object.
-        :raises StopIteration: If there are no more objects to iterate over.
+        :return: Iterator over the resettable named objects.
         """
-        self.iteration_object += 1
-        if self.iteration_object < len(self.resetable_named_objects):
-            return self.resetable_named_objects[self.iteration_object]
-        raise StopIteration
+        return iter(self._object_pool.values())
 
     def reset_all(self):
         """
-        Reset all resettable named objects managed by this manager and clear the list.
+        Reset all resettable named objects managed by this manager and clear the registry.
         """
-        for rno in self.resetable_named_objects:
+        for rno in list(self._object_pool.values()):
             rno.reset()
 
-        self.resetable_named_objects = []
-        self._object_names = set()
         self._object_pool.clear()
 
     def __repr__(self) -> str:
@@ -76,11 +75,11 @@ class ResetAbleNamedObjectManager:
 
         :return: A string representation of the manager.
         """
-        object_details = ", ".join(repr(obj) for obj in self.resetable_named_objects)
-        return f'ResetAbleNamedObjects({len(self.resetable_named_objects)} objects: {object_details})'
+        object_details = ", ".join(repr(obj) for obj in self._object_pool.values())
+        return f'ResetAbleNamedObjects({len(self._object_pool)} objects: {object_details})'
 
     def __len__(self) -> int:
-        return len(self.resetable_named_objects)
+        return len(self._object_pool)
 
 
 class ResetAbleNamedObject(ABC):
@@ -1,14 +1,16 @@
 import logging
 
 from simpy import Environment
-from src.core.components.date_time import DateTime
 from src.core.components.entity import Entity
 from src.core.components.model import Model
 from src.core.components.vehicle_manager import VehicleManager
 from src.core.event.block_event import BlockEvent
-from src.core.global_imports import ENTITY_PROCESSING_LOG_ENTRY
+from src.core.utils.logging_utils import LazyLogEntry
 from src.core.global_imports import random
-from src.core.utils.helper import execute_trigger
+from src.core.utils.helper import execute_trigger, get_value_from_distribution_with_parameters
+
+ROUTING_DECISION = (random.uniform, 0, 100)
+"""Distribution of the routing decision, drawn in percent"""
 
 
 class RoutingObject:
@@ -38,10 +40,10 @@ class RoutingObject:
 
         :param entity: The entity to route
         """
-        logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(
-            "".join(["Routing entity ", entity.name, " of type ", entity.entity_type]), DateTime.get(self.env.now)))
-        logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(
-            "".join(["Connection cache before routing: ", str(self.connection_cache)]), DateTime.get(self.env.now)))
+        logging.root.level <= logging.TRACE and logging.trace(
+            LazyLogEntry(self.env.now, "Routing entity {} of type {}", entity.name, entity.entity_type))
+        logging.root.level <= logging.TRACE and logging.trace(
+            LazyLogEntry(self.env.now, "Connection cache before routing: {}", self.connection_cache))
 
         # Priority 1: If there's a routing_expression, use it (for custom routing logic)
         if self.routing_expression:
@@ -71,19 +73,15 @@ class RoutingObject:
         # If sequence routing is enabled, use it
         if self.sequence_routing:
             logging.root.level <= logging.TRACE and logging.trace(
-                ENTITY_PROCESSING_LOG_ENTRY.format(f"Sequence routing {entity.name} with index {entity.sequence_index}",
-                                                   DateTime.get(self.env.now)))
+                LazyLogEntry(self.env.now, "Sequence routing {} with index {}", entity.name, entity.sequence_index))
 
             if entity.destination is None:
-                destination_name = Model().routing_table.at[entity.sequence_index, Model().routing_table_destination_column]
-                if Model().is_group(destination_name):
-                    entity.destination = Model().get_next_destination_from_group(destination_name)
-                else:
-                    entity.destination = Model().get_component_by_name(destination_name)
+                entity.destination = Model().get_sequence_destination(entity.sequence_index)
 
             destination = entity.destination
             event = event
             if destination is None:
+                destination_name = Model().routing_table.at[entity.sequence_index, Model().routing_table_destination_column]
                 if event is None:
                     event = BlockEvent(self.env)
                     if capa_id is not None:
@@ -110,9 +108,8 @@ class RoutingObject:
             self.retry_counter = 0
             if vehicle_group:
                 logging.root.level <= logging.TRACE and logging.trace(
-                    ENTITY_PROCESSING_LOG_ENTRY.format(
-                        f"Request transport for {entity.name} from {self.name} to {destination.name}",
-                        DateTime.get(self.env.now)))
+                    LazyLogEntry(self.env.now, "Request transport for {} from {} to {}",
+                                 entity.name, self.name, destination.name))
                 entity.is_vehicle_routed = True
                 VehicleManager().request_transport(vehicle_group, entity, destination, self, capa_id, event)
             else:
@@ -130,22 +127,26 @@ class RoutingObject:
                 if conn.entity_type is None or conn.entity_type == entity.entity_type
             ]
 
-            logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(
-                "".join(["Eligible connections: ", str(eligible_connections)]), DateTime.get(self.env.now)))
+            logging.root.level <= logging.TRACE and logging.trace(
+                LazyLogEntry(self.env.now, "Eligible connections: {}", eligible_connections))
 
-            decision = random.uniform(0, 100)
+            decision = get_value_from_distribution_with_parameters(ROUTING_DECISION, (self.name, 'routing'))
 
             for cumulative_probability, connection, vehicle in eligible_connections:
 
-                logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(
-                    "".join(["Decision: ", str(decision), ", Cumulative Probability: ", str(cumulative_probability)]), DateTime.get(self.env.now)))
+                logging.root.level <= logging.TRACE and logging.trace(
+                    LazyLogEntry(self.env.now, "Decision: {}, Cumulative Probability: {}",
+                                 decision, cumulative_probability))
 
                 if decision <= cumulative_probability:
-                    logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(
-                        "".join(["Entity ", entity.name, " routed to ", connection.next_component.name, " via vehicle ", vehicle.name if vehicle else 'None']), DateTime.get(self.env.now)))
+                    logging.root.level <= logging.TRACE and logging.trace(
+                        LazyLogEntry(self.env.now, "Entity {} routed to {} via vehicle {}",
+                                     entity.name, connection.next_component.name, vehicle.name if vehicle else 'None'))
 
                     if vehicle_group:
-                        logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(f"Request transport for {entity.name} from {self.name} to {connection.next_component.name}", DateTime.get(self.env.now)))
+                        logging.root.level <= logging.TRACE and logging.trace(
+                            LazyLogEntry(self.env.now, "Request transport for {} from {} to {}",
+                                         entity.name, self.name, connection.next_component.name))
                         entity.is_vehicle_routed = True
                         VehicleManager().request_transport(vehicle_group, entity, connection.next_component, self, capa_id, event)
                     else:
@@ -188,12 +189,12 @@ class RoutingObject:
         """
         Update the connection cache with the latest connections and probabilities.
         """
-        logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(
-            "".join(["Creating connection cache for ", str(self)]), DateTime.get(self.env.now)))
+        logging.root.level <= logging.TRACE and logging.trace(
+            LazyLogEntry(self.env.now, "Creating connection cache for {}", self))
         self.connection_cache.clear()  # Clear existing cache to avoid stale entries
         total_probability = sum(probability for _, probability, _, _ in self.next_components if probability is not None)
-        logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(
-            "".join(["Total probability: ", str(total_probability)]), DateTime.get(self.env.now)))
+        logging.root.level <= logging.TRACE and logging.trace(
+            LazyLogEntry(self.env.now, "Total probability: {}", total_probability))
 
         if total_probability == 0:
             num_components = len(self.next_components)
@@ -201,26 +202,30 @@ class RoutingObject:
             cumulative_probability = 0
             for next_server, _, entity_type, vehicle in self.next_components:
                 cumulative_probability += equal_probability
-                logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(
-                    "".join(["Setting cache: ", str(cumulative_probability), " -> (", str(self.connections[next_server.name]), ", ", str(vehicle), ")"]), DateTime.get(self.env.now)))
+                logging.root.level <= logging.TRACE and logging.trace(
+                    LazyLogEntry(self.env.now, "Setting cache: {} -> ({}, {})",
+                                 cumulative_probability, self.connections[next_server.name], vehicle))
                 self.connection_cache[cumulative_probability] = (self.connections[next_server.name], vehicle)
         else:
             cumulative_probability = 0
             for next_server, probability, entity_type, vehicle in self.next_components:
                 if probability is not None:
                     cumulative_probability += (probability / total_probability) * 100
-                    logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(
-                        "".join(["Setting cache: ", str(cumulative_probability), " -> (", str(self.connections[next_server.name]), ", ", str(vehicle), ")"]), DateTime.get(self.env.now)))
+                    logging.root.level <= logging.TRACE and logging.trace(
+                        LazyLogEntry(self.env.now, "Setting cache: {} -> ({}, {})",
+                                     cumulative_probability, self.connections[next_server.name], vehicle))
                     self.connection_cache[cumulative_probability] = (self.connections[next_server.name], vehicle)
 
-        logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(
-            "".join(["Updated connection cache: ", str(self.connection_cache)]), DateTime.get(self.env.now)))
+        logging.root.level <= logging.TRACE and logging.trace(
+            LazyLogEntry(self.env.now, "Updated connection cache: {}", self.connection_cache))
 
     @staticmethod
     def retry(waiting_time, calling_object, entity: Entity, vehicle_group: str = None, capa_id=None, event=None):
         calling_object.retry_counter += 1
         if calling_object.retry_counter % 100 == 0:
-            logging.root.level <= logging.TRACE and logging.trace(ENTITY_PROCESSING_LOG_ENTRY.format(f'Retryed x{calling_object.retry_counter} at {calling_object.env.now} from {calling_object}', DateTime.get(calling_object.env.now)))
+            logging.root.level <= logging.TRACE and logging.trace(
+                LazyLogEntry(calling_object.env.now, "Retryed x{} at {} from {}",
+                             calling_object.retry_counter, calling_object.env.now, calling_object))
         yield calling_object.env.timeout(waiting_time)
         calling_object._route_without_truck(entity, vehicle_group=vehicle_group, capa_id=capa_id, event=event)
 
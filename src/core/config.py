@@ -1,4 +1,6 @@
+import copy
 from pathlib import Path
+from types import MappingProxyType
 import yaml
 from typing import Union, Dict, Any, Tuple, Callable
 
@@ -19,11 +21,126 @@ _ROOT = _find_project_root()
 _CONFIG_DIR = _ROOT / "config"
 _GLOBAL_CONFIG = _CONFIG_DIR / "global_config.yaml"
 
+
+# ============================================================================
+# CONFIG SNAPSHOT
+# ============================================================================
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples."""
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Recursively convert a frozen value back to dicts and lists."""
+    if isinstance(value, (dict, MappingProxyType)):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+class ConfigSnapshot:
+    """
+    Immutable configuration of a run.
+
+    The framework settings are resolved once into typed slots when the snapshot is created, so reading them is a
+    plain attribute access. ``apply_overrides`` and ``reset_to_global`` don't change a snapshot, they activate a new
+    one. Components and runs that captured a snapshot or its values keep them, so settings can't leak between
+    replications and scenarios.
+    """
+    __slots__ = ('data', 'precision', 'random_seed', 'duration_warm_up', 'random_streams', 'event_scheduler', 'engine',
+                 'partitions', 'collect_entity_type_stats', 'confidence_level', 'max_recycled_entities',
+                 'entity_pool_default', 'entity_pool_by_type', 'batched_variates', 'variate_block_size', 'in_memory_db',
+                 'logging_level', 'logging_format', 'logging_queue_size', 'logging_queue_timeout', 'matplotlib_log_level',
+                 'max_tasks_per_worker', 'chunk_duration', 'shared_memory_results')
+
+    def __init__(self, data: Dict[str, Any]):
+        """
+        :param data: Configuration as loaded from YAML, copied and frozen by the snapshot
+        """
+        data = _freeze(data)
+        simulation = data.get("simulation") or {}
+        statistics = data.get("statistics") or {}
+        performance = data.get("performance") or {}
+        entity_pool = performance.get("entity_pool") or {}
+        logging_settings = data.get("logging") or {}
+        multiprocessing = data.get("multiprocessing") or {}
+
+        settings = {
+            'data': data,
+
+            # Simulation settings
+            'precision': simulation.get("precision", 2),
+            'random_seed': simulation.get("random_seed", 1),
+            'duration_warm_up': simulation.get("duration_warm_up", 0),
+            'random_streams': simulation.get("random_streams", False),
+            'event_scheduler': simulation.get("event_scheduler", "heap"),
+            'engine': simulation.get("engine", "simpy"),
+            'partitions': simulation.get("partitions", 2),
+
+            # Statistics settings
+            'collect_entity_type_stats': statistics.get("collect_entity_type_stats", False),
+            'confidence_level': statistics.get("confidence_level", 0.95),
+
+            # Performance settings
+            'max_recycled_entities': performance.get("max_recycled_entities", 5000),
+            'entity_pool_default': entity_pool.get("default", 10000),
+            'entity_pool_by_type': entity_pool.get("by_type") or MappingProxyType({}),
+            'batched_variates': performance.get("batched_variates", False),
+            'variate_block_size': performance.get("variate_block_size", 4096),
+
+            # Database settings
+            'in_memory_db': (data.get("database") or {}).get("in_memory", True),
+
+            # Logging settings
+            'logging_level': logging_settings.get("level", "INFO"),
+            'logging_format': logging_settings.get("format", "%(asctime)s %(levelname)s %(message)s"),
+            'logging_queue_size': logging_settings.get("queue_size", 10000),
+            'logging_queue_timeout': logging_settings.get("queue_timeout", 5.0),
+
+            # Visualization settings
+            'matplotlib_log_level': (data.get("visualization") or {}).get("matplotlib_log_level", "ERROR"),
+
+            # Multiprocessing settings
+            'max_tasks_per_worker': multiprocessing.get("max_tasks_per_worker", 100),
+            'chunk_duration': multiprocessing.get("chunk_duration", 0.2),
+            'shared_memory_results': multiprocessing.get("shared_memory_results", False),
+        }
+        for name, value in settings.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("ConfigSnapshot is immutable, use apply_overrides to create a new snapshot")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("ConfigSnapshot is immutable, use apply_overrides to create a new snapshot")
+
+    def get_entity_pool_size(self, entity_type: str = "Entity") -> int:
+        """Get entity pool size for specific type."""
+        return self.entity_pool_by_type.get(entity_type, self.entity_pool_default)
+
+    def with_overrides(self, overrides: Dict[str, Any]) -> "ConfigSnapshot":
+        """
+        Create a new snapshot with overrides deep merged into this one.
+
+        :param overrides: Nested dictionary of settings
+        :return: The new snapshot
+        """
+        data = _thaw(self.data)
+        _deep_merge(data, overrides)
+        return ConfigSnapshot(data)
+
+
 # ============================================================================
 # INTERNAL STATE
 # ============================================================================
-_state = {}
-_original_state = {}
+_SETTINGS = tuple(name for name in ConfigSnapshot.__slots__ if name != 'data')
+_snapshot: ConfigSnapshot = None
+_global_snapshot: ConfigSnapshot = None
 
 
 # ============================================================================
@@ -35,32 +152,55 @@ def _deep_merge(target: Dict[str, Any], src: Dict[str, Any]) -> None:
         if isinstance(v, dict) and isinstance(target.get(k), dict):
             _deep_merge(target[k], v)
         else:
-            target[k] = v
+            target[k] = copy.deepcopy(v)
+
+
+def activate(config: ConfigSnapshot) -> ConfigSnapshot:
+    """
+    Make a snapshot the current configuration.
+
+    Its settings are published as module attributes (``cfg.precision``, ``cfg.random_seed``, ...).
+
+    :param config: The snapshot to activate
+    :return: The snapshot
+    """
+    global _snapshot
+    _snapshot = config
+    module_globals = globals()
+    for name in _SETTINGS:
+        module_globals[name] = getattr(config, name)
+    return config
+
+
+def snapshot() -> ConfigSnapshot:
+    """Get the current configuration snapshot."""
+    return _snapshot
 
 
 def _load_global() -> None:
     """Load the global configuration file."""
+    global _global_snapshot
     if not _GLOBAL_CONFIG.exists():
         raise FileNotFoundError(f"Global config not found: {_GLOBAL_CONFIG}")
 
     with _GLOBAL_CONFIG.open("r", encoding="utf-8") as f:
         data = yaml.safe_load(f) or {}
 
-    _state.clear()
-    _state.update(data)
-    _original_state.clear()
-    _original_state.update(data)
+    _global_snapshot = activate(ConfigSnapshot(data))
 
 
-def apply_overrides(overrides: Union[None, Dict[str, Any], str, Path]) -> None:
+def apply_overrides(overrides: Union[None, Dict[str, Any], str, Path]) -> ConfigSnapshot:
     """
-    Apply configuration overrides.
+    Activate a new snapshot with configuration overrides applied to the current one.
 
     Args:
         overrides: None, dict, path to YAML, or "auto" for auto-detection
+
+    Returns:
+        The active snapshot
     """
     if overrides is None:
-        return
+        return _snapshot
 
     if isinstance(overrides, (str, Path)):
         path = Path(overrides)
@@ -86,16 +226,16 @@ def apply_overrides(overrides: Union[None, Dict[str, Any], str, Path]) -> None:
 
     # Handle inheritance
     if isinstance(overrides, dict) and "_extends" in overrides:
+        overrides = dict(overrides)
         base_config = overrides.pop("_extends")
         apply_overrides(base_config)
 
-    _deep_merge(_state, overrides)
+    return activate(_snapshot.with_overrides(overrides))
 
 
-def reset_to_global() -> None:
+def reset_to_global() -> ConfigSnapshot:
     """Reset configuration to global defaults."""
-    _state.clear()
-    _state.update(_original_state)
+    return activate(_global_snapshot)
 
 
 # ============================================================================
@@ -105,15 +245,18 @@ def get_param(path: str, default=None) -> Any:
     """
     Get parameter using dot notation.
 
+    The parameters are part of the frozen config snapshot: nested sections are returned as read-only mappings
+    (``types.MappingProxyType``) and lists as tuples. Copy them into a dict or list to change them.
+
     Example:
         cfg.get_param('servers.placement.capacity') → 2
-        cfg.get_param('servers.placement.processing_time.params') → [3, 5, 4]
+        cfg.get_param('servers.placement.processing_time.params') → (3, 5, 4)
     """
     keys = path.split('.')
-    value = _state.get('model_parameters', {})
+    value = _snapshot.data.get('model_parameters', {})
 
     for key in keys:
-        if isinstance(value, dict):
+        if isinstance(value, MappingProxyType):
             value = value.get(key)
         else:
             return default
@@ -133,7 +276,7 @@ def get_distribution(path: str) -> Tuple[Callable, ...]:
     """
     dist_config = get_param(path)
 
-    if not dist_config or not isinstance(dist_config, dict):
+    if not dist_config or not isinstance(dist_config, MappingProxyType):
         raise ValueError(f"Invalid distribution config at '{path}': {dist_config}")
 
     dist_name = dist_config.get('distribution')
@@ -160,54 +303,9 @@ def has_param(path: str) -> bool:
 # ============================================================================
 # FRAMEWORK SETTINGS ACCESS
 # ============================================================================
-def __getattr__(name: str) -> Any:
-    """Expose settings as attributes for backward compatibility."""
-
-    # Simulation settings
-    if name == "precision":
-        return (_state.get("simulation") or {}).get("precision", 2)
-    if name == "random_seed":
-        return (_state.get("simulation") or {}).get("random_seed", 1)
-    if name == "duration_warm_up":
-        return (_state.get("simulation") or {}).get("duration_warm_up", 0)
-
-    # Statistics settings
-    if name == "collect_entity_type_stats":
-        return (_state.get("statistics") or {}).get("collect_entity_type_stats", False)
-    if name == "confidence_level":
-        return (_state.get("statistics") or {}).get("confidence_level", 0.95)
-
-    # Performance settings
-    if name == "max_recycled_entities":
-        return (_state.get("performance") or {}).get("max_recycled_entities", 5000)
-    if name == "entity_pool_default":
-        return (_state.get("performance") or {}).get("entity_pool", {}).get("default", 10000)
-    if name == "entity_pool_by_type":
-        return (_state.get("performance") or {}).get("entity_pool", {}).get("by_type", {})
-
-    # Database settings
-    if name == "in_memory_db":
-        return (_state.get("database") or {}).get("in_memory", True)
-
-    # Logging settings
-    if name == "logging_level":
-        return (_state.get("logging") or {}).get("level", "INFO")
-    if name == "logging_format":
-        return (_state.get("logging") or {}).get("format", "%(asctime)s %(levelname)s %(message)s")
-
-    # Visualization settings
-    if name == "matplotlib_log_level":
-        return (_state.get("visualization") or {}).get("matplotlib_log_level", "ERROR")
-
-    raise AttributeError(f"Config has no attribute '{name}'")
-
-
 def get_entity_pool_size(entity_type: str = "Entity") -> int:
     """Get entity pool size for specific type."""
-    by_type = (_state.get("performance") or {}).get("entity_pool", {}).get("by_type", {})
-    if entity_type in by_type:
-        return by_type[entity_type]
-    return (_state.get("performance") or {}).get("entity_pool", {}).get("default", 10000)
+    return _snapshot.get_entity_pool_size(entity_type)
 
 
 # ============================================================================
@@ -6,10 +6,9 @@ All configurable values live in config.py
 
 import logging
 import random
-import pandas as pd
-from matplotlib import pyplot as plt
 from src.core.components_abstract.singleton import Singleton
 from src.core.utils.logging_utils import add_logging_level
+from src.core.utils.random_streams import RandomStreams
 
 # ============================================================================
 # FRAMEWORK CONSTANTS
@@ -34,18 +33,34 @@ if not hasattr(logging, 'TRACE'):
     add_logging_level('TRACE', logging.DEBUG + 5)  # between DEBUG and INFO
 
 logging.basicConfig(level=logging.INFO, format='%(levelname)s:%(message)s')
+# Same as plt.set_loglevel('WARNING'), without importing matplotlib
+logging.getLogger('matplotlib').setLevel(logging.WARNING)
 logging.getLogger('matplotlib.font_manager').setLevel(logging.ERROR)
-plt.set_loglevel('WARNING')
-
-pd.set_option('display.max_columns', None)
-pd.set_option('display.max_colwidth', None)
-pd.set_option('max_seq_item', None)
-pd.set_option('display.width', 1000)
 
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
+def import_pandas():
+    """
+    Import pandas and show complete data frames when they are printed.
+
+    pandas, matplotlib, tabulate and the database layer take longer to import than a short simulation runs, so they
+    are only imported by the features that need them (result tables, CSV input, plots). Use this instead of
+    ``import pandas`` so the display options are set on first use.
+
+    :return: The pandas module
+    """
+    import pandas as pd
+    if not getattr(import_pandas, 'configured', False):
+        pd.set_option('display.max_columns', None)
+        pd.set_option('display.max_colwidth', None)
+        pd.set_option('max_seq_item', None)
+        pd.set_option('display.width', 1000)
+        import_pandas.configured = True
+    return pd
+
+
 def set_duration_warm_up(value):
     global DURATION_WARM_UP
     DURATION_WARM_UP = value
@@ -60,6 +75,7 @@ def set_random_seed(value):
     global RANDOM_SEED
     RANDOM_SEED = value
     random.seed(value)
+    RandomStreams.seed(value)
 
 
 # ============================================================================
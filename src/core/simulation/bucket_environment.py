@@ -0,0 +1,105 @@
+from collections import deque
+from heapq import heappush, heappop
+from typing import Deque, Dict, List
+
+import simpy
+from simpy.core import EmptySchedule, Infinity, SimTime, StopSimulation
+from simpy.events import Event, EventPriority, NORMAL
+
+HEAP_SCHEDULER = 'heap'
+BUCKET_SCHEDULER = 'bucket'
+
+
+class BucketEnvironment(simpy.Environment):
+    """
+    SimPy environment that keeps one FIFO bucket per scheduled timestamp instead of a single event heap.
+
+    Only the distinct timestamps are kept in a heap, so a burst of events at the same time (shift changes,
+    daily batches) costs O(1) per event instead of O(log n). Within a timestamp events are ordered by priority
+    and then by scheduling order, which is exactly the (time, priority, event id) order of ``simpy.Environment``.
+    """
+
+    def __init__(self, initial_time: SimTime = 0):
+        super().__init__(initial_time)
+        self._times: List[SimTime] = []
+        self._buckets: Dict[SimTime, Dict[EventPriority, Deque[Event]]] = {}
+
+    def schedule(self, event: Event, priority: EventPriority = NORMAL, delay: SimTime = 0) -> None:
+        """
+        Schedule an event with a given priority and a delay.
+
+        :param event: The event to schedule
+        :param priority: Priority of the event at its timestamp
+        :param delay: Delay after the current simulation time
+        """
+        time = self._now + delay
+        bucket = self._buckets.get(time)
+        if bucket is None:
+            bucket = self._buckets[time] = {}
+            heappush(self._times, time)
+
+        events = bucket.get(priority)
+        if events is None:
+            events = bucket[priority] = deque()
+        events.append(event)
+
+    def peek(self) -> SimTime:
+        """
+        Get the time of the next scheduled event.
+
+        :return: The time or ``Infinity`` if there is no further event.
+        """
+        return self._times[0] if self._times else Infinity
+
+    def step(self) -> None:
+        """
+        Process the next event.
+
+        :raises EmptySchedule: If no further events are available.
+        """
+        if not self._times:
+            raise EmptySchedule
+
+        time = self._times[0]
+        bucket = self._buckets[time]
+        priority = min(bucket) if len(bucket) > 1 else next(iter(bucket))
+        events = bucket[priority]
+        event = events.popleft()
+
+        if not events:
+            del bucket[priority]
+            if not bucket:
+                del self._buckets[time]
+                heappop(self._times)
+
+        self._now = time
+
+        # Same callback handling as simpy.Environment.step
+        callbacks, event.callbacks = event.callbacks, None
+        try:
+            for callback in callbacks:
+                callback(event)
+        except StopSimulation:
+            event.callbacks = callbacks[callbacks.index(callback) + 1:]
+            self.schedule(event, EventPriority(-1))
+            raise
+
+        if not event._ok and not hasattr(event, '_defused'):
+            exc = type(event._value)(*event._value.args)
+            exc.__cause__ = event._value
+            raise exc
+
+
+def create_environment(scheduler: str = HEAP_SCHEDULER) -> simpy.Environment:
+    """
+    Create the SimPy environment for a simulation run.
+
+    :param scheduler: 'heap' for the standard SimPy event heap, 'bucket' for the :class:`BucketEnvironment`
+    :return: The environment
+    """
+    if scheduler == HEAP_SCHEDULER:
+        return simpy.Environment()
+    if scheduler == BUCKET_SCHEDULER:
+        return BucketEnvironment()
+
+    raise ValueError(f"Unknown event scheduler '{scheduler}', expected '{HEAP_SCHEDULER}' or '{BUCKET_SCHEDULER}'.")
@@ -1,13 +1,24 @@
 import copy
+import functools
 import logging
+import os
 import time
 from typing import Dict, List, Tuple, Optional, Any, Callable
 
-import pandas as pd
+import numpy as np
+from scipy.stats import norm, t
 from tabulate import tabulate
 
-from src.core.simulation.experiments.parameter_manager import ParameterizedModel
+import src.core.config as cfg
+from src.core.components.model import Model
+from src.core.global_imports import import_pandas
+from src.core.simulation.experiments.parameter_manager import ParameterizedModel, apply_live_parameters
 from src.core.simulation.replication import ReplicationRunner
+from src.core.simulation.warm_up_fork import fork_branches, fork_supported
+from src.core.statistics.results_cube import ReplicationDataView, ResultsCube
+from src.core.statistics.stats import calculate_statistics
+
+pd = import_pandas()
 
 
 class ScenarioParameter:
@@ -79,7 +90,8 @@ class ExperimentRunner:
     def __init__(self, name: str, model_builder: Callable,
                  tracked_statistics: List[Tuple[str, str, str, Optional[str]]] = None,
                  global_parameters: Dict[str, Any] = None,
-                 parameter_display_names: Dict[str, str] = None):
+                 parameter_display_names: Dict[str, str] = None,
+                 common_random_numbers: bool = False):
         """
         Initialize an experiment runner.
 
@@ -89,6 +101,9 @@ class ExperimentRunner:
                                 where display_name is optional and used for table headers
         :param global_parameters: Parameters common to all scenarios
         :param parameter_display_names: Dictionary mapping parameter names to display names
+        :param common_random_numbers: Whether all scenarios draw from the same per-component random streams
+                                      (config ``simulation.random_streams``), so that replication r of every scenario
+                                      sees the same arrivals, processing times and breakdowns
         """
         self.name = name
         self.model_builder = model_builder
@@ -99,6 +114,7 @@ class ExperimentRunner:
         self.start_time = None
         self.end_time = None
         self.parameter_display_names = parameter_display_names or {}
+        self.common_random_numbers = common_random_numbers
 
     def standardize_results(self, results_df):
         """
@@ -206,7 +222,8 @@ class ExperimentRunner:
                 steps=steps,
                 num_replications=replications,
                 warm_up=warm_up,
-                multiprocessing=multiprocessing
+                multiprocessing=multiprocessing,
+                config_overrides={'simulation': {'random_streams': True}} if self.common_random_numbers else None
             )
 
             # Run and get the pivot table
@@ -223,17 +240,7 @@ class ExperimentRunner:
                 return pd.DataFrame()
 
             # Add scenario information to the results
-            pivot_df = pd.DataFrame(pivot_table)
-            pivot_df['Scenario'] = scenario.name
-
-            # Add parameter values as columns
-            for param_name, param in scenario.parameters.items():
-                # Clean parameter name for column name
-                clean_name = param_name.replace('.', '_').replace(':', '_')
-                pivot_df[f'Param_{clean_name}'] = param.value
-
-            # Store the results in the scenario
-            scenario.results = pivot_df
+            pivot_df = self._scenario_results(pd.DataFrame(pivot_table), scenario)
 
             # Log completion
             logging.info(f"Completed scenario '{scenario.name}'")
@@ -282,6 +289,107 @@ class ExperimentRunner:
         logging.info(f"Experiment '{self.name}' completed in {self.end_time - self.start_time:.2f} seconds")
         return self.results
 
+    def run_branched(self, branch_time: float, steps: int, replications: int = 1, warm_up: Optional[int] = None,
+                     branch_builder: Callable = None, processes: Optional[int] = None,
+                     confidence: float = 0.95) -> pd.DataFrame:
+        """
+        Run all scenarios as what-if branches from a common state of the model.
+
+        For every replication the model with the global parameters runs once until ``branch_time``. Each scenario then
+        continues from that state in a forked process (Linux): its component parameters are changed on the live
+        components (see ``apply_live_parameters``), ``branch_builder`` makes further changes such as new servers or
+        routing, and the branch runs until ``steps``. The branches of a replication run in parallel and continue the
+        random numbers of the common run, so replication r of all scenarios is paired (see ``get_paired_difference``).
+        Without ``os.fork`` the common run is repeated for every branch, with the same results.
+
+        :param branch_time: Simulation time at which the scenarios branch off
+        :param steps: Number of simulation steps
+        :param replications: Number of replications, replication r is seeded with r
+        :param warm_up: Warm-up period
+        :param branch_builder: Function that changes the live model of a branch, taking the environment and the
+                               parameters of the scenario
+        :param processes: Number of branches running at the same time (default: number of CPUs)
+        :param confidence: Confidence level of the half-widths
+        :return: DataFrame with combined results
+        """
+        if not self.scenarios:
+            raise ValueError("No scenarios defined for the experiment")
+        if not (0 < branch_time < steps):
+            raise ValueError(f"Branch time ({branch_time}) must be between 0 and the simulation length ({steps}).")
+
+        self.start_time = time.time()
+        self.replication_data = {}
+        results = {scenario.name: ResultsCube(replications) for scenario in self.scenarios}
+        base_model = ParameterizedModel(self.model_builder, dict(self.global_parameters))
+        branches_forked = fork_supported()
+
+        def run_common(replication):
+            env = Model().start_simulation(base_model, steps, seed=replication, warm_up=warm_up)
+            env.run(until=branch_time)
+            return env
+
+        def run_branch(scenario, env):
+            scenario_parameters = {k: param.value for k, param in scenario.parameters.items()}
+            apply_live_parameters(scenario_parameters)
+            if branch_builder is not None:
+                branch_builder(env, {**copy.deepcopy(self.global_parameters), **scenario_parameters})
+            env.run(until=steps)
+            return calculate_statistics(env)
+
+        previous_config = cfg.snapshot()
+        cfg.apply_overrides({'simulation': {'random_streams': True}} if self.common_random_numbers else None)
+        try:
+            for r in range(replications):
+                logging.info(f"Running replication {r + 1}/{replications} until the branch time {branch_time}")
+                if branches_forked:
+                    env = run_common(r)
+                    branch_results = fork_branches(
+                        [functools.partial(run_branch, scenario, env) for scenario in self.scenarios],
+                        processes or os.cpu_count() or 1)
+                else:
+                    branch_results = [run_branch(scenario, run_common(r)) for scenario in self.scenarios]
+
+                for scenario, statistics in zip(self.scenarios, branch_results):
+                    results[scenario.name].add(r, statistics)
+        finally:
+            cfg.activate(previous_config)
+
+        all_results = []
+        for scenario in self.scenarios:
+            summary = pd.DataFrame(results[scenario.name].summary(confidence)).set_index(['Type', 'Name', 'Stat'])
+            pivot_df = self._scenario_results(summary[sorted(summary.columns)], scenario)
+            pivot_df.attrs['branch_time'] = branch_time
+            all_results.append(pivot_df)
+            self.replication_data[scenario.name] = ReplicationDataView(results[scenario.name])
+
+        self.end_time = time.time()
+        self.results = pd.concat(all_results, ignore_index=True)
+        logging.info(f"Experiment '{self.name}' branched at {branch_time} completed in "
+                     f"{self.end_time - self.start_time:.2f} seconds")
+        return self.results
+
+    def _scenario_results(self, pivot_df: pd.DataFrame, scenario: Scenario) -> pd.DataFrame:
+        """
+        Add the scenario name and parameters to its results and store them in the scenario.
+
+        :param pivot_df: Pivot table of the scenario
+        :param scenario: Scenario of the results
+        :return: The results with scenario information
+        """
+        pivot_df['Scenario'] = scenario.name
+
+        # Add parameter values as columns
+        for param_name, param in scenario.parameters.items():
+            # Clean parameter name for column name
+            clean_name = param_name.replace('.', '_').replace(':', '_')
+            # Sequences, e.g. distributions with parameters, are one value per row
+            value = param.value
+            pivot_df[f'Param_{clean_name}'] = [value] * len(pivot_df) if isinstance(value, (tuple, list)) else value
+
+        # Store the results in the scenario
+        scenario.results = pivot_df
+        return pivot_df
+
     def filter_results(self, component_type: str = None, component_name: str = None, statistic: str = None) -> pd.DataFrame:
         """
         Filter results based on component type, name, and statistic using MultiIndex.
@@ -352,6 +460,54 @@ class ExperimentRunner:
             logging.warning(f"No data found for {component_type}.{component_name}.{statistic}")
             return pd.DataFrame()
 
+    def get_paired_difference(self, component_type: str, component_name: str, statistic: str,
+                              scenario_a: str, scenario_b: str, confidence: float = 0.95) -> Dict[str, float]:
+        """
+        Estimate the difference of a statistic between two scenarios from the paired replications.
+
+        Replication r of both scenarios uses the same seed, so the differences are paired. With common random
+        numbers the two replications are positively correlated and the confidence interval of the difference is
+        much narrower than that of independent runs.
+
+        :param component_type: Component type (e.g., 'Server')
+        :param component_name: Component name (e.g., 'ATM')
+        :param statistic: Statistic name (e.g., 'TimeInQueue (average)')
+        :param scenario_a: Name of the first scenario
+        :param scenario_b: Name of the second scenario
+        :param confidence: Confidence level of the half-width
+        :return: Dictionary with the average difference (a - b), its half-width and the number of pairs
+        """
+        replication_data = getattr(self, 'replication_data', {})
+        if scenario_a not in replication_data or scenario_b not in replication_data:
+            raise ValueError(f"No replication data for scenarios '{scenario_a}' and '{scenario_b}', "
+                             f"run them with store_replication_data=True.")
+
+        def replication_values(scenario_name):
+            values = []
+            for replication in replication_data[scenario_name]:
+                stats = replication[component_type]
+                if component_type == 'Entity':
+                    component_stats = stats
+                elif isinstance(stats, dict):
+                    component_stats = stats.get(component_name, {})
+                else:
+                    component_stats = next((s for s in stats if s.get(component_type) == component_name), {})
+                values.append(component_stats.get(statistic))
+            return values
+
+        differences = np.array([a - b for a, b in zip(replication_values(scenario_a), replication_values(scenario_b))
+                                if isinstance(a, (int, float)) and isinstance(b, (int, float))], dtype=float)
+        n = len(differences)
+        if n < 2:
+            raise ValueError(f"At least two paired replications are needed for {component_type}.{component_name}."
+                             f"{statistic}.")
+
+        std_dev = np.std(differences, ddof=1)
+        critical_value = norm.ppf((1 + confidence) / 2) if n > 30 else t.ppf((1 + confidence) / 2, df=n - 1)
+        return {'Average': float(np.mean(differences)),
+                'Half-Width': float(critical_value * std_dev / np.sqrt(n)),
+                'Replications': n}
+
     def get_comparison_data(self, component_type: str, component_name: str, statistic: str) -> pd.DataFrame:
         """
         Compare a specific statistic across all scenarios.
@@ -6,6 +6,9 @@ import functools
 import inspect
 import logging
 
+LIVE_ATTRIBUTES = ('time_between_machine_breakdowns', 'machine_breakdown_duration')
+"""Distributions besides the ``*_dwp`` attributes that the components read for every draw"""
+
 
 class ParameterizedModel:
     """
@@ -41,31 +44,7 @@ class ParameterizedModel:
         original_inits = {cls_name: cls.__init__ for cls_name, cls in component_classes.items()}
 
         # Parse parameters by component
-        component_params = {}
-        for param_key, value in self.parameters.items():
-            # Handle dot notation (component.param)
-            if '.' in param_key:
-                parts = param_key.split('.')
-                if len(parts) >= 2:
-                    component_name = parts[0]
-                    param_name = '.'.join(parts[1:])
-
-                    if component_name not in component_params:
-                        component_params[component_name] = {}
-                    component_params[component_name][param_name] = value
-
-            # Handle colon notation (component:param)
-            elif ':' in param_key:
-                component_name, param_name = param_key.split(':', 1)
-
-                if component_name not in component_params:
-                    component_params[component_name] = {}
-                component_params[component_name][param_name] = value
-
-            # Handle direct parameters (not related to components)
-            else:
-                # These stay in self.parameters for direct usage
-                pass
+        component_params = parse_component_parameters(self.parameters)
 
         try:
             # Patch the __init__ methods of all component classes
@@ -110,6 +89,79 @@ class ParameterizedModel:
                 cls.__init__ = original_inits[cls_name]
 
 
+def parse_component_parameters(parameters):
+    """
+    Group the component parameters of a scenario by component.
+
+    :param parameters: Dictionary of parameters, component parameters as 'component.param' or 'component:param'
+    :return: Dictionary of component names and their parameters, direct parameters are left out
+    """
+    component_params = {}
+    for param_key, value in parameters.items():
+        # Handle dot notation (component.param)
+        if '.' in param_key:
+            component_name, param_name = param_key.split('.', 1)
+            component_params.setdefault(component_name, {})[param_name] = value
+
+        # Handle colon notation (component:param)
+        elif ':' in param_key:
+            component_name, param_name = param_key.split(':', 1)
+            component_params.setdefault(component_name, {})[param_name] = value
+
+        # Direct parameters (not related to components) stay in the parameters for direct usage
+    return component_params
+
+
+def find_component(name):
+    """
+    Find a component of the running model by name.
+
+    :param name: Name of the component
+    :return: The component or None
+    """
+    from src.core.components.model import Model
+    from src.core.components.sink import Sink
+    from src.core.components.source import Source
+
+    component = Model().get_component_by_name(name)
+    if component is None:
+        # Sources and sinks aren't registered with the model
+        component = next((c for c in (*Source.sources, *Sink.sinks) if c.name == name), None)
+    return component
+
+
+def apply_live_parameters(parameters):
+    """
+    Change the component parameters of a scenario on the components of a running model.
+
+    The parameters are the constructor arguments of the components, e.g. 'Machine.processing_time_distribution_with_
+    parameters', and are set as attributes ('processing_time_dwp'). Only distributions can be changed, which the
+    components read for every draw (see ``LIVE_ATTRIBUTES``): they take effect from the next draw on. Parameters that
+    set up the model's structure, e.g. the capacity of a server sizes its SimPy resource when it is created, are
+    rejected. Such changes need a function that changes the model, the ``branch_builder`` of
+    ``ExperimentRunner.run_branched``.
+
+    :param parameters: Dictionary of parameters, component parameters as 'component.param' or 'component:param'
+    """
+    for component_name, component_params in parse_component_parameters(parameters).items():
+        component = find_component(component_name)
+        if component is None:
+            raise ValueError(f"Component '{component_name}' of the scenario parameters doesn't exist.")
+
+        for param_name, value in component_params.items():
+            attribute = param_name
+            if attribute not in vars(component) and param_name.endswith('_distribution_with_parameters'):
+                attribute = param_name[:-len('_distribution_with_parameters')] + '_dwp'
+            if attribute not in vars(component):
+                raise ValueError(f"Parameter '{param_name}' of {component_name} can't be changed while the model runs.")
+            # Breakdowns are only drawn by components that were created with them
+            if not (attribute.endswith('_dwp') or (attribute in LIVE_ATTRIBUTES and getattr(component, attribute))):
+                raise ValueError(f"Parameter '{param_name}' of {component_name} sets up the model and can't be changed "
+                                 f"while the model runs, change it with a branch_builder instead.")
+            setattr(component, attribute, value)
+            logging.info(f"Modified {component_name} with parameter {param_name}={value} at time {component.env.now}")
+
+
 def parameterize_model(model_func):
     """
     Decorator to make a model function accept parameters.
@@ -0,0 +1,665 @@
+import gc
+import heapq
+import itertools
+import logging
+import math
+import multiprocessing
+import os
+import random
+import signal
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import simpy
+from simpy.events import NORMAL, URGENT
+
+import src.core.global_imports as gi
+from src.core.components.entity import Entity, EntityManager
+from src.core.simulation.bucket_environment import BucketEnvironment, create_environment
+from src.core.simulation.tandem_engine import _plain_processing_component
+from src.core.simulation.warm_up_fork import fork_supported
+from src.core.types.componet_type import ComponentType
+from src.core.utils.random_streams import RandomStreams
+
+PARTITIONED_ENGINE = 'partitioned'
+
+STATISTICS_ATTRIBUTES = ('queue_lengths', 'queue_times', 'units_utilized_over_time', 'total_time_in_system',
+                         'entities_processed', 'number_exited', 'tally_statistic')
+"""Attributes besides the ``*_pivot_table`` counters that ``calculate_statistics`` reads from the components"""
+
+PARTITION_TYPES = (ComponentType.SOURCES, ComponentType.SERVERS, ComponentType.SINKS)
+
+MAX_INTERLEAVINGS = 120
+"""Orders of simultaneous entity destructions in different partitions that are tried for the same time in system sum"""
+
+
+class SimultaneousEvents(Exception):
+    """
+    Events of different partitions coincide and their order in the SimPy run can't be told, the model has to run with
+    SimPy to get its statistics.
+    """
+
+
+class PartitionedRun:
+    """
+    A model whose components split into groups that are only connected by connections with a process duration, e.g.
+    plant sections linked by conveyors or transports. Every partition of groups runs in its own forked process with
+    the SimPy event loop, the entities crossing a connection between partitions are sent as messages.
+
+    The processes advance in windows (conservative synchronization): an entity entering a cut connection at time t
+    arrives at t + d or later, so with the lookahead L, the shortest duration of a cut connection, no partition can
+    receive an entity before the earliest pending event of all partitions plus L. Every window runs the partitions
+    up to that time, then the parent process delivers the entities sent in the window.
+
+    Only plain probabilistic routing is supported, so a partition never waits on the state of another one, and the
+    components must draw from named random streams (config ``simulation.random_streams``), which don't depend on the
+    event order. The statistics are bitwise those of the SimPy run with named streams:
+
+    - SimPy orders simultaneous events by the order they were scheduled in. The partitions order their events by the
+      time they were scheduled at (see ``PartitionEnvironment``), and an arrival from another partition is ordered
+      by the time the connection scheduled its delivery at, as the connection's timeout in the SimPy run.
+    - The entity statistics are recomputed from the entities created and destroyed in all partitions, in the order
+      of the SimPy run, so the sums are rounded the same way.
+
+    When the order of simultaneous events isn't determined by these times (an arrival and an event of the receiving
+    partition scheduled at the same time, or entities destroyed at the same time in several partitions whose times in
+    system add up differently in another order), the run raises SimultaneousEvents internally and the model is run
+    with SimPy instead. Models with deterministic times can fall back like this, models with continuous distributions
+    practically never do.
+
+    The processes of a run are forked after the model is built, the platform needs ``os.fork``.
+    """
+
+    def __init__(self, partitions: List[list]):
+        """
+        :param partitions: Components of every partition
+        """
+        self.partitions = partitions
+        self.partition_of = {component.component_id: p for p, components in enumerate(partitions)
+                             for component in components}
+        self.cut_connections = [connection for components in partitions for component in components
+                                for connection in component.connections.values()
+                                if self.partition_of[connection.next_component.component_id]
+                                != self.partition_of[component.component_id]]
+        # Shortest process duration of the connections between partitions, infinite for independent partitions
+        self.lookahead = min((connection.process_duration for connection in self.cut_connections), default=math.inf)
+
+    def run(self, duration: float, scheduler: str) -> simpy.Environment:
+        """
+        Simulate the partitions until ``duration`` and record the statistics, or run the model with SimPy if the order
+        of simultaneous events of different partitions can't be told.
+
+        :param duration: Simulation duration
+        :param scheduler: Event scheduler of the environment that is returned
+        :return: An environment whose clock is at the end of the run
+        """
+        from src.core.components.model import Model
+
+        try:
+            results = self._run_partitions(duration)
+            entity_changes = _merge_entity_changes([changes for _, changes in results])
+        except SimultaneousEvents as e:
+            # The model of this process hasn't run yet
+            logging.info("%s, running the model with SimPy", e)
+            env = Model().env
+            env.run(until=duration)
+            return env
+
+        self._record(results, entity_changes)
+
+        # The clock of an empty environment is advanced to the end of the run, statistics read the time from it
+        env = create_environment(scheduler)
+        env.run(until=duration)
+        EntityManager.env = env
+        return env
+
+    def _run_partitions(self, duration: float) -> list:
+        """
+        Fork a process for every partition and synchronize them until ``duration``.
+
+        :param duration: Simulation duration
+        :return: Statistics of every partition
+        """
+        pipes = [multiprocessing.Pipe() for _ in self.partitions]
+        children = []
+        try:
+            for p in range(len(self.partitions)):
+                children.append(_fork_partition(self, p, duration, pipes))
+            for _, child_end in pipes:
+                child_end.close()
+            results = self._synchronize([parent_end for parent_end, _ in pipes], duration)
+        except BaseException:
+            for pid in children:
+                os.kill(pid, signal.SIGKILL)
+            raise
+        finally:
+            for parent_end, _ in pipes:
+                parent_end.close()
+            for pid in children:
+                os.waitpid(pid, 0)
+        return results
+
+    def _synchronize(self, pipes: list, duration: float) -> list:
+        """
+        Advance the partitions window by window and deliver the entities sent between them.
+
+        :param pipes: Connection to the process of every partition
+        :param duration: Simulation duration
+        :return: Statistics of every partition
+        """
+        # All processes of the model start at time 0
+        next_times = [0.0] * len(pipes)
+        incoming = [[] for _ in pipes]
+        while True:
+            next_event = min(min(next_times), min((message[0] for messages in incoming for message in messages),
+                                                  default=math.inf))
+            window_end = min(next_event + self.lookahead, duration)
+            for pipe, messages in zip(pipes, incoming):
+                pipe.send((window_end, messages))
+            if window_end >= duration:
+                return [_receive(pipe) for pipe in pipes]
+
+            incoming = [[] for _ in pipes]
+            for p, pipe in enumerate(pipes):
+                next_times[p], outgoing = _receive(pipe)
+                for message in outgoing:
+                    if message[0] < duration:
+                        next_component = self.cut_connections[message[2]].next_component
+                        incoming[self.partition_of[next_component.component_id]].append(message)
+
+    def _record(self, results: list, entity_changes: list) -> None:
+        """
+        Write the statistics of the partitions into the components and replay the entities created and destroyed on
+        the EntityManager.
+
+        :param results: Component statistics by component id and entity changes of every partition
+        :param entity_changes: Entity changes of all partitions in the order of the SimPy run
+        """
+        from src.core.components.model import Model
+
+        model = Model()
+        for component_statistics, _ in results:
+            for component_id, statistics in component_statistics.items():
+                component = model.get_component_by_id(component_id)
+                for name, value in statistics.items():
+                    setattr(component, name, value)
+
+        # Like add_entity and remove_entity, _update_time_weighted_sum reads the time of each change from the clock
+        clock = EntityManager.env = SimpleNamespace(now=0.0)
+        for time, created, creation_time, destruction_time in entity_changes:
+            clock.now = time
+            if created:
+                EntityManager._update_time_weighted_sum()
+                EntityManager.current_number_in_system += 1
+                if creation_time >= gi.DURATION_WARM_UP:
+                    EntityManager.number_created += 1
+                continue
+
+            if creation_time >= gi.DURATION_WARM_UP and destruction_time > gi.DURATION_WARM_UP:
+                time_in_system = destruction_time - creation_time
+                EntityManager.total_time_in_system += time_in_system
+                EntityManager.max_time_in_system = max(EntityManager.max_time_in_system, time_in_system)
+                EntityManager.min_time_in_system = min(EntityManager.min_time_in_system, time_in_system)
+                EntityManager.number_destroyed += 1
+            EntityManager._update_time_weighted_sum()
+            EntityManager.current_number_in_system -= 1
+
+
+class PartitionEnvironment(simpy.Environment):
+    """
+    Event loop of a partition. SimPy orders events of the same time and priority by a global event id, i.e. in the
+    order they were scheduled in. In a partition the events are ordered by the time they were scheduled at and then
+    by a local id, which is the same order for the events of the partition, but also places the events of other
+    partitions with the time they were scheduled at (see ``schedule_at``).
+
+    The events scheduled while the model was built keep their id, they are the same in all partitions.
+    """
+
+    def schedule(self, event: simpy.Event, priority: simpy.events.EventPriority = NORMAL, delay: float = 0) -> None:
+        heapq.heappush(self._queue, (self._now + delay, priority, (self._now, next(self._eid)), event))
+
+    def schedule_at(self, event: simpy.Event, time: float, priority: simpy.events.EventPriority, eid: tuple) -> None:
+        """
+        Schedule an event at a time with an id in the order of this environment.
+
+        :param event: The event
+        :param time: Time of the event
+        :param priority: Priority of the event at its time
+        :param eid: Tuple of the time the event counts as scheduled at and a further order at that time
+        """
+        heapq.heappush(self._queue, (time, priority, eid, event))
+
+    def step(self) -> None:
+        # Time, priority and id of the event that is processed
+        self.active = self._queue[0][:3] if self._queue else None
+        super().step()
+
+    def next_key(self) -> Optional[tuple]:
+        """
+        :return: Time, priority and id of the next event, None if there is none
+        """
+        return self._queue[0][:3] if self._queue else None
+
+    @classmethod
+    def take_over(cls, env: simpy.Environment, dropped: set) -> int:
+        """
+        Turn the environment of a model that was built but hasn't run into a PartitionEnvironment.
+
+        :param env: Environment with the standard event heap or a BucketEnvironment
+        :param dropped: Events of other partitions that are removed from the schedule
+        :return: The first id of the events scheduled from now on, the ids of the events scheduled while the model was
+                 built are lower
+        """
+        if isinstance(env, BucketEnvironment):
+            events = [(time, priority, event) for time in sorted(env._buckets)
+                      for priority, bucket in sorted(env._buckets[time].items()) for event in bucket]
+            queue = [(time, priority, eid, event) for eid, (time, priority, event) in enumerate(events)]
+            del env._times, env._buckets
+            env._eid = itertools.count(len(queue))
+        else:
+            queue = env._queue
+        first_eid = next(env._eid)
+
+        env.__class__ = cls
+        env._queue = [(time, priority, (env.now, eid), event) for time, priority, eid, event in queue
+                      if event not in dropped]
+        heapq.heapify(env._queue)
+        env.active = None
+        return first_eid
+
+
+class _Delivery(simpy.Event):
+    """
+    Event of an entity sent through a cut connection at its delivery time, scheduled like the connection's timeout in
+    the SimPy run.
+    """
+
+    def __init__(self, env: PartitionEnvironment, time: float, eid: tuple, callback):
+        """
+        :param env: Environment of the partition
+        :param time: Delivery time
+        :param eid: Id of the event, see ``_PartitionWorker.delivery_eid``
+        :param callback: Function called with the event
+        """
+        super().__init__(env)
+        # Triggered when it is created, like a Timeout
+        self._ok, self._value = True, None
+        self.callbacks.append(callback)
+        env.schedule_at(self, time, NORMAL, eid)
+
+
+class _Arrival(_Delivery):
+    """
+    Event of an entity sent by another partition arriving at the next component.
+    """
+
+
+class _PartitionWorker:
+    """
+    Runs one partition of a PartitionedRun on the model inherited from the parent process.
+    """
+
+    def __init__(self, run: PartitionedRun, partition: int, duration: float):
+        """
+        :param run: The partitioned run
+        :param partition: Number of the partition
+        :param duration: Simulation duration
+        """
+        from src.core.components.model import Model
+
+        self.run = run
+        self.duration = duration
+        self.components = run.partitions[partition]
+        self.outgoing = []
+        self.entity_changes = []
+        self._last_delivery = {}
+
+        # The processes of the other partitions' components never start here
+        local = {component.component_id for component in self.components}
+        dropped = {process.target for components in run.partitions if components is not self.components
+                   for component in components
+                   for process in (component.action, *(c.action for c in component.connections.values()))}
+        self.env = Model().env
+        self.first_eid = PartitionEnvironment.take_over(self.env, dropped)
+
+        for index, connection in enumerate(run.cut_connections):
+            if connection.origin_component.component_id in local:
+                connection.handle_entity_arrival = self._sender(index)
+
+        # The entities created and destroyed are replayed in the parent process
+        add_entity, remove_entity = EntityManager.add_entity, EntityManager.remove_entity
+
+        def logged_add_entity(entity: Entity) -> None:
+            self.entity_changes.append((self.env.active, True, entity.creation_time, None))
+            add_entity(entity)
+
+        def logged_remove_entity(entity: Entity) -> None:
+            self.entity_changes.append((self.env.active, False, entity.creation_time, entity.destruction_time))
+            remove_entity(entity)
+
+        EntityManager.add_entity, EntityManager.remove_entity = logged_add_entity, logged_remove_entity
+
+    def delivery_eid(self, start: float, index: int) -> tuple:
+        """
+        Id of the events at the delivery of an entity that entered a cut connection.
+
+        In the SimPy run the connection schedules the delivery when the entity starts through it, after the events
+        scheduled while the model was built. Its order among the other events scheduled at that time isn't known, the
+        arrival checks whether there are such events (see ``_take_over``).
+
+        :param start: Time the entity starts through the connection
+        :param index: Index of the cut connection
+        :return: Id of the events
+        """
+        return start, self.first_eid - 0.5, index
+
+    def _sender(self, index: int):
+        def send(entity: Entity):
+            self._send(index, entity)
+        return send
+
+    def _send(self, index: int, entity: Entity) -> None:
+        """
+        Send an entity entering a cut connection to the partition of the next component. The connection delivers its
+        entities one after the other in FIFO order, as its SimPy process does.
+
+        :param index: Index of the cut connection
+        :param entity: The entity
+        """
+        connection = self.run.cut_connections[index]
+        now = self.env.now
+        start = max(now, self._last_delivery.get(index, now))
+        delivery = self._last_delivery[index] = start + connection.process_duration
+        if start < self.duration:
+            connection.number_entered += 1
+
+        state = dict(vars(entity), current_location=None, destination=None)
+        self.outgoing.append((delivery, start, index, state))
+
+        # The entity stays in this partition's count until the other one takes it over
+        _Delivery(self.env, delivery, self.delivery_eid(start, index), lambda _: _hand_over(connection, entity))
+
+    def receive(self, messages: list) -> None:
+        """
+        Schedule the arrival of the entities sent to the partition at their delivery times.
+
+        :param messages: Delivery time, start time, index of the cut connection and attributes of every entity
+        """
+        for delivery, start, index, state in messages:
+            _Arrival(self.env, delivery, self.delivery_eid(start, index),
+                     lambda event, c=self.run.cut_connections[index].next_component, s=state: self._take_over(event, c, s))
+
+    def _take_over(self, arrival: _Arrival, component, state: Dict) -> None:
+        """
+        Let an entity sent by another partition arrive at the next component.
+
+        :raises SimultaneousEvents: If an event of this partition or another arrival was scheduled at the same time as
+                                    the arrival for the same time, their order in the SimPy run isn't known
+        """
+        time, priority, (start, *_) = self.env.active
+        next_key = self.env.next_key()
+        if next_key is not None and next_key[:2] == (time, priority) and next_key[2][0] == start and (
+                next_key[2][1] >= self.first_eid or isinstance(self.env._queue[0][3], _Arrival)):
+            raise SimultaneousEvents(f"Entities arrive at {component.name} and other events happen at {time}, both "
+                                     f"scheduled at {start}")
+        _take_over(component, state)
+
+    def run_until(self, time: float) -> None:
+        """
+        Process all events before ``time``.
+
+        :param time: End of the window
+        """
+        # Like Environment.run(until=time), with the stop event before all events at time
+        stop = simpy.Event(self.env)
+        stop._ok, stop._value = True, None
+        self.env.schedule_at(stop, time, URGENT, (-math.inf,))
+        self.env.run(until=stop)
+
+    def take_outgoing(self) -> list:
+        """
+        :return: Entities sent since the last call
+        """
+        outgoing, self.outgoing = self.outgoing, []
+        return outgoing
+
+    def statistics(self) -> tuple:
+        """
+        :return: Statistics of the partition's components by component id and the entities created and destroyed
+                 (see ``_merge_entity_changes``)
+        """
+        component_statistics = {
+            component.component_id: {name: value for name, value in vars(component).items()
+                                     if name.endswith('_pivot_table') or name in STATISTICS_ATTRIBUTES}
+            for component in self.components}
+        # Events scheduled after the model was built can only be ordered by the time they were scheduled at across
+        # partitions
+        entity_changes = [((time, priority, eid[0], eid[1] if len(eid) == 2 and eid[1] < self.first_eid else math.inf),
+                           *change) for (time, priority, eid), *change in self.entity_changes]
+        return component_statistics, entity_changes
+
+
+def _fork_partition(run: PartitionedRun, partition: int, duration: float, pipes: list) -> int:
+    """
+    :param run: The partitioned run
+    :param partition: Number of the partition
+    :param duration: Simulation duration
+    :param pipes: Pipes of all partitions, the child keeps only its own end of its pipe
+    :return: Process id of the child
+    """
+    # The random module reseeds itself in a forked child, the child continues the parent's random numbers instead
+    random_state = random.getstate()
+    pid = os.fork()
+    if pid:
+        return pid
+
+    pipe = pipes[partition][1]
+    try:
+        for p, (parent_end, child_end) in enumerate(pipes):
+            parent_end.close()
+            if p != partition:
+                child_end.close()
+        random.setstate(random_state)
+        # Pages inherited from the parent stay shared, the garbage collector doesn't touch (and copy) them
+        gc.freeze()
+        _run_partition(run, partition, duration, pipe)
+    except BaseException as e:
+        try:
+            pipe.send((False, e))
+        except Exception:
+            pipe.send((False, RuntimeError(f"Partition {partition} failed: {e!r}")))
+    finally:
+        os._exit(0)
+
+
+def _run_partition(run: PartitionedRun, partition: int, duration: float, pipe) -> None:
+    worker = _PartitionWorker(run, partition, duration)
+    while True:
+        window_end, messages = pipe.recv()
+        worker.receive(messages)
+        worker.run_until(window_end)
+        if window_end >= duration:
+            pipe.send((True, worker.statistics()))
+            return
+        pipe.send((True, (worker.env.peek(), worker.take_outgoing())))
+
+
+def _receive(pipe):
+    """
+    :return: The reply of a partition, exceptions of the partition are raised
+    """
+    ok, value = pipe.recv()
+    if not ok:
+        raise value
+    return value
+
+
+def _hand_over(connection, entity: Entity) -> None:
+    """
+    Remove an entity that left through a cut connection from the entities in the system of the sending partition.
+    """
+    EntityManager._update_time_weighted_sum()
+    EntityManager.entities.remove(entity)
+    EntityManager.current_number_in_system -= 1
+    EntityManager._update_type_weighted_sum(entity.entity_type)
+    EntityManager.entity_type_count[entity.entity_type] -= 1
+    connection.entities_processed += 1
+    connection.origin_component.number_exited += 1
+
+
+def _take_over(component, state: Dict) -> None:
+    """
+    Recreate an entity sent by another partition and let it arrive at the next component, it counts as in the system
+    but not as created.
+    """
+    entity = object.__new__(Entity)
+    entity.__dict__.update(state)
+    EntityManager._update_time_weighted_sum()
+    EntityManager.entities.append(entity)
+    EntityManager.current_number_in_system += 1
+    EntityManager.initialize_entity_types(entity)
+    component.handle_entity_arrival(entity)
+
+
+def _merge_entity_changes(partition_changes: List[list]) -> list:
+    """
+    Merge the entities created and destroyed in the partitions into the order of the SimPy run.
+
+    The changes are ordered by the time, priority and id of their event in the SimPy run, as far as the partitions
+    know it: changes of events that were scheduled at the same time after the model was built keep the order of their
+    partition, but their order across partitions is unknown. Only the time in system sum depends on it, so such
+    changes are accepted if every interleaving of the partitions gives the same sum.
+
+    :param partition_changes: Order key, whether the entity was created, creation and destruction time of every change
+                              of every partition
+    :return: Time, whether the entity was created, creation and destruction time of every change
+    :raises SimultaneousEvents: If the time in system sum depends on the unknown order
+    """
+    changes = sorted((key, p, i, change) for p, partition in enumerate(partition_changes)
+                     for i, (key, *change) in enumerate(partition))
+    total_time_in_system = 0.0
+    for key, group in itertools.groupby(changes, key=lambda change: change[0]):
+        group = list(group)
+        # Times in system of the counted entities destroyed by every partition
+        times = {}
+        for _, p, _, (created, creation_time, destruction_time) in group:
+            if not created and creation_time >= gi.DURATION_WARM_UP and destruction_time > gi.DURATION_WARM_UP:
+                times.setdefault(p, []).append(destruction_time - creation_time)
+
+        if key[3] == math.inf and len(times) > 1:
+            interleavings = list(itertools.islice(_interleavings(list(times.values())), MAX_INTERLEAVINGS + 1))
+            sums = {sum(interleaving, total_time_in_system) for interleaving in interleavings}
+            if len(sums) > 1 or len(interleavings) > MAX_INTERLEAVINGS:
+                raise SimultaneousEvents(f"Entities are destroyed in {len(times)} partitions at {key[0]}")
+        total_time_in_system = sum((t for ts in times.values() for t in ts), total_time_in_system)
+    return [(key[0], *change) for key, _, _, change in changes]
+
+
+def _interleavings(sequences: List[list]):
+    """
+    :return: Every merge of the sequences that keeps the order of each one
+    """
+    if sum(map(len, sequences)) == 0:
+        yield []
+        return
+    for s, sequence in enumerate(sequences):
+        if sequence:
+            for rest in _interleavings(sequences[:s] + [sequence[1:]] + sequences[s + 1:]):
+                yield [sequence[0]] + rest
+
+
+def find_partitioned_run(model, processes: int) -> Optional[PartitionedRun]:
+    """
+    Check whether a built model can be split into partitions that run in parallel processes.
+
+    :param model: The model after the model function built its components
+    :param processes: Maximum number of partitions (config ``simulation.partitions``)
+    :return: The partitioned run, or None if the model needs the SimPy engine
+    """
+    reason = _unsupported_model(model)
+    if reason is None:
+        partitions = []
+        reason = _partition(model, processes, partitions)
+        if reason is None:
+            return PartitionedRun(partitions)
+
+    logging.debug("Model can't be partitioned (%s), running it with SimPy", reason)
+    return None
+
+
+def _unsupported_model(model) -> Optional[str]:
+    """
+    :return: Why the model's components don't qualify, or None
+    """
+    if not fork_supported():
+        return "the platform can't fork"
+    if not (RandomStreams.named or RandomStreams.antithetic):
+        return "no named random streams"
+    if gi.COLLECT_ENTITY_TYPE_STATS:
+        return "entity type statistics"
+    if model.worker_pools:
+        return "worker pools"
+    if model.state_variables or model.tally_statistics:
+        return "state variables or tally statistics"
+    for component_type in (ComponentType.VEHICLES, ComponentType.COMBINER, ComponentType.SEPARATORS,
+                           ComponentType.STORAGE):
+        if len(model.get_component(component_type)):
+            return f"{component_type.value.lower()}"
+
+    for source in model.get_component(ComponentType.SOURCES):
+        if (source.entity_class is not Entity or source.entity_type != "Default" or source.vehicle_group
+                or source.routing_expression or source.sequence_routing or source.before_creation_trigger
+                or source.after_creation_trigger):
+            return f"source {source.name} routes or creates entities with custom logic"
+
+    for server in model.get_component(ComponentType.SERVERS):
+        if server.oven or not _plain_processing_component(server):
+            return f"server {server.name} routes or processes entities with custom logic"
+
+    for sink in model.get_component(ComponentType.SINKS):
+        if (sink.addon_processing_done_method_with_parameters or sink.source is not None
+                or type(sink).store_processed_entities or not _plain_processing_component(sink)):
+            return f"sink {sink.name} processes entities with custom logic"
+
+    for component_type in PARTITION_TYPES:
+        for component in model.get_component(component_type):
+            for connection in component.connections.values():
+                if connection.vehicle is not None or connection.entity_type is not None:
+                    return f"connection {connection.name} has a vehicle or entity type"
+    return None
+
+
+def _partition(model, processes: int, partitions: List[list]) -> Optional[str]:
+    """
+    Group the components that are connected without a process duration and distribute the groups to the partitions,
+    the largest groups first.
+
+    :return: Why the model can't be partitioned, or None
+    """
+    components = [component for component_type in PARTITION_TYPES for component in model.get_component(component_type)]
+    group_of = {component.component_id: component.component_id for component in components}
+
+    def find(component_id):
+        while group_of[component_id] != component_id:
+            group_of[component_id] = group_of[group_of[component_id]]
+            component_id = group_of[component_id]
+        return component_id
+
+    for component in components:
+        for connection in component.connections.values():
+            if connection.next_component.component_id not in group_of:
+                return f"connection {connection.name} leads to an unsupported component"
+            if not connection.process_duration:
+                group_of[find(component.component_id)] = find(connection.next_component.component_id)
+
+    groups = {}
+    for component in components:
+        groups.setdefault(find(component.component_id), []).append(component)
+    processes = min(processes, len(groups))
+    if processes < 2:
+        return "no groups of components connected by connections with a process duration"
+
+    partitions.extend([] for _ in range(processes))
+    for group in sorted(groups.values(), key=len, reverse=True):
+        min(partitions, key=len).extend(group)
+    return None
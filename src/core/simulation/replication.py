@@ -1,23 +1,24 @@
+import logging
 import time
-import pandas as pd
-import concurrent.futures
-from typing import Dict
-import numpy as np
-from scipy.stats import norm, t
 import src.core.global_imports as gi
 import src.core.config as cfg
 
 from src.core.components.model import Model
 from src.core.global_imports import Stats
-from src.core.statistics.stats import calculate_statistics, calculate_all_stats
+from src.core.statistics.antithetic import AntitheticPairs, antithetic_seed, is_complement
+from src.core.statistics.control_variates import ControlVariates
+from src.core.statistics.precision import PrecisionTargets
+from src.core.statistics.results_cube import ReplicationDataView, ResultsCube
+from src.core.statistics.shared_results import SHARED_RESULT_ROWS, SharedReplicationResults
+from src.core.statistics.stats import REPLICATION_STAT_NAMES, calculate_statistics
+from src.core.simulation.replication_pool import ReplicationPool
+from src.core.simulation.warm_up_fork import (WARM_UP_FORK_CAVEAT, fork_supported, run_forked_replications,
+                                              warm_up_groups, warm_up_seed)
+from src.core.utils.logging_utils import set_replication
+from src.core.utils.random_streams import RandomStreams
 from src.core.utils.utils import print_stats
 from src.core.statistics.entity_type_stats import collect_all_entity_type_stats
 
-from database.base.models import run_replications_table
-from database.base.database_config import drop_table, initialize_table
-from database.replication.replication_db import store_run_replication, create_pivot_run_replication
-from database.replication.replication_entity_types_db import create_table_entity_types_replication
-
 
 class ReplicationRunner:
     """
@@ -26,7 +27,9 @@ class ReplicationRunner:
 
     def __init__(self, model, steps, num_replications, warm_up=None, multiprocessing=False, confidence=0.95,
                  enable_detailed_replication_data=True, config_overrides=None, show_progress=False,
-                 skip_statistics=False):
+                 skip_statistics=False, max_workers=None, max_tasks_per_worker=None, keep_pool=False,
+                 half_width_targets=None, max_replications=None, replications_per_warm_up=None, antithetic=False,
+                 control_variates=None):
         """
         :param model: Callable simulation model function.
         :param steps: Run duration per replication.
@@ -39,6 +42,25 @@ class ReplicationRunner:
         :param config_overrides: Config to apply in each subprocess.
         :param show_progress: Whether to display a progress bar during each replication.
         :param skip_statistics: Whether to skip framework statistics collection (faster for custom stats).
+        :param max_workers: Number of worker processes for parallel execution (default: number of CPUs).
+        :param max_tasks_per_worker: Chunks of replications a worker process runs before it is replaced
+                                     (default: config ``multiprocessing.max_tasks_per_worker``).
+        :param keep_pool: Keep the worker processes for further calls of run, they are shut down by close.
+        :param half_width_targets: Relative and/or absolute half-widths of chosen statistics, see PrecisionTargets.
+                                   With targets, num_replications are run first and further replications are added
+                                   until every target is met or max_replications is reached.
+        :param max_replications: Cap of the replications with half_width_targets (default: 10 * num_replications).
+        :param replications_per_warm_up: Simulate the warm-up once per group of this many replications and fork the
+                                         replications from its end state (Linux), see WARM_UP_FORK_CAVEAT.
+                                         None simulates the warm-up of every replication.
+        :param antithetic: Run the replications in antithetic pairs: replications 2p and 2p + 1 use the same seed, the
+                           second one complements every uniform U to 1 - U. The half-widths are computed from the pair
+                           means, the variance reduction of the pairing is reported with them (see AntitheticPairs).
+                           Needs an even number of replications.
+        :param control_variates: Known means of control statistics by (type, name, statistic), e.g.
+                                 ``{('Server', 'Machine', 'TimeProcessing (average)'): 3.0}``. The averages and
+                                 half-widths of the other statistics are adjusted with control-variate estimators
+                                 (see ControlVariates).
         """
         self.model = model
         self.steps = steps
@@ -50,21 +72,40 @@ class ReplicationRunner:
         self.config_overrides = config_overrides
         self.show_progress = show_progress
         self.skip_statistics = skip_statistics
-        self.all_entity_stats = []
-        self.all_server_stats = {}
-        self.all_sink_stats = {}
-        self.all_source_stats = {}
-        self.all_vehicle_stats = {}
-        self.all_storage_stats = {}
-        self.all_separator_stats = {}
-        self.all_combiner_stats = {}
+        self.max_workers = max_workers
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.keep_pool = keep_pool
+        self.precision_targets = PrecisionTargets(half_width_targets) if half_width_targets else None
+        self.max_replications = max(max_replications or 10 * num_replications, num_replications)
+        if self.precision_targets is not None and (num_replications < 2 or skip_statistics):
+            raise ValueError("Half-width targets need statistics of at least 2 initial replications.")
+        # Achieved precision of the targets after a run
+        self.precision_report = None
+
+        if replications_per_warm_up is not None:
+            if not warm_up or replications_per_warm_up < 1:
+                raise ValueError("Forking after the warm-up needs a warm-up and at least 1 replication per warm-up.")
+            if not fork_supported():
+                logging.warning("Forking after the warm-up is not supported on this platform, every replication "
+                                "simulates its own warm-up.")
+                replications_per_warm_up = None
+        self.replications_per_warm_up = replications_per_warm_up
+
+        if antithetic and (num_replications % 2 or half_width_targets or replications_per_warm_up):
+            raise ValueError("Antithetic pairs need an even number of replications and can't be combined with "
+                             "half-width targets or forking after the warm-up.")
+        self.antithetic = antithetic
+
+        if control_variates and (antithetic or half_width_targets or skip_statistics):
+            raise ValueError("Control variates need the statistics of independent replications and can't be "
+                             "combined with antithetic pairs or half-width targets.")
+        self.control_variates = control_variates
+        self.pool = None
+        # Component statistics of multiprocessing runs with config multiprocessing.shared_memory_results
+        self.shared_results = None
         self.start_time = time.time()
 
-        self.all_entity_type_stats_df = pd.DataFrame()
-        self.all_tally_stats: Dict[str, Dict[str, list[float]]] = {}
-
-        # Only initialize detailed_replication_data if enabled
-        self.detailed_replication_data = [] if enable_detailed_replication_data else None
+        self._reset_results()
 
     def run(self, store_pivot_in_file: str = None, new_database: bool = True):
         """
@@ -76,69 +117,59 @@ class ReplicationRunner:
         # Set random seed for test reproducibility
         gi.set_random_seed(cfg.random_seed)
 
-        Stats.all_detailed_stats = []
-
-        # Only reset detailed data if it's enabled
-        if self.enable_detailed_replication_data:
-            self.detailed_replication_data = []
+        self._reset_results()
+        Stats.all_detailed_stats = self.detailed_replication_data if self.enable_detailed_replication_data else []
 
-        tenth_percentage = int(self.num_replications / 10) or 1
+        max_replications = self.max_replications if self.precision_targets is not None else self.num_replications
 
         if self.multiprocessing:
-            with concurrent.futures.ProcessPoolExecutor() as executor:
-                futures = [
-                    executor.submit(self._run_single_replication, r)
-                    for r in range(self.num_replications)
-                ]
-                for r, future in enumerate(concurrent.futures.as_completed(futures)):
-                    if not self.skip_statistics:
-                        entity_stats, server_stats, sink_stats, source_stats, vehicle_stats, storage_stats, separator_stats, combiner_stats, entity_type_data, tally_stats = future.result()
-                        self._process_results(entity_stats, server_stats, sink_stats, source_stats, vehicle_stats, storage_stats, combiner_stats, separator_stats, entity_type_data, tally_stats)
-                    print_stats(r, self.num_replications, self.start_time, tenth_percentage)
-        else:
-            for r in range(self.num_replications):
-                results = self._run_single_replication(r)
-                if not self.skip_statistics:
-                    (entity_stats, server_stats, sink_stats, source_stats,
-                     vehicle_stats, storage_stats, separator_stats, combiner_stats, entity_type_data, tally_stats) = results
-                    self._process_results(
-                        entity_stats, server_stats, sink_stats, source_stats,
-                        vehicle_stats, storage_stats, separator_stats, combiner_stats,
-                        entity_type_data=entity_type_data,
-                        tally_stats=tally_stats
-                    )
-                print_stats(r, self.num_replications, self.start_time, tenth_percentage)
+            if self.pool is None:
+                self.pool = ReplicationPool(self.worker_copy(), self.max_workers, self.max_tasks_per_worker
+                                            or cfg.max_tasks_per_worker, cfg.chunk_duration,
+                                            chunk_multiple=self.replications_per_warm_up or 1)
+            if cfg.shared_memory_results and not self.skip_statistics:
+                self.shared_results = self._create_shared_results(min(max_replications, SHARED_RESULT_ROWS))
+                # The rows of the shared results are the first columns of the cube
+                self.results.add_columns(self.shared_results.columns)
+
+        try:
+            # Sequential replications: more batches are run until the half-widths meet their targets
+            run_replications = 0
+            batch_end = self.num_replications
+            while batch_end > run_replications:
+                self._run_batch(range(run_replications, batch_end))
+                run_replications = batch_end
+                if self.precision_targets is None:
+                    break
+                required = self.precision_targets.required_replications(self.results, self.confidence)
+                batch_end = min(required or 0, max_replications)
+        except BaseException:
+            self.close(terminate=True)
+            self._release_shared_results()
+            raise
+        if self.multiprocessing and not self.keep_pool:
+            self.close()
+        set_replication(None)
 
         # Skip statistics aggregation if requested
         if self.skip_statistics:
             return None
 
-        combined_stats = calculate_all_stats(
-            self.all_entity_stats, self.all_server_stats, self.all_sink_stats,
-            self.all_source_stats, self.all_vehicle_stats, self.all_storage_stats,
-            self.all_separator_stats, self.all_combiner_stats,
-            ['NumberCreated', 'NumberDestroyed', 'NumberInSystem (average)', 'NumberRemaining', 'TimeInSystem (average)', 'TimeInSystem (max)', 'TimeInSystem (min)'],
-            ['EntitiesInQueue (average)', 'EntitiesInQueue (max)', 'EntitiesInQueue (total)', 'EntitiesProcessed', 'NumberDowntimes',
-             'ScheduledUtilization', 'StarvingTime (scheduled)', 'StarvingTime (total)', 'TimeInQueue (average)', 'TimeInQueue (max)',
-             'TimeProcessing (average)', 'TimeProcessing (total)', 'TotalDowntime', 'UnitsUtilized'],
-            ['NumTimesProcessed (average)', 'NumTimesProcessed (max)', 'NumTimesProcessed (min)', 'NumberEntered', 'TimeInSystem (average)', 'TimeInSystem (max)', 'TimeInSystem (min)'],
-            ['NumberCreated', 'NumberExited'],
-            ['EntitiesInQueue (average)', 'EntitiesInQueue (max)', 'EntitiesInQueue (total)', 'EntitiesTransported', 'NumberDowntimes', 'ScheduledUtilization', 'StarvingTime (scheduled)', 'StarvingTime (total)',
-             'TimeInQueue (average)', 'TimeInQueue (max)', 'TotalDowntimes', 'TotalTrips', 'TravelTime (average)', 'TravelTime (total)', 'UnitsUtilized'],
-            ['EntitiesInQueue (average)', 'EntitiesInQueue (max)', 'EntitiesInQueue (total)', 'EntitiesProcessed',
-             'ScheduledUtilization', 'StarvingTime (scheduled)', 'StarvingTime (total)', 'TimeInQueue (average)', 'TimeInQueue (max)', 'TimeProcessing (average)', 'TimeProcessing (total)', 'UnitsUtilized'],
-            ['EntitiesInQueue (average)', 'EntitiesInQueue (max)', 'EntitiesInQueue (total)', 'EntitiesProcessed', 'NumberDowntimes',
-             'ScheduledUtilization', 'StarvingTime (scheduled)', 'StarvingTime (total)', 'TimeInQueue (average)', 'TimeInQueue (max)',
-             'TimeProcessing (average)', 'TimeProcessing (total)', 'TotalDowntime', 'UnitsUtilized'],
-            ['EntitiesInQueue (total)', 'EntitiesProcessed', 'NumberDowntimes', 'MembersEntered', 'MembersInQueue (average)', 'MembersInQueue (max)',
-             'Members TimeInQueue (average)', 'Members TimeInQueue (max)', 'ParentsEntered', 'ParentsInQueue (average)', 'ParentsInQueue (max)', 'Parents TimeInQueue (average)',
-             'Parents TimeInQueue (max)', 'ScheduledUtilization', 'StarvingTime (scheduled)', 'StarvingTime (total)', 'TimeProcessing (average)', 'TimeProcessing (total)',
-             'TotalDowntime', 'UnitsUtilized'],
-            self.confidence
-        )
-
-        # add tally_stats
-        combined_stats.extend(self.aggregate_tally_stats())
+        self._release_shared_results()
+        if self.antithetic:
+            combined_stats = self.antithetic_pairs.summary(self.results, self.confidence)
+        elif self.control_estimator is not None:
+            combined_stats = self.control_estimator.summary(self.results, self.confidence)
+        else:
+            combined_stats = self.results.summary(self.confidence)
+        if self.precision_targets is not None:
+            self._report_precision()
+
+        # The database layer (peewee, pandas, tabulate) is only imported when results are stored
+        from database.base.models import run_replications_table
+        from database.base.database_config import drop_table, initialize_table
+        from database.replication.replication_db import store_run_replication, create_pivot_run_replication
+        from database.replication.replication_entity_types_db import create_table_entity_types_replication
 
         if new_database:
             drop_table(run_replications_table)
@@ -147,32 +178,192 @@ class ReplicationRunner:
         store_run_replication(combined_stats)
 
         if gi.COLLECT_ENTITY_TYPE_STATS:
-            entity_type_table = create_table_entity_types_replication(etype_df=self.all_entity_type_stats_df)
+            pd = gi.import_pandas()
+            etype_df = pd.DataFrame()
+            if self.all_entity_type_stats:
+                etype_df = pd.concat([pd.DataFrame(data) for data in self.all_entity_type_stats], ignore_index=True)
+            entity_type_table = create_table_entity_types_replication(etype_df=etype_df)
             gi.set_collect_entity_type_stats(False)
             return entity_type_table
 
         combined_pivot_table = create_pivot_run_replication()
+        if self.precision_report is not None:
+            combined_pivot_table.attrs['precision'] = self.precision_report
+        if self.replications_per_warm_up:
+            combined_pivot_table.attrs['warm_up_fork'] = self.warm_up_fork_metadata()
+        if self.antithetic or self.control_estimator is not None:
+            # Variance reduction next to the half-widths of the pair means or the adjusted averages
+            reduction = {(row['Type'], row['Name'], row['Stat']): row['Variance Reduction'] for row in combined_stats}
+            combined_pivot_table['Variance Reduction'] = [reduction.get(index) for index in combined_pivot_table.index]
+        if self.antithetic:
+            combined_pivot_table.attrs['antithetic'] = {'pairs': self.antithetic_pairs.pairs,
+                                                        'variance_reduction': reduction}
+        if self.control_estimator is not None:
+            combined_pivot_table.attrs['control_variates'] = {
+                **self.control_estimator.metadata(self.results, self.confidence), 'variance_reduction': reduction}
 
         if store_pivot_in_file:
             combined_pivot_table.to_csv(store_pivot_in_file)
 
         return combined_pivot_table
 
-    def _run_single_replication(self, replication_number):
+    def _run_batch(self, replication_numbers: range):
         """
-        Run a single replication and return statistics.
+        Run replications and add their results, in the worker processes with multiprocessing.
         """
-        if self.config_overrides is not None:
-            cfg.apply_overrides(self.config_overrides)
+        tenth_percentage = int(len(replication_numbers) / 10) or 1
+        if self.multiprocessing:
+            # Results are processed in replication order, so replication r of different runs can be paired
+            replication_results = self.pool.run(replication_numbers, self.shared_results)
+        elif self.replications_per_warm_up:
+            replication_results = ((r, result) for group in warm_up_groups(replication_numbers,
+                                                                           self.replications_per_warm_up)
+                                   for r, result in zip(group, self._run_replications(group)))
+        else:
+            replication_results = ((r, self._run_single_replication(r)) for r in replication_numbers)
 
-        env = Model().run_simulation(
-            model_func=self.model,
-            duration=self.steps,
-            seed=replication_number,
-            warm_up=self.warm_up,
-            show_progress=self.show_progress
-        )
+        for r, results in replication_results:
+            if not self.skip_statistics:
+                self._process_results(r, results)
+            print_stats(r - replication_numbers.start, len(replication_numbers), self.start_time, tenth_percentage)
 
+    def _report_precision(self):
+        """
+        Log the achieved half-widths of the targets, a warning for targets not met within max_replications.
+        """
+        self.precision_report = self.precision_targets.report(self.results, self.confidence)
+        for row in self.precision_report:
+            message = (f"{row['Type']} {row['Name']} {row['Stat']}: average {row['Average']:.4f}, half-width "
+                       f"{row['Half-Width']:.4f} (target {row['Target']:.4f}) after {row['Replications']} replications")
+            if row['Met']:
+                logging.info(message)
+            else:
+                logging.warning(f"Half-width target not met within {self.max_replications} replications, {message}")
+
+    def close(self, terminate: bool = False):
+        """
+        Shut down the worker processes of multiprocessing runs.
+
+        :param terminate: Stop the workers immediately instead of letting them finish their replications
+        """
+        if self.pool is not None:
+            self.pool.close(terminate)
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(terminate=exc_type is not None)
+
+    def warm_up_fork_metadata(self) -> dict:
+        """
+        :return: Warm-up groups of the last run and the statistical caveat of forking after the warm-up
+        """
+        return {'replications_per_warm_up': self.replications_per_warm_up,
+                'warm_up_groups': len({r // self.replications_per_warm_up for r in self.results.replications}),
+                'warm_up': self.warm_up,
+                'seeds': f"the warm-up of group g is seeded with {warm_up_seed(0)!r} for g = 0 etc., replication r "
+                         f"(group r // {self.replications_per_warm_up}) is reseeded with r at the fork",
+                'caveat': WARM_UP_FORK_CAVEAT}
+
+    def worker_copy(self) -> "ReplicationRunner":
+        """
+        :return: Runner with the settings of this one but without results, sent to each worker process once
+        """
+        return ReplicationRunner(self.model, self.steps, 0, self.warm_up, confidence=self.confidence,
+                                 enable_detailed_replication_data=False, config_overrides=self.config_overrides,
+                                 show_progress=self.show_progress, skip_statistics=self.skip_statistics,
+                                 replications_per_warm_up=self.replications_per_warm_up, antithetic=self.antithetic)
+
+    def _create_shared_results(self, rows: int = SHARED_RESULT_ROWS) -> SharedReplicationResults:
+        """
+        :param rows: Rows of the shared memory block
+        :return: Shared memory block for the component statistics of all replications, built with the config overrides
+        """
+        previous_config = cfg.snapshot()
+        cfg.apply_overrides(self.config_overrides)
+        try:
+            return SharedReplicationResults.for_model(self.model, REPLICATION_STAT_NAMES, rows)
+        finally:
+            cfg.activate(previous_config)
+
+    def _release_shared_results(self):
+        if self.shared_results is not None:
+            self.shared_results.release()
+            self.shared_results = None
+
+    def _run_single_replication(self, replication_number):
+        """
+        Run a single replication with the config overrides and return statistics.
+        """
+        # The overrides only apply to this replication, the previous snapshot is restored afterwards
+        previous_config = cfg.snapshot()
+        cfg.apply_overrides(self.config_overrides)
+        try:
+            return self.simulate_replication(replication_number)
+        finally:
+            cfg.activate(previous_config)
+
+    def _run_replications(self, replication_numbers):
+        """
+        Run the replications of a warm-up group with the config overrides and return their statistics.
+        """
+        previous_config = cfg.snapshot()
+        cfg.apply_overrides(self.config_overrides)
+        try:
+            return list(self.simulate_replications(replication_numbers))
+        finally:
+            cfg.activate(previous_config)
+
+    def simulate_replications(self, replication_numbers):
+        """
+        Run replications with the active config, forked from a shared warm-up per group if enabled.
+
+        :return: Statistics of the replications, in order
+        """
+        if not self.replications_per_warm_up:
+            for r in replication_numbers:
+                yield self.simulate_replication(r)
+            return
+
+        for group in warm_up_groups(replication_numbers, self.replications_per_warm_up):
+            seed = warm_up_seed(group[0] // self.replications_per_warm_up)
+            set_replication(None)
+            env = Model().start_simulation(self.model, self.steps, seed=seed, warm_up=self.warm_up)
+            env.run(until=self.warm_up)
+            yield from run_forked_replications(env, self.steps, group, self._collect_results)
+
+    def simulate_replication(self, replication_number):
+        """
+        Run a single replication with the active config and return statistics.
+        """
+        set_replication(replication_number)
+        seed = replication_number
+        if self.antithetic:
+            seed = antithetic_seed(replication_number)
+            RandomStreams.set_antithetic(True, is_complement(replication_number))
+        try:
+            env = Model().run_simulation(
+                model_func=self.model,
+                duration=self.steps,
+                seed=seed,
+                warm_up=self.warm_up,
+                show_progress=self.show_progress
+            )
+        finally:
+            if self.antithetic:
+                RandomStreams.set_antithetic(False)
+        try:
+            return self._collect_results(env)
+        finally:
+            # Reports the records of the replication the logging queue dropped
+            set_replication(None)
+
+    def _collect_results(self, env):
+        """
+        Statistics of a finished replication.
+        """
         # Skip statistics collection if requested
         if self.skip_statistics:
             return None, [], {}, {}, [], [], [], [], None, {}
@@ -187,104 +378,30 @@ class ReplicationRunner:
 
         return *calculate_statistics(env), entity_type_data, tally_stats
 
-    def _process_results(self, entity_stats, server_stats, sink_stats, source_stats, vehicle_stats, storage_stats, separator_stats,
-                         combiner_stats, entity_type_data=None, tally_stats=None):
+    def _reset_results(self):
+        """
+        Start new accumulators, the replications are only kept if detailed data is enabled.
         """
-        Update the overall accumulators with a replication's results.
+        self.results = ResultsCube(self.num_replications, keep_replications=self.enable_detailed_replication_data)
+        self.detailed_replication_data = ReplicationDataView(self.results) if self.enable_detailed_replication_data else None
+        self.antithetic_pairs = AntitheticPairs() if self.antithetic else None
+        self.control_estimator = ControlVariates(self.control_variates) if self.control_variates else None
+        self.all_entity_type_stats = []
+
+    def _process_results(self, replication_number, results):
         """
-        # Create replication data dictionary
-        replication_data = {
-            'Entity': entity_stats,
-            'Server': server_stats,
-            'Sink': sink_stats,
-            'Source': source_stats,
-            'Vehicle': vehicle_stats,
-            'Storage': storage_stats,
-            'Separator': separator_stats,
-            'Combiner': combiner_stats
-        }
-
-        # Only save detailed replication data if enabled
-        if self.enable_detailed_replication_data:
-            self.detailed_replication_data.append(replication_data)
-
-        # Process overall statistics (always needed for aggregation)
-        self.all_entity_stats.append(entity_stats)
-        for stat in server_stats:
-            server_name = stat['Server']
-            self.all_server_stats.setdefault(server_name, []).append(stat)
-        for sink_name, stat in sink_stats.items():
-            self.all_sink_stats.setdefault(sink_name, []).append(stat)
-        for source_name, stat in source_stats.items():
-            self.all_source_stats.setdefault(source_name, []).append(stat)
-        for stat in vehicle_stats:
-            vehicle_name = stat['Vehicle']
-            self.all_vehicle_stats.setdefault(vehicle_name, []).append(stat)
-        for stat in storage_stats:
-            storage_name = stat['Storage']
-            self.all_storage_stats.setdefault(storage_name, []).append(stat)
-        for stat in separator_stats:
-            separator_name = stat['Separator']
-            self.all_separator_stats.setdefault(separator_name, []).append(stat)
-        for stat in combiner_stats:
-            combiner_name = stat['Combiner']
-            self.all_combiner_stats.setdefault(combiner_name, []).append(stat)
-
-        Stats.all_detailed_stats.append({
-            'Entity': entity_stats,
-            'Server': server_stats,
-            'Sink': sink_stats,
-            'Source': source_stats,
-            'Vehicle': vehicle_stats,
-            'Storage': storage_stats,
-            'Separator': separator_stats,
-            'Combiner': combiner_stats
-        })
+        Add a replication's results to the accumulators.
+        """
+        statistics, (entity_type_data, tally_stats) = results[:8], results[8:]
+        if self.shared_results is not None:
+            values = self.results.add(replication_number, tally_stats=tally_stats,
+                                      row=self.shared_results.row(replication_number))
+        else:
+            values = self.results.add(replication_number, statistics, tally_stats)
+        if self.antithetic_pairs is not None:
+            self.antithetic_pairs.add(replication_number, values, self.results.columns)
+        if self.control_estimator is not None:
+            self.control_estimator.add(values, self.results.columns)
 
         if gi.COLLECT_ENTITY_TYPE_STATS and entity_type_data:
-            df = pd.DataFrame(entity_type_data)
-            self.all_entity_type_stats_df = pd.concat([self.all_entity_type_stats_df, df], ignore_index=True)
-
-        if tally_stats:
-            for key, values in tally_stats.items():
-                if key not in self.all_tally_stats:
-                    self.all_tally_stats[key] = {"min": [], "max": [], "avg": []}
-                self.all_tally_stats[key]["min"].append(values["min"])
-                self.all_tally_stats[key]["max"].append(values["max"])
-                self.all_tally_stats[key]["avg"].append(values["avg"])
-
-    def aggregate_tally_stats(self):
-        result = []
-        for name, series in self.all_tally_stats.items():
-            for metric in ["min", "max", "avg"]:
-                values = series[metric]
-                arr = np.array(values)
-                n = len(arr)
-
-                if n == 0:
-                    continue
-
-                min_val = float(np.min(arr))
-                max_val = float(np.max(arr))
-                mean_val = float(np.mean(arr))
-                std = float(np.std(arr, ddof=1)) if n > 1 else 0
-
-                # Half-width confidence interval
-                if n <= 1:
-                    hw = 0
-                elif n > 30:
-                    hw = norm.ppf((1 + self.confidence) / 2) * (std / np.sqrt(n))
-                else:
-                    hw = t.ppf((1 + self.confidence) / 2, df=n - 1) * (std / np.sqrt(n))
-
-                result.append({
-                    "Type": "Tally",
-                    "Name": name,
-                    "Stat": metric.capitalize(),
-                    "Average": round(mean_val, 4),
-                    "Minimum": round(min_val, 4),
-                    "Maximum": round(max_val, 4),
-                    "Half-Width": round(hw, 4)
-                })
-
-        return result
+            self.all_entity_type_stats.append(entity_type_data)
@@ -0,0 +1,169 @@
+import gc
+import math
+import multiprocessing
+import os
+import queue
+import time
+from multiprocessing import resource_tracker
+from typing import Iterable, Iterator, Optional, Tuple
+
+import src.core.config as cfg
+import src.core.global_imports as gi
+from src.core.utils.logging_utils import get_queue_logging
+
+_worker_runner = None
+"""Replication runner of a worker process, set up once by the pool's initializer."""
+
+
+def _initialize_worker(runner, collect_entity_type_stats: bool, logging_initializer, logging_initargs) -> None:
+    """
+    Initializer of a replication worker process.
+
+    Unpickling the runner imports the model, the runner's config overrides are activated once for all replications
+    of the worker.
+
+    :param runner: Runner without results, see ``ReplicationRunner.worker_copy``
+    :param collect_entity_type_stats: Whether the parent collects entity type statistics
+    :param logging_initializer: Initializer of the logging queue or None
+    :param logging_initargs: Arguments of the logging initializer
+    """
+    global _worker_runner
+    if logging_initializer is not None:
+        logging_initializer(*logging_initargs)
+
+    _worker_runner = runner
+    gi.set_collect_entity_type_stats(collect_entity_type_stats)
+    cfg.apply_overrides(runner.config_overrides)
+
+    # Objects inherited from the parent are never collected, the garbage collector doesn't touch (and copy) their pages
+    gc.freeze()
+
+
+def _run_chunk(replication_numbers: list, shared_results=None) -> Tuple[list, list, float]:
+    """
+    Run a chunk of replications in a worker process.
+
+    :param replication_numbers: Replications of the chunk
+    :param shared_results: SharedReplicationResults the component statistics are written to instead of returned
+    :return: The replication numbers, their results and the wall time of the chunk
+    """
+    start = time.perf_counter()
+    results = []
+    try:
+        for r, result in zip(replication_numbers, _worker_runner.simulate_replications(replication_numbers)):
+            if shared_results is not None and result[0] is not None:
+                shared_results.write(r, result[:8])
+                result = (None,) * 8 + result[8:]
+            results.append(result)
+    finally:
+        if shared_results is not None:
+            shared_results.close()
+    return replication_numbers, results, time.perf_counter() - start
+
+
+class ReplicationPool:
+    """
+    Long-lived worker processes for the replications of a ReplicationRunner.
+
+    The workers are set up once by an initializer (model import, config overrides, logging) and keep running between
+    calls of ``run``. Replications are handed out in chunks that take about ``chunk_duration`` seconds, measured on
+    the chunks finished so far, so sweeps of many short replications aren't dominated by the overhead per task.
+    A worker is replaced by a fresh process after ``max_tasks_per_worker`` chunks, which caps its memory growth.
+    """
+
+    def __init__(self, runner, processes: Optional[int] = None, max_tasks_per_worker: Optional[int] = None,
+                 chunk_duration: float = 0.2, chunk_multiple: int = 1):
+        """
+        :param runner: Runner without results, see ``ReplicationRunner.worker_copy``
+        :param processes: Number of worker processes (default: number of CPUs)
+        :param max_tasks_per_worker: Chunks run by a worker before it is replaced, None to keep the workers
+        :param chunk_duration: Target wall time of a chunk in seconds
+        :param chunk_multiple: Chunks are multiples of this many replications, e.g. the replications of a warm-up group
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk_duration = chunk_duration
+        self.chunk_multiple = chunk_multiple
+        self.elapsed = 0.0
+        self.replications_run = 0
+
+        # Workers attaching to shared memory blocks use the parent's resource tracker, a tracker of their own would
+        # remove the blocks when a recycled worker exits
+        resource_tracker.ensure_running()
+
+        queue_logging = get_queue_logging()
+        logging_initializer, logging_initargs = queue_logging.worker_initializer() if queue_logging else (None, ())
+        self.pool = multiprocessing.Pool(
+            self.processes, _initialize_worker,
+            (runner, gi.COLLECT_ENTITY_TYPE_STATS, logging_initializer, logging_initargs),
+            maxtasksperchild=max_tasks_per_worker)
+
+    @property
+    def replication_duration(self) -> Optional[float]:
+        """Average wall time of a replication in a worker, None before the first chunk finished."""
+        return self.elapsed / self.replications_run if self.replications_run else None
+
+    def chunk_size(self, remaining: int) -> int:
+        """
+        :param remaining: Number of replications not handed out yet
+        :return: Number of replications of the next chunk
+        """
+        if self.replication_duration is None:
+            return self.chunk_multiple
+        size = int(self.chunk_duration / self.replication_duration) if self.replication_duration else remaining
+        # Keep at least two chunks per worker, otherwise one worker finishes the last long chunk alone
+        size = max(1, min(size, math.ceil(remaining / (2 * self.processes))))
+        return math.ceil(size / self.chunk_multiple) * self.chunk_multiple
+
+    def run(self, replication_numbers: Iterable[int], shared_results=None) -> Iterator[Tuple[int, tuple]]:
+        """
+        Run replications in the worker processes.
+
+        :param replication_numbers: Replications to run
+        :param shared_results: SharedReplicationResults the workers write the component statistics to, their place
+                               in the returned results is None. A row has to be read before the next result is
+                               requested.
+        :return: Replication numbers and results, in the order of ``replication_numbers``
+        """
+        replication_numbers = list(replication_numbers)
+        finished = queue.SimpleQueue()
+        results = {}
+        submitted = in_flight = position = 0
+        # Rows of the shared results are reused, replications can't run further ahead of the parent
+        capacity = shared_results.rows if shared_results is not None else len(replication_numbers)
+
+        while position < len(replication_numbers):
+            # Two chunks per worker are in flight, so a worker never waits for the next chunk
+            while (submitted < len(replication_numbers) and in_flight < 2 * self.processes
+                   and submitted - position < capacity):
+                size = min(self.chunk_size(len(replication_numbers) - submitted), capacity - (submitted - position))
+                chunk = replication_numbers[submitted:submitted + size]
+                self.pool.apply_async(_run_chunk, (chunk, shared_results), callback=finished.put, error_callback=finished.put)
+                submitted += size
+                in_flight += 1
+
+            outcome = finished.get()
+            in_flight -= 1
+            if isinstance(outcome, BaseException):
+                raise outcome
+
+            chunk, chunk_results, elapsed = outcome
+            self.elapsed += elapsed
+            self.replications_run += len(chunk)
+            results.update(zip(chunk, chunk_results))
+
+            while position < len(replication_numbers) and replication_numbers[position] in results:
+                replication_number = replication_numbers[position]
+                yield replication_number, results.pop(replication_number)
+                position += 1
+
+    def close(self, terminate: bool = False) -> None:
+        """
+        Shut the worker processes down.
+
+        :param terminate: Stop the workers immediately instead of letting them finish their chunks
+        """
+        if terminate:
+            self.pool.terminate()
+        else:
+            self.pool.close()
+        self.pool.join()
@@ -1,17 +1,17 @@
-import pandas as pd
+import logging
+from typing import TYPE_CHECKING
 
 import src.core.global_imports as gi
 import src.core.config as cfg
+from src.core.statistics.batch_means import BatchMeans
 from src.core.statistics.entity_type_stats import collect_all_entity_type_stats
 from src.core.statistics.stats import calculate_statistics
 from src.core.utils.helper import round_value
 from src.core.components.worker_pool import print_worker_utilization_for_pool, print_all_worker_pools_summary
 from src.core.components.model import Model
 
-from database.base.models import run_simulation_table, db
-from database.base.database_config import drop_table, initialize_table
-from database.simulation.simulation_db import store_run_simulation, create_pivot_run_simulation
-from database.simulation.simulation_entity_types_db import store_entity_type_stats, create_etype_pivot, create_etype_table
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class SimulationRunner:
@@ -19,21 +19,31 @@ class SimulationRunner:
     Runs a single simulation using the provided model function.
     """
 
-    def __init__(self, model, steps, warm_up=None, show_progress=False, skip_statistics=False):
+    def __init__(self, model, steps, warm_up=None, show_progress=False, skip_statistics=False, batches=None,
+                 confidence=0.95):
         """
         :param model: Callable simulation model function.
         :param steps: Number of steps (or minutes) to run the simulation.
         :param warm_up: Warm-up duration to ignore in the statistics.
         :param show_progress: Whether to display a progress bar during simulation.
         :param skip_statistics: Whether to skip framework statistics collection.
+        :param batches: Divide the run after the warm-up into this many batches and report batch means with
+                        confidence intervals, in the schema of the replication results (see BatchMeans).
+        :param confidence: Confidence level of the batch means' half-widths (default: 0.95).
         """
+        if batches is not None and (batches < 2 or skip_statistics):
+            raise ValueError("Batch means need statistics of at least 2 batches.")
         self.model = model
         self.steps = steps
         self.warm_up = warm_up
         self.show_progress = show_progress
         self.skip_statistics = skip_statistics
+        self.batches = batches
+        self.confidence = confidence
+        # Batch means of the last run with batches
+        self.batch_means = None
 
-    def run(self, store_pivot_in_file: str = None, new_database: bool = True) -> pd.DataFrame:
+    def run(self, store_pivot_in_file: str = None, new_database: bool = True) -> 'pd.DataFrame':
         """
         Execute the simulation and return a pivot table summarizing the stats.
         """
@@ -47,6 +57,9 @@ class SimulationRunner:
         # Set random seed for test reproducibility
         gi.set_random_seed(cfg.random_seed)
 
+        if self.batches is not None:
+            return self._run_batch_means(store_pivot_in_file, new_database)
+
         # 1. Run the simulation through Model
         env = Model().run_simulation(
             model_func=self.model,
@@ -64,6 +77,13 @@ class SimulationRunner:
         stats = calculate_statistics(env)
         data = self._format_stats(stats)
 
+        # The database layer (peewee, pandas, tabulate) is only imported when results are stored
+        from database.base.models import run_simulation_table, db
+        from database.base.database_config import drop_table, initialize_table
+        from database.simulation.simulation_db import store_run_simulation, create_pivot_run_simulation
+        from database.simulation.simulation_entity_types_db import (store_entity_type_stats, create_etype_pivot,
+                                                                    create_etype_table)
+
         # 3. Store results in database/file
         if new_database:
             drop_table(run_simulation_table)
@@ -101,6 +121,43 @@ class SimulationRunner:
 
         return pivot_table
 
+    def _run_batch_means(self, store_pivot_in_file: str = None, new_database: bool = True) -> 'pd.DataFrame':
+        """
+        Simulate one long run with a single warm-up and return the pivot table of its batch means.
+        """
+        if cfg.collect_entity_type_stats:
+            logging.warning("Entity type statistics are not split into batches, they are not collected.")
+
+        env = Model().start_simulation(self.model, self.steps, seed=cfg.random_seed, warm_up=gi.DURATION_WARM_UP)
+        self.batch_means = BatchMeans(self.batches, gi.DURATION_WARM_UP, self.steps)
+        self.batch_means.start(env)
+        if self.show_progress:
+            Model()._run_with_progress(env, self.steps)
+        else:
+            env.run(until=self.steps)
+        self.batch_means.finish(env)
+
+        combined_stats = self.batch_means.summary(self.confidence)
+        correlated = self.batch_means.check_autocorrelation()
+
+        # Same table and pivot as the results of replications
+        from database.base.models import run_replications_table
+        from database.base.database_config import drop_table, initialize_table
+        from database.replication.replication_db import store_run_replication, create_pivot_run_replication
+
+        if new_database:
+            drop_table(run_replications_table)
+            initialize_table(run_replications_table)
+
+        store_run_replication(combined_stats)
+        pivot_table = create_pivot_run_replication()
+        pivot_table.attrs['batch_means'] = self.batch_means.metadata(correlated)
+
+        if store_pivot_in_file:
+            pivot_table.to_csv(store_pivot_in_file)
+
+        return pivot_table
+
     def _format_stats(self, stats: tuple) -> list:
         """
         Convert statistics into a list of dictionaries.
@@ -1,12 +1,13 @@
 from typing import Union, Dict, Any
 from src.core.simulation.runner import SimulationRunner
 from src.core.simulation.replication import ReplicationRunner
+from src.core.simulation.warm_up_detection import AUTO_PILOT_FRACTION, detect_warm_up
 import src.core.config as cfg
 
 
 def run_simulation(model, steps, warm_up=None, store_pivot_in_file=None, new_database=True,
                    config: Union[str, Dict[str, Any], None] = None, show_progress: bool = False,
-                   skip_statistics: bool = False):
+                   skip_statistics: bool = False, batches: int = None, confidence: float = 0.95):
     """
     Run a single simulation using the specified model.
 
@@ -21,6 +22,11 @@ def run_simulation(model, steps, warm_up=None, store_pivot_in_file=None, new_dat
                    - dict: inline configuration overrides
     :param show_progress: Whether to display a progress bar during simulation.
     :param skip_statistics: Whether to skip framework statistics collection (faster for custom stats).
+    :param batches: Batch-means mode: divide the run after the warm-up into this many batches of equal length and
+                    report the averages, minima, maxima and half-widths of the batch means in the schema of
+                    ``run_replications``. The lag-1 autocorrelation of the batch means is stored in
+                    ``pivot_table.attrs['batch_means']``, a warning is logged if the batches are correlated.
+    :param confidence: Confidence level of the batch means' half-widths (default: 0.95).
     :return: The pivot table summarizing simulation statistics (or None if skip_statistics=True).
     """
     # Apply configuration overrides before running simulation
@@ -28,7 +34,7 @@ def run_simulation(model, steps, warm_up=None, store_pivot_in_file=None, new_dat
 
     try:
         runner = SimulationRunner(model, steps, warm_up, show_progress=show_progress,
-                                  skip_statistics=skip_statistics)
+                                  skip_statistics=skip_statistics, batches=batches, confidence=confidence)
         return runner.run(store_pivot_in_file, new_database)
     finally:
         # Reset to global configuration after simulation
@@ -40,14 +46,20 @@ def run_replications(model, steps, num_replications, warm_up=None,
                      new_database=True, confidence=0.95,
                      enable_detailed_replication_data=True,
                      config: Union[str, Dict[str, Any], None] = None,
-                     show_progress: bool = False, skip_statistics: bool = False):
+                     show_progress: bool = False, skip_statistics: bool = False, max_workers: int = None,
+                     half_width_targets: Dict[tuple, Dict[str, float]] = None, max_replications: int = None,
+                     replications_per_warm_up: int = None, antithetic: bool = False,
+                     control_variates: Dict[tuple, float] = None):
     """
     Run multiple replications of the simulation.
 
     :param model: The simulation model function.
     :param steps: Number of steps (or minutes) per replication.
     :param num_replications: Total number of replications.
-    :param warm_up: Warm-up duration to ignore in the statistics.
+    :param warm_up: Warm-up duration to ignore in the statistics, 'auto' to detect it with MSER-5 from a pilot run of
+                    a quarter of a replication's length (``AUTO_PILOT_FRACTION``). MSER-5 truncates at most half of
+                    the pilot, for longer warm-ups pass ``detect_warm_up(model, duration)['warm_up']`` of a longer
+                    pilot run instead.
     :param multiprocessing: Whether to use multiprocessing.
     :param store_pivot_in_file: Optional file path to store the pivot table as CSV.
     :param new_database: Whether to create a new database table.
@@ -60,17 +72,45 @@ def run_replications(model, steps, num_replications, warm_up=None,
                    - dict: inline configuration overrides
     :param show_progress: Whether to display a progress bar during each replication.
     :param skip_statistics: Whether to skip framework statistics collection (faster for custom stats).
+    :param max_workers: Number of worker processes with multiprocessing (default: number of CPUs).
+    :param half_width_targets: Confidence interval half-widths to reach, by (type, name, statistic), e.g.
+                               ``{('Sink', 'GoodParts', 'TimeInSystem (average)'): {'relative': 0.05},
+                               ('Server', 'Machine', 'ScheduledUtilization'): {'absolute': 1.0}}``.
+                               num_replications are run first, then further replications until every target is
+                               met or max_replications is reached.
+    :param max_replications: Cap of the replications with half_width_targets (default: 10 * num_replications).
+    :param replications_per_warm_up: Simulate the warm-up once per group of this many replications and fork the
+                                     replications from its end state (Linux). The replications of a group share
+                                     their initial conditions, the caveat is in the table's ``attrs['warm_up_fork']``.
+    :param antithetic: Run the replications in antithetic pairs, the second replication of a pair draws 1 - U for
+                       every uniform U of the first. The half-widths are computed from the pair means, the table gets
+                       a 'Variance Reduction' column. Needs an even number of replications.
+    :param control_variates: Known means of control statistics by (type, name, statistic), e.g. the average
+                             processing time of a server ``{('Server', 'Machine', 'TimeProcessing (average)'): 3.0}``.
+                             The averages and half-widths of the other statistics are adjusted with control-variate
+                             estimators, the table gets a 'Variance Reduction' column and the coefficients are in
+                             its ``attrs['control_variates']``.
     :return: The aggregated pivot table summarizing replication statistics (or None if skip_statistics=True).
+             With half_width_targets the achieved precision is in the table's ``attrs['precision']``.
     """
     # Apply configuration overrides before running replications
     cfg.apply_overrides(config)
 
     try:
+        if warm_up == 'auto':
+            warm_up = detect_warm_up(model, steps * AUTO_PILOT_FRACTION)['warm_up']
+            if warm_up is None:
+                raise ValueError("No warm-up detected, the output doesn't settle within the pilot run. Set the "
+                                 "warm-up by hand or analyze longer pilot runs with detect_warm_up.")
+
         rep_runner = ReplicationRunner(
             model, steps, num_replications, warm_up, multiprocessing,
             confidence, enable_detailed_replication_data,
             config_overrides=config, show_progress=show_progress,
-            skip_statistics=skip_statistics
+            skip_statistics=skip_statistics, max_workers=max_workers,
+            half_width_targets=half_width_targets, max_replications=max_replications,
+            replications_per_warm_up=replications_per_warm_up, antithetic=antithetic,
+            control_variates=control_variates
         )
         return rep_runner.run(store_pivot_in_file, new_database)
     finally:
@@ -0,0 +1,339 @@
+import logging
+from itertools import repeat
+from typing import List, Optional
+
+import numpy as np
+import simpy
+
+import src.core.global_imports as gi
+from src.core.components.entity import Entity, EntityManager
+from src.core.components_abstract.routing_object import ROUTING_DECISION
+from src.core.simulation.bucket_environment import create_environment
+from src.core.types.componet_type import ComponentType
+from src.core.types.queue_type import QueueType
+from src.core.utils.helper import create_connection_cache, get_value_from_distribution_with_parameters, \
+    validate_probabilities
+
+SIMPY_ENGINE = 'simpy'
+AUTO_ENGINE = 'auto'
+
+ARRIVAL_BLOCK_SIZE = 4096
+"""Number of interarrival times drawn at once until the run duration is covered"""
+
+
+class TandemStage:
+    """
+    A server of a tandem line and where it routes the processed entities.
+    """
+
+    def __init__(self, server, cumulative_probabilities: np.ndarray, next_components: list):
+        """
+        :param server: The server
+        :param cumulative_probabilities: Cumulative routing probabilities in percent, as in the connection cache
+        :param next_components: Sink or server behind each cumulative probability
+        """
+        self.server = server
+        self.cumulative_probabilities = cumulative_probabilities
+        self.next_components = next_components
+
+
+class TandemLine:
+    """
+    A model that is a pure tandem line: one Source with distribution arrivals feeding a chain of single FIFO Servers
+    without workers, breakdowns or work schedules, where every Server routes to the next Server or to Sinks.
+
+    Such a line is simulated without the event loop. The departure times of a FIFO server follow Lindley's recursion
+    ``D[i] = max(A[i], D[i - 1]) + p[i]``, which is computed for all entities at once as
+    ``D = C + maximum.accumulate(A - C + p)`` with ``C = cumsum(p)``. The statistics are written into the components
+    and the EntityManager as the SimPy run would, so ``calculate_statistics`` reports them unchanged.
+
+    The random variates are drawn from the same streams and in the same order per stream as in the SimPy run. With
+    named random streams (config ``simulation.random_streams``) both engines therefore produce the same statistics,
+    otherwise they differ only in how the draws of the components are interleaved on the global stream. Entity
+    objects are not created.
+    """
+
+    def __init__(self, source, stages: List[TandemStage], sinks: list):
+        """
+        :param source: The source of the line
+        :param stages: The servers in line order
+        :param sinks: All sinks of the model
+        """
+        self.source = source
+        self.stages = stages
+        self.sinks = sinks
+
+    def run(self, duration: float, scheduler: str) -> simpy.Environment:
+        """
+        Simulate the line until ``duration`` and record the statistics.
+
+        :param duration: Simulation duration
+        :param scheduler: Event scheduler of the environment that is returned
+        :return: An environment whose clock is at the end of the run
+        """
+        warm_up = gi.DURATION_WARM_UP
+        creation_times = self._creation_times(duration)
+        number_created = len(creation_times)
+        exit_times = np.full(number_created, np.inf)
+        sink_entries = {id(sink): [] for sink in self.sinks}
+
+        self._record_source(creation_times, warm_up)
+
+        entities = np.arange(number_created)
+        arrival_times = creation_times
+        for stage in self.stages:
+            departure_times = self._run_server(stage.server, arrival_times, duration, warm_up)
+            departed = departure_times < duration
+            entities, departure_times = entities[departed], departure_times[departed]
+
+            if len(stage.next_components) == 1:
+                targets = np.zeros(len(entities), dtype=int)
+            else:
+                decisions = _draw(ROUTING_DECISION, (stage.server.name, 'routing'), len(entities))
+                targets = np.searchsorted(stage.cumulative_probabilities, decisions, side='left')
+
+            next_entities, next_arrival_times = entities[:0], departure_times[:0]
+            for index, component in enumerate(stage.next_components):
+                routed = targets == index
+                if id(component) in sink_entries:
+                    sink_entries[id(component)].append((entities[routed], departure_times[routed]))
+                    exit_times[entities[routed]] = departure_times[routed]
+                else:
+                    next_entities, next_arrival_times = entities[routed], departure_times[routed]
+            # Entities beyond the last cumulative probability are not routed and stay in the system, as in SimPy
+            entities, arrival_times = next_entities, next_arrival_times
+
+        for sink in self.sinks:
+            self._record_sink(sink, sink_entries[id(sink)], creation_times, warm_up)
+        self._record_entities(creation_times, exit_times, duration, warm_up)
+
+        # The clock of an empty environment is advanced to the end of the run, statistics read the time from it
+        env = create_environment(scheduler)
+        env.run(until=duration)
+        EntityManager.env = env
+        return env
+
+    def _creation_times(self, duration: float) -> np.ndarray:
+        """
+        Draw the interarrival times of the source until the run duration is covered.
+
+        :param duration: Simulation duration
+        :return: Creation times of all entities created before the end of the run
+        """
+        blocks = []
+        last_time = 0.0
+        while last_time < duration:
+            waits = _draw(self.source.creation_time_dwp, (self.source.name, 'arrival'), ARRIVAL_BLOCK_SIZE)
+            # Same sequential float additions as the timeouts of the source process
+            times = np.cumsum(np.concatenate(([last_time], waits)))
+            blocks.append(times[:-1])
+            last_time = times[-1]
+
+        creation_times = np.concatenate(blocks)
+        return creation_times[creation_times < duration]
+
+    def _record_source(self, creation_times: np.ndarray, warm_up: float) -> None:
+        number_created = int(np.count_nonzero(creation_times >= warm_up))
+        self.source.entities_created_pivot_table = number_created
+        self.source.number_exited_pivot_table = number_created
+
+    @staticmethod
+    def _run_server(server, arrival_times: np.ndarray, duration: float, warm_up: float) -> np.ndarray:
+        """
+        Compute the departures of a FIFO single server with Lindley's recursion and record its statistics.
+
+        :param server: The server
+        :param arrival_times: Sorted arrival times at the server
+        :param duration: Simulation duration
+        :param warm_up: Warm-up duration
+        :return: Departure times, at or after ``duration`` for entities that don't finish in the run
+        """
+        processing_times = _draw(server.processing_time_dwp, (server.name, 'processing'), len(arrival_times))
+        cumulative_processing = np.cumsum(processing_times)
+        departure_times = cumulative_processing + np.maximum.accumulate(
+            arrival_times - cumulative_processing + processing_times)
+        start_times = np.maximum(arrival_times, np.concatenate(([-np.inf], departure_times[:-1])))
+
+        # Queue length sampled at every arrival: the arriving entity and all that have not started before
+        entered = arrival_times >= warm_up
+        not_started = np.arange(1, len(arrival_times) + 1) - np.searchsorted(start_times, arrival_times, side='left')
+        server.queue_lengths = not_started[entered].tolist()
+        server.number_entered_pivot_table = int(np.count_nonzero(entered))
+
+        started = (start_times >= warm_up) & (start_times < duration)
+        server.queue_times = (start_times - arrival_times)[started].tolist()
+
+        finished = departure_times < duration
+        server.units_utilized_over_time = list(zip(start_times[finished].tolist(), departure_times[finished].tolist(),
+                                                   repeat(1)))
+
+        processed = finished & (departure_times >= warm_up)
+        server.total_entities_processed_pivot_table = int(np.count_nonzero(processed))
+        server.number_exited_pivot_table = server.total_entities_processed_pivot_table
+        server.total_processing_time_pivot_table = float(np.sum(processing_times[processed]))
+        return departure_times
+
+    @staticmethod
+    def _record_sink(sink, entries: list, creation_times: np.ndarray, warm_up: float) -> None:
+        if not entries:
+            return
+
+        entities = np.concatenate([block for block, _ in entries])
+        arrival_times = np.concatenate([times for _, times in entries])
+        sink.entities_processed += len(entities)
+
+        entered = arrival_times >= warm_up
+        sink.number_entered_pivot_table += int(np.count_nonzero(entered))
+        if entered.any():
+            time_in_system = arrival_times[entered] - creation_times[entities[entered]]
+            sink.total_time_in_system += float(np.sum(time_in_system))
+            sink.max_time_in_system_pivot_table = max(sink.max_time_in_system_pivot_table, float(time_in_system.max()))
+            sink.min_time_in_system_pivot_table = min(sink.min_time_in_system_pivot_table, float(time_in_system.min()))
+
+    @staticmethod
+    def _record_entities(creation_times: np.ndarray, exit_times: np.ndarray, duration: float, warm_up: float) -> None:
+        destroyed = exit_times < duration
+        counted = destroyed & (creation_times >= warm_up) & (exit_times > warm_up)
+        time_in_system = exit_times[counted] - creation_times[counted]
+
+        EntityManager.number_created = int(np.count_nonzero(creation_times >= warm_up))
+        EntityManager.number_destroyed = len(time_in_system)
+        EntityManager.total_time_in_system = float(np.sum(time_in_system))
+        if len(time_in_system):
+            EntityManager.max_time_in_system = float(time_in_system.max())
+            EntityManager.min_time_in_system = float(time_in_system.min())
+
+        # Time-weighted number in system after the warm-up, complete up to the end of the run
+        in_system_until = np.clip(np.minimum(exit_times, duration), warm_up, duration)
+        EntityManager.time_weighted_sum = float(np.sum(in_system_until - np.clip(creation_times, warm_up, duration)))
+        EntityManager.current_number_in_system = len(creation_times) - int(np.count_nonzero(destroyed))
+        EntityManager.last_change_time = duration
+
+
+def _draw(dwp, stream_name, size: int) -> np.ndarray:
+    """
+    Draw variates one after the other from the random stream the components use.
+
+    :param dwp: Tuple of distribution function and parameters
+    :param stream_name: Tuple of component name and purpose
+    :param size: Number of variates
+    :return: Array of the variates
+    """
+    return np.fromiter((get_value_from_distribution_with_parameters(dwp, stream_name) for _ in range(size)),
+                       dtype=float, count=size)
+
+
+def find_tandem_line(model) -> Optional[TandemLine]:
+    """
+    Check whether a built model is a pure tandem line that can be simulated without the event loop.
+
+    :param model: The model after the model function built its components
+    :return: The tandem line, or None if the model needs the SimPy engine
+    """
+    reason = _unsupported_model(model)
+    if reason is None:
+        sources = list(model.get_component(ComponentType.SOURCES))
+        stages = []
+        reason = _build_stages(sources[0], stages, model)
+        if reason is None:
+            return TandemLine(sources[0], stages, list(model.get_component(ComponentType.SINKS)))
+
+    logging.debug("Model is not a pure tandem line (%s), running it with SimPy", reason)
+    return None
+
+
+def _unsupported_model(model) -> Optional[str]:
+    """
+    :return: Why the model's components don't qualify, or None
+    """
+    if gi.COLLECT_ENTITY_TYPE_STATS:
+        return "entity type statistics"
+    if model.worker_pools:
+        return "worker pools"
+    for component_type in (ComponentType.VEHICLES, ComponentType.COMBINER, ComponentType.SEPARATORS,
+                           ComponentType.STORAGE):
+        if len(model.get_component(component_type)):
+            return f"{component_type.value.lower()}"
+
+    sources = list(model.get_component(ComponentType.SOURCES))
+    if len(sources) != 1:
+        return "not exactly one source"
+    source = sources[0]
+    if (source.creation_time_dwp is None or source.arrival_table is not None or source.entity_class is not Entity
+            or source.entity_type != "Default" or source.max_arrival is not None or source.vehicle_group
+            or source.before_creation_trigger or source.after_creation_trigger):
+        return f"source {source.name} needs the event loop"
+
+    for server in model.get_component(ComponentType.SERVERS):
+        if (server.capacity != 1 or server.queuing_order != QueueType.FIFO or server.processing_time_dwp is None
+                or server.time_between_machine_breakdowns or server.work_schedule is not None or server.oven
+                or server.entity_processing_times or server.global_processing_times
+                or not _plain_processing_component(server)):
+            return f"server {server.name} needs the event loop"
+
+    for sink in model.get_component(ComponentType.SINKS):
+        if (sink.processing_time_dwp or sink.time_between_machine_breakdowns or sink.addon_processing_done_method_with_parameters
+                or sink.source is not None or type(sink).store_processed_entities or not _plain_processing_component(sink)):
+            return f"sink {sink.name} needs the event loop"
+
+    return None
+
+
+def _plain_processing_component(component) -> bool:
+    return not (component.storage_queue or component.worker_store is not None or component.routing_expression
+                or component.sequence_routing or component.vehicle_group or component.before_arrival_trigger
+                or component.after_arrival_trigger or component.before_processing_trigger
+                or component.after_processing_trigger)
+
+
+def _build_stages(source, stages: List[TandemStage], model) -> Optional[str]:
+    """
+    Follow the connections from the source and collect the servers in line order.
+
+    :return: Why the connections don't form a tandem line, or None
+    """
+    servers = model.get_component(ComponentType.SERVERS)
+    sinks = model.get_component(ComponentType.SINKS)
+
+    create_connection_cache(source)
+    first = _next_components(source)
+    if first is None or len(first) != 1 or servers.get(first[0].name) is not first[0]:
+        return "the source does not feed exactly one server"
+
+    server = first[0]
+    visited = set()
+    while server is not None:
+        if id(server) in visited:
+            return "the servers form a cycle"
+        visited.add(id(server))
+
+        create_connection_cache(server)
+        validate_probabilities(server)
+        next_components = _next_components(server)
+        if not next_components:
+            return f"server {server.name} has no plain connections"
+
+        next_servers = [component for component in next_components if servers.get(component.name) is component]
+        if len(next_servers) > 1:
+            return f"server {server.name} routes to several servers"
+        if any(servers.get(c.name) is not c and sinks.get(c.name) is not c for c in next_components):
+            return f"server {server.name} routes to other components"
+
+        stages.append(TandemStage(server, np.array(list(server.connection_cache)), next_components))
+        server = next_servers[0] if next_servers else None
+
+    if len(visited) != len(servers):
+        return "not all servers are in the line"
+    return None
+
+
+def _next_components(component) -> Optional[list]:
+    """
+    :return: The component behind each connection cache entry, or None if a connection needs the event loop
+    """
+    next_components = []
+    for connection, vehicle in component.connection_cache.values():
+        if vehicle is not None or connection.process_duration or connection.entity_type is not None:
+            return None
+        next_components.append(connection.next_component)
+    return next_components
@@ -0,0 +1,234 @@
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.core.components.entity import EntityManager
+from src.core.components.model import Model
+from src.core.components.sink import Sink
+
+MSER_BATCH_SIZE = 5
+"""Observations per batch mean of MSER-5"""
+
+DEFAULT_BATCHES = 1000
+"""Default number of observations of the output series of a pilot run"""
+
+AUTO_PILOT_FRACTION = 0.25
+"""Length of the pilot run of ``run_replications(warm_up='auto')`` as a fraction of a replication"""
+
+
+class WarmUpRecorder:
+    """
+    Records batched output series during a run, one observation per interval of simulation time.
+
+    A sampling process reads the cumulative counters of the entity manager and the sinks at the end of every interval,
+    so the model itself isn't instrumented and the overhead is one event per interval. The series are:
+
+    - ``('Entity', 'Entity', 'NumberInSystem')``: time-weighted average number of entities in the system
+    - ``('Entity', 'Entity', 'TimeInSystem')``: average time in system of the entities destroyed in the interval
+    - ``('Sink', name, 'TimeInSystem')``: average time in system of the entities entering each sink
+
+    Intervals without entities have NaN as time in system. The observation of the interval ending with the run is
+    recorded by calling ``sample`` after the run.
+    """
+
+    def __init__(self, interval: float):
+        """
+        :param interval: Simulation time per observation
+        """
+        if interval <= 0:
+            raise ValueError(f"Interval of the warm-up series must be positive, got {interval}.")
+        self.interval = interval
+        self.observations: Dict[tuple, List[float]] = {}
+        self._sinks = []
+        self._totals = {}
+
+    def start(self, env) -> None:
+        """
+        Start sampling the model built on an environment.
+
+        :param env: Environment of the model at time 0
+        """
+        self._sinks = list(Sink.sinks)
+        self.observations = {('Entity', 'Entity', 'NumberInSystem'): [], ('Entity', 'Entity', 'TimeInSystem'): []}
+        self.observations.update({('Sink', sink.name, 'TimeInSystem'): [] for sink in self._sinks})
+        self._totals = {'Entity': (0.0, 0.0, 0)}
+        self._totals.update({sink.name: (0.0, 0) for sink in self._sinks})
+        env.process(self._run(env))
+
+    def _run(self, env):
+        while True:
+            yield env.timeout(self.interval)
+            self.sample()
+
+    def sample(self) -> None:
+        """
+        Record the observations of the interval ending now.
+        """
+        EntityManager._update_time_weighted_sum()
+        weighted_sum, total_time, destroyed = self._totals['Entity']
+        self.observations[('Entity', 'Entity', 'NumberInSystem')].append(
+            (EntityManager.time_weighted_sum - weighted_sum) / self.interval)
+        self.observations[('Entity', 'Entity', 'TimeInSystem')].append(
+            _interval_mean(EntityManager.total_time_in_system - total_time, EntityManager.number_destroyed - destroyed))
+        self._totals['Entity'] = (EntityManager.time_weighted_sum, EntityManager.total_time_in_system,
+                                  EntityManager.number_destroyed)
+
+        for sink in self._sinks:
+            total_time, entities = self._totals[sink.name]
+            self.observations[('Sink', sink.name, 'TimeInSystem')].append(
+                _interval_mean(sink.total_time_in_system - total_time, sink.entities_processed - entities))
+            self._totals[sink.name] = (sink.total_time_in_system, sink.entities_processed)
+
+    def series(self) -> Dict[tuple, np.ndarray]:
+        """
+        :return: Observations by component type, component name and statistic
+        """
+        return {name: np.array(values, dtype=float) for name, values in self.observations.items()}
+
+
+def _interval_mean(total: float, count: int) -> float:
+    return total / count if count else np.nan
+
+
+def _fill_gaps(series: np.ndarray) -> np.ndarray:
+    """
+    :param series: Observations with NaN for intervals without entities
+    :return: The observations with NaN replaced by the previous value, leading NaN by the first value
+    """
+    missing = np.isnan(series)
+    if not missing.any() or missing.all():
+        return series
+    index = np.where(missing, 0, np.arange(len(series)))
+    np.maximum.accumulate(index, out=index)
+    filled = series[index]
+    filled[:np.argmax(~missing)] = series[np.argmax(~missing)]
+    return filled
+
+
+def mser(series: np.ndarray, batch_size: int = MSER_BATCH_SIZE) -> Optional[int]:
+    """
+    Truncation point of an output series by the marginal standard error rule (MSER-5 with the default batch size).
+
+    The series is grouped into batch means Z_1..Z_m. For every truncation d of the first batches, the squared
+    standard error of the mean of the remaining batches is sum((Z_j - mean_d)^2) / (m - d)^2. The truncation
+    minimizing it is chosen among the first half of the batches, a minimum at the end of the first half means the
+    series is still trending and the run is too short to tell.
+
+    :param series: Observations in time order, NaN observations are filled with the previous value
+    :param batch_size: Observations per batch mean
+    :return: Number of observations to discard, None if the series is too short or still trending
+    """
+    series = _fill_gaps(np.asarray(series, dtype=float))
+    m = len(series) // batch_size
+    if m < 4:
+        return None
+    batches = series[:m * batch_size].reshape(m, batch_size).mean(axis=1)
+
+    # Sums over the batches d..m-1 for every truncation d, all truncations in one pass
+    remaining = np.arange(m, 0, -1)
+    sums = np.cumsum(batches[::-1])[::-1]
+    squares = np.cumsum((batches * batches)[::-1])[::-1]
+    squared_deviations = np.maximum(squares - sums * sums / remaining, 0)
+    standard_errors = squared_deviations / (remaining * remaining)
+
+    d = int(np.argmin(standard_errors[:m // 2 + 1]))
+    if d == m // 2:
+        return None
+    return d * batch_size
+
+
+def welch_moving_average(series: np.ndarray, window: int) -> np.ndarray:
+    """
+    Moving average of Welch's method, to inspect where the (averaged) output series levels off.
+
+    Observation i is averaged over i - w..i + w, the first observations over the symmetric window that fits.
+
+    :param series: Observations in time order, e.g. averaged over several pilot runs
+    :param window: Half-width w of the moving window in observations
+    :return: Moving averages of the first len(series) - window observations
+    """
+    series = _fill_gaps(np.asarray(series, dtype=float))
+    n = len(series) - window
+    if n <= 0:
+        return np.array([])
+    cumulative = np.concatenate(([0.0], np.cumsum(series)))
+    i = np.arange(n)
+    half = np.minimum(i, window)
+    return (cumulative[i + half + 1] - cumulative[i - half]) / (2 * half + 1)
+
+
+def welch(series: np.ndarray, window: int, tolerance: float = 0.05) -> Optional[int]:
+    """
+    Truncation point by Welch's method: the first observation after which the moving average stays within a relative
+    tolerance of its level in the second half of the series.
+
+    :param series: Observations in time order
+    :param window: Half-width of the moving window in observations
+    :param tolerance: Relative deviation from the level that counts as steady
+    :return: Number of observations to discard, None if the moving average doesn't settle
+    """
+    averages = welch_moving_average(series, window)
+    if len(averages) < 4:
+        return None
+    level = averages[len(averages) // 2:].mean()
+    outside = np.flatnonzero(np.abs(averages - level) > tolerance * abs(level))
+    if not len(outside):
+        return 0
+    truncation = int(outside[-1]) + 1
+    return truncation if truncation <= len(averages) // 2 else None
+
+
+def detect_warm_up(model, duration: float, interval: Optional[float] = None, pilots: int = 1,
+                   method: str = 'mser5', window: Optional[int] = None, seed=None) -> dict:
+    """
+    Recommend a warm-up period from pilot runs of a model.
+
+    The pilot runs record the output series of a WarmUpRecorder, without a warm-up and without computing the
+    statistics of the run. The truncation point of every series is determined by MSER-5 (``method='mser5'``) or
+    Welch's method (``method='welch'``) on the series averaged over the pilots, the recommended warm-up is the
+    largest one. Both are a single pass over the series, so the analysis costs a fraction of the pilot runs.
+
+    :param model: Function that builds the model
+    :param duration: Simulation duration of a pilot run, e.g. the length of a replication
+    :param interval: Simulation time per observation (default: duration / 1000)
+    :param pilots: Number of pilot runs, seeded with 'warm-up pilot 0', 'warm-up pilot 1', ... unless seed is given
+    :param method: 'mser5' or 'welch'
+    :param window: Half-width of the moving window of Welch's method in observations (default: 5% of the series)
+    :param seed: Seed of the first pilot run, the following pilots add their number
+    :return: Dictionary with the recommended 'warm_up', the 'truncation' time per series, the 'series' averaged over
+             the pilots, the 'interval' and the 'method'. The warm-up is None if a series didn't settle.
+    """
+    if method not in ('mser5', 'welch'):
+        raise ValueError(f"Unknown warm-up detection method '{method}', expected 'mser5' or 'welch'.")
+    interval = interval or duration / DEFAULT_BATCHES
+
+    runs = []
+    for pilot in range(pilots):
+        recorder = WarmUpRecorder(interval)
+        pilot_seed = f"warm-up pilot {pilot}" if seed is None else seed + pilot
+        env = Model().start_simulation(model, duration, seed=pilot_seed)
+        recorder.start(env)
+        env.run(until=duration)
+        recorder.sample()
+        runs.append({name: _fill_gaps(values) for name, values in recorder.series().items()})
+
+    series = {name: np.mean([run[name] for run in runs], axis=0) for name in runs[0]}
+    truncation = {}
+    for name, values in series.items():
+        if np.isnan(values).all():
+            # No entity reached this sink
+            continue
+        if method == 'mser5':
+            observations = mser(values)
+        else:
+            observations = welch(values, window or max(1, len(values) // 20))
+        truncation[name] = observations * interval if observations is not None else None
+
+    unsettled = [' '.join(name) for name, time in truncation.items() if time is None]
+    if unsettled:
+        logging.warning(f"No warm-up found for {', '.join(unsettled)}, the pilot run is too short or the model "
+                        f"doesn't reach a steady state.")
+    warm_up = None if unsettled else max(truncation.values(), default=0.0)
+    logging.info(f"Recommended warm-up ({method}): {warm_up}")
+    return {'warm_up': warm_up, 'truncation': truncation, 'series': series, 'interval': interval, 'method': method}
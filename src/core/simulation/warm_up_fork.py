@@ -0,0 +1,151 @@
+import functools
+import gc
+import os
+import pickle
+import random
+from collections import deque
+from typing import Any, Callable, Iterator, List, Tuple
+
+import src.core.global_imports as gi
+from src.core.utils.logging_utils import set_replication
+
+WARM_UP_FORK_CAVEAT = (
+    "Replications of a warm-up group branch from one simulated warm-up and share its end state (entities in the "
+    "system, pending events and their already drawn times). They are only independent after the fork, so the "
+    "replications of a group are positively correlated and the half-widths understate the uncertainty of the "
+    "initial conditions, most for short runs after the warm-up and few groups.")
+"""Statistical caveat of replications forked after a shared warm-up, stored with the results"""
+
+
+def fork_supported() -> bool:
+    """
+    :return: Whether the platform can fork the process (Linux and other POSIX systems)
+    """
+    return hasattr(os, 'fork')
+
+
+def warm_up_seed(group: int) -> str:
+    """
+    :param group: Number of the warm-up group
+    :return: Seed of the group's warm-up, distinct from the integer seeds of the replications
+    """
+    return f"warm-up {group}"
+
+
+def warm_up_groups(replication_numbers, replications_per_warm_up: int) -> Iterator[List[int]]:
+    """
+    :param replication_numbers: Replications to run
+    :param replications_per_warm_up: Replications branched from each warm-up
+    :return: Consecutive replications of the same warm-up group, replication r is in group r // replications_per_warm_up
+    """
+    group = []
+    for r in replication_numbers:
+        if group and group[0] // replications_per_warm_up != r // replications_per_warm_up:
+            yield group
+            group = []
+        group.append(r)
+    if group:
+        yield group
+
+
+def fork_branches(branches: List[Callable[[], Any]], processes: int = 1) -> list:
+    """
+    Run functions in forked child processes which inherit the state of the simulation at the fork.
+
+    The results are pickled back through a pipe, exceptions of a branch are raised in the parent. Up to ``processes``
+    branches run at the same time.
+
+    :param branches: Functions without arguments that continue the simulation and return picklable results
+    :param processes: Number of branches running at the same time
+    :return: Results of the branches, in order
+    """
+    results = []
+    running = deque()
+    try:
+        for i, branch in enumerate(branches):
+            running.append((i, _fork(branch)))
+            if len(running) >= processes:
+                results.append(_join(*running.popleft()))
+        while running:
+            results.append(_join(*running.popleft()))
+    except BaseException:
+        # The results of the other branches are dropped, their children exit when they can't write them
+        for _, (pid, read_fd) in running:
+            os.close(read_fd)
+            os.waitpid(pid, 0)
+        raise
+    return results
+
+
+def _fork(branch: Callable[[], Any]) -> Tuple[int, int]:
+    """
+    :param branch: Function run in the child process
+    :return: Process id of the child and file descriptor of the pipe its results are read from
+    """
+    # The random module reseeds itself in a forked child, the child continues the parent's random numbers instead
+    random_state = random.getstate()
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        random.setstate(random_state)
+        try:
+            # Pages inherited from the parent stay shared, the garbage collector doesn't touch (and copy) them
+            gc.freeze()
+            payload = (True, branch())
+        except BaseException as e:
+            payload = (False, e)
+        try:
+            with os.fdopen(write_fd, 'wb') as pipe:
+                try:
+                    pickle.dump(payload, pipe, pickle.HIGHEST_PROTOCOL)
+                except Exception as e:
+                    pickle.dump((False, RuntimeError(f"Results of the branch can't be pickled: {e!r}")), pipe)
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    return pid, read_fd
+
+
+def _join(branch: int, child: Tuple[int, int]):
+    """
+    :param branch: Number of the branch
+    :param child: Process id and pipe of the child
+    :return: Results of the branch
+    """
+    pid, read_fd = child
+    with os.fdopen(read_fd, 'rb') as pipe:
+        data = pipe.read()
+    _, status = os.waitpid(pid, 0)
+    if not data:
+        raise RuntimeError(f"Forked branch {branch} exited with status {status} without results.")
+    succeeded, value = pickle.loads(data)
+    if not succeeded:
+        raise value
+    return value
+
+
+def run_forked_replications(env, duration, replication_numbers: List[int], collect_results: Callable) -> list:
+    """
+    Branch replications from a model at the end of its warm-up.
+
+    Every replication runs in a forked child process which inherits the model's state, reseeds the random streams with
+    the replication number and simulates the rest of the run. The replications of the group run one after another.
+
+    :param env: Environment of the model, run until the end of the warm-up
+    :param duration: Simulation duration
+    :param replication_numbers: Replications of the group
+    :param collect_results: Function that returns the results of a replication from its environment
+    :return: Results of the replications
+    """
+    def continue_replication(r):
+        set_replication(r)
+        try:
+            gi.set_random_seed(r)
+            env.run(until=duration)
+            return collect_results(env)
+        finally:
+            set_replication(None)
+
+    return fork_branches([functools.partial(continue_replication, r) for r in replication_numbers])
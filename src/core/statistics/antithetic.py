@@ -0,0 +1,99 @@
+from typing import Dict, List
+
+import numpy as np
+
+from src.core.statistics.results_cube import Column, ResultsCube
+
+
+def antithetic_seed(replication: int) -> int:
+    """
+    :param replication: Replication number
+    :return: Seed of the replication's pair, the number of its first member
+    """
+    return replication - replication % 2
+
+
+def is_complement(replication: int) -> bool:
+    """
+    :param replication: Replication number
+    :return: Whether the replication is the second member of its pair, drawing complemented uniforms
+    """
+    return replication % 2 == 1
+
+
+class AntitheticPairs:
+    """
+    Results of antithetic pairs of replications: replications 2p and 2p + 1 form pair p, run with the same seed, the
+    second one with every uniform U replaced by 1 - U (see ``RandomStreams.set_antithetic``).
+
+    The members of a pair are dependent but the pairs are independent, so the confidence intervals are computed from
+    the pair means, aggregated in their own ResultsCube with the columns of the replications. The variance reduction of
+    a statistic is 1 - Var(pair mean) / (Var(replication) / 2), the share of the variance of the mean of two independent
+    replications removed by pairing them. It is negative if the members are positively correlated.
+    """
+
+    def __init__(self):
+        self.results = ResultsCube(keep_replications=False)
+        # Values of pairs whose other member hasn't come in yet, by pair
+        self._waiting: Dict[int, np.ndarray] = {}
+
+    @property
+    def pairs(self) -> int:
+        """
+        :return: Number of complete pairs
+        """
+        return len(self.results.replications)
+
+    def add(self, replication: int, values: np.ndarray, columns: List[Column]) -> None:
+        """
+        Add the results of a replication, the pair mean is added with the second member of a pair.
+
+        :param replication: Replication number
+        :param values: Values of the replication in the order of the columns (see ``ResultsCube.add``)
+        :param columns: Columns of the replications
+        """
+        pair = replication // 2
+        other = self._waiting.pop(pair, None)
+        if other is None:
+            self._waiting[pair] = values
+            return
+
+        width = max(len(values), len(other))
+        self.results.add_columns(columns[:width])
+        mean = (np.pad(values, (0, width - len(values)), constant_values=np.nan)
+                + np.pad(other, (0, width - len(other)), constant_values=np.nan)) / 2
+        self.results.add(pair, row=mean)
+
+    def variance_reduction(self, replications: ResultsCube) -> np.ndarray:
+        """
+        :param replications: Results of the individual replications
+        :return: Variance reduction of every column of the pairs, NaN without variance or with less than 2 pairs
+        """
+        columns = len(self.results.columns)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            pair_variance = self.results.m2[:columns] / (self.results.count[:columns] - 1)
+            replication_variance = replications.m2[:columns] / (replications.count[:columns] - 1)
+            reduction = 1 - pair_variance / (replication_variance / 2)
+        valid = (self.results.count[:columns] > 1) & (replication_variance > 0)
+        return np.where(valid, reduction, np.nan)
+
+    def summary(self, replications: ResultsCube, confidence: float = 0.95) -> list:
+        """
+        Aggregated statistics of the replications with the half-widths of the pair means and the variance reduction.
+
+        :param replications: Results of the individual replications
+        :param confidence: Confidence level of the half-widths
+        :return: Rows of ``ResultsCube.summary`` with an additional 'Variance Reduction'
+        """
+        rows = replications.summary(confidence)
+        columns = len(self.results.columns)
+        half_widths = self.results.half_widths(confidence).tolist()
+        reduction = self.variance_reduction(replications).tolist()
+        counts = self.results.count[:columns].tolist()
+
+        for row in rows:
+            c = replications.column((row['Type'], row['Name'], row['Stat']))
+            paired = c < columns and counts[c] > 0
+            row['Half-Width'] = round(half_widths[c], 4) if paired else None
+            row['Variance Reduction'] = round(reduction[c], 4) if paired and reduction[c] == reduction[c] else None
+        return rows
@@ -0,0 +1,276 @@
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.core.components.combiner import Combiner
+from src.core.components.entity import EntityManager
+from src.core.components.logistic.storage import Storage
+from src.core.components.separator import Separator
+from src.core.components.server import Server
+from src.core.components.sink import Sink
+from src.core.components.vehicle import Vehicle
+from src.core.statistics.results_cube import Column, ResultsCube, iterate_components
+from src.core.statistics.stats import calculate_statistics
+
+MAX_BATCH_AUTOCORRELATION = 0.2
+"""Lag-1 autocorrelation of the batch means above which the batches are considered correlated"""
+
+COUNT_STATS = frozenset({
+    'NumberCreated', 'NumberDestroyed', 'NumberEntered', 'NumberExited', 'EntitiesInQueue (total)',
+    'EntitiesProcessed', 'EntitiesTransported', 'MembersEntered', 'ParentsEntered', 'NumberDowntimes',
+    'TotalDowntime', 'TotalDowntimes', 'TotalTrips', 'TimeProcessing (total)', 'TravelTime (total)'})
+"""Statistics counted over the run, the value of a batch is the difference of the counts at its bounds"""
+
+TIME_AVERAGE_STATS = frozenset({'NumberInSystem (average)', 'ScheduledUtilization', 'StarvingTime (scheduled)'})
+"""Statistics averaged over the simulation time after the warm-up"""
+
+OBSERVATION_COUNTS = {
+    'Entity': {'TimeInSystem (average)': 'number_destroyed'},
+    'Server': {'EntitiesInQueue (average)': 'queue_lengths', 'TimeInQueue (average)': 'queue_times',
+               'TimeProcessing (average)': 'total_entities_processed_pivot_table'},
+    'Vehicle': {'EntitiesInQueue (average)': 'queue_lengths', 'TimeInQueue (average)': 'queue_times',
+                'TravelTime (average)': 'total_trips'},
+    'Storage': {'EntitiesInQueue (average)': 'queue_lengths', 'TimeInQueue (average)': 'queue_times',
+                'TimeProcessing (average)': 'total_entities_processed_pivot_table'},
+    'Separator': {'EntitiesInQueue (average)': 'queue_lengths', 'TimeInQueue (average)': 'queue_times',
+                  'TimeProcessing (average)': 'total_entities_processed_pivot_table'},
+    'Combiner': {'MembersInQueue (average)': 'member_queue_lengths',
+                 'ParentsInQueue (average)': 'parent_queue_lengths',
+                 'Members TimeInQueue (average)': 'member_queue_times',
+                 'Parents TimeInQueue (average)': 'parent_queue_times',
+                 'TimeProcessing (average)': 'total_entities_processed_pivot_table'},
+    'Sink': {'TimeInSystem (average)': 'entities_processed'},
+}
+"""Attribute of a component counting the observations of an average statistic, the length of a list attribute"""
+
+# Kinds of columns
+_RUN, _COUNT, _AVERAGE = 0, 1, 2
+
+
+class BatchMeans:
+    """
+    Batch means of a single long run: the run after the warm-up is divided into batches of equal simulation time and
+    every batch is one observation of the statistics, like a replication.
+
+    A sampling process calls ``calculate_statistics`` at the end of the warm-up and of every batch, and turns the
+    cumulative statistics into the values of the batch as they come in:
+
+    - counts and totals (``COUNT_STATS``) are differenced and scaled by the number of batches, so their average is
+      the count of the whole run after the warm-up
+    - averages over the simulation time (``TIME_AVERAGE_STATS``) and over observations (``OBSERVATION_COUNTS``) are
+      turned back into sums and averaged over the time or the observations of the batch
+    - maxima, minima and the other statistics that don't split into batches (NumberRemaining, UnitsUtilized,
+      StarvingTime (total), NumTimesProcessed) are reported with the value of the whole run and without half-width
+
+    Only the previous cumulative statistics are kept, the batches are aggregated in a ResultsCube together with the
+    sums of the lag-1 products of the batch means, so memory doesn't grow with the number of batches. The tallies
+    of the model are not split into batches.
+    """
+
+    def __init__(self, num_batches: int, warm_up: float, duration: float,
+                 max_autocorrelation: float = MAX_BATCH_AUTOCORRELATION):
+        """
+        :param num_batches: Number of batches, at least 2
+        :param warm_up: End of the warm-up, start of the first batch
+        :param duration: Simulation duration, end of the last batch
+        :param max_autocorrelation: Lag-1 autocorrelation of the batch means above which a warning is logged
+        """
+        if num_batches < 2:
+            raise ValueError(f"Batch means need at least 2 batches, got {num_batches}.")
+        if duration <= warm_up:
+            raise ValueError(f"Simulation duration ({duration}) must exceed the warm-up ({warm_up}).")
+        self.num_batches = num_batches
+        self.warm_up = warm_up
+        self.batch_length = (duration - warm_up) / num_batches
+        self.max_autocorrelation = max_autocorrelation
+
+        self.results = ResultsCube(keep_replications=False)
+        self.run_values = np.zeros(0)
+        self._kinds = np.zeros(0, dtype=np.int8)
+        self._sums = None
+        self._weights = None
+        self._previous = None
+        self._first = None
+        self._lag_products = np.zeros(0)
+        self._complete = np.zeros(0, dtype=bool)
+
+    @property
+    def batches(self) -> int:
+        """
+        :return: Number of completed batches
+        """
+        return len(self.results.replications)
+
+    def start(self, env) -> None:
+        """
+        Start sampling the model built on an environment.
+
+        :param env: Environment of the model at time 0
+        """
+        env.process(self._run(env))
+
+    def _run(self, env):
+        yield env.timeout(self.warm_up)
+        self.sample(env)
+        for batch in range(1, self.num_batches):
+            yield env.timeout(self.warm_up + batch * self.batch_length - env.now)
+            self.sample(env)
+
+    def finish(self, env) -> None:
+        """
+        Record the last batch, ending with the run.
+
+        :param env: Environment after the run
+        """
+        self.sample(env)
+
+    def sample(self, env) -> None:
+        """
+        Record the statistics at the end of the warm-up, or the batch ending now.
+
+        :param env: Environment of the model
+        """
+        columns, values, weights = self._snapshot(env, env.now - self.warm_up)
+        indices = self.results.add_columns(columns)
+        self._grow(indices, columns)
+
+        sums = np.full(len(self.results.columns), np.nan)
+        cumulative_weights = np.zeros(len(self.results.columns))
+        sums[indices] = values * np.where(np.isnan(weights), 1, weights)
+        cumulative_weights[indices] = np.nan_to_num(weights)
+        self.run_values[indices] = values
+
+        if self._sums is not None:
+            self._add_batch(sums - self._sums, cumulative_weights - self._weights)
+        self._sums, self._weights = sums, cumulative_weights
+
+    def _snapshot(self, env, elapsed: float):
+        """
+        :param env: Environment of the model
+        :param elapsed: Simulation time since the end of the warm-up
+        :return: Columns, their cumulative values and the time or number of observations they are averaged over
+                 (NaN for counts and statistics that aren't split)
+        """
+        components = {'Entity': {'Entity': EntityManager}}
+        for component_type, instances in (('Server', Server.servers), ('Vehicle', Vehicle.vehicles),
+                                          ('Storage', Storage.storages), ('Separator', Separator.separators),
+                                          ('Combiner', Combiner.combiners), ('Sink', Sink.sinks)):
+            components[component_type] = {component.name: component for component in instances}
+
+        columns, values, weights = [], [], []
+        for component_type, name, component_stats in iterate_components(calculate_statistics(env)):
+            counts = OBSERVATION_COUNTS.get(component_type, {})
+            for stat, value in component_stats.items():
+                if stat == component_type:
+                    continue
+                columns.append((component_type, name, stat))
+                values.append(value if isinstance(value, (int, float)) else np.nan)
+                if stat in TIME_AVERAGE_STATS:
+                    weights.append(elapsed)
+                elif stat in counts:
+                    count = getattr(components[component_type][name], counts[stat])
+                    weights.append(len(count) if isinstance(count, list) else count)
+                else:
+                    weights.append(np.nan)
+        return columns, np.array(values, dtype=float), np.array(weights, dtype=float)
+
+    def _grow(self, indices: np.ndarray, columns: List[Column]) -> None:
+        """
+        Extend the per-column state to new columns of the cube.
+        """
+        extra = len(self.results.columns) - len(self.run_values)
+        if extra <= 0:
+            return
+        self.run_values = np.concatenate((self.run_values, np.full(extra, np.nan)))
+        self._kinds = np.concatenate((self._kinds, np.zeros(extra, dtype=np.int8)))
+        self._lag_products = np.concatenate((self._lag_products, np.zeros(extra)))
+        self._complete = np.concatenate((self._complete, np.full(extra, self._previous is None)))
+        for arrays in ('_sums', '_weights', '_previous', '_first'):
+            if getattr(self, arrays) is not None:
+                setattr(self, arrays, np.concatenate((getattr(self, arrays), np.full(extra, np.nan))))
+
+        for i, (component_type, _, stat) in zip(indices.tolist(), columns):
+            if stat in COUNT_STATS:
+                self._kinds[i] = _COUNT
+            elif stat in TIME_AVERAGE_STATS or stat in OBSERVATION_COUNTS.get(component_type, {}):
+                self._kinds[i] = _AVERAGE
+
+    def _add_batch(self, sums: np.ndarray, weights: np.ndarray) -> None:
+        """
+        :param sums: Sums of the batch, counts for count statistics
+        :param weights: Time or observations of the batch
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            batch = np.where(self._kinds == _COUNT, sums * self.num_batches,
+                             np.where((self._kinds == _AVERAGE) & (weights > 0), sums / weights, np.nan))
+
+        present = ~np.isnan(batch)
+        batchable = self._kinds != _RUN
+        if self._previous is None:
+            self._first = batch.copy()
+        else:
+            self._lag_products += np.nan_to_num(self._previous * batch)
+        self._complete &= present | ~batchable
+        self._previous = batch
+
+        self.results.add(self.batches, row=batch)
+
+    def autocorrelation(self) -> Dict[Column, float]:
+        """
+        Lag-1 autocorrelation of the batch means, from the sums kept while the batches come in.
+
+        :return: Autocorrelation by column, for the statistics with a value in every batch that vary
+        """
+        k = self.batches
+        if k < 3:
+            return {}
+        mean, m2 = self.results.mean[:len(self._kinds)], self.results.m2[:len(self._kinds)]
+        total = k * mean
+        lagged = self._lag_products - mean * (2 * total - self._first - self._previous) + (k - 1) * mean * mean
+        valid = (self._kinds != _RUN) & self._complete & (m2 > 1e-12 * np.maximum(mean * mean, 1))
+        return {self.results.columns[i]: float(lagged[i] / m2[i]) for i in np.flatnonzero(valid)}
+
+    def summary(self, confidence: float = 0.95) -> list:
+        """
+        Aggregated statistics of the batches, in the schema of ``ResultsCube.summary`` of replications.
+
+        :param confidence: Confidence level of the half-widths
+        :return: Rows with type, name, statistic, average, minimum, maximum and half-width
+        """
+        rows = self.results.summary(confidence)
+        for row in rows:
+            i = self.results.column((row['Type'], row['Name'], row['Stat']))
+            if self._kinds[i] == _RUN:
+                value = None if np.isnan(self.run_values[i]) else round(float(self.run_values[i]), 4)
+                row.update({'Average': value, 'Minimum': value, 'Maximum': value, 'Half-Width': None})
+        return rows
+
+    def check_autocorrelation(self) -> Dict[Column, float]:
+        """
+        Log a warning for statistics whose batch means are correlated, their half-widths are too small.
+
+        :return: Autocorrelation of the correlated statistics by column
+        """
+        correlated = {column: value for column, value in self.autocorrelation().items()
+                      if value > self.max_autocorrelation}
+        if correlated:
+            worst = max(correlated, key=correlated.get)
+            logging.warning(f"Batch means of {len(correlated)} statistics are correlated, e.g. {' '.join(worst)} with a "
+                            f"lag-1 autocorrelation of {correlated[worst]:.2f} > {self.max_autocorrelation}. "
+                            f"Use fewer, longer batches or a longer run.")
+        return correlated
+
+    def metadata(self, correlated: Optional[Dict[Column, float]] = None) -> dict:
+        """
+        :param correlated: Result of ``check_autocorrelation``
+        :return: Number and length of the batches, warm-up and the lag-1 autocorrelation of the batch means
+        """
+        return {
+            'batches': self.batches,
+            'batch_length': self.batch_length,
+            'warm_up': self.warm_up,
+            'autocorrelation': self.autocorrelation(),
+            'max_autocorrelation': self.max_autocorrelation,
+            'correlated': sorted(correlated if correlated is not None else self.check_autocorrelation())
+        }
@@ -0,0 +1,164 @@
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.core.statistics.results_cube import Column, ResultsCube
+
+
+class ControlVariates:
+    """
+    Control-variate estimators of the replication averages.
+
+    Controls are statistics of the replications whose expectation is known, e.g. the average processing time of a
+    server with a known distribution or the number of entities created by a Poisson source. An output Y is adjusted
+    by the deviation of the controls' averages from their expectations mu:
+
+        Y_cv = mean(Y) - beta * (mean(C) - mu)
+
+    with the coefficients beta of the least squares regression of Y on the controls, which minimize the variance of
+    Y_cv. Its confidence interval uses the residual variance of the regression with n - q - 1 degrees of freedom for
+    q controls, so the adjustment pays off when the controls explain a good share of the variance of an output.
+
+    Means, sums of squared deviations and co-moments of every column with the controls are updated in place for every
+    replication (Welford's algorithm), like the accumulators of the ResultsCube. Columns without a value in some
+    replication are not adjusted.
+    """
+
+    def __init__(self, controls: Dict[Column, float]):
+        """
+        :param controls: Known expectation of the control statistics, by (type, name, statistic)
+        """
+        if not controls:
+            raise ValueError("Control variates need at least one control statistic with a known mean.")
+        self.controls: List[Column] = list(controls)
+        self.known_means = np.array(list(controls.values()), dtype=float)
+        self.count = 0
+        self._control_indices = None
+
+        q = len(self.controls)
+        self.control_mean = np.zeros(q)
+        self.control_m2 = np.zeros((q, q))
+        self.mean = np.zeros(0)
+        self.m2 = np.zeros(0)
+        self.co_moments = np.zeros((0, q))
+
+    def add(self, values: np.ndarray, columns: List[Column]) -> None:
+        """
+        Add the results of a replication.
+
+        :param values: Values of the replication in the order of the columns (see ``ResultsCube.add``)
+        :param columns: Columns of the replications
+        """
+        if self._control_indices is None:
+            index = {column: i for i, column in enumerate(columns)}
+            missing = [' '.join(control) for control in self.controls if control not in index]
+            if missing:
+                raise ValueError(f"No results for the control statistics {', '.join(missing)}")
+            self._control_indices = np.array([index[control] for control in self.controls], dtype=np.intp)
+
+        controls = values[self._control_indices]
+        if np.isnan(controls).any():
+            raise ValueError("Every replication needs a value of every control statistic.")
+
+        extra = len(values) - len(self.mean)
+        if extra > 0:
+            # Columns that were missing in earlier replications are not adjusted
+            fill = np.nan if self.count else 0.0
+            self.mean = np.concatenate((self.mean, np.full(extra, fill)))
+            self.m2 = np.concatenate((self.m2, np.full(extra, fill)))
+            self.co_moments = np.concatenate((self.co_moments, np.full((extra, len(self.controls)), fill)))
+        elif extra < 0:
+            values = np.concatenate((values, np.full(-extra, np.nan)))
+
+        self.count += 1
+        control_delta = controls - self.control_mean
+        self.control_mean += control_delta / self.count
+        self.control_m2 += np.outer(controls - self.control_mean, control_delta)
+
+        delta = values - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (values - self.mean)
+        self.co_moments += np.outer(values - self.mean, control_delta)
+
+    def estimates(self, confidence: float = 0.95) -> Optional[Dict[str, np.ndarray]]:
+        """
+        :param confidence: Confidence level of the half-widths
+        :return: 'average', 'half_width', 'variance_reduction' (1 - variance of the adjusted average / variance of the
+                 average) and 'coefficients' (columns x controls) of all columns, NaN for columns that aren't
+                 adjusted. None with less than q + 2 replications for q controls.
+        """
+        from scipy.stats import t
+
+        if not (0 < confidence < 1):
+            raise ValueError("Confidence level must be between 0 and 1 (exclusive), e.g., 0.95 for 95%.")
+        n, q = self.count, len(self.controls)
+        if n < q + 2:
+            return None
+
+        # The pseudo-inverse tolerates collinear or constant controls
+        control_inverse = np.linalg.pinv(self.control_m2)
+        coefficients = self.co_moments @ control_inverse
+        deviation = self.control_mean - self.known_means
+        average = self.mean - coefficients @ deviation
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            residual = np.maximum(self.m2 - np.sum(coefficients * self.co_moments, axis=1), 0) / (n - q - 1)
+            variance = residual * (1 / n + deviation @ control_inverse @ deviation)
+            unadjusted_variance = self.m2 / (n - 1) / n
+            variance_reduction = 1 - variance / unadjusted_variance
+        half_width = t.ppf((1 + confidence) / 2, df=n - q - 1) * np.sqrt(variance)
+
+        adjusted = np.isfinite(average) & (unadjusted_variance > 0)
+        adjusted[self._control_indices] = False
+        return {'average': np.where(adjusted, average, np.nan),
+                'half_width': np.where(adjusted, half_width, np.nan),
+                'variance_reduction': np.where(adjusted, variance_reduction, np.nan),
+                'coefficients': np.where(adjusted[:, None], coefficients, np.nan)}
+
+    def summary(self, replications: ResultsCube, confidence: float = 0.95) -> list:
+        """
+        Aggregated statistics of the replications with the adjusted averages and half-widths.
+
+        :param replications: Results of the replications
+        :param confidence: Confidence level of the half-widths
+        :return: Rows of ``ResultsCube.summary`` with an additional 'Variance Reduction', minimum and maximum are
+                 those of the replications
+        """
+        rows = replications.summary(confidence)
+        estimates = self.estimates(confidence)
+        if estimates is None:
+            logging.warning(f"Control variates need at least {len(self.controls) + 2} replications, the averages are "
+                            f"not adjusted.")
+            for row in rows:
+                row['Variance Reduction'] = None
+            return rows
+
+        average, half_width, reduction = (estimates[key].tolist()
+                                          for key in ('average', 'half_width', 'variance_reduction'))
+        for row in rows:
+            c = replications.column((row['Type'], row['Name'], row['Stat']))
+            adjusted = c < len(average) and average[c] == average[c]
+            if adjusted:
+                row['Average'] = round(average[c], 4)
+                row['Half-Width'] = round(half_width[c], 4)
+            row['Variance Reduction'] = round(reduction[c], 4) if adjusted else None
+        return rows
+
+    def metadata(self, replications: ResultsCube, confidence: float = 0.95) -> dict:
+        """
+        :param replications: Results of the replications
+        :param confidence: Confidence level of the half-widths
+        :return: Known means of the controls, their averages over the replications and the coefficients of the
+                 adjusted columns
+        """
+        estimates = self.estimates(confidence)
+        coefficients = {}
+        if estimates is not None:
+            for c, column_coefficients in enumerate(estimates['coefficients'].tolist()):
+                if column_coefficients[0] == column_coefficients[0]:
+                    coefficients[replications.columns[c]] = dict(zip(self.controls, column_coefficients))
+        return {'controls': dict(zip(self.controls, self.known_means.tolist())),
+                'control_averages': dict(zip(self.controls, self.control_mean.tolist())),
+                'replications': self.count,
+                'coefficients': coefficients}
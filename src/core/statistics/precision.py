@@ -0,0 +1,85 @@
+import math
+from typing import Dict, List, Optional
+
+from src.core.statistics.results_cube import Column, ResultsCube
+
+
+class PrecisionTargets:
+    """
+    Half-width targets of the confidence intervals of chosen statistics, the stopping rule of sequential replications.
+
+    A target is given per column of the results as ``{'relative': 0.05}`` (half-width at most 5% of the average),
+    ``{'absolute': 0.5}`` (half-width at most 0.5) or both, then both have to be met. The number of replications a
+    target needs is estimated from the current half-width, which shrinks with the square root of the replications.
+    """
+
+    def __init__(self, targets: Dict[Column, Dict[str, float]]):
+        """
+        :param targets: Targets by component type, component name and statistic,
+                        e.g. ``{('Sink', 'GoodParts', 'TimeInSystem (average)'): {'relative': 0.05}}``
+        """
+        if not targets:
+            raise ValueError("At least one half-width target is required.")
+        for column, target in targets.items():
+            if not target or set(target) - {'relative', 'absolute'}:
+                raise ValueError(f"Target of {' '.join(column)} must have a 'relative' and/or 'absolute' half-width.")
+            if any(value <= 0 for value in target.values()):
+                raise ValueError(f"Half-width targets of {' '.join(column)} must be positive.")
+        self.targets = {tuple(column): dict(target) for column, target in targets.items()}
+
+    def target_half_width(self, average: float, target: Dict[str, float]) -> float:
+        """
+        :param average: Current average of the statistic
+        :param target: Relative and/or absolute half-width
+        :return: Largest half-width that meets the target
+        """
+        bounds = [target.get('absolute', math.inf)]
+        if 'relative' in target:
+            bounds.append(target['relative'] * abs(average))
+        return min(bounds)
+
+    def report(self, results: ResultsCube, confidence: float = 0.95) -> List[dict]:
+        """
+        Achieved precision of every target.
+
+        :param results: Results of the replications so far
+        :param confidence: Confidence level of the half-widths
+        :return: Rows with the column, average, half-width, relative half-width, target and whether it is met
+        """
+        half_widths = results.half_widths(confidence)
+        rows = []
+        for column, target in self.targets.items():
+            c = results.column(column)
+            average, half_width = float(results.mean[c]), float(half_widths[c])
+            enough_values = results.count[c] > 1
+            component_type, name, stat = column
+            rows.append({
+                'Type': component_type,
+                'Name': name,
+                'Stat': stat,
+                'Replications': int(results.count[c]),
+                'Average': average,
+                'Half-Width': half_width,
+                'Relative Half-Width': half_width / abs(average) if average else (0.0 if not half_width else math.inf),
+                'Target': self.target_half_width(average, target),
+                'Met': bool(enough_values and half_width <= self.target_half_width(average, target))
+            })
+        return rows
+
+    def required_replications(self, results: ResultsCube, confidence: float = 0.95) -> Optional[int]:
+        """
+        :param results: Results of the replications so far
+        :param confidence: Confidence level of the half-widths
+        :return: Estimated number of replications that meets all targets, None if all targets are met
+        """
+        required = 0
+        for row in self.report(results, confidence):
+            if row['Met']:
+                continue
+            if row['Replications'] < 2 or not row['Target']:
+                # No spread to extrapolate from yet, or a relative target of an average of 0
+                required = max(required, 2 * max(row['Replications'], 1))
+            else:
+                ratio = row['Half-Width'] / row['Target']
+                required = max(required, math.ceil(row['Replications'] * ratio * ratio))
+        return required or None
@@ -0,0 +1,247 @@
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+COMPONENT_TYPES = ('Entity', 'Server', 'Sink', 'Source', 'Vehicle', 'Storage', 'Separator', 'Combiner')
+"""Component types in the order of the results of ``calculate_statistics``"""
+
+TALLY_TYPE = 'Tally'
+"""Type of the columns of tally statistics"""
+
+Column = Tuple[str, str, str]
+"""Component type, component name and statistic of a column"""
+
+
+def iterate_components(statistics: tuple) -> Iterator[Tuple[str, str, dict]]:
+    """
+    :param statistics: Results of ``calculate_statistics``
+    :return: Component type, name and statistics of every component in the results
+    """
+    entity_stats, server_stats, sink_stats, source_stats, vehicle_stats, storage_stats, separator_stats, combiner_stats = statistics
+    yield 'Entity', 'Entity', entity_stats
+    for component_type, component_stats in (('Server', server_stats), ('Vehicle', vehicle_stats),
+                                            ('Storage', storage_stats), ('Separator', separator_stats),
+                                            ('Combiner', combiner_stats)):
+        for stats in component_stats:
+            yield component_type, stats[component_type], stats
+    for component_type, component_stats in (('Sink', sink_stats), ('Source', source_stats)):
+        for name, stats in component_stats.items():
+            yield component_type, name, stats
+
+
+class ResultsCube:
+    """
+    Replication results by component, statistic and replication, aggregated while the replications come in.
+
+    Every numeric statistic of the results gets a column, whatever its name. Count, mean and sum of squared
+    deviations (Welford's algorithm), minimum and maximum of each column are updated in place with NumPy for every
+    replication, so averages and confidence intervals need no second pass over the replications. NaN and infinite
+    values don't count towards these.
+
+    With ``keep_replications`` the values are also stored in a replication x column matrix, which backs the detailed
+    replication data. Without it the memory of the cube doesn't grow with the number of replications.
+    """
+
+    def __init__(self, num_replications: int = 0, keep_replications: bool = True):
+        """
+        :param num_replications: Expected number of replications, rows of the matrix are allocated for them
+        :param keep_replications: Whether to store the values of every replication
+        """
+        self.keep_replications = keep_replications
+        self.columns: List[Column] = []
+        self.replications: List[int] = []
+        self._index: Dict[Column, int] = {}
+
+        self.count = np.zeros(0, dtype=np.int64)
+        self.mean = np.zeros(0)
+        self.m2 = np.zeros(0)
+        self.minimum = np.zeros(0)
+        self.maximum = np.zeros(0)
+        self.values = np.full((num_replications if keep_replications else 0, 0), np.nan)
+
+    def add_columns(self, columns: List[Column]) -> np.ndarray:
+        """
+        Add columns that don't exist yet.
+
+        :param columns: Columns to add
+        :return: Indices of the columns
+        """
+        new_columns = [column for column in dict.fromkeys(columns) if column not in self._index]
+        if new_columns:
+            for column in new_columns:
+                self._index[column] = len(self.columns)
+                self.columns.append(column)
+
+            capacity = len(self.count)
+            if len(self.columns) > capacity:
+                extra = max(len(self.columns) - capacity, capacity)
+                self.count = np.concatenate((self.count, np.zeros(extra, dtype=np.int64)))
+                self.mean = np.concatenate((self.mean, np.zeros(extra)))
+                self.m2 = np.concatenate((self.m2, np.zeros(extra)))
+                self.minimum = np.concatenate((self.minimum, np.full(extra, np.inf)))
+                self.maximum = np.concatenate((self.maximum, np.full(extra, -np.inf)))
+                self.values = np.concatenate((self.values, np.full((len(self.values), extra), np.nan)), axis=1)
+
+        return np.fromiter((self._index[column] for column in columns), dtype=np.intp, count=len(columns))
+
+    def add(self, replication: int, statistics: Optional[tuple] = None, tally_stats: Optional[dict] = None,
+            row: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Add the results of a replication.
+
+        :param replication: Replication number
+        :param statistics: Results of ``calculate_statistics``
+        :param tally_stats: Minimum, maximum and average of the tallies, by tally name
+        :param row: Component statistics as values of the first columns (see ``SharedReplicationResults``), instead
+                    of ``statistics``
+        :return: Values of the replication in the order of the columns, NaN for columns without a value
+        """
+        columns = []
+        values = []
+        if statistics is not None:
+            for component_type, name, component_stats in iterate_components(statistics):
+                for stat, value in component_stats.items():
+                    if stat != component_type:
+                        columns.append((component_type, name, stat))
+                        values.append(value if isinstance(value, (int, float)) else np.nan)
+        for name, tally in (tally_stats or {}).items():
+            for stat, value in tally.items():
+                columns.append((TALLY_TYPE, name, stat.capitalize()))
+                values.append(value if isinstance(value, (int, float)) else np.nan)
+
+        indices = self.add_columns(columns)
+        values = np.array(values, dtype=np.float64)
+        if row is not None:
+            indices = np.concatenate((np.arange(len(row)), indices))
+            values = np.concatenate((row, values))
+        self._update(replication, indices, values)
+
+        dense = np.full(len(self.columns), np.nan)
+        dense[indices] = values
+        return dense
+
+    def _update(self, replication: int, indices: np.ndarray, values: np.ndarray) -> None:
+        # TimeInSystem (min) is infinite in replications without finished entities, those have no value like NaN
+        present = np.isfinite(values)
+        i = indices[present]
+        x = values[present]
+
+        self.count[i] += 1
+        delta = x - self.mean[i]
+        self.mean[i] += delta / self.count[i]
+        self.m2[i] += delta * (x - self.mean[i])
+        self.minimum[i] = np.minimum(self.minimum[i], x)
+        self.maximum[i] = np.maximum(self.maximum[i], x)
+
+        if self.keep_replications:
+            if replication >= len(self.values):
+                extra = max(replication + 1 - len(self.values), len(self.values))
+                self.values = np.concatenate((self.values, np.full((extra, self.values.shape[1]), np.nan)))
+            self.values[replication, indices] = values
+        self.replications.append(replication)
+
+    def column(self, column: Column) -> int:
+        """
+        :param column: Component type, component name and statistic
+        :return: Index of the column
+        """
+        try:
+            return self._index[column]
+        except KeyError:
+            raise ValueError(f"No results for {' '.join(column)}") from None
+
+    def half_widths(self, confidence: float = 0.95) -> np.ndarray:
+        """
+        :param confidence: Confidence level of the half-widths
+        :return: Half-widths of the confidence intervals of the means of all columns, 0 for less than 2 values
+        """
+        from scipy.stats import norm, t
+
+        if not (0 < confidence < 1):
+            raise ValueError("Confidence level must be between 0 and 1 (exclusive), e.g., 0.95 for 95%.")
+
+        n = self.count[:len(self.columns)]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std_dev = np.sqrt(self.m2[:len(self.columns)] / (n - 1))
+            # n > 30 uses the normal distribution approximation, smaller samples the t-distribution
+            quantile = np.where(n > 30, norm.ppf((1 + confidence) / 2),
+                                t.ppf((1 + confidence) / 2, df=np.maximum(n - 1, 1)))
+            return np.where(n > 1, quantile * std_dev / np.sqrt(n), 0)
+
+    def summary(self, confidence: float = 0.95) -> list:
+        """
+        Aggregated statistics of all columns, component types in the order of ``calculate_statistics`` and tallies.
+
+        :param confidence: Confidence level of the half-widths
+        :return: Rows with type, name, statistic, average, minimum, maximum and half-width
+        """
+        columns = len(self.columns)
+        n = self.count[:columns]
+        half_width = self.half_widths(confidence)
+
+        type_order = {component_type: i for i, component_type in enumerate(COMPONENT_TYPES + (TALLY_TYPE,))}
+        order = sorted(range(columns), key=lambda c: type_order.get(self.columns[c][0], len(type_order)))
+
+        rows = []
+        n, mean, minimum, maximum, half_width = (a.tolist() for a in (n, self.mean, self.minimum, self.maximum, half_width))
+        for c in order:
+            component_type, name, stat = self.columns[c]
+            if not n[c] and component_type == TALLY_TYPE:
+                continue
+            rows.append({
+                'Type': component_type,
+                'Name': name,
+                'Stat': stat,
+                'Average': round(mean[c], 4) if n[c] else None,
+                'Minimum': round(minimum[c], 4) if n[c] else None,
+                'Maximum': round(maximum[c], 4) if n[c] else None,
+                'Half-Width': round(half_width[c], 4) if n[c] else None
+            })
+        return rows
+
+    def replication_data(self, replication: int) -> dict:
+        """
+        Component statistics of a replication in the layout of ``calculate_statistics``.
+
+        :param replication: Replication number
+        :return: Statistics by component type
+        """
+        data = {'Entity': {}, 'Server': [], 'Sink': {}, 'Source': {}, 'Vehicle': [], 'Storage': [], 'Separator': [],
+                'Combiner': []}
+        components = {}
+        for (component_type, name, stat), value in zip(self.columns, self.values[replication].tolist()):
+            if component_type not in data:
+                continue
+            stats = components.get((component_type, name))
+            if stats is None:
+                if component_type == 'Entity':
+                    stats = data['Entity']
+                elif component_type in ('Sink', 'Source'):
+                    stats = data[component_type][name] = {}
+                else:
+                    stats = {component_type: name}
+                    data[component_type].append(stats)
+                components[(component_type, name)] = stats
+            stats[stat] = None if value != value else value
+        return data
+
+
+class ReplicationDataView(Sequence):
+    """
+    Detailed data of the replications of a ResultsCube, built from its matrix when a replication is accessed.
+    """
+
+    def __init__(self, cube: ResultsCube):
+        """
+        :param cube: Cube that keeps its replications
+        """
+        self.cube = cube
+
+    def __len__(self) -> int:
+        return len(self.cube.replications)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.cube.replication_data(r) for r in self.cube.replications[index]]
+        return self.cube.replication_data(self.cube.replications[index])
@@ -0,0 +1,117 @@
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.core.components.combiner import Combiner
+from src.core.components.logistic.storage import Storage
+from src.core.components.model import Model
+from src.core.components.separator import Separator
+from src.core.components.server import Server
+from src.core.components.sink import Sink
+from src.core.components.source import Source
+from src.core.components.vehicle import Vehicle
+from src.core.statistics.results_cube import COMPONENT_TYPES, Column, iterate_components
+
+SHARED_RESULT_ROWS = 256
+"""Rows of a shared memory block, the pool doesn't run more replications ahead of the parent"""
+
+
+class SharedReplicationResults:
+    """
+    Component statistics of the replications of a run in a shared memory block.
+
+    The block is a float64 matrix with a column per component and statistic. The columns are fixed when the model is
+    built, so worker processes write the statistics of a replication into a row and the parent adds the row to its
+    ResultsCube as a NumPy array, without pickling or rebuilding dictionaries. Missing and non-numeric values are NaN.
+    Replication r uses row r modulo the number of rows, the rows are reused once the parent has read them.
+
+    The parent creates the block and releases it after the run, workers attach to it by name when an instance is
+    unpickled and detach with ``close``.
+    """
+
+    def __init__(self, columns: List[Column], rows: int = SHARED_RESULT_ROWS, name: Optional[str] = None):
+        """
+        :param columns: Columns of the matrix
+        :param rows: Rows of the matrix
+        :param name: Name of the shared memory block to attach to, None to create a new block
+        """
+        self.columns = columns
+        self.rows = rows
+        self._index = None
+        self._components = None
+
+        shape = (rows, len(columns))
+        self._shm = SharedMemory(name=name, create=name is None, size=max(8, 8 * shape[0] * shape[1]))
+        self.name = self._shm.name
+        self.array = np.ndarray(shape, dtype=np.float64, buffer=self._shm.buf)
+        if name is None:
+            self.array.fill(np.nan)
+
+    @classmethod
+    def for_model(cls, model_func, stat_names: Dict[str, List[str]], rows: int = SHARED_RESULT_ROWS) -> "SharedReplicationResults":
+        """
+        Build a model with the current config and create the block for its components.
+
+        :param model_func: Function that builds the model
+        :param stat_names: Statistics per component type, see ``REPLICATION_STAT_NAMES``
+        :param rows: Rows of the matrix
+        :return: The results with a new shared memory block
+        """
+        Model().build(model_func)
+        components = {'Entity': ['Entity'],
+                      'Server': [server.name for server in Server.servers],
+                      'Sink': [sink.name for sink in Sink.sinks],
+                      'Source': [source.name for source in Source.sources],
+                      'Vehicle': [vehicle.name for vehicle in Vehicle.vehicles],
+                      'Storage': [storage.name for storage in Storage.storages],
+                      'Separator': [separator.name for separator in Separator.separators],
+                      'Combiner': [combiner.name for combiner in Combiner.combiners]}
+        columns = [(component_type, name, stat) for component_type in COMPONENT_TYPES
+                   for name in components[component_type] for stat in stat_names[component_type]]
+        return cls(columns, rows)
+
+    def __getstate__(self):
+        return self.columns, self.rows, self.name
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def write(self, replication: int, statistics: tuple) -> None:
+        """
+        Write the statistics of a replication into its row.
+
+        :param replication: Replication number
+        :param statistics: Results of ``calculate_statistics``
+        """
+        if self._index is None:
+            self._index = {column: i for i, column in enumerate(self.columns)}
+            self._components = {(component_type, name) for component_type, name, _ in self.columns}
+
+        row = np.full(len(self.columns), np.nan)
+        for component_type, name, component_stats in iterate_components(statistics):
+            if (component_type, name) not in self._components:
+                raise ValueError(f"{component_type} {name} was created while the model ran and has no column in the "
+                                 f"shared replication results, disable multiprocessing.shared_memory_results")
+            for stat, value in component_stats.items():
+                i = self._index.get((component_type, name, stat))
+                if i is not None and isinstance(value, (int, float)):
+                    row[i] = value
+        self.array[replication % self.rows] = row
+
+    def row(self, replication: int) -> np.ndarray:
+        """
+        :param replication: Replication number
+        :return: Row of the replication, a view into the shared memory block
+        """
+        return self.array[replication % self.rows]
+
+    def close(self) -> None:
+        """Detach from the shared memory block."""
+        self.array = None
+        self._shm.close()
+
+    def release(self) -> None:
+        """Detach from and remove the shared memory block, called by the process that created it."""
+        self.close()
+        self._shm.unlink()
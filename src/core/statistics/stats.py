@@ -1,5 +1,4 @@
 import numpy as np
-from scipy.stats import norm, t
 
 import src.core.global_imports as gi
 from src.core.components.combiner import Combiner
@@ -401,6 +400,28 @@ def calculate_statistics(env) -> tuple:
     return entity_stats, server_stats, sink_stats, source_stats, vehicle_stats, storage_stats, separator_stats, combiner_stats
 
 
+REPLICATION_STAT_NAMES = {
+    'Entity': ['NumberCreated', 'NumberDestroyed', 'NumberInSystem (average)', 'NumberRemaining', 'TimeInSystem (average)', 'TimeInSystem (max)', 'TimeInSystem (min)'],
+    'Server': ['EntitiesInQueue (average)', 'EntitiesInQueue (max)', 'EntitiesInQueue (total)', 'EntitiesProcessed', 'NumberDowntimes',
+               'ScheduledUtilization', 'StarvingTime (scheduled)', 'StarvingTime (total)', 'TimeInQueue (average)', 'TimeInQueue (max)',
+               'TimeProcessing (average)', 'TimeProcessing (total)', 'TotalDowntime', 'UnitsUtilized'],
+    'Sink': ['NumTimesProcessed (average)', 'NumTimesProcessed (max)', 'NumTimesProcessed (min)', 'NumberEntered', 'TimeInSystem (average)', 'TimeInSystem (max)', 'TimeInSystem (min)'],
+    'Source': ['NumberCreated', 'NumberExited'],
+    'Vehicle': ['EntitiesInQueue (average)', 'EntitiesInQueue (max)', 'EntitiesInQueue (total)', 'EntitiesTransported', 'NumberDowntimes', 'ScheduledUtilization', 'StarvingTime (scheduled)', 'StarvingTime (total)',
+                'TimeInQueue (average)', 'TimeInQueue (max)', 'TotalDowntimes', 'TotalTrips', 'TravelTime (average)', 'TravelTime (total)', 'UnitsUtilized'],
+    'Storage': ['EntitiesInQueue (average)', 'EntitiesInQueue (max)', 'EntitiesInQueue (total)', 'EntitiesProcessed',
+                'ScheduledUtilization', 'StarvingTime (scheduled)', 'StarvingTime (total)', 'TimeInQueue (average)', 'TimeInQueue (max)', 'TimeProcessing (average)', 'TimeProcessing (total)', 'UnitsUtilized'],
+    'Separator': ['EntitiesInQueue (average)', 'EntitiesInQueue (max)', 'EntitiesInQueue (total)', 'EntitiesProcessed', 'NumberDowntimes',
+                  'ScheduledUtilization', 'StarvingTime (scheduled)', 'StarvingTime (total)', 'TimeInQueue (average)', 'TimeInQueue (max)',
+                  'TimeProcessing (average)', 'TimeProcessing (total)', 'TotalDowntime', 'UnitsUtilized'],
+    'Combiner': ['EntitiesInQueue (total)', 'EntitiesProcessed', 'NumberDowntimes', 'MembersEntered', 'MembersInQueue (average)', 'MembersInQueue (max)',
+                 'Members TimeInQueue (average)', 'Members TimeInQueue (max)', 'ParentsEntered', 'ParentsInQueue (average)', 'ParentsInQueue (max)', 'Parents TimeInQueue (average)',
+                 'Parents TimeInQueue (max)', 'ScheduledUtilization', 'StarvingTime (scheduled)', 'StarvingTime (total)', 'TimeProcessing (average)', 'TimeProcessing (total)',
+                 'TotalDowntime', 'UnitsUtilized'],
+}
+"""Statistics aggregated over replications per component type, in the order of ``calculate_statistics``"""
+
+
 def calculate_all_stats(all_entity_stats, all_server_stats, all_sink_stats, all_source_stats,
                         all_vehicle_stats, all_storage_stats, all_separator_stats, all_combiner_stats,
                         entity_stat_names, server_stat_names, sink_stat_names,
@@ -411,6 +432,9 @@ def calculate_all_stats(all_entity_stats, all_server_stats, all_sink_stats, all_
 
      separator_stat_names, combiner_stat_names,
     """
+    # scipy.stats takes longer to import than a short simulation runs, only import it when aggregating
+    from scipy.stats import norm, t
+
     def calculate_aggregate_stats(values) -> tuple:
         numeric_values = [v for v in values if isinstance(v, (int, float))]
         if not numeric_values:
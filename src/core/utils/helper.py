@@ -1,17 +1,31 @@
-from typing import Tuple, Callable, Union
+import os
+from typing import TYPE_CHECKING, Tuple, Callable, Union
+
 import src.core.config as cfg
+import src.core.global_imports as gi
+from src.core.utils.random_streams import RandomStreams
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 ROUND_DECIMAL_PLACES = 4
 
+_csv_tables = {}
+"""Parsed input tables by path and reading options, with the modification time of the parsed file"""
 
-def get_value_from_distribution_with_parameters(dwp: Tuple[Callable[..., float]]):
+
+def get_value_from_distribution_with_parameters(dwp: Tuple[Callable[..., float]], stream_name: Tuple[str, str] = None):
     """
     Get a value from a distribution with parameters.
 
     :param dwp: Tuple of distribution function and parameters
+    :param stream_name: Tuple of component name and purpose of the random stream to draw from (see RandomStreams)
 
     :return: Value from the distribution
     """
+    if RandomStreams.active:
+        return RandomStreams.draw(dwp, stream_name)
+
     distribution, parameters = dwp[0], dwp[1:]
     return distribution(*parameters)
 
@@ -74,39 +88,32 @@ def round_value(val: Union[int, float]):
     return round(val, cfg.precision) if isinstance(val, float) else val
 
 
-def count_entity_type(entity_type: str, queue: list):
+def read_csv_table(csv_path: str, config: dict = None) -> 'pd.DataFrame':
     """
-    Counts the number of an entity type in the queue.
+    Read a CSV input table (arrival table, routing table, work schedule, worker list).
 
-    :param entity_type: Type of the entity to count.
-    :param queue: The queue where the entites are in.
-    :return: Number of appearences of an entity type.
-    """
-
-    return sum(1 for entity in queue if entity[0].entity_type == entity_type)
+    A table is parsed only once per process and shared by every model built afterwards, so replications and the
+    replication workers reuse the parsed table instead of reading the file again. The file is parsed again when it
+    was modified, replacing the table of the older version. Every call returns a copy of the parsed table, so a model
+    that changes its table doesn't change the tables of the following models.
 
-
-def get_entity_by_type(entity_type: str, queue: list):
+    :param csv_path: Path to the CSV file
+    :param config: Optional pandas configuration for CSV reading
+    :return: The parsed table
     """
-    Gets the first entity of a specific type from a queue.
-
-   :param entity_type: Type of the entity to count.
-   :param queue: The queue where the entites are in.
-   :return: First entity of the entity type in the queue.
-   """
-    found_index = None
-    found_entity = None
-    i = 0
-
-    while found_entity is None:
-        if queue[i][0].entity_type == entity_type:
-            found_index = i
-            found_entity = queue[i]
-        i += 1
-
-    if found_index is not None:
-        del queue[found_index]
-        return found_entity
+    options = tuple(sorted(config.items())) if config else ()
+    key = (os.path.abspath(csv_path), options)
+    modification_time = os.path.getmtime(csv_path)
+    try:
+        cached = _csv_tables.get(key)
+    except TypeError:
+        # Unhashable reading options can't be cached
+        return gi.import_pandas().read_csv(csv_path, **config)
+
+    if cached is None or cached[0] != modification_time:
+        # Only the latest version of a file is kept
+        cached = _csv_tables[key] = (modification_time, gi.import_pandas().read_csv(csv_path, **dict(options)))
+    return cached[1].copy()
 
 
 def execute_trigger(trigger, component, entity, *args, **kwargs) -> bool:
@@ -1,4 +1,9 @@
+import copy
 import logging
+import logging.handlers
+import multiprocessing
+import queue
+from typing import Dict, Optional
 
 
 def add_logging_level(level_name, level_num, method_name=None) -> None:
@@ -44,3 +49,273 @@ def add_logging_level(level_name, level_num, method_name=None) -> None:
     setattr(logging, level_name, level_num)
     setattr(logging.getLoggerClass(), method_name, logForLevel)
     setattr(logging, method_name, logToRoot)
+
+
+class LazyLogEntry:
+    """
+    Entity processing log message at a simulation time that is formatted only when a handler emits it.
+
+    ``logging`` calls ``str()`` on the message of a record just before writing it, so the message template, its
+    arguments and the date time string of ``DateTime.get`` cost nothing for records that no handler writes.
+    """
+    __slots__ = ('time', 'message', 'args')
+
+    def __init__(self, time, message: str, *args):
+        """
+        :param time: Simulation time of the log entry
+        :param message: Message template for ``str.format``
+        :param args: Arguments of the message template
+        """
+        self.time = time
+        self.message = message
+        self.args = args
+
+    def __str__(self) -> str:
+        from src.core.components.date_time import DateTime
+        from src.core.global_imports import ENTITY_PROCESSING_LOG_ENTRY
+
+        message = self.message.format(*self.args) if self.args else self.message
+        return ENTITY_PROCESSING_LOG_ENTRY.format(message, DateTime.get(self.time))
+
+
+_replication = None
+"""Replication number the records of this process are tagged with."""
+_queue_logging = None
+"""The running QueueLogging of this process, if any."""
+_queue_handler = None
+"""Queue handler of this process, of the running QueueLogging or of a replication worker."""
+
+DROP_REPORT_TIMEOUT = 5.0
+"""Seconds the report of the dropped records of a replication waits for room in the queue"""
+
+
+def set_replication(replication: Optional[int]) -> None:
+    """
+    Tag all records logged by this process through the logging queue with a replication number.
+
+    The records of the previous replication that didn't fit into the queue are reported first.
+
+    :param replication: Replication number or None for records outside of replications
+    """
+    global _replication
+    if _queue_handler is not None:
+        _queue_handler.report_dropped()
+    _replication = replication
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler for a bounded queue.
+
+    Only the message of a record is resolved before it is enqueued (it has to be picklable for worker processes),
+    formatting and I/O are left to the listener. A record waits up to ``timeout`` seconds for room in a full queue,
+    records that still don't fit are dropped and counted in a counter shared by all processes. The number of dropped
+    records of a replication is logged as a warning when the replication changes (see ``set_replication``).
+    """
+
+    def __init__(self, log_queue, dropped, timeout: float = 0):
+        """
+        :param log_queue: Bounded multiprocessing queue
+        :param dropped: Shared multiprocessing.Value counting the dropped records
+        :param timeout: Seconds a record waits for room in a full queue, 0 drops it at once
+        """
+        super().__init__(log_queue)
+        self.dropped = dropped
+        self.timeout = timeout
+        self.unreported: Dict[Optional[int], int] = {}
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.replication = _replication
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.timeout:
+                self.queue.put(record, timeout=self.timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.unreported[_replication] = self.unreported.get(_replication, 0) + 1
+            with self.dropped.get_lock():
+                self.dropped.value += 1
+
+    def report_dropped(self) -> None:
+        """Log a warning with the number of dropped records for every replication that dropped records."""
+        for replication, dropped in list(self.unreported.items()):
+            record = self.prepare(logging.LogRecord(
+                logging.getLogger().name, logging.WARNING, __file__, 0,
+                "%d log records were dropped, the logging queue was full", (dropped,), None))
+            record.replication = replication
+            record.dropped_records = dropped
+            try:
+                self.queue.put(record, timeout=DROP_REPORT_TIMEOUT)
+            except queue.Full:
+                # Reported with the next change of the replication
+                return
+            del self.unreported[replication]
+
+
+class ReplicationQueueListener(logging.handlers.QueueListener):
+    """
+    Queue listener that prefixes the messages of records logged during a replication with the replication number.
+
+    The reports of dropped records are counted by replication.
+    """
+
+    def __init__(self, log_queue, *handlers, respect_handler_level: bool = False,
+                 dropped_per_replication: Optional[Dict[Optional[int], int]] = None):
+        """
+        :param log_queue: Queue of the records
+        :param handlers: Handlers writing the records
+        :param respect_handler_level: Whether the levels of the handlers filter the records
+        :param dropped_per_replication: Dictionary the dropped records are counted in by replication
+        """
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.dropped_per_replication = {} if dropped_per_replication is None else dropped_per_replication
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        replication = getattr(record, 'replication', None)
+        dropped = getattr(record, 'dropped_records', 0)
+        if dropped:
+            self.dropped_per_replication[replication] = self.dropped_per_replication.get(replication, 0) + dropped
+        if replication is not None:
+            record.msg = f"[Replication {replication}] {record.msg}"
+        return record
+
+    def enqueue_sentinel(self) -> None:
+        # The queue can be full when the listener is stopped
+        self.queue.put(self._sentinel)
+
+
+class QueueLogging:
+    """
+    Logging pipeline in which simulation code only enqueues records.
+
+    The handlers of the root logger are moved behind a single listener thread in the parent process that does all
+    formatting and I/O. Replication worker processes get a handler for the same bounded queue (see
+    ``install_worker_queue_logging``), so they never contend on the output.
+
+    A record waits up to ``queue_timeout`` seconds for room in a full queue, so while the queue is full the simulation
+    is slowed down to the pace of the listener instead of losing records. With a timeout of 0 the simulation never
+    waits and the records that don't fit are dropped.
+    """
+
+    def __init__(self, queue_size: int = 10000, queue_timeout: float = 5.0):
+        """
+        :param queue_size: Maximum number of records waiting in the queue
+        :param queue_timeout: Seconds a record waits for room in a full queue before it's dropped, 0 to drop it at once
+        """
+        self.queue = multiprocessing.Queue(queue_size)
+        self.dropped = multiprocessing.Value('L', 0)
+        self.handler = BoundedQueueHandler(self.queue, self.dropped, queue_timeout)
+        self.listener = None
+        self.dropped_per_replication: Dict[Optional[int], int] = {}
+        self._root_handlers = []
+
+    @property
+    def dropped_records(self) -> int:
+        """Number of records dropped because the queue was full."""
+        return self.dropped.value
+
+    def start(self) -> None:
+        """Move the root handlers behind the listener and install the queue handler on the root logger."""
+        global _queue_handler
+        _queue_handler = self.handler
+        root = logging.getLogger()
+        self._root_handlers = list(root.handlers)
+        for handler in self._root_handlers:
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+
+        self.listener = ReplicationQueueListener(self.queue, *self._root_handlers, respect_handler_level=True,
+                                                 dropped_per_replication=self.dropped_per_replication)
+        self.listener.start()
+
+    def stop(self) -> int:
+        """
+        Write all queued records and restore the root handlers.
+
+        The number of dropped records by replication is in ``dropped_per_replication``, records logged outside of
+        replications under None.
+
+        :return: Number of dropped records
+        """
+        global _queue_handler
+        self.handler.report_dropped()
+        _queue_handler = None
+        root = logging.getLogger()
+        root.removeHandler(self.handler)
+        self.listener.stop()
+        self.listener = None
+        for handler in self._root_handlers:
+            root.addHandler(handler)
+
+        if self.dropped_records:
+            logging.warning("Logging queue was full, %d records were dropped", self.dropped_records)
+        return self.dropped_records
+
+    def worker_initializer(self):
+        """
+        :return: Initializer and its arguments for the replication worker processes
+        """
+        return install_worker_queue_logging, (self.queue, self.dropped, logging.getLogger().level, self.handler.timeout)
+
+
+def install_worker_queue_logging(log_queue, dropped, level: int, timeout: float = 0) -> None:
+    """
+    Initializer of a replication worker process: send all records of the process to the parent's logging queue.
+
+    :param log_queue: Queue of the parent's QueueLogging
+    :param dropped: Shared counter of dropped records
+    :param level: Level of the root logger
+    :param timeout: Seconds a record waits for room in a full queue
+    """
+    global _queue_handler
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    _queue_handler = BoundedQueueHandler(log_queue, dropped, timeout)
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+
+
+def start_queue_logging(queue_size: int = 10000, queue_timeout: float = 5.0) -> QueueLogging:
+    """
+    Switch the logging of this process to a queue with a single listener, stopping a running one first.
+
+    :param queue_size: Maximum number of records waiting in the queue
+    :param queue_timeout: Seconds a record waits for room in a full queue before it's dropped, 0 to drop it at once
+    :return: The running QueueLogging
+    """
+    global _queue_logging
+    stop_queue_logging()
+    _queue_logging = QueueLogging(queue_size, queue_timeout)
+    _queue_logging.start()
+    return _queue_logging
+
+
+def stop_queue_logging() -> int:
+    """
+    Stop the running QueueLogging, write all queued records and restore the root handlers.
+
+    :return: Number of dropped records
+    """
+    global _queue_logging
+    if _queue_logging is None:
+        return 0
+    dropped = _queue_logging.stop()
+    _queue_logging = None
+    return dropped
+
+
+def get_queue_logging() -> Optional[QueueLogging]:
+    """
+    :return: The running QueueLogging of this process or None
+    """
+    return _queue_logging
@@ -0,0 +1,267 @@
+import random
+import zlib
+from statistics import NormalDist
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from src.core.components_abstract.singleton import Singleton
+
+GLOBAL_RANDOM = random.random.__self__
+"""The hidden random.Random instance behind the module functions of random"""
+MODULE_RANDOM = random.random
+"""The module function random.random, bound to the random.Random implementation of GLOBAL_RANDOM"""
+
+# Block samplers for the distributions of the random module: (generator, parameters, size) -> block of variates
+NUMPY_SAMPLERS = {
+    random.expovariate: lambda generator, p, size: generator.exponential(1 / p[0], size),
+    random.uniform: lambda generator, p, size: generator.uniform(p[0], p[1], size),
+    random.triangular: lambda generator, p, size: generator.triangular(
+        p[0], p[2] if len(p) > 2 and p[2] is not None else (p[0] + p[1]) / 2, p[1], size),
+    random.normalvariate: lambda generator, p, size: generator.normal(p[0], p[1], size),
+    random.gauss: lambda generator, p, size: generator.normal(p[0], p[1], size),
+    random.lognormvariate: lambda generator, p, size: generator.lognormal(p[0], p[1], size),
+    random.gammavariate: lambda generator, p, size: generator.gamma(p[0], p[1], size),
+    random.betavariate: lambda generator, p, size: generator.beta(p[0], p[1], size),
+    random.weibullvariate: lambda generator, p, size: p[0] * generator.weibull(p[1], size),
+    random.paretovariate: lambda generator, p, size: generator.pareto(p[0], size) + 1,
+    random.randint: lambda generator, p, size: generator.integers(p[0], p[1] + 1, size),
+}
+"""Distributions of the random module that can be drawn in blocks"""
+
+_STANDARD_NORMAL = NormalDist()
+
+
+class AntitheticRandom(random.Random):
+    """
+    A random.Random for antithetic pairs of runs. With ``complement`` every uniform U is replaced by 1 - U, and every
+    integer k of randint, randrange, choice and shuffle in 0..n-1 by n - 1 - k, so the distributions built on them
+    (inverse transforms like expovariate, uniform and triangular, weighted choices) are mirrored.
+
+    Normal and lognormal variates are drawn by inverse transform from one uniform, so both members of a pair consume
+    the same uniforms. Acceptance-rejection samplers (gammavariate, betavariate, vonmisesvariate) use complemented
+    uniforms too, but the members of a pair can consume a different number of them and drift apart.
+    """
+    complement = False
+
+    def __init__(self, x=None, complement: bool = False):
+        """
+        :param x: Seed
+        :param complement: Whether the uniforms are complemented (second member of a pair)
+        """
+        super().__init__(x)
+        self.complement = complement
+
+    def random(self) -> float:
+        u = super().random()
+        # 1 - U is in (0, 1], U = 0 stays 0 to keep the range of random()
+        return 1.0 - u if self.complement and u else u
+
+    def _randbelow(self, n: int) -> int:
+        k = super()._randbelow(n)
+        return n - 1 - k if self.complement else k
+
+    def normalvariate(self, mu: float = 0.0, sigma: float = 1.0) -> float:
+        return mu + sigma * _STANDARD_NORMAL.inv_cdf(max(self.random(), 2 ** -53))
+
+    def gauss(self, mu: float = 0.0, sigma: float = 1.0) -> float:
+        return self.normalvariate(mu, sigma)
+
+
+class RandomStream:
+    """
+    A source of random variates for distribution specifications ``(distribution, *parameters)``.
+
+    Distributions of the ``random`` module are drawn from the stream's own ``random.Random`` instance, or from blocks
+    of its NumPy generator when batching is enabled. Other functions (lambdas, custom distributions) are called as they
+    are. The default stream has no ``random.Random`` instance of its own and uses the ``random`` module.
+    """
+
+    def __init__(self, seed_sequence: np.random.SeedSequence, own_random: bool = True, antithetic: bool = False,
+                 complement: bool = False):
+        """
+        :param seed_sequence: Seed sequence of the stream
+        :param own_random: Whether the stream draws from its own random.Random instance instead of the random module
+        :param antithetic: Whether the stream draws for an antithetic pair of runs (see AntitheticRandom)
+        :param complement: Whether the stream draws complemented uniforms, for the second member of a pair
+        """
+        self.random = None
+        if own_random:
+            seed = int(seed_sequence.generate_state(1, np.uint64)[0])
+            self.random = AntitheticRandom(seed, complement) if antithetic else random.Random(seed)
+        self.generator = np.random.default_rng(seed_sequence)
+        self._buffers = {}
+
+    def draw(self, dwp: Tuple[Callable[..., float]], batched: bool = False, block_size: int = 4096):
+        """
+        Take the next variate for a distribution specification.
+
+        :param dwp: Tuple of distribution function and parameters
+        :param batched: Whether to draw from pre-drawn NumPy blocks
+        :param block_size: Number of variates drawn per block
+        :return: Value from the distribution
+        """
+        if batched:
+            try:
+                buffer = self._buffers.get(dwp)
+            except TypeError:
+                # Unhashable parameters
+                buffer = None
+            else:
+                if buffer is not None:
+                    try:
+                        return next(buffer)
+                    except StopIteration:
+                        pass
+
+                sampler = NUMPY_SAMPLERS.get(dwp[0])
+                if sampler is not None:
+                    try:
+                        block = sampler(self.generator, dwp[1:], block_size)
+                    except (ValueError, TypeError, IndexError, ZeroDivisionError):
+                        # Parameters NumPy does not accept (e.g. a degenerate triangle), draw it unbatched
+                        block = None
+
+                    if block is not None:
+                        buffer = self._buffers[dwp] = iter(block.tolist())
+                        return next(buffer)
+
+        distribution = dwp[0]
+        if getattr(distribution, '__self__', None) is GLOBAL_RANDOM:
+            # Bound to the random module's instance at import, looked up again for the methods of AntitheticRandom
+            distribution = getattr(self.random or GLOBAL_RANDOM, distribution.__name__)
+        return distribution(*dwp[1:])
+
+
+class RandomStreams(Singleton):
+    """
+    Registry of the random streams of a simulation run.
+
+    With named streams enabled, every component and purpose, e.g. ``("Placement", "processing")``, draws from its own
+    stream. The stream is derived from the run's seed with ``numpy.random.SeedSequence`` and a spawn key made from the
+    component name and purpose. Its draws therefore don't depend on other components or the event order: adding a
+    component leaves the draws of all others unchanged, and scenarios run with the same seed get common random numbers.
+
+    Both named streams and batching (see ``RandomStream.draw``) change the random numbers for a seed compared to the
+    ``random`` module and are disabled by default (config ``simulation.random_streams``,
+    ``performance.batched_variates``).
+
+    For antithetic pairs of runs (see ``set_antithetic``) all streams and the random module draw through
+    AntitheticRandom. Components always draw from named streams then, so the uniforms of a component and purpose are
+    complemented one for one even when the members of a pair process their events in a different order. Variates are
+    not batched.
+    """
+    named = False
+    """Whether components draw from their own named streams."""
+    batched = False
+    """Whether variates are drawn from pre-drawn NumPy blocks."""
+    active = False
+    """Whether named streams, batching or antithetic variates are enabled."""
+    antithetic = False
+    """Whether the run is a member of an antithetic pair."""
+    complement = False
+    """Whether the run is the second member of an antithetic pair, drawing complemented uniforms."""
+    block_size = 4096
+    """Number of variates drawn per block."""
+    seed_entropy = 1
+    default = RandomStream(np.random.SeedSequence(1), own_random=False)
+    """Stream for draws without a component, backed by the random module."""
+    _streams = {}
+
+    @classmethod
+    def configure(cls, named: bool = False, batched: bool = False, block_size: int = 4096) -> None:
+        """
+        Enable or disable named streams and batching.
+
+        :param named: Whether components draw from their own named streams
+        :param batched: Whether variates are drawn from pre-drawn NumPy blocks
+        :param block_size: Number of variates drawn per block
+        """
+        cls.named = named
+        cls.batched = batched
+        cls.active = named or batched or cls.antithetic
+        cls.block_size = block_size
+        cls.seed(cls.seed_entropy)
+
+    @classmethod
+    def set_antithetic(cls, antithetic: bool, complement: bool = False) -> None:
+        """
+        Draw the following runs as a member of an antithetic pair, or normally again.
+
+        The random module's instance is switched to AntitheticRandom, so distributions of the random module complement
+        their uniforms wherever they are called. ``random.random`` is bound to the instance's method while the runs are
+        antithetic, so distributions calling it directly like ``(lambda: random.random() * k,)`` are complemented too,
+        and restored afterwards (``ReplicationRunner`` switches back in a ``finally``). Functions that bound
+        ``random.random`` to another name beforehand (``from random import random``) are not complemented. The streams
+        are created anew by the next ``seed``.
+
+        :param antithetic: Whether the runs are members of an antithetic pair
+        :param complement: Whether the runs are second members, drawing 1 - U for every uniform U
+        """
+        cls.antithetic = antithetic
+        cls.complement = antithetic and complement
+        cls.active = cls.named or cls.batched or antithetic
+        if antithetic:
+            GLOBAL_RANDOM.__class__ = AntitheticRandom
+            GLOBAL_RANDOM.complement = cls.complement
+            # The module function is bound to random.Random.random, not to the method of the instance's class
+            random.random = GLOBAL_RANDOM.random
+        else:
+            GLOBAL_RANDOM.__class__ = random.Random
+            vars(GLOBAL_RANDOM).pop('complement', None)
+            random.random = MODULE_RANDOM
+
+    @classmethod
+    def seed(cls, value) -> None:
+        """
+        Reseed all streams and drop all pre-drawn variates.
+
+        :param value: Seed of the run
+        """
+        if value is not None and not (isinstance(value, int) and value >= 0):
+            # SeedSequence only accepts non-negative integers
+            value = zlib.crc32(repr(value).encode())
+        cls.seed_entropy = value
+        cls.default = RandomStream(np.random.SeedSequence(value), own_random=False)
+        cls._streams = {}
+
+    @classmethod
+    def get(cls, stream_name: Optional[Tuple[str, str]]) -> RandomStream:
+        """
+        Get the stream of a component and purpose.
+
+        :param stream_name: Tuple of component name and purpose, or None for the default stream
+        :return: The stream, the default stream if named streams are disabled
+        """
+        if stream_name is None or not (cls.named or cls.antithetic):
+            return cls.default
+
+        stream = cls._streams.get(stream_name)
+        if stream is None:
+            spawn_key = tuple(zlib.crc32(part.encode()) for part in stream_name)
+            stream = cls._streams[stream_name] = RandomStream(
+                np.random.SeedSequence(cls.seed_entropy, spawn_key=spawn_key), antithetic=cls.antithetic,
+                complement=cls.complement)
+        return stream
+
+    @classmethod
+    def draw(cls, dwp: Tuple[Callable[..., float]], stream_name: Optional[Tuple[str, str]] = None):
+        """
+        Take the next variate for a distribution specification from a stream.
+
+        :param dwp: Tuple of distribution function and parameters
+        :param stream_name: Tuple of component name and purpose, or None for the default stream
+        :return: Value from the distribution
+        """
+        return cls.get(stream_name).draw(dwp, cls.batched and not cls.antithetic, cls.block_size)
+
+    @classmethod
+    def random(cls, stream_name: Optional[Tuple[str, str]] = None):
+        """
+        Random number generator of a stream for draws that are not distribution specifications (e.g. choices).
+
+        :param stream_name: Tuple of component name and purpose, or None for the default stream
+        :return: The stream's random.Random instance, or the random module if named streams are disabled
+        """
+        stream = cls.get(stream_name)
+        return stream.random if stream.random is not None else random
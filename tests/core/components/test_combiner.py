@@ -5,8 +5,9 @@ import simpy
 
 from src.core.components.sink import Sink
 from src.core.components.source import Source
-from src.core.components.entity import EntityManager
+from src.core.components.entity import Entity, EntityManager
 from src.core.components.combiner import Combiner
+from src.core.components.entity_type_queue import EntityTypeQueue
 from src.core.components.separator import Separator
 
 
@@ -70,3 +71,23 @@ class TestCases(unittest.TestCase):
         assert combiner.number_combinded_exited_pivot_table <= combiner.number_members_entered_pivot_table
         assert separator.number_members_exited_pivot_table > 0
         assert separator.number_parents_exited_pivot_table > 0
+
+    def test_member_queue_by_entity_type(self):
+        member_queue = EntityTypeQueue()
+        members = [Entity(f"Member_{i}", 0, entity_type) for i, entity_type in enumerate('abab')]
+        for i, member in enumerate(members):
+            member_queue.append((member, i))
+
+        self.assertEqual(len(member_queue), 4)
+        self.assertEqual(member_queue.count('a'), 2)
+        self.assertEqual(member_queue.count('c'), 0)
+
+        # Oldest member of a type, newest member overall
+        self.assertEqual(member_queue.pop_by_type('b'), (members[1], 1))
+        self.assertEqual(member_queue.pop(), (members[3], 3))
+        self.assertEqual(member_queue.pop(), (members[2], 2))
+        self.assertEqual(list(member_queue), [(members[0], 0)])
+
+        member_queue.clear()
+        self.assertEqual(len(member_queue), 0)
+        self.assertRaises(IndexError, member_queue.pop)
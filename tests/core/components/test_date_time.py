@@ -0,0 +1,45 @@
+import unittest
+from datetime import datetime
+
+import src.core.config as cfg
+from src.core.components.date_time import DateTime
+from src.core.types.time_component import TimeComponent
+
+
+class TestCases(unittest.TestCase):
+
+    def setUp(self):
+        DateTime.set(datetime(2024, 12, 12, 0, 0, 0))
+
+    def tearDown(self):
+        DateTime.map(TimeComponent.minute)
+        cfg.reset_to_global()
+
+    def test_cached_results_match_formatting(self):
+        for time_now in (0, 1, 1.0, 59.5, 1440, 1234.56789):
+            for flags in ((True, False), (False, True), (False, False)):
+                expected = DateTime._format(time_now, *flags)
+                self.assertEqual(DateTime.get(time_now, *flags), expected)
+                self.assertEqual(DateTime.get(time_now, *flags), expected)
+
+        self.assertEqual(DateTime.get(90), "90  , 1:30:00, Thu 12 Dec 2024, 01:30:00:000000")
+        self.assertEqual(DateTime.get(90.0), "90.0, 1:30:00, Thu 12 Dec 2024, 01:30:00:000000")
+        self.assertEqual(DateTime.get(1440, False, True), (5, 0, 0))
+
+    def test_cache_follows_date_time_mapping_and_precision(self):
+        self.assertEqual(DateTime.get(90, False), "1:30:00")
+
+        DateTime.map(TimeComponent.second)
+        self.assertEqual(DateTime.get(90, False), "0:01:30")
+
+        DateTime.set(datetime(2024, 12, 13, 0, 0, 0))
+        self.assertEqual(DateTime.get(90), "90  , 0:01:30, Fri 13 Dec 2024, 00:01:30:000000")
+
+        self.assertTrue(DateTime.get(1.23456).startswith("1.2346, "))
+        cfg.apply_overrides({'simulation': {'precision': 2}})
+        self.assertTrue(DateTime.get(1.23456).startswith("1.23, "))
+
+    def test_cache_size_is_bounded(self):
+        for time_now in range(DateTime.format_cache_size * 2):
+            DateTime.get(time_now)
+        self.assertLessEqual(len(DateTime._format_cache), DateTime.format_cache_size)
@@ -2,11 +2,12 @@ import unittest
 import random
 import simpy
 
-from src.core.components.model import Model
+from src.core.components.model import Model, ComponentType
 from src.core.components.entity import EntityManager
 from src.core.components.server import Server
 from src.core.components.sink import Sink
 from src.core.components.source import Source
+from src.core.components_abstract.resetable_named_object import ResetAbleNamedObject
 
 
 class TestCases(unittest.TestCase):
@@ -70,3 +71,50 @@ class TestCases(unittest.TestCase):
 
         # Check that the state got update every time an entity left the server
         assert len(Model().get_state('test')) == sink.number_entered_pivot_table
+
+    def test_component_ids(self):
+        Model().reset_simulation()
+        server_1 = Server(self.env, "IdServer1", (random.expovariate, 1 / 6))
+        server_2 = Server(self.env, "IdServer2", (random.expovariate, 1 / 6))
+
+        assert server_1.component_id != server_2.component_id
+        assert Model().get_component_by_id(server_1.component_id) is server_1
+        assert list(Model().get_component(ComponentType.SERVERS)) == [server_1, server_2]
+
+        # A component replacing another one with the same name takes over its id and slot
+        replacement = Server(self.env, "IdServer1", (random.expovariate, 1 / 6))
+        assert replacement.component_id == server_1.component_id
+        assert Model().get_component_by_id(server_1.component_id) is replacement
+        assert list(Model().get_component(ComponentType.SERVERS)) == [replacement, server_2]
+
+        # Ids stay stable when the model is rebuilt
+        Model().reset_simulation()
+        assert Model().get_component_by_id(server_2.component_id) is None
+        rebuilt = Server(self.env, "IdServer2", (random.expovariate, 1 / 6))
+        assert rebuilt.component_id == server_2.component_id
+
+        # Unknown ids don't resolve, an id reserved for a name is taken by the component created later
+        assert Model().get_component_by_id(-1) is None
+        assert Model().get_component_by_id(len(Model().component_ids)) is None
+        reserved = Model().get_component_id("IdServer3")
+        assert Model().get_component_by_id(reserved) is None
+        assert Server(self.env, "IdServer3", (random.expovariate, 1 / 6)).component_id == reserved
+
+    def test_component_registry_with_many_components(self):
+        class SyntheticComponent(ResetAbleNamedObject):
+            def reset(self):
+                pass
+
+        Model().reset_simulation()
+        manager = Model().get_component(ComponentType.SERVERS)
+        for i in range(50000):
+            component = SyntheticComponent(self.env, f"Synthetic_{i}", ComponentType.SERVERS, manager)
+            Model().add_component(component, ComponentType.SERVERS)
+
+        assert len(manager) == 50000
+        for name in ("Synthetic_0", "Synthetic_25000", "Synthetic_49999"):
+            component = Model().get_component_by_name(name)
+            assert manager.get(name) is component
+            assert Model().get_component_by_id(component.component_id) is component
+            assert component.component_id == Model().component_ids[name]
+        Model().reset_simulation()
@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+from scipy.integrate import odeint
+
+from src.core.components.oven import Oven
+
+
+class TestCases(unittest.TestCase):
+
+    def _solve_numerically(self, oven, time_range):
+        return odeint(oven.model, oven.current_values, time_range,
+                      args=(oven.proportionality_constant_temperature_workpiece,
+                            oven.proportionality_constant_temperature_oven,
+                            oven.proportionality_constant_door))
+
+    def test_closed_form_matches_ode_solution(self):
+        for door_status, heating_status in ((False, True), (True, True), (True, False)):
+            oven = Oven(temperature_initiale_workpiece=15, temperature_initiale_oven=80)
+            oven.update_oven(heating_status=heating_status, door_status=door_status)
+            time_range = np.linspace(0, 30, 301)
+
+            expected = self._solve_numerically(oven, time_range)
+            workpiece, temperature_oven = oven.temperatures_after(time_range)
+
+            np.testing.assert_allclose(workpiece, expected[:, 0], atol=1e-4)
+            np.testing.assert_allclose(temperature_oven, expected[:, 1], atol=1e-4)
+
+    def test_closed_form_with_equal_rates(self):
+        oven = Oven(temperature_initiale_workpiece=15, temperature_initiale_oven=80)
+        oven.proportionality_constant_temperature_workpiece = oven.proportionality_constant_temperature_oven
+        time_range = np.linspace(0, 30, 301)
+
+        expected = self._solve_numerically(oven, time_range)
+        workpiece, _ = oven.temperatures_after(time_range)
+
+        np.testing.assert_allclose(workpiece, expected[:, 0], atol=1e-4)
+
+    def test_time_to_required_temperature(self):
+        oven = Oven(temperature_initiale_oven=20, temperature_initiale_setpoint=200)
+        time_to_heat = oven.calculate_time_to_required_temperature()
+
+        _, temperature_oven = oven.temperatures_after(time_to_heat)
+        self.assertAlmostEqual(temperature_oven, 185)
+
+        # The previous grid search on a 0.1 step found the first grid point after the exact time
+        time_range = np.arange(0, 100, 0.1)
+        solution = self._solve_numerically(oven, time_range)
+        grid_time = time_range[np.argmax(solution[:, 1] >= 185)]
+        self.assertLessEqual(grid_time - time_to_heat, 0.1 + 1e-6)
+        self.assertGreaterEqual(grid_time - time_to_heat, -1e-6)
+
+        # Never reached with the door open and the heating off
+        oven.update_oven(heating_status=False, door_status=True)
+        self.assertEqual(oven.calculate_time_to_required_temperature(), 10000)
+
+    def test_history_is_bounded(self):
+        oven = Oven(history_size=50)
+        for step in range(1, 101):
+            oven.update_oven(door_status=step % 2 == 0)
+            oven.calculate_oven(step)
+
+        self.assertEqual(len(oven.temperature_history_oven), 50)
+        self.assertEqual(len(oven.list_with_timestamps_in_steps), 50)
+        self.assertEqual(oven.list_with_timestamps_in_steps[-1], 100)
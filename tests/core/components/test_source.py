@@ -2,12 +2,16 @@ import unittest
 from pathlib import Path
 from typing import Union
 import os
+import tempfile
+from unittest.mock import patch
 import simpy
 from src.core.simulation.simulation import run_simulation
 
 from src.core.components.entity import Entity, EntityManager
 from src.core.components.sink import Sink
 from src.core.components.source import Source
+from src.core.utils import helper
+from src.core.utils.helper import read_csv_table
 
 
 class TestCase(unittest.TestCase):
@@ -187,3 +191,29 @@ class TestCase(unittest.TestCase):
 
         self.assertEqual(count_wood, 2)
         self.assertEqual(count_stone, 1)
+
+    def test_arrival_table_parsed_once(self):
+        first = Source(self.env, "TestSource1", arrival_table_file=self.arrival_table_path_arrival_para)
+        first.arrival_table.iat[0, 0] = -1
+        # A model rebuilt for the next replication reuses the parsed table, in a copy of its own
+        EntityManager.env = self.env = simpy.Environment()
+        with patch('pandas.read_csv') as read_csv:
+            second = Source(self.env, "TestSource1", arrival_table_file=self.arrival_table_path_arrival_para)
+        read_csv.assert_not_called()
+        self.assertIsNot(first.arrival_table, second.arrival_table)
+        self.assertNotEqual(second.arrival_table.iat[0, 0], -1)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            table_file = os.path.join(tmp_dir, 'arrivals.csv')
+            with open(table_file, 'w') as f:
+                f.write('time\n1\n2\n')
+            table = read_csv_table(table_file)
+
+            with open(table_file, 'w') as f:
+                f.write('time\n1\n2\n3\n')
+            os.utime(table_file, (os.path.getmtime(table_file) + 10,) * 2)
+            self.assertEqual(len(table), 2)
+            self.assertEqual(len(read_csv_table(table_file)), 3)
+            # The table of the older version isn't kept
+            self.assertEqual([key for key in helper._csv_tables if key[0] == os.path.abspath(table_file)],
+                             [(os.path.abspath(table_file), ())])
@@ -5,7 +5,7 @@ import simpy
 
 from src.core.components.vehicle import Vehicle
 from src.core.components.vehicle_manager import VehicleManager
-from src.core.components.entity import EntityManager
+from src.core.components.entity import Entity, EntityManager
 from src.core.components.server import Server
 from src.core.components.sink import Sink
 from src.core.components.source import Source
@@ -77,3 +77,35 @@ class TestCase(unittest.TestCase):
         self.assertGreater(server2.number_entered_pivot_table, 10)
         self.assertGreater(vehicle_1.entities_transported, 10)
         self.assertEqual(vehicle_2.entities_transported, 0)
+
+    def test_idle_vehicle_index_follows_vehicle_state(self):
+        VehicleManager().add_vehicle_group('IdleTest')
+        VehicleManager().env = self.env
+        vehicles = [Vehicle(self.env, f'idle_vehicle_{i}', (lambda: 1,), vehicle_group='IdleTest') for i in range(4)]
+        self.assertEqual(VehicleManager().idle_vehicles['IdleTest'], [0, 1, 2, 3])
+
+        vehicles[2].idle = False
+        vehicles[0].idle = False
+        self.assertEqual(VehicleManager().idle_vehicles['IdleTest'], [1, 3])
+
+        vehicles[2].idle = True
+        self.assertEqual(VehicleManager().idle_vehicles['IdleTest'], [1, 2, 3])
+
+    def test_batch_loading_keeps_arrival_order(self):
+        VehicleManager().add_vehicle_group('BatchTest')
+        VehicleManager().env = self.env
+        vehicle = Vehicle(self.env, 'batch_vehicle', (lambda: 1,), vehicle_capacity=3, batching=True, vehicle_group='BatchTest')
+        sink = Sink(self.env, "BatchSink")
+        arrived = []
+        sink.handle_entity_arrival = arrived.append
+
+        entities = [Entity(f'batch_entity_{i}', 0) for i in range(5)]
+        for entity in entities[:3]:
+            vehicle.handle_entity_arrival(entity, sink)
+        self.env.run(until=10)
+        for entity in entities[3:]:
+            vehicle.handle_entity_arrival(entity, sink)
+        self.env.run(until=20)
+
+        self.assertEqual(arrived, entities[:3])
+        self.assertEqual([entity for entity, _, _ in vehicle.entity_queue], entities[3:])
@@ -0,0 +1,80 @@
+import random
+import unittest
+
+import simpy
+
+from src.core.components.entity import EntityManager
+from src.core.components.vehicle import Vehicle
+from src.core.components.vehicle_manager import VehicleManager
+from src.core.components.vehicle_manager_strategy import get_vehicle_with_no_collusion, \
+    get_vehicle_with_no_collusion_sweep_line
+
+
+class Point:
+    def __init__(self, name, y, x=0):
+        self.name = name
+        self.position = (x, y, 0)
+
+
+class TestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.env = simpy.Environment()
+        EntityManager.env = self.env
+        VehicleManager().add_vehicle_group('CollisionTest')
+        VehicleManager().env = self.env
+
+    def _create_vehicles(self, number):
+        vehicles = []
+        for i in range(number):
+            vehicle = Vehicle(self.env, f'collision_vehicle_{i}', (lambda: 1,), vehicle_group='CollisionTest')
+            vehicle.set_home_point(Point(f'home_{i}', i * 50))
+            vehicles.append(vehicle)
+        return vehicles
+
+    def _randomize(self, vehicles, rng):
+        for vehicle in vehicles:
+            state = rng.random()
+            if state < 0.15:
+                vehicle.lower_bound = rng.randint(0, 1000)
+                vehicle.upper_bound = vehicle.lower_bound + rng.randint(0, 20)
+                vehicle.idle = False
+            elif state < 0.3:
+                vehicle.idle = True
+                vehicle.position = (0, rng.randint(0, 1000), 0)
+            else:
+                vehicle.idle = True
+                vehicle.position = vehicle.home_point.position
+
+    def test_sweep_line_matches_pairwise_strategy(self):
+        rng = random.Random(42)
+        vehicles = self._create_vehicles(20)
+
+        for _ in range(1000):
+            self._randomize(vehicles, rng)
+            calling_object = Point('origin', rng.randint(0, 1000))
+            destination_y = calling_object.position[1] + rng.randint(-30, 30)
+            destination = Point('destination', destination_y, destination_y)
+
+            expected = get_vehicle_with_no_collusion(vehicles, calling_object, None, destination)
+            actual = get_vehicle_with_no_collusion_sweep_line(vehicles, calling_object, None, destination)
+
+            self.assertIs(actual, expected)
+
+    def test_index_follows_vehicle_movement(self):
+        vehicles = self._create_vehicles(2)
+        destination = Point('destination', 5)
+        calling_object = Point('origin', 0)
+
+        get_vehicle_with_no_collusion_sweep_line(vehicles, calling_object, None, destination)
+        position_index = vehicles[0].position_index
+        self.assertIs(vehicles[1].position_index, position_index)
+
+        vehicles[1].lower_bound = 0
+        vehicles[1].upper_bound = 20
+        vehicles[1].idle = False
+        self.assertTrue(position_index.is_blocked(5, vehicles[0], 0, 5))
+
+        vehicles[1].idle = True
+        vehicles[1].position = vehicles[1].home_point.position
+        self.assertFalse(position_index.is_blocked(5, vehicles[0], 0, 5))
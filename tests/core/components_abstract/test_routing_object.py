@@ -143,6 +143,22 @@ class TestCases(unittest.TestCase):
         # Check that only server 2 got entities
         assert server_1.total_entities_processed_pivot_table == 0 and server_2.total_entities_processed_pivot_table > 0
 
+    def test_sequence_destinations_resolved_by_id(self):
+        Model().add_routing_group('TestGroup', 'No_Queue')
+        Model().add_member_to_group('TestGroup', 'TestServer1')
+        server_1 = Server(self.env, "TestServer1", (random.expovariate, 1 / 6), sequence_routing=True)
+        sink = Sink(self.env, "TestSink")
+        Model().add_routing_table('destination', pd.DataFrame({'destination': ['TestGroup', 'TestSink', 'Missing']}))
+
+        self.assertIs(Model().get_sequence_destination(0), server_1)
+        self.assertIs(Model().get_sequence_destination(1), sink)
+        self.assertIsNone(Model().get_sequence_destination(2))
+        self.assertEqual(Model()._routing_table_destinations[1], sink.component_id)
+
+        # A new routing table is resolved again
+        Model().add_routing_table('destination', pd.DataFrame({'destination': ['TestSink']}))
+        self.assertIs(Model().get_sequence_destination(0), sink)
+
     def test_creating_routing_group(self):
         Model().add_routing_group('TestGroup')
         self.assertEqual(len(Model().routing_group['TestGroup']), 0)
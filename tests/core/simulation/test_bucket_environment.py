@@ -0,0 +1,83 @@
+import random
+import unittest
+
+import simpy
+
+import src.core.config as cfg
+from src.core.components.model import Model
+from src.core.components.server import Server
+from src.core.components.sink import Sink
+from src.core.components.source import Source
+from src.core.simulation.bucket_environment import BucketEnvironment, create_environment
+
+
+def record_event_order(env):
+    rng = random.Random(3)
+    order = []
+
+    def worker(name):
+        for i in range(20):
+            # Coarse delays produce many events at the same timestamp
+            yield env.timeout(rng.choice((0, 1, 1, 2)))
+            order.append((env.now, name, i))
+            if i % 5 == 0:
+                event = env.event()
+                event.succeed()
+                yield event
+                order.append((env.now, name, 'event'))
+
+    def interrupter(process):
+        yield env.timeout(3)
+        process.interrupt()
+
+    def interrupted():
+        try:
+            yield env.timeout(10)
+        except simpy.Interrupt:
+            order.append((env.now, 'interrupted'))
+
+    for name in range(30):
+        env.process(worker(name))
+    env.process(interrupter(env.process(interrupted())))
+    env.run(until=25)
+    return order
+
+
+def setup_model(env):
+    source = Source(env, "BucketSource", (random.expovariate, 1 / 2))
+    server = Server(env, "BucketServer", (lambda: 2,))
+    sink = Sink(env, "BucketSink")
+
+    source.connect(server)
+    server.connect(sink)
+
+
+class TestCases(unittest.TestCase):
+
+    def tearDown(self):
+        cfg.reset_to_global()
+
+    def test_same_event_order_as_simpy(self):
+        self.assertEqual(record_event_order(BucketEnvironment()), record_event_order(simpy.Environment()))
+
+    def test_run_until_event_and_peek(self):
+        env = BucketEnvironment()
+        self.assertEqual(env.peek(), simpy.core.Infinity)
+
+        timeout = env.timeout(5, value='done')
+        self.assertEqual(env.peek(), 5)
+        self.assertEqual(env.run(until=timeout), 'done')
+        self.assertEqual(env.now, 5)
+
+    def test_scheduler_selected_by_config(self):
+        self.assertIsInstance(create_environment(), simpy.Environment)
+        self.assertRaises(ValueError, create_environment, 'calendar')
+
+        sink_counts = {}
+        for scheduler in ('heap', 'bucket'):
+            cfg.apply_overrides({'simulation': {'event_scheduler': scheduler}})
+            env = Model().run_simulation(setup_model, 1000, seed=1)
+            self.assertEqual(isinstance(env, BucketEnvironment), scheduler == 'bucket')
+            sink_counts[scheduler] = Model().get_component_by_name("BucketServer").number_exited_pivot_table
+
+        self.assertEqual(sink_counts['heap'], sink_counts['bucket'])
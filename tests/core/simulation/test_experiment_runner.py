@@ -1,9 +1,13 @@
+import random
 import unittest
 import pandas as pd
 from unittest.mock import MagicMock, patch
 
+from src.core.components.model import Model
 from src.core.simulation.experiments.experiment import ScenarioParameter, Scenario, ExperimentRunner
-from src.core.simulation.experiments.parameter_manager import ParameterizedModel, parameterize_model
+from src.core.simulation.experiments.parameter_manager import ParameterizedModel, find_component, parameterize_model
+from src.core.statistics.stats import calculate_statistics
+from tests.helpers import SimulationTestCase, setup_single_server_model
 
 
 class TestScenarioParameter(unittest.TestCase):
@@ -284,6 +288,7 @@ class TestExperimentRunner(unittest.TestCase):
 
         # Verify ReplicationRunner was created and run
         mock_replication_runner_class.assert_called_once()
+        self.assertIsNone(mock_replication_runner_class.call_args.kwargs['config_overrides'])
         mock_runner.run.assert_called_once_with(new_database=True)
 
         # Verify results
@@ -401,6 +406,29 @@ class TestExperimentRunner(unittest.TestCase):
         )
         self.assertTrue(result.equals(pd.DataFrame({'test': [1, 2, 3]})))
 
+    def test_get_paired_difference(self):
+        """Test the paired difference of a statistic between two scenarios."""
+        def replication(queue_time, exits):
+            return {'Server': [{'Server': 'ATM', 'TimeInQueue (average)': queue_time}],
+                    'Sink': {'Exit': {'NumberEntered': exits}}}
+
+        self.runner.replication_data = {
+            'Baseline': [replication(5.0, 100), replication(7.0, 110), replication(6.0, 90)],
+            'TwoATMs': [replication(2.0, 101), replication(3.0, 111), replication(3.5, 91)]
+        }
+
+        difference = self.runner.get_paired_difference('Server', 'ATM', 'TimeInQueue (average)', 'Baseline', 'TwoATMs')
+        self.assertAlmostEqual(difference['Average'], 3.1666667)
+        self.assertEqual(difference['Replications'], 3)
+        self.assertGreater(difference['Half-Width'], 0)
+
+        difference = self.runner.get_paired_difference('Sink', 'Exit', 'NumberEntered', 'Baseline', 'TwoATMs')
+        self.assertEqual(difference['Average'], -1)
+        self.assertEqual(difference['Half-Width'], 0)
+
+        self.assertRaises(ValueError, self.runner.get_paired_difference,
+                          'Server', 'ATM', 'TimeInQueue (average)', 'Baseline', 'Unknown')
+
     @patch('builtins.print')
     @patch('src.core.simulation.experiments.experiment.tabulate')
     def test_display_summary_table(self, mock_tabulate, mock_print):
@@ -633,5 +661,65 @@ class TestIntegrationScenarios(unittest.TestCase):
         self.assertEqual(mock_replication_class.call_count, 3)
 
 
+def branch_model(env, parameters=None):
+    setup_single_server_model(env, "Branch", (random.uniform, 2, 3.8))
+
+
+def rush_hour(env, parameters):
+    if parameters.get('rush'):
+        find_component("BranchSource").creation_time_dwp = (random.expovariate, 1 / 2)
+
+
+class TestBranchedScenarios(SimulationTestCase):
+    """Integration tests for what-if scenarios branched from a mid-run state."""
+
+    def setUp(self):
+        super().setUp()
+        self.experiment = ExperimentRunner("Branching", branch_model)
+        self.experiment.create_scenario('Baseline')
+        self.experiment.create_scenario('FastService', {
+            'BranchServer.processing_time_distribution_with_parameters': (random.uniform, 1, 2)})
+        self.experiment.create_scenario('Rush', {'rush': True})
+
+    def run_branched(self):
+        return self.experiment.run_branched(branch_time=500, steps=1500, replications=3, branch_builder=rush_hour)
+
+    def test_branches_continue_common_run(self):
+        results = self.run_branched()
+        self.assertEqual(list(results['Scenario'].unique()), ['Baseline', 'FastService', 'Rush'])
+
+        # The baseline branch is the run without branching
+        env = Model().run_simulation(ParameterizedModel(branch_model), 1500, seed=2)
+        entity_stats, server_stats, sink_stats, *_ = calculate_statistics(env)
+        baseline = self.experiment.replication_data['Baseline'][2]
+        self.assertEqual(baseline['Server'], server_stats)
+        self.assertEqual(baseline['Sink'], sink_stats)
+
+        faster = self.experiment.get_paired_difference('Entity', 'Entity', 'TimeInSystem (average)',
+                                                       'Baseline', 'FastService')
+        self.assertGreater(faster['Average'], 0)
+        more_entities = self.experiment.get_paired_difference('Source', 'BranchSource', 'NumberCreated',
+                                                              'Rush', 'Baseline')
+        self.assertGreater(more_entities['Average'], 0)
+
+    def test_same_results_without_fork(self):
+        forked = self.run_branched()
+        with patch('src.core.simulation.experiments.experiment.fork_supported', return_value=False):
+            repeated = self.run_branched()
+        pd.testing.assert_frame_equal(forked, repeated)
+
+    def test_unknown_live_parameter(self):
+        self.experiment.create_scenario('SpareParts', {'BranchServer.spare_parts': 2})
+        with self.assertRaisesRegex(ValueError, "spare_parts"):
+            self.run_branched()
+        self.assertRaises(ValueError, self.experiment.run_branched, 2000, 1500)
+
+    def test_structural_live_parameter(self):
+        # The capacity sizes the server's resource when it is created, setting the attribute would change nothing
+        self.experiment.create_scenario('SecondServer', {'BranchServer.capacity': 2})
+        with self.assertRaisesRegex(ValueError, "capacity.*branch_builder"):
+            self.run_branched()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,162 @@
+import random
+import unittest
+
+import src.core.config as cfg
+from src.core.components.model import Model
+from src.core.components.server import Server
+from src.core.components.sink import Sink
+from src.core.components.source import Source
+from src.core.simulation.partitioned_engine import find_partitioned_run
+from src.core.simulation.replication import ReplicationRunner
+from src.core.statistics.stats import calculate_statistics
+from tests.helpers import SimulationTestCase, flatten, setup_single_server_model
+
+
+def setup_plant(env):
+    # Sections A and C feed the assembly of section B through conveyors
+    source_a = Source(env, "PlantSourceA", (random.expovariate, 1 / 5))
+    first_a = Server(env, "PlantFirstA", (random.uniform, 2, 4))
+    second_a = Server(env, "PlantSecondA", (random.uniform, 1, 4))
+    assembly = Server(env, "PlantAssemblyB", (random.triangular, 1, 4, 2), capacity=2)
+    sink_b = Sink(env, "PlantSinkB")
+    source_c = Source(env, "PlantSourceC", (random.expovariate, 1 / 8))
+    server_c = Server(env, "PlantServerC", (random.uniform, 3, 5))
+    sink_c = Sink(env, "PlantSinkC")
+
+    source_a.connect(first_a)
+    first_a.connect(second_a, 80)
+    first_a.connect(assembly, 20, process_duration=7.5)
+    second_a.connect(assembly, process_duration=4.25)
+    assembly.connect(sink_b)
+    source_c.connect(server_c)
+    server_c.connect(sink_c, 50)
+    server_c.connect(assembly, 50, process_duration=3)
+
+
+def setup_failing_plant(env):
+    source = Source(env, "FailingSource", (random.expovariate, 1 / 5))
+    server = Server(env, "FailingServer", (random.uniform, 2, 4))
+    broken = Server(env, "FailingBroken", (lambda: 1 / 0,))
+    sink = Sink(env, "FailingSink")
+
+    source.connect(server)
+    server.connect(broken, process_duration=2)
+    broken.connect(sink)
+
+
+def setup_clocked_line(env, interarrival_b=5, transport_duration=2):
+    # Fixed times, entities from the other section arrive at ServerB at the same times as its own
+    source_a = Source(env, "ClockedSourceA", (random.uniform, 4, 4))
+    server_a = Server(env, "ClockedServerA", (random.uniform, 3, 3))
+    sink_a = Sink(env, "ClockedSinkA")
+    source_b = Source(env, "ClockedSourceB", (random.uniform, interarrival_b, interarrival_b))
+    server_b = Server(env, "ClockedServerB", (random.uniform, 1, 1))
+    sink_b = Sink(env, "ClockedSinkB")
+
+    source_a.connect(server_a)
+    server_a.connect(sink_a, 50)
+    server_a.connect(server_b, 50, process_duration=transport_duration)
+    source_b.connect(server_b)
+    server_b.connect(sink_b)
+
+
+def setup_unordered_clocked_line(env):
+    # An arrival and a creation at ServerB both scheduled at time 3 for time 6
+    setup_clocked_line(env, interarrival_b=3, transport_duration=3)
+
+
+def setup_single_server(env):
+    setup_single_server_model(env, "Unpartitioned")
+
+
+def run_engine(model, engine, duration, warm_up=None, partitions=2, random_streams=True, scheduler='heap'):
+    cfg.apply_overrides({'simulation': {'engine': engine, 'partitions': partitions, 'random_streams': random_streams,
+                                        'event_scheduler': scheduler}})
+    env = Model().run_simulation(model, duration, seed=3, warm_up=warm_up)
+    return dict(flatten(calculate_statistics(env)))
+
+
+class TestPartitionedEngine(SimulationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Other tests switch it on for the whole process, it sends a model to the event loop
+        self.store_processed_entities, Sink.store_processed_entities = Sink.store_processed_entities, False
+
+    def tearDown(self):
+        Sink.store_processed_entities = self.store_processed_entities
+        super().tearDown()
+
+    def assertSameStatistics(self, simpy_stats, partitioned_stats):
+        self.assertEqual(simpy_stats.keys(), partitioned_stats.keys())
+        for name, value in simpy_stats.items():
+            self.assertEqual(value, partitioned_stats[name], name)
+
+    def test_same_statistics_as_simpy_with_named_streams(self):
+        for partitions in (2, 3):
+            for warm_up in (None, 500):
+                with self.subTest(partitions=partitions, warm_up=warm_up):
+                    simpy_stats = run_engine(setup_plant, 'simpy', 3000, warm_up)
+                    partitioned_stats = run_engine(setup_plant, 'partitioned', 3000, warm_up, partitions)
+                    # The parent process only records the statistics of the partitions
+                    self.assertEqual(Source.sources.get("PlantSourceA").entities, [])
+                    self.assertSameStatistics(simpy_stats, partitioned_stats)
+
+    def test_same_statistics_as_simpy_with_simultaneous_events(self):
+        for warm_up, scheduler in ((None, 'heap'), (100, 'heap'), (None, 'bucket')):
+            with self.subTest(warm_up=warm_up, scheduler=scheduler):
+                simpy_stats = run_engine(setup_clocked_line, 'simpy', 1000, warm_up)
+                with self.assertNoLogs(level='INFO'):
+                    partitioned_stats = run_engine(setup_clocked_line, 'partitioned', 1000, warm_up,
+                                                   scheduler=scheduler)
+                self.assertSameStatistics(simpy_stats, partitioned_stats)
+
+    def test_unordered_simultaneous_events_run_with_simpy(self):
+        simpy_stats = run_engine(setup_unordered_clocked_line, 'simpy', 1000)
+        with self.assertLogs(level='INFO') as logs:
+            partitioned_stats = run_engine(setup_unordered_clocked_line, 'partitioned', 1000)
+        self.assertIn("running the model with SimPy", logs.output[-1])
+        self.assertSameStatistics(simpy_stats, partitioned_stats)
+
+    def test_partitions(self):
+        cfg.apply_overrides({'simulation': {'random_streams': True}})
+        Model().start_simulation(setup_plant, 100)
+
+        run = find_partitioned_run(Model(), 2)
+        self.assertEqual([sorted(component.name for component in partition) for partition in run.partitions],
+                         [['PlantAssemblyB', 'PlantFirstA', 'PlantSecondA', 'PlantSinkB', 'PlantSourceA'],
+                          ['PlantServerC', 'PlantSinkC', 'PlantSourceC']])
+        self.assertEqual([(connection.origin_component.name, connection.next_component.name)
+                          for connection in run.cut_connections], [('PlantServerC', 'PlantAssemblyB')])
+        self.assertEqual(run.lookahead, 3)
+        self.assertEqual(find_partitioned_run(Model(), 3).lookahead, 3)
+
+    def test_falls_back_to_simpy(self):
+        for model, random_streams in ((setup_plant, False), (setup_single_server, True)):
+            with self.subTest(model=model.__name__, random_streams=random_streams):
+                cfg.apply_overrides({'simulation': {'random_streams': random_streams}})
+                Model().start_simulation(model, 100)
+                with self.assertLogs(level='DEBUG'):
+                    self.assertIsNone(find_partitioned_run(Model(), 2))
+
+                self.assertEqual(run_engine(model, 'simpy', 1000, random_streams=random_streams),
+                                 run_engine(model, 'partitioned', 1000, random_streams=random_streams))
+
+        cfg.apply_overrides({'simulation': {'random_streams': True}})
+        Model().start_simulation(setup_plant, 100)
+        self.assertIsNone(find_partitioned_run(Model(), 1))
+
+    def test_errors_of_partitions_are_raised(self):
+        self.assertRaises(ZeroDivisionError, run_engine, setup_failing_plant, 'partitioned', 100)
+
+    def test_replications_with_partitioned_engine(self):
+        runners = {engine: ReplicationRunner(setup_plant, 2000, 2, config_overrides={
+            'simulation': {'engine': engine, 'random_streams': True}}) for engine in ('simpy', 'partitioned')}
+
+        for replication in range(2):
+            simpy_stats, partitioned_stats = (runner._run_single_replication(replication) for runner in runners.values())
+            self.assertSameStatistics(dict(flatten(simpy_stats[:8])), dict(flatten(partitioned_stats[:8])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,10 @@
 import unittest
 
+import src.core.config as cfg
 import src.core.global_imports as gi
+from src.core.simulation.replication import ReplicationRunner
 from src.core.simulation.simulation import run_replications
+from tests.helpers import SimulationTestCase, setup_single_server_model
 
 
 def dummy_model(env):
@@ -25,3 +28,19 @@ class TestCases(unittest.TestCase):
 
         # Expectation: flag is reset
         self.assertFalse(gi.COLLECT_ENTITY_TYPE_STATS)
+
+
+def setup_rerun_model(env):
+    setup_single_server_model(env, "Rerun")
+
+
+class TestRepeatedRuns(SimulationTestCase):
+
+    def test_entity_type_stats_reset_between_runs(self):
+        cfg.apply_overrides({'statistics': {'collect_entity_type_stats': True}})
+        runner = ReplicationRunner(setup_rerun_model, 200, 3)
+        runner.run()
+        runner.run()
+
+        self.assertEqual(len(runner.all_entity_type_stats), 3)
+        self.assertEqual(len(runner.results.replications), 3)
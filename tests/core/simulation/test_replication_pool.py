@@ -0,0 +1,88 @@
+import os
+import unittest
+
+import src.core.config as cfg
+from src.core.simulation.replication import ReplicationRunner
+from src.core.simulation.replication_pool import ReplicationPool
+from tests.helpers import SimulationTestCase, setup_single_server_model
+
+
+def setup_pool_model(env):
+    setup_single_server_model(env, "Pool")
+
+
+class ProcessRunner:
+    """Runner whose replications report the worker process and the active config"""
+    config_overrides = {'simulation': {'precision': 7}}
+
+    @staticmethod
+    def simulate_replications(replication_numbers):
+        for replication_number in replication_numbers:
+            yield replication_number, os.getpid(), cfg.precision
+
+
+class TestReplicationPool(SimulationTestCase):
+
+    def run_replications(self, **kwargs):
+        runner = ReplicationRunner(setup_pool_model, 500, 12, config_overrides={'simulation': {'random_streams': True}},
+                                   **kwargs)
+        runner.run()
+        return runner
+
+    def test_same_results_as_serial_run(self):
+        serial = self.run_replications()
+        parallel = self.run_replications(multiprocessing=True, max_workers=2)
+
+        self.assertEqual(list(serial.detailed_replication_data), list(parallel.detailed_replication_data))
+        self.assertEqual(serial.results.summary(), parallel.results.summary())
+        self.assertIsNone(parallel.pool)
+
+    def test_results_in_order_and_config_applied_once_per_worker(self):
+        pool = ReplicationPool(ProcessRunner(), processes=2)
+        try:
+            results = list(pool.run(range(20)))
+        finally:
+            pool.close()
+
+        self.assertEqual([r for r, _ in results], list(range(20)))
+        self.assertEqual([result[0] for _, result in results], list(range(20)))
+        self.assertTrue(all(result[2] == 7 for _, result in results))
+        self.assertEqual(pool.replications_run, 20)
+        self.assertEqual(cfg.precision, 4)
+
+    def test_workers_recycled_after_max_tasks(self):
+        pool = ReplicationPool(ProcessRunner(), processes=1, max_tasks_per_worker=1, chunk_duration=0)
+        try:
+            processes = {result[1] for _, result in pool.run(range(4))}
+        finally:
+            pool.close()
+
+        self.assertEqual(len(processes), 4)
+
+    def test_chunk_size_adapts_to_replication_duration(self):
+        pool = ReplicationPool(ProcessRunner(), processes=2, chunk_duration=0.2)
+        pool.close()
+
+        self.assertEqual(pool.chunk_size(1000), 1)
+        pool.elapsed, pool.replications_run = 0.01, 10
+        self.assertEqual(pool.chunk_size(1000), 200)
+        self.assertEqual(pool.chunk_size(100), 25)
+        pool.elapsed = 1
+        self.assertEqual(pool.chunk_size(1000), 2)
+        pool.elapsed = 10
+        self.assertEqual(pool.chunk_size(1000), 1)
+
+    def test_keep_pool_between_runs(self):
+        with ReplicationRunner(setup_pool_model, 200, 4, multiprocessing=True, max_workers=2, keep_pool=True,
+                               skip_statistics=True) as runner:
+            runner.run(new_database=False)
+            pool = runner.pool
+            runner.run(new_database=False)
+            self.assertIs(runner.pool, pool)
+            self.assertEqual(pool.replications_run, 8)
+
+        self.assertIsNone(runner.pool)
+
+
+if __name__ == '__main__':
+    unittest.main()
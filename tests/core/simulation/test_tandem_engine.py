@@ -0,0 +1,142 @@
+import math
+import random
+import unittest
+
+import numpy as np
+
+import src.core.config as cfg
+import src.core.global_imports as gi
+from src.core.components.model import Model
+from src.core.components.server import Server
+from src.core.components.sink import Sink
+from src.core.components.source import Source
+from src.core.simulation.replication import ReplicationRunner
+from src.core.simulation.tandem_engine import find_tandem_line
+from src.core.statistics.stats import calculate_statistics
+from tests.helpers import flatten
+
+
+def setup_tandem_line(env):
+    source = Source(env, "TandemSource", (random.expovariate, 1 / 6))
+    placement = Server(env, "TandemPlacement", (random.triangular, 3, 5, 4))
+    inspection = Server(env, "TandemInspection", (random.uniform, 2, 5.5))
+    rework = Server(env, "TandemRework", (random.expovariate, 1 / 3))
+    good_parts = Sink(env, "TandemGoodParts")
+    bad_parts = Sink(env, "TandemBadParts")
+
+    source.connect(placement)
+    placement.connect(inspection)
+    inspection.connect(good_parts, 80)
+    inspection.connect(rework, 12)
+    inspection.connect(bad_parts, 8)
+    rework.connect(good_parts)
+
+
+def setup_deterministic_line(env):
+    # Arrivals every 2 and processing every 3 give many simultaneous events
+    source = Source(env, "DeterministicSource", (lambda: 2,))
+    first = Server(env, "DeterministicFirst", (lambda: 3,))
+    second = Server(env, "DeterministicSecond", (lambda: 1.5,))
+    sink = Sink(env, "DeterministicSink")
+
+    source.connect(first)
+    first.connect(second)
+    second.connect(sink)
+
+
+def setup_line_with_breakdowns(env):
+    source = Source(env, "BreakdownSource", (random.expovariate, 1 / 6))
+    server = Server(env, "BreakdownServer", (random.uniform, 2, 5), time_between_machine_breakdowns=(random.expovariate, 1 / 500),
+                    machine_breakdown_duration=(random.uniform, 10, 20))
+    sink = Sink(env, "BreakdownSink")
+
+    source.connect(server)
+    server.connect(sink)
+
+
+def setup_parallel_servers(env):
+    source = Source(env, "ParallelSource", (random.expovariate, 1 / 2))
+    server = Server(env, "ParallelServer", (random.uniform, 2, 5), capacity=2)
+    sink = Sink(env, "ParallelSink")
+
+    source.connect(server)
+    server.connect(sink)
+
+
+def run_engine(model, engine, duration, warm_up=None, seed=3, random_streams=True, batched_variates=False):
+    cfg.apply_overrides({'simulation': {'engine': engine, 'random_streams': random_streams},
+                         'performance': {'batched_variates': batched_variates}})
+    env = Model().run_simulation(model, duration, seed=seed, warm_up=warm_up)
+    return dict(flatten(calculate_statistics(env)))
+
+
+class TestTandemEngine(unittest.TestCase):
+
+    def setUp(self):
+        # Other tests switch these on for the whole process, either one sends a model to the event loop
+        gi.set_collect_entity_type_stats(False)
+        self.store_processed_entities, Sink.store_processed_entities = Sink.store_processed_entities, False
+
+    def tearDown(self):
+        Sink.store_processed_entities = self.store_processed_entities
+        cfg.reset_to_global()
+
+    def assertSameStatistics(self, simpy_stats, tandem_stats):
+        self.assertEqual(simpy_stats.keys(), tandem_stats.keys())
+        for name, value in simpy_stats.items():
+            if isinstance(value, float):
+                self.assertTrue(math.isclose(value, tandem_stats[name], rel_tol=1e-9, abs_tol=1e-9),
+                                f"{name}: {value} != {tandem_stats[name]}")
+            else:
+                self.assertEqual(value, tandem_stats[name], name)
+
+    def test_same_statistics_as_simpy_with_named_streams(self):
+        for model, duration, warm_up in ((setup_tandem_line, 20000, None), (setup_tandem_line, 20000, 500),
+                                         (setup_deterministic_line, 100, None), (setup_deterministic_line, 101, 10)):
+            for batched_variates in (False, True):
+                with self.subTest(model=model.__name__, warm_up=warm_up, batched_variates=batched_variates):
+                    self.assertSameStatistics(
+                        run_engine(model, 'simpy', duration, warm_up, batched_variates=batched_variates),
+                        run_engine(model, 'auto', duration, warm_up, batched_variates=batched_variates))
+
+    def test_tandem_engine_skips_event_loop(self):
+        run_engine(setup_tandem_line, 'auto', 1000)
+        self.assertEqual(Source.sources.get("TandemSource").entities, [])
+        self.assertGreater(Source.sources.get("TandemSource").entities_created_pivot_table, 0)
+
+    def test_statistically_equal_on_global_stream(self):
+        # Without named streams the engines interleave the draws differently, compare the replication means
+        names = ('/1/0/TimeInQueue (average)', '/1/1/TimeInQueue (average)', '/1/0/ScheduledUtilization',
+                 '/0/TimeInSystem (average)', '/0/NumberInSystem (average)')
+        samples = {engine: np.array([[run_engine(setup_tandem_line, engine, 5000, seed=seed, random_streams=False)[name]
+                                      for name in names] for seed in range(10)]) for engine in ('simpy', 'auto')}
+
+        difference = samples['simpy'].mean(axis=0) - samples['auto'].mean(axis=0)
+        standard_error = np.sqrt(samples['simpy'].var(axis=0, ddof=1) / 10 + samples['auto'].var(axis=0, ddof=1) / 10)
+        for name, z in zip(names, difference / standard_error):
+            self.assertLess(abs(z), 3, name)
+
+    def test_falls_back_to_simpy(self):
+        for model in (setup_line_with_breakdowns, setup_parallel_servers):
+            with self.subTest(model=model.__name__):
+                cfg.apply_overrides({'simulation': {'engine': 'auto', 'random_streams': True}})
+                Model().run_simulation(model, 100, seed=1)
+                self.assertIsNone(find_tandem_line(Model()))
+
+                self.assertEqual(run_engine(model, 'simpy', 2000), run_engine(model, 'auto', 2000))
+
+    def test_unknown_engine(self):
+        cfg.apply_overrides({'simulation': {'engine': 'lindley'}})
+        self.assertRaises(ValueError, Model().run_simulation, setup_tandem_line, 100)
+
+    def test_replications_with_tandem_engine(self):
+        runners = {engine: ReplicationRunner(setup_tandem_line, 5000, 3, config_overrides={
+            'simulation': {'engine': engine, 'random_streams': True}}) for engine in ('simpy', 'auto')}
+
+        for replication in range(3):
+            simpy_stats, tandem_stats = (runner._run_single_replication(replication) for runner in runners.values())
+            self.assertSameStatistics(dict(flatten(simpy_stats[:8])), dict(flatten(tandem_stats[:8])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import random
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from src.core.components.server import Server
+from src.core.components.sink import Sink
+from src.core.components.source import Source
+from src.core.simulation.simulation import run_replications
+from src.core.simulation.warm_up_detection import _fill_gaps, detect_warm_up, mser, welch, welch_moving_average
+from tests.helpers import SimulationTestCase
+
+
+def setup_loaded_model(env):
+    # Starts empty, the line fills up to its steady state of about 5 entities
+    source = Source(env, "WarmUpSource", (random.uniform, 3.5, 4.5))
+    previous = source
+    for i in range(5):
+        server = Server(env, f"WarmUpServer{i}", (random.uniform, 3.4, 3.8))
+        previous.connect(server)
+        previous = server
+    previous.connect(Sink(env, "WarmUpSink"))
+
+
+class TestTruncationRules(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.stationary = rng.normal(10, 1, 1000)
+        self.transient = self.stationary + 20 * np.exp(-np.arange(1000) / 50)
+
+    def test_mser5(self):
+        truncation = mser(self.transient)
+        self.assertEqual(truncation % 5, 0)
+        self.assertGreater(truncation, 100)
+        self.assertLess(truncation, 400)
+        self.assertLess(mser(self.stationary), 100)
+
+        # A trend that never settles has its minimum in the second half
+        self.assertIsNone(mser(np.arange(1000.0)))
+        self.assertIsNone(mser(self.stationary[:15]))
+
+    def test_welch(self):
+        averages = welch_moving_average(np.arange(10.0), 2)
+        np.testing.assert_allclose(averages, [0, 1, 2, 3, 4, 5, 6, 7])
+        self.assertEqual(len(welch_moving_average(self.transient, 25)), 975)
+
+        truncation = welch(self.transient, 25)
+        self.assertGreater(truncation, 100)
+        self.assertLess(truncation, 400)
+        self.assertIsNone(welch(np.arange(1000.0), 25))
+
+    def test_fill_gaps(self):
+        np.testing.assert_array_equal(_fill_gaps(np.array([np.nan, 2, np.nan, np.nan, 5, np.nan])), [2, 2, 2, 2, 5, 5])
+        self.assertTrue(np.isnan(_fill_gaps(np.array([np.nan, np.nan]))).all())
+
+
+class TestDetectWarmUp(SimulationTestCase):
+
+    def test_warm_up_from_pilot_run(self):
+        analysis = detect_warm_up(setup_loaded_model, 20000, pilots=2)
+
+        self.assertEqual(set(analysis['series']), {('Entity', 'Entity', 'NumberInSystem'),
+                                                   ('Entity', 'Entity', 'TimeInSystem'),
+                                                   ('Sink', 'WarmUpSink', 'TimeInSystem')})
+        self.assertEqual(len(analysis['series'][('Entity', 'Entity', 'NumberInSystem')]), 1000)
+        self.assertEqual(analysis['warm_up'], max(analysis['truncation'].values()))
+        self.assertGreater(analysis['warm_up'], 0)
+        self.assertLessEqual(analysis['warm_up'], 10000)
+        # Time in system is averaged over the entities leaving in an interval
+        self.assertAlmostEqual(np.mean(analysis['series'][('Sink', 'WarmUpSink', 'TimeInSystem')]), 20, delta=10)
+
+        self.assertRaises(ValueError, detect_warm_up, setup_loaded_model, 1000, method='welsh')
+
+    def test_run_replications_with_detected_warm_up(self):
+        with patch('src.core.simulation.simulation.ReplicationRunner') as runner_class, \
+                patch('src.core.simulation.simulation.detect_warm_up', wraps=detect_warm_up) as detect:
+            run_replications(setup_loaded_model, 5000, 2, warm_up='auto')
+        warm_up = runner_class.call_args.args[3]
+        # The pilot run is a quarter of a replication
+        detect.assert_called_once_with(setup_loaded_model, 1250)
+        self.assertEqual(warm_up, detect_warm_up(setup_loaded_model, 1250)['warm_up'])
+        self.assertGreater(warm_up, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+
+import src.core.global_imports as gi
+from src.core.components.model import Model
+from src.core.simulation.replication import ReplicationRunner
+from src.core.simulation.replication_pool import ReplicationPool
+from src.core.simulation.simulation import run_replications
+from src.core.simulation.warm_up_fork import WARM_UP_FORK_CAVEAT, fork_supported, warm_up_groups, warm_up_seed
+from src.core.statistics.stats import calculate_statistics
+from tests.helpers import SimulationTestCase, setup_single_server_model
+
+
+def setup_fork_model(env):
+    setup_single_server_model(env, "Fork")
+
+
+def setup_failing_model(env):
+    setup_fork_model(env)
+
+    def fail():
+        yield env.timeout(150)
+        raise RuntimeError("ForkFailure")
+
+    env.process(fail())
+
+
+class TestWarmUpGroups(unittest.TestCase):
+
+    def test_groups_of_consecutive_replications(self):
+        self.assertEqual(list(warm_up_groups(range(2, 9), 3)), [[2], [3, 4, 5], [6, 7, 8]])
+        self.assertEqual(list(warm_up_groups([], 3)), [])
+
+    def test_pool_chunks_are_whole_groups(self):
+        pool = ReplicationPool.__new__(ReplicationPool)
+        pool.processes, pool.chunk_duration, pool.chunk_multiple = 2, 0.2, 4
+        pool.elapsed = pool.replications_run = 0
+        self.assertEqual(pool.chunk_size(100), 4)
+        pool.elapsed, pool.replications_run = 0.3, 10
+        self.assertEqual(pool.chunk_size(100), 8)
+
+
+@unittest.skipUnless(fork_supported(), "os.fork is not available")
+class TestForkAfterWarmUp(SimulationTestCase):
+
+    def run_forked(self, **kwargs):
+        runner = ReplicationRunner(setup_fork_model, 600, 6, warm_up=200, replications_per_warm_up=3, **kwargs)
+        runner.run()
+        return runner
+
+    def test_branch_continues_warm_up_with_replication_seed(self):
+        runner = self.run_forked()
+
+        # Replication 4 branches from the warm-up of group 1
+        env = Model().start_simulation(setup_fork_model, 600, seed=warm_up_seed(1), warm_up=200)
+        env.run(until=200)
+        gi.set_random_seed(4)
+        env.run(until=600)
+
+        entity_stats, server_stats, sink_stats, *_ = calculate_statistics(env)
+        replication = runner.detailed_replication_data[4]
+        self.assertEqual(replication['Entity'], entity_stats)
+        self.assertEqual(replication['Server'], server_stats)
+        self.assertEqual(replication['Sink'], sink_stats)
+        # Branches of a group are reseeded differently
+        self.assertNotEqual(runner.detailed_replication_data[3], runner.detailed_replication_data[4])
+
+    def test_reproducible_with_multiprocessing(self):
+        serial = self.run_forked()
+        parallel = self.run_forked(multiprocessing=True, max_workers=2)
+
+        self.assertEqual(list(serial.detailed_replication_data), list(parallel.detailed_replication_data))
+        self.assertEqual(serial.results.summary(), parallel.results.summary())
+
+    def test_caveat_in_metadata(self):
+        pivot_table = run_replications(setup_fork_model, 600, 6, warm_up=200, replications_per_warm_up=4)
+
+        metadata = pivot_table.attrs['warm_up_fork']
+        self.assertEqual(metadata['warm_up_groups'], 2)
+        self.assertEqual(metadata['replications_per_warm_up'], 4)
+        self.assertEqual(metadata['caveat'], WARM_UP_FORK_CAVEAT)
+
+    def test_errors_of_branches_raised(self):
+        runner = ReplicationRunner(setup_failing_model, 600, 2, warm_up=100, replications_per_warm_up=2)
+        with self.assertRaisesRegex(RuntimeError, "ForkFailure"):
+            runner.run()
+
+    def test_warm_up_required(self):
+        self.assertRaises(ValueError, ReplicationRunner, setup_fork_model, 600, 2, replications_per_warm_up=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+
+from src.core.simulation.replication import ReplicationRunner
+from src.core.simulation.simulation import run_replications
+from src.core.statistics.antithetic import AntitheticPairs
+from src.core.statistics.results_cube import ResultsCube
+from tests.helpers import SimulationTestCase, setup_single_server_model
+
+TIME_IN_SYSTEM = ('Sink', 'AntitheticSink', 'TimeInSystem (average)')
+
+
+def setup_antithetic_model(env):
+    setup_single_server_model(env, "Antithetic")
+
+
+class TestAntitheticPairs(unittest.TestCase):
+
+    def test_pair_means(self):
+        replications = ResultsCube()
+        pairs = AntitheticPairs()
+        replications.add_columns([('Server', 'Cube', 'A'), ('Server', 'Cube', 'B')])
+        rng = np.random.default_rng(3)
+        # A is perfectly negatively correlated within a pair, B independent
+        for r in (1, 0, 2, 3, 5, 4, 6, 7):
+            row = np.array([10 + (-1) ** r * (r // 2 + 1), rng.normal()])
+            pairs.add(r, replications.add(r, row=row), replications.columns)
+
+        self.assertEqual(pairs.pairs, 4)
+        np.testing.assert_allclose(pairs.results.mean[:2], replications.mean[:2])
+        reduction = pairs.variance_reduction(replications)
+        self.assertAlmostEqual(reduction[0], 1)
+        self.assertLess(reduction[1], 1)
+
+        rows = pairs.summary(replications)
+        self.assertEqual(rows[0]['Half-Width'], 0)
+        self.assertEqual(rows[0]['Variance Reduction'], 1)
+        self.assertEqual(rows[0]['Minimum'], 6)
+
+
+class TestAntitheticReplications(SimulationTestCase):
+
+    def test_members_of_a_pair_are_mirrored(self):
+        runner = ReplicationRunner(setup_antithetic_model, 1000, 2, antithetic=True)
+        runner.run()
+
+        first, second = (runner.detailed_replication_data[r]['Server'][0] for r in (0, 1))
+        # Uniform processing times on 2..4 average to 3 exactly over a pair
+        processing = (first['TimeProcessing (average)'] * first['EntitiesProcessed']
+                      + second['TimeProcessing (average)'] * second['EntitiesProcessed'])
+        self.assertAlmostEqual(processing / (first['EntitiesProcessed'] + second['EntitiesProcessed']), 3, delta=0.05)
+        self.assertNotEqual(first['EntitiesProcessed'], second['EntitiesProcessed'])
+
+    def test_variance_reduction_reported(self):
+        pivot_table = run_replications(setup_antithetic_model, 1000, 20, antithetic=True)
+
+        reduction = pivot_table.loc[TIME_IN_SYSTEM, 'Variance Reduction']
+        self.assertGreater(reduction, 0.3)
+        self.assertEqual(pivot_table.attrs['antithetic']['pairs'], 10)
+        self.assertEqual(pivot_table.attrs['antithetic']['variance_reduction'][TIME_IN_SYSTEM], reduction)
+
+    def test_reproducible_with_multiprocessing(self):
+        serial = ReplicationRunner(setup_antithetic_model, 500, 4, antithetic=True)
+        serial.run()
+        parallel = ReplicationRunner(setup_antithetic_model, 500, 4, antithetic=True, multiprocessing=True,
+                                     max_workers=2)
+        parallel.run()
+
+        self.assertEqual(serial.antithetic_pairs.summary(serial.results),
+                         parallel.antithetic_pairs.summary(parallel.results))
+
+    def test_invalid_options(self):
+        self.assertRaises(ValueError, ReplicationRunner, setup_antithetic_model, 500, 3, antithetic=True)
+        self.assertRaises(ValueError, ReplicationRunner, setup_antithetic_model, 500, 4, warm_up=100,
+                          replications_per_warm_up=2, antithetic=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
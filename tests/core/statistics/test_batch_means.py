@@ -0,0 +1,80 @@
+import random
+import unittest
+
+import numpy as np
+
+from src.core.components.model import Model
+from src.core.simulation.runner import SimulationRunner
+from src.core.simulation.simulation import run_simulation
+from src.core.statistics.batch_means import BatchMeans
+from src.core.statistics.results_cube import ResultsCube
+from tests.helpers import SimulationTestCase, setup_single_server_model
+
+
+def setup_batch_model(env, mean_processing_time=3):
+    setup_single_server_model(env, "Batch", (random.uniform, mean_processing_time - 1, mean_processing_time + 1))
+
+
+def setup_congested_model(env):
+    # Utilization of about 95%, the queue length changes slowly
+    setup_batch_model(env, mean_processing_time=3.8)
+
+
+class TestBatchMeans(SimulationTestCase):
+
+    def test_batch_means_agree_with_single_run(self):
+        single = run_simulation(setup_batch_model, 20000, warm_up=1000)
+        batched = run_simulation(setup_batch_model, 20000, warm_up=1000, batches=10)
+
+        self.assertEqual(batched.columns.tolist(), ['Average', 'Half-Width', 'Maximum', 'Minimum'])
+        for stat in ('NumberCreated', 'NumberDestroyed', 'NumberInSystem (average)', 'TimeInSystem (max)'):
+            self.assertAlmostEqual(batched.loc[('Entity', 'Entity', stat), 'Average'],
+                                   single.loc[('Entity', 'Entity', stat), 'Value'], places=3)
+        utilization = batched.loc[('Server', 'BatchServer', 'ScheduledUtilization')]
+        self.assertAlmostEqual(utilization['Average'],
+                               single.loc[('Server', 'BatchServer', 'ScheduledUtilization'), 'Value'], places=3)
+        self.assertGreater(utilization['Half-Width'], 0)
+        self.assertLess(utilization['Minimum'], utilization['Average'])
+        # Maxima don't split into batches
+        self.assertEqual(batched.loc[('Entity', 'Entity', 'TimeInSystem (max)'), 'Half-Width'], 0)
+
+        metadata = batched.attrs['batch_means']
+        self.assertEqual(metadata['batches'], 10)
+        self.assertEqual(metadata['batch_length'], 1900)
+        self.assertIn(('Sink', 'BatchSink', 'TimeInSystem (average)'), metadata['autocorrelation'])
+        self.assertNotIn(('Sink', 'BatchSink', 'TimeInSystem (max)'), metadata['autocorrelation'])
+
+    def test_streaming_autocorrelation(self):
+        env = Model().start_simulation(setup_batch_model, 5000, warm_up=500)
+        batch_means = BatchMeans(20, 500, 5000)
+        # Keep the batches to compare with the two-pass estimate
+        batch_means.results = ResultsCube()
+        batch_means.start(env)
+        env.run(until=5000)
+        batch_means.finish(env)
+
+        self.assertEqual(batch_means.batches, 20)
+        for column, autocorrelation in batch_means.autocorrelation().items():
+            x = batch_means.results.values[:20, batch_means.results.column(column)]
+            deviations = x - x.mean()
+            expected = np.sum(deviations[:-1] * deviations[1:]) / np.sum(deviations * deviations)
+            self.assertAlmostEqual(autocorrelation, expected, places=6, msg=column)
+
+    def test_correlated_batches(self):
+        runner = SimulationRunner(setup_congested_model, 20000, warm_up=1000, batches=200)
+        with self.assertLogs(level='WARNING') as logs:
+            pivot_table = runner.run()
+
+        self.assertIn("longer batches", '\n'.join(logs.output))
+        metadata = pivot_table.attrs['batch_means']
+        self.assertIn(('Entity', 'Entity', 'NumberInSystem (average)'), metadata['correlated'])
+        self.assertGreater(metadata['autocorrelation'][('Entity', 'Entity', 'NumberInSystem (average)')], 0.2)
+
+    def test_invalid_batches(self):
+        self.assertRaises(ValueError, SimulationRunner, setup_batch_model, 1000, batches=1)
+        self.assertRaises(ValueError, SimulationRunner, setup_batch_model, 1000, batches=10, skip_statistics=True)
+        self.assertRaises(ValueError, BatchMeans, 10, 1000, 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
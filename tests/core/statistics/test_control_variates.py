@@ -0,0 +1,105 @@
+import unittest
+
+import numpy as np
+from scipy.stats import t
+
+from src.core.simulation.replication import ReplicationRunner
+from src.core.simulation.simulation import run_replications
+from src.core.statistics.control_variates import ControlVariates
+from src.core.statistics.results_cube import ResultsCube
+from tests.helpers import SimulationTestCase, setup_single_server_model
+
+OUTPUT = ('Server', 'Cube', 'Output')
+CONTROL = ('Server', 'Cube', 'Control')
+PROCESSING_TIME = ('Server', 'ControlServer', 'TimeProcessing (average)')
+TIME_IN_SYSTEM = ('Sink', 'ControlSink', 'TimeInSystem (average)')
+CREATED = ('Source', 'ControlSource', 'NumberCreated')
+
+
+def setup_control_model(env):
+    setup_single_server_model(env, "Control")
+
+
+class TestControlVariates(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.control = rng.normal(10, 2, 30)
+        self.output = 3 * self.control + rng.normal(0, 1, 30)
+
+        self.replications = ResultsCube()
+        self.replications.add_columns([OUTPUT, CONTROL])
+        self.estimator = ControlVariates({CONTROL: 10})
+        for r, row in enumerate(zip(self.output, self.control)):
+            values = self.replications.add(r, row=np.array(row))
+            self.estimator.add(values, self.replications.columns)
+
+    def test_regression_estimates(self):
+        estimates = self.estimator.estimates()
+
+        # Least squares fit evaluated at the known mean of the control
+        design = np.column_stack((np.ones(30), self.control))
+        (intercept, slope), residuals, *_ = np.linalg.lstsq(design, self.output, rcond=None)
+        self.assertAlmostEqual(estimates['coefficients'][0, 0], slope)
+        self.assertAlmostEqual(estimates['average'][0], intercept + slope * 10)
+
+        deviation = self.control.mean() - 10
+        variance = residuals[0] / 28 * (1 / 30 + deviation ** 2 / np.sum((self.control - self.control.mean()) ** 2))
+        self.assertAlmostEqual(estimates['half_width'][0], t.ppf(0.975, 28) * np.sqrt(variance))
+        self.assertGreater(estimates['variance_reduction'][0], 0.9)
+        # The control itself isn't adjusted
+        self.assertTrue(np.isnan(estimates['average'][1]))
+
+    def test_summary(self):
+        rows = {row['Stat']: row for row in self.estimator.summary(self.replications)}
+
+        self.assertAlmostEqual(rows['Output']['Average'], self.estimator.estimates()['average'][0], places=4)
+        self.assertLess(rows['Output']['Half-Width'], self.replications.half_widths()[0])
+        self.assertEqual(rows['Output']['Minimum'], round(self.output.min(), 4))
+        self.assertIsNone(rows['Control']['Variance Reduction'])
+        self.assertEqual(rows['Control']['Average'], round(self.control.mean(), 4))
+
+    def test_missing_values(self):
+        estimator = ControlVariates({CONTROL: 10})
+        estimator.add(np.array([1.0, 10]), [OUTPUT, CONTROL])
+        self.assertRaises(ValueError, estimator.add, np.array([1.0, np.nan]), [OUTPUT, CONTROL])
+        self.assertRaises(ValueError, ControlVariates({('Server', 'Cube', 'Other'): 1}).add, np.array([1.0, 10]),
+                          [OUTPUT, CONTROL])
+        self.assertRaises(ValueError, ControlVariates, {})
+
+        # Too few replications for the regression
+        self.assertIsNone(estimator.estimates())
+        with self.assertLogs(level='WARNING'):
+            rows = estimator.summary(self.replications)
+        self.assertIsNone(rows[0]['Variance Reduction'])
+
+
+class TestControlVariateReplications(SimulationTestCase):
+
+    def test_adjusted_replication_statistics(self):
+        plain = ReplicationRunner(setup_control_model, 1000, 20)
+        plain.run()
+        # Poisson arrivals with a mean interarrival time of 4, the first one after an interarrival time
+        controls = {PROCESSING_TIME: 3.0, CREATED: 250}
+        pivot_table = run_replications(setup_control_model, 1000, 20, control_variates=controls)
+
+        # The realized arrivals and processing times explain part of the variance of the time in system
+        self.assertLess(pivot_table.loc[TIME_IN_SYSTEM, 'Half-Width'],
+                        plain.results.half_widths()[plain.results.column(TIME_IN_SYSTEM)])
+        self.assertGreater(pivot_table.loc[TIME_IN_SYSTEM, 'Variance Reduction'], 0.1)
+        self.assertTrue(np.isnan(pivot_table.loc[PROCESSING_TIME, 'Variance Reduction']))
+
+        metadata = pivot_table.attrs['control_variates']
+        self.assertEqual(metadata['controls'], controls)
+        self.assertEqual(metadata['replications'], 20)
+        self.assertGreater(metadata['coefficients'][TIME_IN_SYSTEM][PROCESSING_TIME], 0)
+
+    def test_invalid_combinations(self):
+        self.assertRaises(ValueError, ReplicationRunner, setup_control_model, 500, 4, antithetic=True,
+                          control_variates={PROCESSING_TIME: 3.0})
+        self.assertRaises(ValueError, ReplicationRunner, setup_control_model, 500, 4, skip_statistics=True,
+                          control_variates={PROCESSING_TIME: 3.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+import numpy as np
+
+from src.core.simulation.replication import ReplicationRunner
+from src.core.simulation.simulation import run_replications
+from src.core.statistics.precision import PrecisionTargets
+from src.core.statistics.results_cube import ResultsCube
+from tests.helpers import SimulationTestCase, setup_single_server_model
+
+TIME_IN_SYSTEM = ('Sink', 'PrecisionSink', 'TimeInSystem (average)')
+UTILIZATION = ('Server', 'PrecisionServer', 'ScheduledUtilization')
+
+
+def setup_precision_model(env):
+    setup_single_server_model(env, "Precision")
+
+
+def make_cube(values):
+    cube = ResultsCube(keep_replications=False)
+    cube.add_columns([('Server', 'Cube', 'A'), ('Server', 'Cube', 'B')])
+    for r, row in enumerate(values):
+        cube.add(r, row=np.asarray(row, dtype=float))
+    return cube
+
+
+class TestPrecisionTargets(unittest.TestCase):
+
+    def test_invalid_targets(self):
+        self.assertRaises(ValueError, PrecisionTargets, {})
+        self.assertRaises(ValueError, PrecisionTargets, {UTILIZATION: {'relativ': 0.1}})
+        self.assertRaises(ValueError, PrecisionTargets, {UTILIZATION: {'absolute': 0}})
+
+    def test_report_and_required_replications(self):
+        rng = np.random.default_rng(1)
+        cube = make_cube(np.column_stack((rng.normal(100, 10, 20), rng.normal(50, 1, 20))))
+        half_widths = cube.half_widths()
+
+        targets = PrecisionTargets({('Server', 'Cube', 'A'): {'absolute': half_widths[0] / 2},
+                                    ('Server', 'Cube', 'B'): {'relative': 0.5, 'absolute': 10}})
+        report = targets.report(cube)
+        self.assertEqual([row['Met'] for row in report], [False, True])
+        self.assertAlmostEqual(report[0]['Relative Half-Width'], half_widths[0] / cube.mean[0])
+        # Halving the half-width takes four times the replications
+        self.assertEqual(targets.required_replications(cube), 80)
+
+        self.assertIsNone(PrecisionTargets({('Server', 'Cube', 'B'): {'relative': 0.5}}).required_replications(cube))
+        self.assertRaises(ValueError, PrecisionTargets({('Server', 'Cube', 'C'): {'relative': 0.5}}).report, cube)
+
+
+class TestSequentialReplications(SimulationTestCase):
+
+    def test_replications_until_targets_met(self):
+        targets = {TIME_IN_SYSTEM: {'relative': 0.1}, UTILIZATION: {'absolute': 1.0}}
+        pivot_table = run_replications(setup_precision_model, 500, 5, half_width_targets=targets, max_replications=500)
+
+        report = pivot_table.attrs['precision']
+        self.assertTrue(all(row['Met'] for row in report))
+        self.assertGreater(report[0]['Replications'], 5)
+        self.assertLess(report[0]['Replications'], 500)
+        self.assertTrue(all(row['Half-Width'] <= row['Target'] for row in report))
+
+    def test_same_results_as_fixed_replications(self):
+        targets = {UTILIZATION: {'absolute': 1.0}}
+        sequential = ReplicationRunner(setup_precision_model, 500, 5, half_width_targets=targets, max_replications=200)
+        sequential.run()
+        n = sequential.precision_report[0]['Replications']
+
+        fixed = ReplicationRunner(setup_precision_model, 500, n, multiprocessing=True, max_workers=2)
+        fixed.run()
+        self.assertEqual(sequential.results.summary(), fixed.results.summary())
+        self.assertEqual(list(sequential.detailed_replication_data), list(fixed.detailed_replication_data))
+
+    def test_cap_reached(self):
+        targets = {TIME_IN_SYSTEM: {'relative': 0.0001}}
+        runner = ReplicationRunner(setup_precision_model, 200, 4, multiprocessing=True, max_workers=2,
+                                   half_width_targets=targets, max_replications=12)
+        with self.assertLogs(level='WARNING'):
+            runner.run()
+
+        self.assertEqual(len(runner.detailed_replication_data), 12)
+        self.assertFalse(runner.precision_report[0]['Met'])
+        self.assertIsNone(runner.pool)
+
+
+if __name__ == '__main__':
+    unittest.main()
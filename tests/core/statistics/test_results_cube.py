@@ -0,0 +1,130 @@
+import random
+import tracemalloc
+import unittest
+import warnings
+
+import numpy as np
+
+from src.core.statistics.results_cube import ReplicationDataView, ResultsCube
+from src.core.statistics.stats import calculate_all_stats
+
+
+def make_replication(rng, servers=3):
+    entity_stats = {'NumberCreated': rng.randint(90, 110), 'TimeInSystem (average)': rng.uniform(5, 15)}
+    server_stats = [{'Server': f"CubeServer{i}", 'ScheduledUtilization': rng.uniform(50, 90),
+                     'TimeInQueue (average)': rng.expovariate(1 / 3), 'CustomStat': rng.random()}
+                    for i in range(servers)]
+    sink_stats = {'CubeSink': {'NumberEntered': rng.randint(80, 100), 'TimeInSystem (max)': None}}
+    source_stats = {'CubeSource': {'NumberCreated': rng.randint(90, 110)}}
+    return entity_stats, server_stats, sink_stats, source_stats, [], [], [], []
+
+
+class TestResultsCube(unittest.TestCase):
+
+    def test_summary_like_calculate_all_stats(self):
+        rng = random.Random(7)
+        replications = [make_replication(rng) for _ in range(40)]
+        cube = ResultsCube(len(replications))
+        for r, replication in enumerate(replications):
+            cube.add(r, replication, {'CubeTally': {'min': rng.random(), 'max': 1 + rng.random(), 'avg': 0.5}})
+
+        entity_stats, server_stats, sink_stats, source_stats, *_ = zip(*replications)
+        all_server_stats = {}
+        for stats in server_stats:
+            for stat in stats:
+                all_server_stats.setdefault(stat['Server'], []).append(stat)
+        expected = calculate_all_stats(
+            list(entity_stats), all_server_stats, {'CubeSink': [stats['CubeSink'] for stats in sink_stats]},
+            {'CubeSource': [stats['CubeSource'] for stats in source_stats]}, {}, {}, {}, {},
+            ['NumberCreated', 'TimeInSystem (average)'], ['ScheduledUtilization', 'TimeInQueue (average)', 'CustomStat'],
+            ['NumberEntered', 'TimeInSystem (max)'], ['NumberCreated'], [], [], [], [])
+
+        summary = cube.summary()
+        self.assertEqual([row for row in summary if row['Type'] != 'Tally'], expected)
+        self.assertEqual([(row['Name'], row['Stat']) for row in summary if row['Type'] == 'Tally'],
+                         [('CubeTally', 'Min'), ('CubeTally', 'Max'), ('CubeTally', 'Avg')])
+
+    def test_welford_matches_two_pass(self):
+        rng = np.random.default_rng(3)
+        values = rng.normal(1e6, 5, size=(500, 4))
+        cube = ResultsCube(keep_replications=False)
+        cube.add_columns([('Server', 'Welford', str(c)) for c in range(4)])
+        for r, row in enumerate(values):
+            cube.add(r, row=row)
+
+        np.testing.assert_allclose(cube.mean[:4], values.mean(axis=0), rtol=1e-12)
+        np.testing.assert_allclose(cube.m2[:4] / 499, values.var(axis=0, ddof=1), rtol=1e-8)
+        np.testing.assert_array_equal(cube.minimum[:4], values.min(axis=0))
+        np.testing.assert_array_equal(cube.maximum[:4], values.max(axis=0))
+
+    def test_replications_with_an_empty_sink(self):
+        rng = random.Random(13)
+        cube = ResultsCube(4)
+        replications = [make_replication(rng) for _ in range(4)]
+        for r, replication in enumerate(replications):
+            # No entity reaches the sink in the odd replications
+            replication[0]['TimeInSystem (min)'] = float('inf') if r % 2 else r + 1.0
+            replication[2]['CubeSink']['NumberEntered'] = 0 if r % 2 else 10
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            for r, replication in enumerate(replications):
+                cube.add(r, replication)
+            summary = {(row['Type'], row['Stat']): row for row in cube.summary()}
+
+        self.assertEqual(summary['Entity', 'TimeInSystem (min)'],
+                         {'Type': 'Entity', 'Name': 'Entity', 'Stat': 'TimeInSystem (min)', 'Average': 2.0,
+                          'Minimum': 1.0, 'Maximum': 3.0, 'Half-Width': 12.7062})
+        self.assertEqual(summary['Sink', 'NumberEntered']['Average'], 5.0)
+        self.assertEqual(ReplicationDataView(cube)[1]['Entity']['TimeInSystem (min)'], float('inf'))
+
+    def test_servers_counted_once_per_replication(self):
+        rng = random.Random(17)
+        replications = [make_replication(rng, servers=2) for _ in range(6)]
+        cube = ResultsCube(len(replications))
+        for r, replication in enumerate(replications):
+            cube.add(r, replication)
+
+        column = cube.column(('Server', 'CubeServer1', 'ScheduledUtilization'))
+        values = [replication[1][1]['ScheduledUtilization'] for replication in replications]
+        self.assertEqual(cube.count[column], 6)
+        self.assertAlmostEqual(cube.mean[column], np.mean(values))
+        self.assertAlmostEqual(cube.m2[column] / 5, np.var(values, ddof=1))
+
+    def test_detailed_data_from_the_cube(self):
+        rng = random.Random(11)
+        replications = [make_replication(rng) for _ in range(5)]
+        cube = ResultsCube(2)
+        for r, replication in enumerate(replications):
+            cube.add(r, replication)
+
+        data = ReplicationDataView(cube)
+        self.assertEqual(len(data), 5)
+        self.assertEqual(data[3], dict(zip(('Entity', 'Server', 'Sink', 'Source', 'Vehicle', 'Storage', 'Separator',
+                                            'Combiner'), replications[3])))
+        self.assertEqual(data[-2:], [data[3], data[4]])
+
+    def test_memory_flat_without_kept_replications(self):
+        rng = random.Random(5)
+        cube = ResultsCube(10000, keep_replications=False)
+        replication = make_replication(rng, servers=20)
+
+        tracemalloc.start()
+        try:
+            for r in range(1000):
+                cube.add(r, replication)
+            after_thousand = tracemalloc.get_traced_memory()[0]
+            for r in range(1000, 10000):
+                cube.add(r, replication)
+            after_ten_thousand = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+        # Only the list of replication numbers grows, far less than a copy of the 60+ statistics per replication
+        self.assertLess(after_ten_thousand - after_thousand, 9000 * 64)
+        self.assertEqual(cube.values.shape[0], 0)
+        self.assertEqual(cube.count[0], 10000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import random
+import unittest
+from multiprocessing.shared_memory import SharedMemory
+
+import pandas as pd
+
+import src.core.config as cfg
+from src.core.components.model import Model
+from src.core.components.server import Server
+from src.core.components.sink import Sink
+from src.core.components.source import Source
+from src.core.simulation.replication import ReplicationRunner
+from src.core.statistics.results_cube import ReplicationDataView, ResultsCube
+from src.core.statistics.shared_results import SharedReplicationResults
+from src.core.statistics.stats import REPLICATION_STAT_NAMES, calculate_statistics
+from tests.helpers import SimulationTestCase
+
+
+def setup_shared_model(env):
+    source = Source(env, "SharedSource", (random.expovariate, 1 / 4))
+    first = Server(env, "SharedFirst", (random.uniform, 1, 3))
+    second = Server(env, "SharedSecond", (random.uniform, 2, 4))
+    good_parts = Sink(env, "SharedGoodParts")
+    bad_parts = Sink(env, "SharedBadParts")
+
+    source.connect(first)
+    first.connect(second)
+    second.connect(good_parts, 90)
+    second.connect(bad_parts, 10)
+
+
+def setup_growing_model(env):
+    setup_shared_model(env)
+
+    def add_server():
+        yield env.timeout(10)
+        Server(env, "SharedLateServer", (random.uniform, 1, 2))
+
+    env.process(add_server())
+
+
+class TestSharedReplicationResults(SimulationTestCase):
+
+    def test_rows_reused_in_results_cube(self):
+        shared_results = SharedReplicationResults.for_model(setup_shared_model, REPLICATION_STAT_NAMES, rows=2)
+        try:
+            from_rows, from_statistics = ResultsCube(3), ResultsCube(3)
+            from_rows.add_columns(shared_results.columns)
+            for r in range(3):
+                statistics = calculate_statistics(Model().run_simulation(setup_shared_model, 1000, seed=r))
+                shared_results.write(r, statistics)
+                from_rows.add(r, row=shared_results.row(r))
+                from_statistics.add(r, statistics)
+
+            self.assertEqual(from_rows.summary(), from_statistics.summary())
+            self.assertEqual(list(ReplicationDataView(from_rows)), list(ReplicationDataView(from_statistics)))
+        finally:
+            shared_results.release()
+
+    def test_same_results_as_pickled_transfer(self):
+        pivot_tables = {}
+        for shared_memory_results in (False, True):
+            cfg.apply_overrides({'multiprocessing': {'shared_memory_results': shared_memory_results}})
+            # More replications than rows in the shared memory block
+            runner = ReplicationRunner(setup_shared_model, 100, 300, multiprocessing=True, max_workers=2)
+            pivot_tables[shared_memory_results] = runner.run()
+            if not shared_memory_results:
+                pickled_data = list(runner.detailed_replication_data)
+
+        pd.testing.assert_frame_equal(pivot_tables[False], pivot_tables[True])
+        self.assertEqual(pickled_data, list(runner.detailed_replication_data))
+
+    def test_block_released_after_run(self):
+        cfg.apply_overrides({'multiprocessing': {'shared_memory_results': True}})
+        runner = ReplicationRunner(setup_shared_model, 100, 2, multiprocessing=True, max_workers=1,
+                                   enable_detailed_replication_data=False, keep_pool=True)
+        with runner:
+            shared_results = runner._create_shared_results()
+            name = shared_results.name
+            shared_results.release()
+            runner.run()
+
+        self.assertIsNone(runner.shared_results)
+        self.assertRaises(FileNotFoundError, SharedMemory, name=name)
+
+    def test_components_created_while_running(self):
+        cfg.apply_overrides({'multiprocessing': {'shared_memory_results': True}})
+        runner = ReplicationRunner(setup_growing_model, 100, 2, multiprocessing=True, max_workers=1)
+
+        with self.assertRaisesRegex(ValueError, "SharedLateServer"):
+            runner.run()
+        self.assertIsNone(runner.shared_results)
+        self.assertIsNone(runner.pool)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import random
+import unittest
+
+import simpy
+
+import src.core.config as cfg
+from src.core.components.entity import EntityManager
+from src.core.components.model import Model
+from src.core.components.server import Server
+from src.core.components.sink import Sink
+from src.core.components.source import Source
+from src.core.simulation.replication import ReplicationRunner
+
+
+def setup_model(env):
+    source = Source(env, "ConfigSource", (random.expovariate, 1 / 2))
+    server = Server(env, "ConfigServer", (random.uniform, 1, 2))
+    sink = Sink(env, "ConfigSink")
+
+    source.connect(server)
+    server.connect(sink)
+
+
+class TestConfigSnapshot(unittest.TestCase):
+
+    def tearDown(self):
+        cfg.reset_to_global()
+
+    def test_snapshot_is_immutable(self):
+        config = cfg.snapshot()
+        with self.assertRaises(AttributeError):
+            config.precision = 8
+        with self.assertRaises(AttributeError):
+            del config.random_seed
+        with self.assertRaises(TypeError):
+            config.data['simulation']['precision'] = 8
+
+    def test_apply_overrides_creates_new_snapshot(self):
+        original = cfg.snapshot()
+        overridden = cfg.apply_overrides({'simulation': {'precision': 7},
+                                          'performance': {'entity_pool': {'by_type': {'Pallet': 42}}}})
+
+        self.assertIsNot(overridden, original)
+        self.assertIs(cfg.snapshot(), overridden)
+        self.assertEqual(cfg.precision, 7)
+        self.assertEqual(overridden.get_entity_pool_size('Pallet'), 42)
+        self.assertEqual(overridden.get_entity_pool_size('Truck'), original.get_entity_pool_size('Truck'))
+        self.assertEqual(original.precision, 4)
+        self.assertEqual(original.get_entity_pool_size('Pallet'), original.entity_pool_default)
+
+        cfg.reset_to_global()
+        self.assertIs(cfg.snapshot(), original)
+        self.assertEqual(cfg.precision, 4)
+
+    def test_overrides_do_not_share_mutable_values(self):
+        overrides = {'model_parameters': {'server': {'params': [3, 5, 4]}}}
+        cfg.apply_overrides(overrides)
+        overrides['model_parameters']['server']['params'].append(6)
+
+        self.assertEqual(cfg.get_param('server.params'), (3, 5, 4))
+
+    def test_entity_manager_captures_pool_sizes(self):
+        cfg.apply_overrides({'performance': {'entity_pool': {'default': 3, 'by_type': {'Pallet': 5}}}})
+        EntityManager.initialize(simpy.Environment())
+        cfg.reset_to_global()
+
+        self.assertEqual(EntityManager.max_pool_size_by_type['Pallet'], 5)
+        self.assertEqual(EntityManager.max_pool_size_by_type['Crate'], 3)
+
+    def test_replication_overrides_do_not_leak(self):
+        original = cfg.snapshot()
+        runner = ReplicationRunner(setup_model, steps=100, num_replications=1,
+                                   config_overrides={'simulation': {'random_streams': True}})
+        runner._run_single_replication(0)
+
+        self.assertTrue(Model().config.random_streams)
+        self.assertIs(cfg.snapshot(), original)
+        self.assertFalse(cfg.random_streams)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+LAZY_PACKAGES = ('pandas', 'matplotlib', 'seaborn', 'tabulate', 'peewee', 'scipy', 'database')
+"""Packages a simulation run must not import until a feature that needs them is used"""
+
+MODEL_IMPORTS = """
+import src.core.simulation.simulation
+from src.core.components.server import Server
+from src.core.components.sink import Sink
+from src.core.components.source import Source
+from src.core.global_imports import random
+"""
+
+
+def run_python(code: str) -> str:
+    """
+    Run code in a fresh interpreter in the project root.
+
+    :param code: Code to run
+    :return: Standard output of the interpreter
+    """
+    result = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT, capture_output=True, text=True,
+                            timeout=120)
+    if result.returncode != 0:
+        raise AssertionError(result.stderr)
+    return result.stdout
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_model_imports_skip_heavy_packages(self):
+        output = run_python(MODEL_IMPORTS + f"""
+import json, sys
+print(json.dumps({{'loaded': sorted({{m.split('.')[0] for m in sys.modules}} & set({LAZY_PACKAGES!r}))}}))
+""")
+        self.assertEqual(json.loads(output)['loaded'], [])
+
+    def test_import_time(self):
+        output = run_python(f"""
+import time
+start = time.perf_counter()
+{MODEL_IMPORTS}
+print(time.perf_counter() - start)
+""")
+        import_time = float(output)
+        print(f"\nImport time of a simulation model: {import_time * 1000:.0f} ms")
+
+        # Generous bound, pandas, matplotlib and scipy.stats alone took more than a second to import
+        self.assertLess(import_time, 5)
+
+    def test_database_import_runs_no_query(self):
+        output = run_python("""
+from database.base.models import run_replications_table, run_simulation_table
+
+def fail(*args, **kwargs):
+    raise AssertionError("Query at import time")
+
+run_simulation_table.select = run_replications_table.select = fail
+import database.simulation.simulation_db
+import database.replication.replication_db
+print("ok")
+""")
+        self.assertEqual(output.strip(), "ok")
+
+    def test_pandas_display_options_set_on_first_use(self):
+        output = run_python("""
+from src.core.global_imports import import_pandas
+pd = import_pandas()
+print(pd.get_option('display.max_columns'), pd.get_option('display.width'))
+""")
+        self.assertEqual(output.split(), ['None', '1000'])
+
+
+if __name__ == '__main__':
+    unittest.main()
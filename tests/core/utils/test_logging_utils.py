@@ -0,0 +1,153 @@
+import io
+import logging
+import random
+import threading
+import unittest
+from datetime import datetime
+
+import src.core.global_imports  # noqa: F401 (adds the TRACE level)
+from src.core.components.date_time import DateTime
+from src.core.components.server import Server
+from src.core.components.sink import Sink
+from src.core.components.source import Source
+from src.core.simulation.replication import ReplicationRunner
+from src.core.utils.logging_utils import LazyLogEntry, QueueLogging, set_replication, start_queue_logging, \
+    stop_queue_logging
+
+
+class CountingName:
+    """Argument that counts how often the log message was formatted."""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __format__(self, format_spec):
+        self.formatted += 1
+        return "Entity 1"
+
+
+class TestCases(unittest.TestCase):
+
+    def setUp(self):
+        DateTime.set(datetime(2024, 12, 12, 0, 0, 0))
+        self.stream = io.StringIO()
+        self.handler = logging.StreamHandler(self.stream)
+        self.logger = logging.Logger("test_lazy_log_entry")
+        self.logger.setLevel(logging.TRACE)
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+
+    def test_entry_is_formatted_when_emitted(self):
+        name = CountingName()
+        self.logger.trace(LazyLogEntry(90, "[Server] {} finished processing {}, time {}", "Server1", name, 2.5))
+
+        self.assertEqual(name.formatted, 1)
+        self.assertEqual(self.stream.getvalue().strip(), "{:<120} at {}".format(
+            "[Server] Server1 finished processing Entity 1, time 2.5", DateTime.get(90)))
+
+    def test_entry_is_not_formatted_when_filtered(self):
+        name = CountingName()
+        self.handler.setLevel(logging.INFO)
+        self.logger.trace(LazyLogEntry(90, "{} routed", name))
+
+        self.assertEqual(name.formatted, 0)
+        self.assertEqual(self.stream.getvalue(), "")
+
+    def test_message_without_arguments_is_not_a_template(self):
+        self.assertTrue(str(LazyLogEntry(0, "Cache {not a field}")).startswith("Cache {not a field} "))
+
+
+def setup_logging_model(env):
+    source = Source(env, "QueueLogSource", (random.expovariate, 1))
+    server = Server(env, "QueueLogServer", (random.uniform, 0.5, 0.9),
+                    after_processing_trigger=lambda component, entity, **kwargs: logging.info("%s done", entity.name))
+    sink = Sink(env, "QueueLogSink")
+
+    source.connect(server)
+    server.connect(sink)
+
+
+class TestQueueLogging(unittest.TestCase):
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.handler = logging.StreamHandler(self.stream)
+        self.handler.setFormatter(logging.Formatter("%(levelname)s:%(message)s"))
+        self.root_level = logging.root.level
+        logging.root.setLevel(logging.INFO)
+        self.root_handlers = logging.root.handlers[:]
+        for handler in self.root_handlers:
+            logging.root.removeHandler(handler)
+        logging.root.addHandler(self.handler)
+
+    def tearDown(self):
+        stop_queue_logging()
+        set_replication(None)
+        logging.root.removeHandler(self.handler)
+        for handler in self.root_handlers:
+            logging.root.addHandler(handler)
+        logging.root.setLevel(self.root_level)
+
+    def test_listener_formats_and_tags_records(self):
+        queue_logging = start_queue_logging()
+        self.assertEqual(logging.root.handlers, [queue_logging.handler])
+
+        logging.info("Before %s", "replications")
+        set_replication(3)
+        logging.info("%s done", "Entity 1")
+        logging.debug("Not written")
+
+        self.assertEqual(stop_queue_logging(), 0)
+        self.assertEqual(logging.root.handlers, [self.handler])
+        self.assertEqual(self.stream.getvalue().splitlines(),
+                         ["INFO:Before replications", "INFO:[Replication 3] Entity 1 done"])
+
+    def test_full_queue_drops_and_counts_records(self):
+        queue_logging = QueueLogging(queue_size=2, queue_timeout=0)
+        logger = logging.Logger("test_full_queue")
+        logger.addHandler(queue_logging.handler)
+
+        for i in range(5):
+            logger.warning("Record %d", i)
+
+        self.assertEqual(queue_logging.dropped_records, 3)
+        self.assertEqual(queue_logging.queue.get(timeout=5).msg, "Record 0")
+
+    def test_full_queue_waits_for_the_listener(self):
+        start_queue_logging(queue_size=2)
+        for i in range(500):
+            logging.info("Record %d", i)
+
+        self.assertEqual(stop_queue_logging(), 0)
+        self.assertEqual(len(self.stream.getvalue().splitlines()), 500)
+
+    def test_dropped_records_reported_per_replication(self):
+        released = threading.Event()
+        # The listener holds the first record until the queue is full
+        self.handler.addFilter(lambda record: released.wait(5))
+        queue_logging = start_queue_logging(queue_size=2, queue_timeout=0)
+
+        set_replication(3)
+        for i in range(10):
+            logging.info("Record %d", i)
+        released.set()
+        set_replication(None)
+        stop_queue_logging()
+
+        dropped = queue_logging.dropped_records
+        self.assertGreaterEqual(dropped, 7)
+        self.assertEqual(queue_logging.dropped_per_replication, {3: dropped})
+        self.assertIn(f"WARNING:[Replication 3] {dropped} log records were dropped, the logging queue was full",
+                      self.stream.getvalue().splitlines())
+
+    def test_replication_workers_log_through_the_queue(self):
+        start_queue_logging()
+        ReplicationRunner(setup_logging_model, 20, 2, multiprocessing=True, max_workers=2,
+                          enable_detailed_replication_data=False, skip_statistics=True).run(new_database=False)
+        stop_queue_logging()
+
+        lines = self.stream.getvalue().splitlines()
+        for replication in range(2):
+            self.assertTrue(any(line.startswith(f"INFO:[Replication {replication}] Default_Entity") for line in lines))
@@ -0,0 +1,199 @@
+import math
+import random
+import statistics
+import unittest
+
+import src.core.config as cfg
+import src.core.global_imports as gi
+from src.core.components.model import Model
+from src.core.components.server import Server
+from src.core.components.sink import Sink
+from src.core.components.source import Source
+from src.core.utils.helper import get_value_from_distribution_with_parameters
+from src.core.utils.random_streams import GLOBAL_RANDOM, MODULE_RANDOM, AntitheticRandom, RandomStreams
+
+
+def setup_model(env):
+    source = Source(env, "VariateSource", (random.expovariate, 1 / 4))
+    server = Server(env, "VariateServer", (random.triangular, 1, 5, 2))
+    sink_1 = Sink(env, "VariateSink1")
+    sink_2 = Sink(env, "VariateSink2")
+
+    source.connect(server)
+    server.connect(sink_1, 30)
+    server.connect(sink_2, 70)
+
+
+sources = {}
+
+
+def setup_line(env, name, processing_time_dwp=(random.uniform, 1, 3)):
+    source = sources[name] = Source(env, f"{name}Source", (random.expovariate, 1 / 2))
+    server = Server(env, f"{name}Server", processing_time_dwp)
+    sink = Sink(env, f"{name}Sink")
+
+    source.connect(server)
+    server.connect(sink)
+
+
+def setup_one_line(env):
+    setup_line(env, "LineA")
+
+
+def setup_two_lines(env):
+    setup_line(env, "LineA")
+    setup_line(env, "LineB", (random.expovariate, 1))
+
+
+def line_results(model_func, seed=7):
+    Model().run_simulation(model_func, 1000, seed=seed)
+    source = sources["LineA"]
+    server = Model().get_component_by_name("LineAServer")
+    return source.entities_created_pivot_table, server.number_exited_pivot_table, sum(server.queue_times)
+
+
+class TestCases(unittest.TestCase):
+
+    def setUp(self):
+        RandomStreams.configure(batched=True, block_size=100)
+        gi.set_random_seed(1)
+
+    def tearDown(self):
+        RandomStreams.configure()
+        cfg.reset_to_global()
+
+    def test_disabled_streams_use_random_module(self):
+        RandomStreams.configure()
+        gi.set_random_seed(5)
+        values = [get_value_from_distribution_with_parameters((random.expovariate, 2)) for _ in range(10)]
+        random.seed(5)
+        self.assertEqual(values, [random.expovariate(2) for _ in range(10)])
+
+    def test_buffers_are_reproducible_and_refill(self):
+        dwp = (random.uniform, 2, 4)
+        values = [get_value_from_distribution_with_parameters(dwp) for _ in range(250)]
+        gi.set_random_seed(1)
+        self.assertEqual(values, [get_value_from_distribution_with_parameters(dwp) for _ in range(250)])
+        self.assertEqual(len(set(values)), 250)
+        self.assertTrue(all(2 <= value <= 4 for value in values))
+
+    def test_buffered_distributions_keep_parameter_meaning(self):
+        RandomStreams.configure(batched=True, block_size=20000)
+
+        def sample(dwp):
+            return [get_value_from_distribution_with_parameters(dwp) for _ in range(20000)]
+
+        self.assertAlmostEqual(statistics.mean(sample((random.expovariate, 1 / 6))), 6, delta=0.2)
+        self.assertAlmostEqual(statistics.mean(sample((random.triangular, 3, 5, 4))), 4, delta=0.05)
+        self.assertAlmostEqual(statistics.mean(sample((random.triangular, 0, 6))), 3, delta=0.1)
+        self.assertAlmostEqual(statistics.mean(sample((random.weibullvariate, 2, 1))), 2, delta=0.1)
+        self.assertAlmostEqual(statistics.mean(sample((random.paretovariate, 3))), 1.5, delta=0.05)
+
+        integers = sample((random.randint, 1, 3))
+        self.assertEqual(set(integers), {1, 2, 3})
+        self.assertIsInstance(integers[0], int)
+
+    def test_other_specifications_are_called_directly(self):
+        self.assertEqual(get_value_from_distribution_with_parameters((lambda: 7,)), 7)
+        self.assertEqual(get_value_from_distribution_with_parameters((max, [1, 9])), 9)
+        # Degenerate triangle is rejected by NumPy and drawn by the random module
+        self.assertEqual(get_value_from_distribution_with_parameters((random.triangular, 2, 2, 2)), 2)
+
+    def test_run_simulation_with_batched_variates(self):
+        cfg.apply_overrides({'performance': {'batched_variates': True, 'variate_block_size': 64}})
+
+        results = []
+        for _ in range(2):
+            Model().run_simulation(setup_model, 2000, seed=3)
+            server = Model().get_component_by_name("VariateServer")
+            results.append([server.number_exited_pivot_table, sum(server.queue_times)])
+
+        self.assertTrue(RandomStreams.batched)
+        self.assertEqual(results[0], results[1])
+        self.assertGreater(results[0][0], 0)
+
+    def test_named_streams_are_independent(self):
+        RandomStreams.configure(named=True)
+        gi.set_random_seed(2)
+        stream = RandomStreams.get(("LineA", "processing"))
+        values = [RandomStreams.draw((random.uniform, 0, 1), ("LineA", "processing")) for _ in range(5)]
+
+        self.assertIs(RandomStreams.get(("LineA", "processing")), stream)
+        self.assertIsNot(RandomStreams.get(("LineA", "arrival")), stream)
+        self.assertNotEqual(values, [RandomStreams.draw((random.uniform, 0, 1), ("LineA", "arrival")) for _ in range(5)])
+
+        gi.set_random_seed(2)
+        self.assertEqual(values, [RandomStreams.draw((random.uniform, 0, 1), ("LineA", "processing")) for _ in range(5)])
+
+    def test_adding_a_component_keeps_the_draws_of_the_others(self):
+        cfg.apply_overrides({'simulation': {'random_streams': True}})
+        self.assertEqual(line_results(setup_one_line), line_results(setup_two_lines))
+
+        cfg.apply_overrides({'simulation': {'random_streams': False}})
+        self.assertNotEqual(line_results(setup_one_line), line_results(setup_two_lines))
+
+    def test_common_random_numbers_across_scenarios(self):
+        def setup_faster_line(env):
+            setup_line(env, "LineA", (random.uniform, 1, 2))
+
+        cfg.apply_overrides({'simulation': {'random_streams': True}})
+        self.assertEqual(line_results(setup_one_line)[0], line_results(setup_faster_line)[0])
+        self.assertLess(line_results(setup_faster_line)[2], line_results(setup_one_line)[2])
+
+
+class TestAntitheticVariates(unittest.TestCase):
+
+    def tearDown(self):
+        RandomStreams.set_antithetic(False)
+        RandomStreams.configure()
+        cfg.reset_to_global()
+
+    def test_complemented_uniforms(self):
+        first, second = AntitheticRandom(3), AntitheticRandom(3, complement=True)
+        for _ in range(100):
+            self.assertAlmostEqual(first.random() + second.random(), 1)
+        self.assertEqual([first.randint(1, 6) + second.randint(1, 6) for _ in range(100)], [7] * 100)
+        # Inverse transforms are mirrored, e.g. short interarrival times against long ones
+        for _ in range(100):
+            self.assertAlmostEqual(first.uniform(2, 4) + second.uniform(2, 4), 6)
+            self.assertAlmostEqual(first.normalvariate(10, 2) + second.normalvariate(10, 2), 20)
+            self.assertAlmostEqual(math.exp(-first.expovariate(1)) + math.exp(-second.expovariate(1)), 1)
+        # The first class of a weighted choice is drawn for the lowest uniforms, never by both members
+        self.assertFalse(any(first.choices('ab', [1, 3])[0] == second.choices('ab', [1, 3])[0] == 'a'
+                             for _ in range(100)))
+
+    def test_random_module_and_streams(self):
+        RandomStreams.set_antithetic(True, complement=True)
+        self.assertIsInstance(GLOBAL_RANDOM, AntitheticRandom)
+        self.assertTrue(RandomStreams.active)
+        gi.set_random_seed(5)
+        complemented = [random.uniform(0, 1), RandomStreams.draw((random.uniform, 0, 1), ("Line", "processing"))]
+
+        RandomStreams.set_antithetic(True)
+        gi.set_random_seed(5)
+        plain = [random.uniform(0, 1), RandomStreams.draw((random.uniform, 0, 1), ("Line", "processing"))]
+        for u, v in zip(plain, complemented):
+            self.assertAlmostEqual(u + v, 1)
+
+        RandomStreams.set_antithetic(False)
+        self.assertIs(type(GLOBAL_RANDOM), random.Random)
+        self.assertFalse(RandomStreams.active)
+        gi.set_random_seed(5)
+        self.assertEqual(random.uniform(0, 1), plain[0])
+
+    def test_distributions_calling_random_directly(self):
+        dwp = (lambda: random.random() * 4,)
+        draws = {}
+        for complement in (False, True):
+            RandomStreams.set_antithetic(True, complement)
+            gi.set_random_seed(5)
+            draws[complement] = [get_value_from_distribution_with_parameters(dwp) for _ in range(50)]
+            # Named streams call the function the same way
+            draws[complement].append(RandomStreams.draw(dwp, ("Line", "processing")))
+        for u, v in zip(draws[False], draws[True]):
+            self.assertAlmostEqual(u + v, 4)
+
+        RandomStreams.set_antithetic(False)
+        self.assertIs(random.random, MODULE_RANDOM)
+        gi.set_random_seed(5)
+        self.assertEqual(dwp[0](), draws[False][0])
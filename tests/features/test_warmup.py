@@ -116,3 +116,6 @@ class TestWarmUp(unittest.TestCase):
 
         # Check that the number of destroyed entities is less than 10
         self.assertLess(destroyed_entities, 10, "The number of destroyed entities exceeded the expected threshold (10).")
+
+        # Every server counts once per replication, it was 1.9499 while the servers were collected twice
+        self.assertEqual(pivot_table.at[('Server', 'Server1', 'EntitiesInQueue (max)'), 'Half-Width'], 3.062)
@@ -0,0 +1,54 @@
+import random
+import unittest
+
+import src.core.config as cfg
+import src.core.global_imports as gi
+from src.core.components.server import Server
+from src.core.components.sink import Sink
+from src.core.components.source import Source
+
+
+def setup_single_server_model(env, prefix, processing_time_dwp=(random.uniform, 2, 4)):
+    """
+    Source -> Server -> Sink with Poisson arrivals every 4 time units on average, used by the replication tests.
+
+    :param env: SimPy environment
+    :param prefix: Prefix of the component names, e.g. "Pool" for PoolSource, PoolServer and PoolSink
+    :param processing_time_dwp: Processing time distribution of the server
+    :return: Source, server and sink
+    """
+    source = Source(env, f"{prefix}Source", (random.expovariate, 1 / 4))
+    server = Server(env, f"{prefix}Server", processing_time_dwp)
+    sink = Sink(env, f"{prefix}Sink")
+
+    source.connect(server)
+    server.connect(sink)
+    return source, server, sink
+
+
+def flatten(statistics, prefix=''):
+    """
+    :param statistics: Nested dicts, lists and tuples, e.g. the result of ``calculate_statistics``
+    :param prefix: Path of ``statistics``
+    :return: Iterator over the path and value of every leaf, e.g. ("/1/0/TimeInQueue (average)", 1.5)
+    """
+    if isinstance(statistics, dict):
+        for key, value in statistics.items():
+            yield from flatten(value, f"{prefix}/{key}")
+    elif isinstance(statistics, (list, tuple)):
+        for index, value in enumerate(statistics):
+            yield from flatten(value, f"{prefix}/{index}")
+    else:
+        yield prefix, statistics
+
+
+class SimulationTestCase(unittest.TestCase):
+    """
+    Runs simulations without entity type statistics and restores the global config afterwards.
+    """
+
+    def setUp(self):
+        gi.set_collect_entity_type_stats(False)
+
+    def tearDown(self):
+        cfg.reset_to_global()